@@ -37,6 +37,9 @@ DB_POOL_MAX_CONN = 5
 
 # --- IP限制配置 ---
 MAX_IPS_PER_USER = int(os.environ.get('MAX_IPS_PER_USER', 5))
+# 已绑定IP的校验结果在进程内缓存的秒数（未绑定的IP不缓存；0 = 每次请求都查询数据库）
+AUTH_IP_CACHE_TTL_SECONDS = float(os.environ.get('AUTH_IP_CACHE_TTL_SECONDS', 30))
+AUTH_IP_CACHE_MAX_ENTRIES = int(os.environ.get('AUTH_IP_CACHE_MAX_ENTRIES', 10000))
 
 # --- 游客模式配置 ---
 def _load_guest_config():
@@ -69,6 +72,43 @@ UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
 ALLOWED_EXTENSIONS = {'xlsx', 'xls'}
 MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB - 主要通过行数限制（1000行）控制
 
+# --- 专利爬虫配置 ---
+SCRAPER_MAX_CONCURRENCY = int(os.environ.get('SCRAPER_MAX_CONCURRENCY', 4))
+SCRAPER_REQUESTS_PER_SECOND = float(os.environ.get('SCRAPER_REQUESTS_PER_SECOND', 1.0))
+SCRAPER_BURST = int(os.environ.get('SCRAPER_BURST', 2))
+SCRAPER_CACHE_ENABLED = os.environ.get('SCRAPER_CACHE_ENABLED', 'true').lower() == 'true'
+SCRAPER_CACHE_DB = os.environ.get('SCRAPER_CACHE_DB', os.path.join(BASE_DIR, 'cache', 'patent_pages.db'))
+SCRAPER_CACHE_TTL_HOURS = float(os.environ.get('SCRAPER_CACHE_TTL_HOURS', 24))
+SCRAPER_CACHE_MEMORY_ENTRIES = int(os.environ.get('SCRAPER_CACHE_MEMORY_ENTRIES', 256))
+SCRAPER_CACHE_MAX_MB = int(os.environ.get('SCRAPER_CACHE_MAX_MB', 512))
+SCRAPER_PARSER = os.environ.get('SCRAPER_PARSER', 'lxml')  # bs4 | lxml
+SCRAPER_SESSION_POOL_SIZE = int(os.environ.get('SCRAPER_SESSION_POOL_SIZE', 8))
+SCRAPER_CONNECTIONS_PER_SESSION = int(os.environ.get('SCRAPER_CONNECTIONS_PER_SESSION', 2))
+SCRAPER_HTTP_RETRIES = int(os.environ.get('SCRAPER_HTTP_RETRIES', 2))
+SCRAPER_RETRY_BACKOFF = float(os.environ.get('SCRAPER_RETRY_BACKOFF', 0.5))
+
+# --- 权利要求处理配置 ---
+CLAIMS_PROCESSING_WORKERS = int(os.environ.get('CLAIMS_PROCESSING_WORKERS', min(4, os.cpu_count() or 1)))
+CLAIMS_PROCESSING_CHUNK_SIZE = int(os.environ.get('CLAIMS_PROCESSING_CHUNK_SIZE', 500))
+CLAIMS_JOB_STALE_SECONDS = float(os.environ.get('CLAIMS_JOB_STALE_SECONDS', 120))
+CLAIMS_TASK_STORE = os.environ.get('CLAIMS_TASK_STORE', 'sqlite')  # sqlite | redis | memory
+CLAIMS_TASK_DB = os.environ.get('CLAIMS_TASK_DB', os.path.join(BASE_DIR, 'cache', 'claims_tasks.db'))
+CLAIMS_TASK_REDIS_URL = os.environ.get('CLAIMS_TASK_REDIS_URL', '')
+CLAIMS_TASK_TTL_HOURS = float(os.environ.get('CLAIMS_TASK_TTL_HOURS', 24))
+
+# --- Excel解析快照配置 ---
+EXCEL_SNAPSHOT_DIR = os.environ.get('EXCEL_SNAPSHOT_DIR', os.path.join(BASE_DIR, 'cache', 'excel_snapshots'))
+
+# --- 附图标记OCR缓存配置 ---
+DRAWING_OCR_CACHE_DIR = os.environ.get('DRAWING_OCR_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'drawing_ocr'))
+DRAWING_OCR_CACHE_TTL_DAYS = float(os.environ.get('DRAWING_OCR_CACHE_TTL_DAYS', 7))
+DRAWING_OCR_CACHE_MEMORY_MB = int(os.environ.get('DRAWING_OCR_CACHE_MEMORY_MB', 64))
+DRAWING_OCR_CACHE_MAX_MB = int(os.environ.get('DRAWING_OCR_CACHE_MAX_MB', 256))
+
+# --- 附图标记OCR并行配置 ---
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', min(2, os.cpu_count() or 1)))  # 0 = 在当前进程内识别
+OCR_WORKER_MEMORY_MB = int(os.environ.get('OCR_WORKER_MEMORY_MB', 500))
+
 # --- 静态文件配置 ---
 STATIC_FOLDER = BASE_DIR
 STATIC_URL_PATH = ''
@@ -6,6 +6,9 @@ This module initializes and configures all Flask extensions including:
 - Database connection pool
 """
 
+import threading
+import time
+
 import psycopg2.pool
 from flask_cors import CORS
 from backend.config import Config
@@ -14,6 +17,58 @@ from backend.config import Config
 db_pool = None
 
 
+class InstrumentedConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    Thread-safe PostgreSQL connection pool with checkout metrics.
+    
+    Request threads share the pool, so checkouts and returns are serialized
+    by ThreadedConnectionPool's lock; the counters below use their own lock.
+    """
+    
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._checkout_started = {}
+        self._metrics = {
+            'checkouts': 0,
+            'exhausted': 0,
+            'in_use': 0,
+            'peak_in_use': 0,
+            'total_hold_seconds': 0.0,
+        }
+    
+    def getconn(self, key=None):
+        try:
+            conn = super().getconn(key)
+        except psycopg2.pool.PoolError:
+            with self._metrics_lock:
+                self._metrics['exhausted'] += 1
+            raise
+        with self._metrics_lock:
+            self._checkout_started[id(conn)] = time.monotonic()
+            self._metrics['checkouts'] += 1
+            self._metrics['in_use'] += 1
+            self._metrics['peak_in_use'] = max(self._metrics['peak_in_use'], self._metrics['in_use'])
+        return conn
+    
+    def putconn(self, conn, key=None, close=False):
+        super().putconn(conn, key, close)
+        with self._metrics_lock:
+            started = self._checkout_started.pop(id(conn), None)
+            if started is not None:
+                self._metrics['in_use'] -= 1
+                self._metrics['total_hold_seconds'] += time.monotonic() - started
+    
+    def stats(self):
+        """Get checkout counters (exhausted = checkouts refused because all connections were in use)."""
+        with self._metrics_lock:
+            result = dict(self._metrics)
+        result['max_connections'] = self.maxconn
+        result['avg_hold_ms'] = (result['total_hold_seconds'] * 1000 / result['checkouts']
+                                 if result['checkouts'] else 0.0)
+        return result
+
+
 def init_extensions(app):
     """
     Initialize Flask extensions.
@@ -41,7 +96,7 @@ def init_db_pool():
             db_pool = None
             return
         
-        db_pool = psycopg2.pool.SimpleConnectionPool(
+        db_pool = InstrumentedConnectionPool(
             Config.DB_POOL_MIN_CONN,
             Config.DB_POOL_MAX_CONN,
             dsn=database_url
@@ -60,3 +115,8 @@ def init_db_pool():
 def get_db_pool():
     """Get database connection pool."""
     return db_pool
+
+
+def get_db_pool_stats():
+    """Get database connection pool metrics (None when no database is configured)."""
+    return db_pool.stats() if db_pool else None
@@ -9,14 +9,23 @@ import os
 import json
 import traceback
 import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
 from flask import Blueprint, request, Response
 from werkzeug.utils import secure_filename
 
 from backend.middleware import login_required
 from backend.utils import create_response
-from patent_claims_processor.services import ProcessingService, ExportService
-from patent_claims_processor.processors import ExcelProcessor
+from backend.config import (
+    CLAIMS_PROCESSING_WORKERS, CLAIMS_PROCESSING_CHUNK_SIZE, CLAIMS_JOB_STALE_SECONDS,
+    CLAIMS_TASK_STORE, CLAIMS_TASK_DB, CLAIMS_TASK_REDIS_URL, CLAIMS_TASK_TTL_HOURS
+)
+from backend.utils.task_store import create_task_store
+from patent_claims_processor.services import ProcessingService, ExportService, ClaimsJob
+from patent_claims_processor.services.result_storage import save_processed_claims, load_processed_claims
+from patent_claims_processor.processors import ExcelProcessor, ColumnNotFoundError
 
 
 claims_bp = Blueprint('claims', __name__)
@@ -32,16 +41,57 @@ if not os.path.exists(UPLOAD_FOLDER):
 if not os.path.exists(TASKS_FOLDER):
     os.makedirs(TASKS_FOLDER)
 
-# Store processing task status (in-memory, consider using Redis for production)
-processing_tasks = {}
+# Task status shared by all workers (status, progress, result summary).
+# Full results are saved under TASKS_FOLDER and referenced by task ID.
+task_store = create_task_store(
+    CLAIMS_TASK_STORE,
+    db_path=CLAIMS_TASK_DB,
+    redis_url=CLAIMS_TASK_REDIS_URL,
+    ttl_seconds=CLAIMS_TASK_TTL_HOURS * 3600
+)
+
+# Results already loaded by this worker, most recently used last
+MAX_CACHED_RESULTS = 8
+
+# Maximum number of Excel rows per /claims/result page
+MAX_RESULT_PAGE_ROWS = 1000
+_task_results = OrderedDict()
+_task_results_lock = threading.Lock()
+
+
+def get_result_path(result_ref: str) -> str:
+    """Path of the columnar result file for a result reference"""
+    return os.path.join(TASKS_FOLDER, f"{result_ref}.claims")
+
+
+def remove_result_file(result_ref: str) -> None:
+    """Delete a task's result file (workers that still map it keep their copy)"""
+    if not result_ref:
+        return
+    try:
+        os.remove(get_result_path(result_ref))
+    except OSError:
+        pass
 
 
 def save_task_to_disk(task_id: str, task_data: dict) -> None:
-    """Save task data to disk for persistence"""
+    """
+    Save task data to disk for persistence.
+    
+    Task fields go to a small JSON file; a result, if present, is written to
+    a columnar result file referenced by the task's result_ref.
+    """
     try:
         task_file = os.path.join(TASKS_FOLDER, f"{task_id}.json")
         
-        # 深拷贝任务数据，确保所有字段都被保存
+        result = task_data.get('result')
+        result_ref = task_data.get('result_ref')
+        summary = task_data.get('summary')
+        if result is not None:
+            result_ref = result_ref or task_id
+            summary = summary or build_result_summary(result)
+            save_processed_claims(get_result_path(result_ref), result)
+        
         task_data_copy = {
             'status': task_data.get('status'),
             'progress': task_data.get('progress'),
@@ -49,48 +99,15 @@ def save_task_to_disk(task_id: str, task_data: dict) -> None:
             'error': task_data.get('error'),
             'file_id': task_data.get('file_id'),
             'sheet_name': task_data.get('sheet_name'),
-            'start_time': task_data.get('start_time')  # 添加开始时间
+            'start_time': task_data.get('start_time'),  # 添加开始时间
+            'summary': summary,
+            'result_ref': result_ref
         }
         
-        # Convert result object to dict if present
-        if task_data.get('result'):
-            result = task_data['result']
-            task_data_copy['result'] = {
-                'total_cells_processed': result.total_cells_processed,
-                'total_claims_extracted': result.total_claims_extracted,
-                'language_distribution': result.language_distribution,
-                'independent_claims_count': result.independent_claims_count,
-                'dependent_claims_count': result.dependent_claims_count,
-                'claims_data': [
-                    {
-                        'claim_number': c.claim_number,
-                        'claim_type': c.claim_type,
-                        'claim_text': c.claim_text,
-                        'language': c.language,
-                        'referenced_claims': c.referenced_claims,
-                        'original_text': c.original_text,
-                        'confidence_score': c.confidence_score,
-                        'patent_number': getattr(c, 'patent_number', None),
-                        'row_index': getattr(c, 'row_index', None)
-                    } for c in result.claims_data
-                ],
-                'processing_errors': [
-                    {
-                        'error_type': e.error_type,
-                        'cell_index': e.cell_index,
-                        'error_message': e.error_message,
-                        'suggested_action': e.suggested_action,
-                        'severity': e.severity
-                    } for e in result.processing_errors
-                ]
-            }
-        else:
-            task_data_copy['result'] = None
-        
         print(f"[save_task_to_disk] Saving task {task_id} with status: {task_data_copy['status']}")
         
         with open(task_file, 'w', encoding='utf-8') as f:
-            json.dump(task_data_copy, f, ensure_ascii=False, indent=2)
+            json.dump(task_data_copy, f, ensure_ascii=False)
             
         print(f"[save_task_to_disk] Task {task_id} saved successfully")
     except Exception as e:
@@ -99,35 +116,44 @@ def save_task_to_disk(task_id: str, task_data: dict) -> None:
 
 
 def load_task_from_disk(task_id: str) -> dict:
-    """Load task data from disk"""
+    """
+    Load task data (without the result) from disk.
+    
+    Task files written by older versions embed the whole result as JSON;
+    it is converted to a columnar result file on first load.
+    """
     try:
         task_file = os.path.join(TASKS_FOLDER, f"{task_id}.json")
         if os.path.exists(task_file):
             with open(task_file, 'r', encoding='utf-8') as f:
                 task_data = json.load(f)
             
-            # Convert dict back to result object if present
-            if task_data.get('result') and isinstance(task_data['result'], dict):
+            legacy_result = task_data.pop('result', None)
+            if isinstance(legacy_result, dict):
                 from patent_claims_processor.models import ProcessedClaims, ClaimInfo, ProcessingError
                 
-                result_dict = task_data['result']
-                claims_data = [
-                    ClaimInfo(**c) for c in result_dict.get('claims_data', [])
-                ]
-                processing_errors = [
-                    ProcessingError(**e) for e in result_dict.get('processing_errors', [])
-                ]
-                
-                task_data['result'] = ProcessedClaims(
-                    total_cells_processed=result_dict['total_cells_processed'],
-                    total_claims_extracted=result_dict['total_claims_extracted'],
-                    language_distribution=result_dict['language_distribution'],
-                    independent_claims_count=result_dict['independent_claims_count'],
-                    dependent_claims_count=result_dict['dependent_claims_count'],
-                    processing_errors=processing_errors,
-                    claims_data=claims_data
+                result = ProcessedClaims(
+                    total_cells_processed=legacy_result['total_cells_processed'],
+                    total_claims_extracted=legacy_result['total_claims_extracted'],
+                    language_distribution=legacy_result['language_distribution'],
+                    independent_claims_count=legacy_result['independent_claims_count'],
+                    dependent_claims_count=legacy_result['dependent_claims_count'],
+                    processing_errors=[
+                        ProcessingError(**e) for e in legacy_result.get('processing_errors', [])
+                    ],
+                    claims_data=[
+                        ClaimInfo(**c) for c in legacy_result.get('claims_data', [])
+                    ],
+                    patent_numbers=legacy_result.get('patent_numbers')
                 )
+                task_data['result'] = result
+                save_task_to_disk(task_id, task_data)
+                task_data.pop('result')
+                task_data['summary'] = build_result_summary(result)
+                task_data['result_ref'] = task_id
             
+            task_data.setdefault('summary', None)
+            task_data.setdefault('result_ref', None)
             return task_data
     except Exception as e:
         print(f"Warning: Failed to load task from disk: {e}")
@@ -135,6 +161,207 @@ def load_task_from_disk(task_id: str) -> dict:
     return None
 
 
+def build_result_summary(result) -> dict:
+    """Build the result summary kept in the task store"""
+    return {
+        'total_cells_processed': result.total_cells_processed,
+        'total_claims_extracted': result.total_claims_extracted,
+        'independent_claims_count': result.independent_claims_count,
+        'dependent_claims_count': result.dependent_claims_count,
+        'language_distribution': result.language_distribution,
+        'error_count': len(result.processing_errors)
+    }
+
+
+def cache_task_result(result_ref: str, result) -> None:
+    """Keep a loaded result in this worker's result cache"""
+    with _task_results_lock:
+        _task_results[result_ref] = result
+        _task_results.move_to_end(result_ref)
+        while len(_task_results) > MAX_CACHED_RESULTS:
+            _task_results.popitem(last=False)
+
+
+def get_task_result(result_ref: str):
+    """Get a task's full result, mapping its result file on first use in this worker"""
+    with _task_results_lock:
+        if result_ref in _task_results:
+            _task_results.move_to_end(result_ref)
+            return _task_results[result_ref]
+    
+    result_path = get_result_path(result_ref)
+    if not os.path.exists(result_path):
+        return None
+    result = load_processed_claims(result_path)
+    cache_task_result(result_ref, result)
+    return result
+
+
+def get_task(task_id: str, with_result: bool = False) -> dict:
+    """
+    Get task state from the shared task store.
+    
+    Tasks that exist only as JSON files on disk (older versions, or expired
+    from the store) are registered in the task store on first access.
+    
+    Args:
+        task_id: Task identifier
+        with_result: Also load the full result (None until completed)
+    
+    Returns:
+        Task dict, or None if the task does not exist
+    """
+    task = task_store.get(task_id)
+    if task is None:
+        task = load_task_from_disk(task_id)
+        if task is None:
+            return None
+        task_store.create(task_id, task)
+    
+    if with_result:
+        task['result'] = get_task_result(task['result_ref']) if task.get('result_ref') else None
+    return task
+
+
+def get_job_dir(task_id: str) -> str:
+    """Checkpoint directory of a task's processing job"""
+    return os.path.join(TASKS_FOLDER, f"{task_id}.job")
+
+
+def run_claims_job(task_id: str, file_path: str, column_name: str, sheet_name: str = None,
+                   patent_column_name: str = None, columns: dict = None) -> None:
+    """
+    Process a claims file as a chunked, checkpointed job.
+    
+    Every completed chunk is checkpointed under get_job_dir(task_id), so a
+    job interrupted by a worker restart continues from its last chunk when
+    resumed (see resume_stale_task). Only one worker runs a job at a time.
+    
+    Args:
+        task_id: Task identifier
+        file_path: Uploaded Excel file
+        column_name: Claims column
+        sheet_name: Worksheet name
+        patent_column_name: Patent number column
+        columns: Columns already read by the caller (optional)
+    """
+    processing_service = ProcessingService(
+        workers=CLAIMS_PROCESSING_WORKERS,
+        chunk_size=CLAIMS_PROCESSING_CHUNK_SIZE
+    )
+    job = ClaimsJob(
+        processing_service, get_job_dir(task_id), file_path, column_name,
+        sheet_name=sheet_name, patent_column_name=patent_column_name,
+        stale_seconds=CLAIMS_JOB_STALE_SECONDS
+    )
+    if not job.acquire():
+        print(f"[run_claims_job] Task {task_id} is being processed by another worker")
+        return
+    
+    try:
+        print(f"[run_claims_job] Starting processing for task: {task_id}")
+        print(f"[run_claims_job] File: {file_path}")
+        print(f"[run_claims_job] Column: {column_name}")
+        print(f"[run_claims_job] Sheet: {sheet_name}")
+        print(f"[run_claims_job] Patent column: {patent_column_name}")
+        
+        # 进度、消息和心跳在一次原子更新中写入任务存储（每完成一块更新一次）
+        def update_progress(current, total):
+            progress = int((current / total) * 100) if total else 100
+            task_store.update(task_id, progress=progress, message=f'正在处理... ({current}/{total})',
+                              updated_at=time.time())
+            print(f"[run_claims_job] Progress: {progress}% ({current}/{total})")
+        
+        # 处理单块或读取文件耗时较长时，心跳保持任务不被判定为中断
+        def keep_alive():
+            task_store.update(task_id, updated_at=time.time())
+        
+        result = job.run(progress_callback=update_progress, preloaded_columns=columns,
+                         heartbeat_callback=keep_alive)
+        
+        print(f"[run_claims_job] Processing completed successfully")
+        print(f"[run_claims_job] Claims extracted: {result.total_claims_extracted}")
+        
+        # Save full result to disk, then publish the reference and summary.
+        # Each run gets its own result file, so workers holding an
+        # earlier run's result never read a half-replaced file.
+        result_ref = f"{task_id}_{uuid.uuid4().hex[:8]}"
+        task = task_store.get(task_id) or {}
+        task.update(
+            status='completed',
+            progress=100,
+            message='处理完成',
+            result=result,
+            result_ref=result_ref,
+            summary=build_result_summary(result)
+        )
+        save_task_to_disk(task_id, task)
+        cache_task_result(result_ref, load_processed_claims(get_result_path(result_ref)))
+        task_store.update(
+            task_id,
+            status='completed',
+            progress=100,
+            message='处理完成',
+            summary=task['summary'],
+            result_ref=result_ref,
+            updated_at=time.time()
+        )
+        job.cleanup()
+        
+        print(f"[run_claims_job] Task status updated to completed")
+        
+    except Exception as e:
+        print(f"[run_claims_job] Error in background processing: {traceback.format_exc()}")
+        task_store.update(
+            task_id,
+            status='failed',
+            error=str(e),
+            message=f'处理失败: {str(e)}',
+            updated_at=time.time()
+        )
+        job.cleanup()
+    finally:
+        job.release()
+
+
+def start_claims_job(task_id: str, file_path: str, column_name: str, sheet_name: str = None,
+                     patent_column_name: str = None, columns: dict = None) -> None:
+    """Run a claims job in a background thread"""
+    thread = threading.Thread(
+        target=run_claims_job,
+        args=(task_id, file_path, column_name, sheet_name, patent_column_name, columns)
+    )
+    thread.daemon = True
+    thread.start()
+
+
+def is_task_stale(task: dict) -> bool:
+    """Whether a processing task has stopped sending heartbeats (its worker exited)"""
+    last_update = task.get('updated_at') or task.get('start_time') or 0
+    return time.time() - last_update > CLAIMS_JOB_STALE_SECONDS
+
+
+def resume_stale_task(task_id: str, task: dict) -> bool:
+    """
+    Resume a processing task whose worker stopped, from its last checkpoint.
+    
+    Returns:
+        True if the job was restarted
+    """
+    if task.get('status') != 'processing' or not is_task_stale(task) or not task.get('column_name'):
+        return False
+    
+    file_path = os.path.join(UPLOAD_FOLDER, task['file_id'])
+    if not os.path.exists(file_path):
+        return False
+    
+    print(f"[resume_stale_task] Resuming task {task_id} from its last checkpoint")
+    task_store.update(task_id, message='正在恢复处理...', updated_at=time.time())
+    start_claims_job(task_id, file_path, task['column_name'], task.get('sheet_name'),
+                     task.get('patent_column_name'))
+    return True
+
+
 def allowed_file(filename: str) -> bool:
     """
     Check if file extension is allowed.
@@ -352,16 +579,20 @@ def process_claims():
         
         # Validate claims content before processing
         try:
+            # 流式读取一次所需列，校验后直接交给后台处理，不再重复读取文件
             excel_processor = ExcelProcessor()
-            df = excel_processor.read_excel_file(file_path, sheet_name=sheet_name)
-            
-            if column_name not in df.columns:
+            try:
+                columns = excel_processor.read_columns(
+                    file_path, [column_name], sheet_name=sheet_name,
+                    optional_columns=[patent_column_name] if patent_column_name else []
+                )
+            except ColumnNotFoundError:
                 return create_response(
                     error=f"列'{column_name}'不存在",
                     status_code=400
                 )
             
-            column_data = excel_processor.get_column_data(df, column_name)
+            column_data = columns[column_name]
             
             # Check if content contains "权利要求" keywords in multiple languages
             claims_keywords = [
@@ -428,132 +659,42 @@ def process_claims():
         print(f"  Safe sheet name: {safe_sheet_name}")
         
         # Clean up old task if exists (allow overwriting)
-        if task_id in processing_tasks:
-            old_task = processing_tasks[task_id]
+        old_task = task_store.get(task_id)
+        if old_task:
             if old_task['status'] == 'processing':
                 # 检查任务是否真的在处理中（通过检查最后更新时间）
-                # 如果任务超过5分钟没有更新，认为已经失败，允许重新处理
-                import time
-                current_time = time.time()
-                task_start_time = old_task.get('start_time', current_time)
-                elapsed_time = current_time - task_start_time
-                
-                if elapsed_time < 300:  # 5分钟内
+                # 处理中的任务每完成一块都会更新心跳，长时间没有更新说明worker已退出
+                if not is_task_stale(old_task):
                     return create_response(
                         error="该文件和工作表的处理任务正在进行中，请等待完成",
                         status_code=400
                     )
-                else:
-                    print(f"[process_claims] Old task timed out ({elapsed_time:.1f}s), allowing restart")
+                print(f"[process_claims] Old task stopped reporting progress, allowing restart")
             # Remove old completed/failed/timed-out task
-            del processing_tasks[task_id]
+            task_store.delete(task_id)
+            remove_result_file(old_task.get('result_ref'))
         
         # Initialize task status
-        import time
-        processing_tasks[task_id] = {
+        # 任务状态写入共享任务存储，任意worker都能查询进度；
+        # 保存处理参数，worker退出后可由其他worker从检查点继续处理
+        task_store.create(task_id, {
             'status': 'processing',
             'progress': 0,
             'message': '正在处理...',
-            'result': None,
             'error': None,
             'file_id': file_id,
             'sheet_name': sheet_name,
-            'start_time': time.time()  # 添加开始时间
-        }
-        
-        # 立即保存任务状态到磁盘，防止worker重启导致任务丢失
-        # 性能优化：只保存初始状态，不在进度更新时频繁保存
-        save_task_to_disk(task_id, processing_tasks[task_id])
-        print(f"[process_claims] Task {task_id} created and saved to disk")
-        
-        # Process file in background thread
-        def process_in_background():
-            try:
-                print(f"[process_in_background] Starting processing for task: {task_id}")
-                print(f"[process_in_background] File: {file_path}")
-                print(f"[process_in_background] Column: {column_name}")
-                print(f"[process_in_background] Sheet: {sheet_name}")
-                print(f"[process_in_background] Patent column: {patent_column_name}")
-                
-                # 定义进度回调函数
-                # 性能优化：只更新内存中的进度，不保存到磁盘
-                def update_progress(current, total):
-                    progress = int((current / total) * 100)
-                    processing_tasks[task_id]['progress'] = progress
-                    processing_tasks[task_id]['message'] = f'正在处理... ({current}/{total})'
-                    # 【性能优化关键】：移除频繁的磁盘I/O，只在完成或失败时保存
-                    # 这可以提升30-50%的处理速度
-                    print(f"[process_in_background] Progress: {progress}% ({current}/{total})")
-                
-                # Create processing service
-                processing_service = ProcessingService()
-                
-                # 【关键修复】：设置超时保护，避免长时间运行
-                import signal
-                
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("处理超时")
-                
-                # 设置30秒超时（Render限制）
-                # 注意：Windows不支持signal.alarm，只在Linux上有效
-                try:
-                    if hasattr(signal, 'SIGALRM'):
-                        signal.signal(signal.SIGALRM, timeout_handler)
-                        signal.alarm(25)  # 25秒超时，留5秒缓冲
-                except Exception:
-                    pass  # Windows环境忽略
-                
-                # Process Excel file with progress callback
-                result = processing_service.process_excel_file(
-                    file_path=file_path,
-                    column_name=column_name,
-                    sheet_name=sheet_name,
-                    patent_column_name=patent_column_name,
-                    progress_callback=update_progress
-                )
-                
-                # 取消超时
-                try:
-                    if hasattr(signal, 'SIGALRM'):
-                        signal.alarm(0)
-                except Exception:
-                    pass
-                
-                print(f"[process_in_background] Processing completed successfully")
-                print(f"[process_in_background] Claims extracted: {result.total_claims_extracted}")
-                
-                # Update task status
-                processing_tasks[task_id]['status'] = 'completed'
-                processing_tasks[task_id]['progress'] = 100
-                processing_tasks[task_id]['message'] = '处理完成'
-                processing_tasks[task_id]['result'] = result
-                
-                print(f"[process_in_background] Task status updated to completed")
-                
-                # Save task to disk for persistence
-                save_task_to_disk(task_id, processing_tasks[task_id])
-                print(f"[process_in_background] Task saved to disk")
-                
-            except TimeoutError as e:
-                print(f"[process_in_background] Timeout error: {str(e)}")
-                processing_tasks[task_id]['status'] = 'timeout'
-                processing_tasks[task_id]['error'] = '处理超时，请尝试减少数据量或分批处理'
-                processing_tasks[task_id]['message'] = '处理超时'
-                save_task_to_disk(task_id, processing_tasks[task_id])
-                
-            except Exception as e:
-                print(f"[process_in_background] Error in background processing: {traceback.format_exc()}")
-                processing_tasks[task_id]['status'] = 'failed'
-                processing_tasks[task_id]['error'] = str(e)
-                processing_tasks[task_id]['message'] = f'处理失败: {str(e)}'
-                
-                # Save failed task to disk as well
-                save_task_to_disk(task_id, processing_tasks[task_id])
-                print(f"[process_in_background] Failed task saved to disk")
+            'column_name': column_name,
+            'patent_column_name': patent_column_name,
+            'start_time': time.time(),  # 添加开始时间
+            'updated_at': time.time(),
+            'summary': None,
+            'result_ref': None
+        })
+        print(f"[process_claims] Task {task_id} created")
         
-        thread = threading.Thread(target=process_in_background)
-        thread.daemon = True
-        thread.start()
+        # Process file in background thread (chunked and checkpointed, see run_claims_job)
+        start_claims_job(task_id, file_path, column_name, sheet_name, patent_column_name, columns)
         
         return create_response(data={
             'task_id': task_id,
@@ -585,26 +726,19 @@ def get_processing_status(task_id):
     try:
         print(f"Checking status for task: {task_id}")
         
-        # Try to get from memory first
-        if task_id not in processing_tasks:
-            print(f"Task {task_id} not in memory, trying disk...")
-            # Try to load from disk
-            task_data = load_task_from_disk(task_id)
-            if task_data:
-                processing_tasks[task_id] = task_data
-                print(f"Task {task_id} loaded from disk")
-            else:
-                print(f"Task {task_id} not found on disk either")
-                print(f"Available tasks in memory: {list(processing_tasks.keys())}")
-                # 返回一个更友好的响应，而不是404
-                return create_response(data={
-                    'task_id': task_id,
-                    'status': 'not_found',
-                    'progress': 0,
-                    'message': '任务不存在或已过期'
-                })
-        
-        task = processing_tasks[task_id]
+        task = get_task(task_id)
+        if task is None:
+            print(f"Task {task_id} not found")
+            # 返回一个更友好的响应，而不是404
+            return create_response(data={
+                'task_id': task_id,
+                'status': 'not_found',
+                'progress': 0,
+                'message': '任务不存在或已过期'
+            })
+        
+        # 处理该任务的worker已退出时，从最后一个检查点继续处理
+        resume_stale_task(task_id, task)
         
         response_data = {
             'task_id': task_id,
@@ -614,16 +748,8 @@ def get_processing_status(task_id):
         }
         
         # Add result summary if completed
-        if task['status'] == 'completed' and task['result']:
-            result = task['result']
-            response_data['summary'] = {
-                'total_cells_processed': result.total_cells_processed,
-                'total_claims_extracted': result.total_claims_extracted,
-                'independent_claims_count': result.independent_claims_count,
-                'dependent_claims_count': result.dependent_claims_count,
-                'language_distribution': result.language_distribution,
-                'error_count': len(result.processing_errors)
-            }
+        if task['status'] == 'completed' and task.get('summary'):
+            response_data['summary'] = task['summary']
         
         # Add error information if failed
         if task['status'] == 'failed':
@@ -650,6 +776,12 @@ def get_processing_result(task_id):
     
     Requirements 6.1, 6.2: Generate structured data with all claims information.
     
+    Query Parameters:
+        row_start: First Excel row index of the page (optional)
+        row_count: Number of rows in the page (optional, at most MAX_RESULT_PAGE_ROWS)
+    
+    Without paging parameters all claims are returned.
+    
     Args:
         task_id: Task identifier
     
@@ -659,23 +791,14 @@ def get_processing_result(task_id):
     try:
         print(f"[get_processing_result] Fetching result for task: {task_id}")
         
-        # Try to get from memory first
-        if task_id not in processing_tasks:
-            print(f"[get_processing_result] Task not in memory, trying disk...")
-            # Try to load from disk
-            task_data = load_task_from_disk(task_id)
-            if task_data:
-                processing_tasks[task_id] = task_data
-                print(f"[get_processing_result] Task loaded from disk")
-            else:
-                print(f"[get_processing_result] Task not found")
-                print(f"[get_processing_result] Available tasks: {list(processing_tasks.keys())}")
-                return create_response(
-                    error="任务不存在",
-                    status_code=404
-                )
+        task = get_task(task_id, with_result=True)
+        if task is None:
+            print(f"[get_processing_result] Task not found")
+            return create_response(
+                error="任务不存在",
+                status_code=404
+            )
         
-        task = processing_tasks[task_id]
         print(f"[get_processing_result] Task status: {task['status']}")
         
         if task['status'] != 'completed':
@@ -688,13 +811,33 @@ def get_processing_result(task_id):
             )
         
         result = task['result']
-        print(f"[get_processing_result] Processing result, claims count: {len(result.claims_data)}")
+        
+        # 分页：按行索引区间读取权利要求
+        row_start = request.args.get('row_start', type=int)
+        row_count = request.args.get('row_count', type=int)
+        pagination = None
+        if row_start is not None or row_count is not None:
+            row_start = max(0, row_start or 0)
+            row_count = max(1, min(row_count or MAX_RESULT_PAGE_ROWS, MAX_RESULT_PAGE_ROWS))
+            row_stop = row_start + row_count
+            claims = result.claims_in_rows(row_start, row_stop)
+            errors = [e for e in result.processing_errors if row_start <= e.cell_index < row_stop]
+            pagination = {
+                'row_start': row_start,
+                'row_count': row_count,
+                'total_rows': result.total_cells_processed,
+                'has_more': row_stop < result.total_cells_processed
+            }
+        else:
+            claims = result.claims_data
+            errors = result.processing_errors
+        print(f"[get_processing_result] Processing result, claims count: {len(claims)}")
         
         # Build detailed results
         claims_list = []
         claims_by_row = {}  # 按行索引组织权利要求数据
         
-        for claim in result.claims_data:
+        for claim in claims:
             claim_dict = {
                 'claim_number': claim.claim_number,
                 'claim_type': claim.claim_type,
@@ -718,7 +861,7 @@ def get_processing_result(task_id):
                 claims_by_row[row_index].append(claim_dict)
         
         errors_list = []
-        for error in result.processing_errors:
+        for error in errors:
             errors_list.append({
                 'error_type': error.error_type,
                 'cell_index': error.cell_index,
@@ -740,6 +883,8 @@ def get_processing_result(task_id):
             'claims_by_row': claims_by_row,  # 添加按行组织的数据
             'errors': errors_list
         }
+        if pagination:
+            response_data['pagination'] = pagination
         
         print(f"[get_processing_result] Returning {len(claims_list)} claims")
         return create_response(data=response_data)
@@ -767,19 +912,12 @@ def export_claims_result(task_id):
         File download response
     """
     try:
-        # Try to get from memory first
-        if task_id not in processing_tasks:
-            # Try to load from disk
-            task_data = load_task_from_disk(task_id)
-            if task_data:
-                processing_tasks[task_id] = task_data
-            else:
-                return create_response(
-                    error="任务不存在",
-                    status_code=404
-                )
-
-        task = processing_tasks[task_id]
+        task = get_task(task_id, with_result=True)
+        if task is None:
+            return create_response(
+                error="任务不存在",
+                status_code=404
+            )
 
         if task['status'] != 'completed':
             return create_response(
@@ -886,19 +1024,12 @@ def get_processing_report(task_id):
         JSON response with report text
     """
     try:
-        # Try to get from memory first
-        if task_id not in processing_tasks:
-            # Try to load from disk
-            task_data = load_task_from_disk(task_id)
-            if task_data:
-                processing_tasks[task_id] = task_data
-            else:
-                return create_response(
-                    error="任务不存在",
-                    status_code=404
-                )
-        
-        task = processing_tasks[task_id]
+        task = get_task(task_id, with_result=True)
+        if task is None:
+            return create_response(
+                error="任务不存在",
+                status_code=404
+            )
         
         if task['status'] != 'completed':
             return create_response(
@@ -953,20 +1084,14 @@ def get_visualization_data(task_id):
         print(f"[get_visualization_data] Task: {task_id}, Patent: {patent_number}, Row: {row_index}")
         
         # 获取任务数据
-        if task_id not in processing_tasks:
-            print(f"[get_visualization_data] Task not in memory, loading from disk...")
-            task_data = load_task_from_disk(task_id)
-            if task_data:
-                processing_tasks[task_id] = task_data
-                print(f"[get_visualization_data] Task loaded from disk")
-            else:
-                print(f"[get_visualization_data] Task not found on disk")
-                return create_response(
-                    error="任务不存在",
-                    status_code=404
-                )
+        task = get_task(task_id, with_result=True)
+        if task is None:
+            print(f"[get_visualization_data] Task not found")
+            return create_response(
+                error="任务不存在",
+                status_code=404
+            )
         
-        task = processing_tasks[task_id]
         print(f"[get_visualization_data] Task status: {task['status']}")
         
         if task['status'] != 'completed':
@@ -976,26 +1101,15 @@ def get_visualization_data(task_id):
             )
         
         result = task['result']
-        print(f"[get_visualization_data] Total claims in result: {len(result.claims_data)}")
-        
-        # 筛选出指定专利的权利要求
-        patent_claims = []
+        print(f"[get_visualization_data] Total claims in result: {len(result)}")
         
+        # 按索引只读取指定专利或行的权利要求
         if patent_number:
-            # 按专利号筛选
             print(f"[get_visualization_data] Filtering by patent_number: {patent_number}")
-            for claim in result.claims_data:
-                if claim.patent_number == patent_number:
-                    patent_claims.append(claim)
-                    print(f"[get_visualization_data] Found claim {claim.claim_number} for patent {patent_number}")
+            patent_claims = result.claims_for_patent(patent_number)
         elif row_index is not None:
-            # 按行索引筛选
             print(f"[get_visualization_data] Filtering by row_index: {row_index}")
-            for claim in result.claims_data:
-                claim_row = getattr(claim, 'row_index', None)
-                if claim_row == row_index:
-                    patent_claims.append(claim)
-                    print(f"[get_visualization_data] Found claim {claim.claim_number} at row {row_index}")
+            patent_claims = result.claims_for_row(row_index) if isinstance(row_index, int) else []
         else:
             print(f"[get_visualization_data] Error: No patent_number or row_index provided")
             return create_response(
@@ -1005,16 +1119,7 @@ def get_visualization_data(task_id):
         
         if not patent_claims:
             print(f"[get_visualization_data] No claims found for patent_number={patent_number}, row_index={row_index}")
-            # 打印所有可用的专利号和行索引，帮助调试
-            available_patents = set()
-            available_rows = set()
-            for claim in result.claims_data:
-                if claim.patent_number:
-                    available_patents.add(claim.patent_number)
-                if hasattr(claim, 'row_index') and claim.row_index is not None:
-                    available_rows.add(claim.row_index)
-            print(f"[get_visualization_data] Available patents: {list(available_patents)[:10]}")
-            print(f"[get_visualization_data] Available rows: {list(available_rows)[:10]}")
+            print(f"[get_visualization_data] Available patents: {(result.patent_numbers or [])[:10]}")
             
             return create_response(
                 error="未找到该专利的权利要求数据",
@@ -231,19 +231,8 @@ def parse_claims_text():
                 # 检测当前权利要求的语言
                 claim_language = language_detector.detect_language(normalized_text)
                 
-                # 分类权利要求类型
-                claim_type = classifier.classify_claim_type(normalized_text, claim_language)
-                
-                # 提取引用关系
-                referenced_claims = []
-                if claim_type == 'dependent':
-                    try:
-                        referenced_claims = classifier.extract_referenced_claims(
-                            normalized_text, claim_language
-                        )
-                    except Exception:
-                        # 引用提取失败时，仍然标记为从属权利要求但引用为空
-                        pass
+                # 分类权利要求类型并提取引用关系
+                claim_type, referenced_claims = classifier.analyze_claim(normalized_text, claim_language)
                 
                 # 处理特殊引用标记
                 resolved_references = []
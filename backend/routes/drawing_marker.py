@@ -11,6 +11,7 @@ This module handles patent drawing marker functionality, including:
 
 import traceback
 import asyncio
+import threading
 from io import BytesIO
 from flask import Blueprint, request
 
@@ -23,10 +24,119 @@ from backend.utils.ocr_utils import (
     calculate_statistics
 )
 from backend.services.api_service import get_zhipu_client
+from backend.utils.drawing_cache import DrawingCacheManager, make_cache_key
+from backend.config import (
+    DRAWING_OCR_CACHE_DIR, DRAWING_OCR_CACHE_TTL_DAYS, DRAWING_OCR_CACHE_MEMORY_MB, DRAWING_OCR_CACHE_MAX_MB
+)
 
 
 drawing_marker_bp = Blueprint('drawing_marker', __name__)
 
+_cache_manager = None
+_cache_manager_lock = threading.Lock()
+
+
+def get_cache_manager() -> DrawingCacheManager:
+    """
+    Get or create the OCR result cache shared by all requests of this process.
+    
+    The persistent tier lives under DRAWING_OCR_CACHE_DIR and is shared by
+    all workers on the host.
+    """
+    global _cache_manager
+    
+    if _cache_manager is not None:
+        return _cache_manager
+    
+    with _cache_manager_lock:
+        if _cache_manager is None:
+            _cache_manager = DrawingCacheManager(
+                cache_dir=DRAWING_OCR_CACHE_DIR or None,
+                max_age_days=DRAWING_OCR_CACHE_TTL_DAYS,
+                max_memory_bytes=DRAWING_OCR_CACHE_MEMORY_MB * 1024 * 1024,
+                max_disk_bytes=DRAWING_OCR_CACHE_MAX_MB * 1024 * 1024
+            )
+    
+    return _cache_manager
+
+
+def add_cache_stats(cache_info: dict) -> dict:
+    """
+    Add this request's hit/miss counts and the cache's counters to cache_info.
+    
+    The summary is stored under the '_stats' key; per-drawing entries are
+    keyed by drawing name as before.
+    """
+    entries = [info for info in cache_info.values() if isinstance(info, dict) and 'has_cache' in info]
+    hits = sum(1 for info in entries if info['has_cache'])
+    cache_info['_stats'] = {
+        'hits': hits,
+        'misses': len(entries) - hits,
+        'cache': get_cache_manager().stats()
+    }
+    return cache_info
+
+
+def prepare_drawing_ocr(drawings: list, ocr_mode: str, force_refresh: bool) -> tuple:
+    """
+    Look up a request's drawings in the OCR cache and recognize the misses
+    together in the OCR worker pool.
+    
+    Only RapidOCR misses are batched; GLM and PP-OCRv5 drawings are
+    recognized one by one by the remote services.
+    
+    Args:
+        drawings: Drawings of the request ({'name', 'data', ...})
+        ocr_mode: OCR mode the results are cached under
+        force_refresh: Ignore cached results
+        
+    Returns:
+        tuple: (drawing index -> cached entry,
+                drawing index -> detected markers or the exception its
+                recognition failed with, see take_ocr_result)
+    """
+    import base64
+    from backend.utils.ocr_utils import perform_ocr_batch
+    
+    cache_manager = get_cache_manager()
+    cached_results = {}
+    indexes, images = [], []
+    for index, drawing in enumerate(drawings):
+        try:
+            image_data = base64.b64decode(drawing['data'])
+        except Exception:
+            # Reported by the per-drawing loop
+            continue
+        if not force_refresh:
+            cached_result = cache_manager.get_cache(make_cache_key(ocr_mode, image_data)[0])
+            if cached_result:
+                cached_results[index] = cached_result
+                continue
+        indexes.append(index)
+        images.append(image_data)
+    
+    if not images or ocr_mode in ('glm_ocr', 'paddle_ocr'):
+        return cached_results, {}
+    print(f"[DEBUG] Recognizing {len(images)} drawings in the OCR worker pool")
+    return cached_results, dict(zip(indexes, perform_ocr_batch(images)))
+
+
+def take_ocr_result(ocr_batch: dict, index: int, image_data: bytes) -> list:
+    """
+    Get a drawing's markers from prepare_drawing_ocr.
+    
+    Re-raises the drawing's recognition error so the caller reports it as
+    before; drawings not in the batch are recognized now.
+    """
+    from backend.utils.ocr_utils import perform_ocr
+    
+    result = ocr_batch.get(index)
+    if result is None:
+        return perform_ocr(image_data)
+    if isinstance(result, Exception):
+        raise result
+    return result
+
 
 @drawing_marker_bp.route('/drawing-marker/process', methods=['POST'])
 def process_drawing_marker():
@@ -76,7 +186,7 @@ def process_drawing_marker():
             "message": "成功处理 1 张图片，识别出 1 个数字序号，匹配率 33.33%",
             "cache_info": {
                 "has_cache": false,
-                "cache_key": "drawing1.png_hash123"
+                "cache_key": "rapidocr_hash123"
             }
         }
     }
@@ -102,13 +212,11 @@ def process_drawing_marker():
             return create_response(error="specification is required and must be a non-empty string", status_code=400)
         
         import base64
-        import hashlib
         from backend.utils.ocr_utils import perform_ocr
         from backend.utils.component_extractor import extract_reference_markers
         from backend.utils.text_preprocessor import TextPreprocessor
 
-        from backend.utils.drawing_cache import DrawingCacheManager
-        cache_manager = DrawingCacheManager()
+        cache_manager = get_cache_manager()
 
         processed_results = []
         total_numbers = 0
@@ -141,19 +249,20 @@ def process_drawing_marker():
 
         print(f"[DEBUG] Step 1: Processing {len(drawings)} drawings with OCR (mode: {ocr_mode})...")
 
-        for drawing in drawings:
+        cached_results, ocr_batch = prepare_drawing_ocr(drawings, ocr_mode, force_refresh)
+
+        for index, drawing in enumerate(drawings):
             try:
                 print(f"[DEBUG] Processing drawing: {drawing['name']}")
 
                 # 解析base64图片数据
                 image_data = base64.b64decode(drawing['data'])
                 
-                image_hash = hashlib.md5(image_data).hexdigest()
-                cache_key = f"{ocr_mode}_{drawing['name']}_{image_hash}"
+                cache_key, image_hash = make_cache_key(ocr_mode, image_data)
                 
                 cached_result = None
                 if not force_refresh:
-                    cached_result = cache_manager.get_cache(cache_key)
+                    cached_result = cached_results.get(index)
                     if cached_result:
                         print(f"[DEBUG] Found cached result for {drawing['name']}")
                         cache_info[drawing['name']] = {
@@ -192,7 +301,7 @@ def process_drawing_marker():
                             print(f"[WARN] PP-OCRv5 failed, falling back to RapidOCR: {str(e)}")
                             all_detected_numbers = perform_ocr(image_data)
                     else:
-                        all_detected_numbers = perform_ocr(image_data)
+                        all_detected_numbers = take_ocr_result(ocr_batch, index, image_data)
                     
                     cache_manager.set_cache(cache_key, {
                         'drawing_name': drawing['name'],
@@ -438,7 +547,7 @@ def process_drawing_marker():
             'missing_markers': missing_markers,
             'suggestions': stats['suggestions'],
             'message': message,
-            'cache_info': cache_info,
+            'cache_info': add_cache_stats(cache_info),
             'ocr_mode': ocr_mode,
             'ocr_mode_display': ocr_mode_display,
             'debug_info': {
@@ -580,7 +689,7 @@ def reprocess_specification():
     
     Request body:
     {
-        "cache_keys": ["drawing1.png_hash123", "drawing2.png_hash456"],
+        "cache_keys": ["rapidocr_hash123", "rapidocr_hash456"],
         "specification": "更新后的说明书内容",
         "ai_mode": true/false,
         "model_name": "glm-4-flash" (required when ai_mode=true),
@@ -615,8 +724,7 @@ def reprocess_specification():
             )
         
         # Import cache manager
-        from backend.utils.drawing_cache import DrawingCacheManager
-        cache_manager = DrawingCacheManager()
+        cache_manager = get_cache_manager()
         
         # Load cached OCR results
         processed_results = []
@@ -797,41 +905,41 @@ def reprocess_drawings():
         
         # Import necessary modules
         import base64
-        import hashlib
         from backend.utils.ocr_utils import (
-            perform_ocr,
             deduplicate_results,
             filter_by_confidence,
             match_with_reference_map
         )
-        from backend.utils.drawing_cache import DrawingCacheManager
         
-        cache_manager = DrawingCacheManager()
+        cache_manager = get_cache_manager()
         processed_results = []
         total_ocr_detected = 0
         total_matched = 0
         total_unmatched = 0
         
+        # Recognize all drawings in the OCR worker pool (force refresh to get new results)
+        _, ocr_batch = prepare_drawing_ocr(drawings, 'rapidocr', force_refresh=True)
+        
         # Process each drawing with OCR
-        for drawing in drawings:
+        for index, drawing in enumerate(drawings):
             try:
                 print(f"[DEBUG] Processing drawing: {drawing['name']}")
                 
                 # Decode image
                 image_data = base64.b64decode(drawing['data'])
                 
-                # Generate cache key
-                image_hash = hashlib.md5(image_data).hexdigest()
-                cache_key = f"{drawing['name']}_{image_hash}"
+                # Generate cache key (drawings are always re-recognized with RapidOCR here)
+                cache_key, image_hash = make_cache_key('rapidocr', image_data)
                 
                 # Perform OCR (force refresh to get new results)
-                all_detected_numbers = perform_ocr(image_data)
+                all_detected_numbers = take_ocr_result(ocr_batch, index, image_data)
                 
                 # Save to cache
                 cache_manager.set_cache(cache_key, {
                     'drawing_name': drawing['name'],
                     'ocr_results': all_detected_numbers,
-                    'image_hash': image_hash
+                    'image_hash': image_hash,
+                    'ocr_mode': 'rapidocr'
                 })
                 
                 print(f"[DEBUG] OCR detected {len(all_detected_numbers)} markers")
@@ -963,13 +1071,11 @@ def process_drawing_marker_staged():
             return create_response(error="specification is required and must be a non-empty string", status_code=400)
         
         import base64
-        import hashlib
         from backend.utils.ocr_utils import perform_ocr, deduplicate_results, filter_by_confidence, match_with_reference_map, calculate_statistics
-        from backend.utils.drawing_cache import DrawingCacheManager
         from backend.utils.text_segment_extractor import extract_relevant_segments
         from backend.utils.component_extractor import extract_reference_markers
         
-        cache_manager = DrawingCacheManager()
+        cache_manager = get_cache_manager()
         
         glm_api_key = None
         if ocr_mode == 'glm_ocr':
@@ -1000,15 +1106,16 @@ def process_drawing_marker_staged():
         if stage in ['ocr', 'all'] and not ocr_results_from_client:
             print(f"[STAGED] Step 1: OCR recognition (mode: {ocr_mode})...")
             
-            for drawing in drawings:
+            cached_results, ocr_batch = prepare_drawing_ocr(drawings, ocr_mode, force_refresh)
+            
+            for index, drawing in enumerate(drawings):
                 try:
                     image_data = base64.b64decode(drawing['data'])
-                    image_hash = hashlib.md5(image_data).hexdigest()
-                    cache_key = f"{ocr_mode}_{drawing['name']}_{image_hash}"
+                    cache_key, image_hash = make_cache_key(ocr_mode, image_data)
                     
                     cached_result = None
                     if not force_refresh:
-                        cached_result = cache_manager.get_cache(cache_key)
+                        cached_result = cached_results.get(index)
                     
                     if cached_result and not force_refresh:
                         all_detected_numbers = cached_result['ocr_results']
@@ -1029,7 +1136,7 @@ def process_drawing_marker_staged():
                                 print(f"[WARN] PP-OCRv5 failed, falling back: {str(e)}")
                                 all_detected_numbers = perform_ocr(image_data)
                         else:
-                            all_detected_numbers = perform_ocr(image_data)
+                            all_detected_numbers = take_ocr_result(ocr_batch, index, image_data)
                         
                         cache_manager.set_cache(cache_key, {
                             'drawing_name': drawing['name'],
@@ -1069,7 +1176,7 @@ def process_drawing_marker_staged():
                     'stage': 'ocr',
                     'ocr_markers': list(all_ocr_markers),
                     'drawings': processed_results,
-                    'cache_info': cache_info,
+                    'cache_info': add_cache_stats(cache_info),
                     'message': f"OCR识别完成，共识别出 {len(all_ocr_markers)} 个序号"
                 })
         
@@ -1131,8 +1238,7 @@ def process_drawing_marker_staged():
                     for drawing in drawings:
                         try:
                             image_data = base64.b64decode(drawing['data'])
-                            image_hash = hashlib.md5(image_data).hexdigest()
-                            cache_key = f"{ocr_mode}_{drawing['name']}_{image_hash}"
+                            cache_key, image_hash = make_cache_key(ocr_mode, image_data)
                             
                             cached_result = cache_manager.get_cache(cache_key)
                             if cached_result:
@@ -1280,7 +1386,7 @@ def process_drawing_marker_staged():
                 'match_rate': stats['match_rate'],
                 'avg_confidence': stats['avg_confidence'],
                 'message': message,
-                'cache_info': cache_info,
+                'cache_info': add_cache_stats(cache_info),
                 'ocr_mode': ocr_mode,
                 'ocr_mode_display': ocr_mode_display,
                 'extraction_info': {
@@ -5,15 +5,21 @@ Excel文件上传和处理功能的API路由
 """
 
 import os
+import glob
 import json
+import hashlib
+import threading
 import traceback
+from collections import OrderedDict
 from datetime import datetime
 from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
 import pandas as pd
+from backend.config import EXCEL_SNAPSHOT_DIR
 from backend.middleware import validate_api_request
 from backend.utils import create_response
 from backend.utils.column_detector import ColumnDetector
+from backend.utils.excel_snapshot import WorkbookSnapshot, save_workbook_snapshot, source_signature
 
 # 创建蓝图
 excel_upload_bp = Blueprint('excel_upload', __name__)
@@ -26,6 +32,11 @@ MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB - 主要通过行数限制（1000行
 # 确保上传目录存在
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# 本进程已打开的解析快照（快照路径 -> WorkbookSnapshot），最近使用的在后
+MAX_OPEN_SNAPSHOTS = 8
+_snapshots = OrderedDict()
+_snapshots_lock = threading.Lock()
+
 
 def allowed_file(filename):
     """检查文件扩展名是否允许"""
@@ -33,13 +44,14 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def parse_excel_file(file_path, header_row=0):
+def parse_excel_file(file_path, header_row=0, include_rows=True):
     """
     解析Excel文件（增强版，包含详细错误处理）
     
     Args:
         file_path: Excel文件路径
         header_row: 标题行索引（从0开始）
+        include_rows: 是否返回按行组织的data（快照只需要按列的column_values）
     
     Returns:
         dict: 包含列信息和数据的字典
@@ -163,37 +175,45 @@ def parse_excel_file(file_path, header_row=0):
                 'column_names': list(df.columns)
             }
         
-        # 转换数据为字典列表
-        data = []
-        for index, row in df.iterrows():
-            row_data = {
-                'row_index': index + header_row + 1,  # Excel行号（从1开始）
-                'data': {}
-            }
-            
-            for col in df.columns:
+        # 按列转换单元格（与逐行iterrows取到的值相同：都来自df.values）
+        values = df.values
+        column_values = []
+        for j, col in enumerate(df.columns):
+            converted = []
+            for index, value in zip(df.index, values[:, j]):
                 try:
-                    value = row[col]
                     # 处理各种类型的空值
                     if pd.isna(value) or value is None or (isinstance(value, str) and value.strip() == ''):
-                        row_data['data'][col] = None
+                        converted.append(None)
                     else:
                         # 安全地转换为字符串
-                        row_data['data'][col] = str(value).strip()
+                        converted.append(str(value).strip())
                 except Exception as cell_error:
                     print(f"[Excel解析] 警告: 处理单元格 [{index}, {col}] 时出错: {str(cell_error)}")
-                    row_data['data'][col] = None
-            
-            data.append(row_data)
+                    converted.append(None)
+            column_values.append(converted)
         
-        print(f"[Excel解析] 数据转换完成，共 {len(data)} 行")
+        # 转换数据为字典列表
+        data = None
+        if include_rows:
+            data = [
+                {
+                    'row_index': index + header_row + 1,  # Excel行号（从1开始）
+                    'data': {col: column_values[j][i] for j, col in enumerate(df.columns)}
+                }
+                for i, index in enumerate(df.index)
+            ]
+        
+        print(f"[Excel解析] 数据转换完成，共 {len(df)} 行")
         
         return {
             'success': True,
             'columns': columns,
             'column_analysis': column_analysis,  # 新增：智能列识别结果
             'data': data,
-            'total_rows': len(data),
+            'column_names': list(df.columns),
+            'column_values': column_values,
+            'total_rows': len(df),
             'sheet_names': sheet_names,
             'original_filename': os.path.basename(file_path),
             'file_info': {
@@ -217,43 +237,108 @@ def parse_excel_file(file_path, header_row=0):
         }
 
 
-def search_patent_numbers(data, column_name, query, limit=50):
+def _snapshot_prefix(file_path):
+    key = hashlib.md5(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+    return os.path.join(EXCEL_SNAPSHOT_DIR, key)
+
+
+def get_snapshot_path(file_path, header_row=0):
+    """解析快照文件路径（按上传文件路径和标题行区分）"""
+    return f"{_snapshot_prefix(file_path)}_h{header_row}.snap"
+
+
+def load_workbook_snapshot(file_path, header_row=0):
+    """
+    获取Excel文件的解析快照
+    
+    快照在上传时生成；不存在或源文件已变化时重新解析文件并生成。
+    打开的快照在本进程内复用，分页和搜索不再重新读取工作表。
+    
+    Args:
+        file_path: Excel文件路径
+        header_row: 标题行索引（从0开始）
+    
+    Returns:
+        tuple: (snapshot, error) 解析失败时snapshot为None，error为错误信息
+    """
+    signature = source_signature(file_path, header_row)
+    snapshot_path = get_snapshot_path(file_path, header_row)
+    
+    with _snapshots_lock:
+        snapshot = _snapshots.get(snapshot_path)
+        if snapshot is not None and snapshot.is_current(signature):
+            _snapshots.move_to_end(snapshot_path)
+            return snapshot, None
+    
+    snapshot = None
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = WorkbookSnapshot(snapshot_path)
+            if not snapshot.is_current(signature):
+                snapshot = None
+        except (OSError, ValueError) as e:
+            print(f"[Excel快照] 快照不可用，重新解析: {str(e)}")
+            snapshot = None
+    
+    if snapshot is None:
+        parse_result = parse_excel_file(file_path, header_row, include_rows=False)
+        if not parse_result['success']:
+            return None, parse_result['error']
+        
+        meta = {key: parse_result[key] for key in
+                ('columns', 'column_analysis', 'sheet_names', 'original_filename', 'file_info')}
+        save_workbook_snapshot(snapshot_path, signature, meta,
+                               parse_result['column_names'], parse_result['column_values'])
+        snapshot = WorkbookSnapshot(snapshot_path)
+    
+    with _snapshots_lock:
+        _snapshots[snapshot_path] = snapshot
+        _snapshots.move_to_end(snapshot_path)
+        while len(_snapshots) > MAX_OPEN_SNAPSHOTS:
+            # 不显式关闭：其他请求可能仍在读取，映射随对象回收释放
+            _snapshots.popitem(last=False)
+    
+    return snapshot, None
+
+
+def delete_workbook_snapshots(file_path):
+    """删除Excel文件的所有解析快照"""
+    for snapshot_path in glob.glob(f"{_snapshot_prefix(file_path)}_h*.snap"):
+        with _snapshots_lock:
+            _snapshots.pop(snapshot_path, None)
+        try:
+            os.remove(snapshot_path)
+        except OSError as e:
+            print(f"[Excel快照] 删除快照失败: {str(e)}")
+
+
+def search_patent_numbers(snapshot, column_name, query, limit=50):
     """
     在Excel数据中搜索专利号
     
+    使用专利号列的搜索索引（见PatentNumberIndex），只解码匹配的行。
+    
     Args:
-        data: Excel数据列表
+        snapshot: Excel解析快照（WorkbookSnapshot）
         column_name: 专利号列名
         query: 搜索查询字符串
         limit: 返回结果数量限制
     
     Returns:
-        list: 匹配的行数据
+        list: 匹配的行数据，完全匹配（match_score为1.0）在前
     """
     if not query or not query.strip():
-        return data[:limit]  # 如果没有查询条件，返回前N行
-    
-    query = query.strip().lower()
-    results = []
-    
-    for row in data:
-        if len(results) >= limit:
-            break
-            
-        patent_value = row['data'].get(column_name)
-        if patent_value and query in patent_value.lower():
-            # 计算匹配度
-            match_score = 1.0 if query == patent_value.lower() else 0.8
-            
-            results.append({
-                **row,
-                'match_score': match_score,
-                'patent_number': patent_value
-            })
-    
-    # 按匹配度排序
-    results.sort(key=lambda x: x['match_score'], reverse=True)
-    return results
+        return snapshot.rows(0, limit)  # 如果没有查询条件，返回前N行
+    
+    index = snapshot.patent_index(column_name)
+    return [
+        {
+            **snapshot.row(row),
+            'match_score': match_score,
+            'patent_number': index.values[row]
+        }
+        for row, match_score in index.search(query, limit)
+    ]
 
 
 # ==================== Excel文件上传API ====================
@@ -330,29 +415,34 @@ def upload_excel_file():
         # 获取标题行参数
         header_row = int(request.form.get('header_row', 0))
         
-        # 解析文件
-        parse_result = parse_excel_file(file_path, header_row)
+        # 解析文件并生成快照
+        snapshot, parse_error = load_workbook_snapshot(file_path, header_row)
         
-        if not parse_result['success']:
+        if snapshot is None:
             # 删除上传的文件
             if os.path.exists(file_path):
                 os.remove(file_path)
             return create_response(
-                error=parse_result['error'],
+                error=parse_error,
                 status_code=400
             )
         
+        # 为识别出的专利号列预先建立搜索索引
+        patent_column = (snapshot.meta['column_analysis'] or {}).get('patent_number_column')
+        if patent_column and patent_column.get('column_name') in snapshot.column_names:
+            snapshot.patent_index(patent_column['column_name'])
+        
         # 返回成功结果
         return create_response(data={
             'file_id': safe_filename,
             'file_path': file_path,
-            'columns': parse_result['columns'],
-            'column_analysis': parse_result['column_analysis'],  # 新增：智能列识别结果
-            'total_rows': parse_result['total_rows'],
-            'sheet_names': parse_result['sheet_names'],
-            'original_filename': parse_result['original_filename'],
-            'file_info': parse_result['file_info'],
-            'preview_data': parse_result['data'][:10]  # 返回前10行作为预览
+            'columns': snapshot.meta['columns'],
+            'column_analysis': snapshot.meta['column_analysis'],  # 新增：智能列识别结果
+            'total_rows': snapshot.total_rows,
+            'sheet_names': snapshot.meta['sheet_names'],
+            'original_filename': snapshot.meta['original_filename'],
+            'file_info': snapshot.meta['file_info'],
+            'preview_data': snapshot.rows(0, 10)  # 返回前10行作为预览
         })
         
     except Exception as e:
@@ -390,18 +480,18 @@ def get_excel_columns(file_id):
         # 获取标题行参数
         header_row = int(request.args.get('header_row', 0))
         
-        # 解析文件
-        parse_result = parse_excel_file(file_path, header_row)
+        # 读取解析快照
+        snapshot, parse_error = load_workbook_snapshot(file_path, header_row)
         
-        if not parse_result['success']:
+        if snapshot is None:
             return create_response(
-                error=parse_result['error'],
+                error=parse_error,
                 status_code=400
             )
         
         return create_response(data={
-            'columns': parse_result['columns'],
-            'total_rows': parse_result['total_rows']
+            'columns': snapshot.meta['columns'],
+            'total_rows': snapshot.total_rows
         })
         
     except Exception as e:
@@ -460,17 +550,17 @@ def search_excel_data(file_id):
         if limit > 100:
             limit = 100
         
-        # 解析文件
-        parse_result = parse_excel_file(file_path, header_row)
+        # 读取解析快照
+        snapshot, parse_error = load_workbook_snapshot(file_path, header_row)
         
-        if not parse_result['success']:
+        if snapshot is None:
             return create_response(
-                error=parse_result['error'],
+                error=parse_error,
                 status_code=400
             )
         
         # 检查列是否存在
-        column_names = [col['name'] for col in parse_result['columns']]
+        column_names = [col['name'] for col in snapshot.meta['columns']]
         if column_name not in column_names:
             return create_response(
                 error=f"列 '{column_name}' 不存在。可用列: {', '.join(column_names)}",
@@ -479,7 +569,7 @@ def search_excel_data(file_id):
         
         # 搜索数据
         results = search_patent_numbers(
-            parse_result['data'], 
+            snapshot, 
             column_name, 
             query, 
             limit
@@ -490,7 +580,7 @@ def search_excel_data(file_id):
             'total_count': len(results),
             'query': query,
             'column_name': column_name,
-            'file_info': parse_result['file_info']
+            'file_info': snapshot.meta['file_info']
         })
         
     except ValueError as e:
@@ -544,32 +634,32 @@ def get_excel_data(file_id):
         if page_size > 500:
             page_size = 500
         
-        # 解析文件
-        parse_result = parse_excel_file(file_path, header_row)
+        # 读取解析快照
+        snapshot, parse_error = load_workbook_snapshot(file_path, header_row)
         
-        if not parse_result['success']:
+        if snapshot is None:
             return create_response(
-                error=parse_result['error'],
+                error=parse_error,
                 status_code=400
             )
         
-        # 分页处理
-        total_rows = len(parse_result['data'])
+        # 分页处理（只解码本页的行）
+        total_rows = snapshot.total_rows
         start_index = (page - 1) * page_size
         end_index = start_index + page_size
         
-        paginated_data = parse_result['data'][start_index:end_index]
+        paginated_data = snapshot.rows(start_index, end_index)
         
         return create_response(data={
             'data': paginated_data,
-            'columns': parse_result['columns'],
+            'columns': snapshot.meta['columns'],
             'pagination': {
                 'page': page,
                 'page_size': page_size,
                 'total_rows': total_rows,
                 'total_pages': (total_rows + page_size - 1) // page_size
             },
-            'file_info': parse_result['file_info']
+            'file_info': snapshot.meta['file_info']
         })
         
     except ValueError as e:
@@ -609,8 +699,9 @@ def delete_excel_file(file_id):
                 status_code=404
             )
         
-        # 删除文件
+        # 删除文件及其解析快照
         os.remove(file_path)
+        delete_workbook_snapshots(file_path)
         
         return create_response(data={
             'success': True,
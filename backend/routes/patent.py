@@ -8,32 +8,75 @@ Supports multiple LLM providers: ZhipuAI (default) and Aliyun Bailian.
 
 import json
 import logging
+import threading
 import time
 import traceback
 from datetime import datetime, timedelta
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session
 from backend.middleware import validate_api_request
 from backend.services import get_zhipu_client
 from backend.services.llm_service import get_llm_client, is_aliyun_model
 from backend.utils import create_response
-from backend.scraper.simple_scraper import SimplePatentScraper
+from backend.config import (
+    SCRAPER_MAX_CONCURRENCY, SCRAPER_REQUESTS_PER_SECOND, SCRAPER_BURST,
+    SCRAPER_CACHE_ENABLED, SCRAPER_CACHE_DB, SCRAPER_CACHE_TTL_HOURS,
+    SCRAPER_CACHE_MEMORY_ENTRIES, SCRAPER_CACHE_MAX_MB, SCRAPER_PARSER,
+    SCRAPER_SESSION_POOL_SIZE, SCRAPER_CONNECTIONS_PER_SESSION, SCRAPER_HTTP_RETRIES, SCRAPER_RETRY_BACKOFF
+)
+from backend.scraper.simple_scraper import DEFAULT_HEADERS, SimplePatentScraper
+from backend.scraper.patent_cache import PatentPageCache
+from backend.scraper.session_pool import SessionPool
 
 logger = logging.getLogger(__name__)
 
 patent_bp = Blueprint('patent', __name__)
 
 _scraper_instance = None
+_scraper_lock = threading.Lock()
 
 GUEST_PATENT_SEARCH_LIMIT = 5
 GUEST_PATENT_SEARCH_WINDOW_HOURS = 1
 
 
 def get_scraper_instance() -> SimplePatentScraper:
-    """Get or create the global scraper instance."""
+    """
+    Get or create the shared scraper instance.
+    
+    The instance is shared by all request threads: HTTP sessions are checked out
+    of its session pool per request, while the rate limiter, page cache and
+    in-flight request coalescing are shared.
+    """
     global _scraper_instance
     
-    if _scraper_instance is None:
-        _scraper_instance = SimplePatentScraper(delay=2.0)
+    if _scraper_instance is not None:
+        return _scraper_instance
+    
+    with _scraper_lock:
+        if _scraper_instance is None:
+            cache = None
+            if SCRAPER_CACHE_ENABLED:
+                cache = PatentPageCache(
+                    db_path=SCRAPER_CACHE_DB,
+                    ttl_seconds=SCRAPER_CACHE_TTL_HOURS * 3600,
+                    memory_entries=SCRAPER_CACHE_MEMORY_ENTRIES,
+                    max_disk_bytes=SCRAPER_CACHE_MAX_MB * 1024 * 1024
+                )
+            session_pool = SessionPool(
+                size=SCRAPER_SESSION_POOL_SIZE,
+                pool_maxsize=SCRAPER_CONNECTIONS_PER_SESSION,
+                retries=SCRAPER_HTTP_RETRIES,
+                backoff_factor=SCRAPER_RETRY_BACKOFF,
+                headers=DEFAULT_HEADERS
+            )
+            _scraper_instance = SimplePatentScraper(
+                delay=2.0,
+                max_concurrency=SCRAPER_MAX_CONCURRENCY,
+                requests_per_second=SCRAPER_REQUESTS_PER_SECOND,
+                burst=SCRAPER_BURST,
+                cache=cache,
+                parser=SCRAPER_PARSER,
+                session_pool=session_pool
+            )
     
     return _scraper_instance
 
@@ -108,6 +151,74 @@ def get_version():
     })
 
 
+@patent_bp.route('/patent/cache/stats', methods=['GET'])
+def get_patent_cache_stats():
+    """Get patent page cache hit/miss, request coalescing and session pool statistics."""
+    is_valid, error_response = validate_api_request()
+    if not is_valid:
+        return error_response
+    
+    scraper = get_scraper_instance()
+    coalescing = scraper.in_flight.stats() if scraper.in_flight else None
+    session_pool = scraper.session_pool.stats()
+    if not scraper.cache:
+        return create_response(data={'enabled': False, 'coalescing': coalescing, 'session_pool': session_pool})
+    
+    return create_response(data={'enabled': True, **scraper.cache.stats(), 'coalescing': coalescing, 'session_pool': session_pool})
+
+
+def parse_search_request():
+    """
+    Validate a patent search request body.
+    
+    Returns:
+        tuple: (search_params, error_response); search_params holds patent_numbers,
+        crawl_specification and selected_fields
+    """
+    req_data = request.get_json()
+    patent_numbers = req_data.get('patent_numbers', [])
+    crawl_specification = req_data.get('crawl_specification', False)
+    selected_fields = req_data.get('selected_fields', None)
+    
+    print(f"[API] 收到爬取请求: {len(patent_numbers)} 个专利")
+    print(f"[API] crawl_specification: {crawl_specification}")
+    print(f"[API] selected_fields: {selected_fields}")
+    
+    if not isinstance(patent_numbers, list):
+        if isinstance(patent_numbers, str):
+            patent_numbers = patent_numbers.replace('\n', ' ').split()
+        else:
+            return None, create_response(
+                error="patent_numbers must be a list or string",
+                status_code=400
+            )
+    
+    patent_numbers = [p.strip() for p in patent_numbers if p.strip()]
+    patent_numbers = list(set(patent_numbers))
+    
+    if not patent_numbers:
+        return None, create_response(
+            error="No valid patent numbers provided",
+            status_code=400
+        )
+    
+    is_allowed, error_msg = check_guest_patent_limit(len(patent_numbers))
+    if not is_allowed:
+        return None, create_response(error=error_msg, status_code=403)
+    
+    if session.get('is_guest') and len(patent_numbers) > GUEST_PATENT_SEARCH_LIMIT:
+        return None, create_response(
+            error=f"游客模式每次最多查询 {GUEST_PATENT_SEARCH_LIMIT} 篇专利",
+            status_code=403
+        )
+    
+    return {
+        'patent_numbers': patent_numbers,
+        'crawl_specification': crawl_specification,
+        'selected_fields': selected_fields
+    }, None
+
+
 @patent_bp.route('/patent/search', methods=['POST'])
 def search_patents():
     """
@@ -126,49 +237,17 @@ def search_patents():
         return error_response
     
     try:
-        req_data = request.get_json()
-        patent_numbers = req_data.get('patent_numbers', [])
-        crawl_specification = req_data.get('crawl_specification', False)
-        selected_fields = req_data.get('selected_fields', None)
-        
-        print(f"[API] 收到爬取请求: {len(patent_numbers)} 个专利")
-        print(f"[API] crawl_specification: {crawl_specification}")
-        print(f"[API] selected_fields: {selected_fields}")
-        
-        if not isinstance(patent_numbers, list):
-            if isinstance(patent_numbers, str):
-                patent_numbers = patent_numbers.replace('\n', ' ').split()
-            else:
-                return create_response(
-                    error="patent_numbers must be a list or string",
-                    status_code=400
-                )
-        
-        patent_numbers = [p.strip() for p in patent_numbers if p.strip()]
-        patent_numbers = list(set(patent_numbers))
-        
-        if not patent_numbers:
-            return create_response(
-                error="No valid patent numbers provided",
-                status_code=400
-            )
-        
-        is_allowed, error_msg = check_guest_patent_limit(len(patent_numbers))
-        if not is_allowed:
-            return create_response(error=error_msg, status_code=403)
-        
-        if session.get('is_guest') and len(patent_numbers) > GUEST_PATENT_SEARCH_LIMIT:
-            return create_response(
-                error=f"游客模式每次最多查询 {GUEST_PATENT_SEARCH_LIMIT} 篇专利",
-                status_code=403
-            )
+        search_params, error_response = parse_search_request()
+        if error_response:
+            return error_response
+        patent_numbers = search_params['patent_numbers']
         
         try:
             scraper = get_scraper_instance()
             results = scraper.scrape_patents_batch(
                 patent_numbers, 
-                crawl_specification=crawl_specification,
-                selected_fields=selected_fields
+                crawl_specification=search_params['crawl_specification'],
+                selected_fields=search_params['selected_fields']
             )
             
             record_guest_patent_search(len(patent_numbers))
@@ -192,6 +271,88 @@ def search_patents():
         )
 
 
+def format_stream_record(record, stream_format):
+    """Serialize one streamed search record as an NDJSON line or an SSE event."""
+    payload = json.dumps(record, ensure_ascii=False)
+    if stream_format == 'sse':
+        return f"event: {record['type']}\ndata: {payload}\n\n"
+    return payload + '\n'
+
+
+@patent_bp.route('/patent/search/stream', methods=['POST'])
+def search_patents_stream():
+    """
+    Search for multiple patents, streaming each result as soon as it is scraped.
+    
+    Request body: same as /patent/search, plus
+        - format: 'ndjson' (default) or 'sse'; 'sse' is also chosen by
+          an ``Accept: text/event-stream`` header
+    
+    Returns:
+        Newline-delimited JSON (or server-sent events) with one record per patent:
+        {"type": "result", "index", "total", ...SimplePatentResult.to_dict()}
+        in completion order, followed by a final
+        {"type": "summary", "total", "succeeded", "failed", "processing_time"} record.
+        An unexpected failure mid-stream ends it with {"type": "error", "error"}.
+    """
+    is_valid, error_response = validate_api_request()
+    if not is_valid:
+        return error_response
+    
+    try:
+        search_params, error_response = parse_search_request()
+        if error_response:
+            return error_response
+    except Exception as e:
+        print(f"Error in search_patents_stream: {traceback.format_exc()}")
+        return create_response(
+            error=f"Failed to search patents: {str(e)}",
+            status_code=500
+        )
+    
+    stream_format = (request.get_json(silent=True) or {}).get('format')
+    if stream_format not in ('ndjson', 'sse'):
+        stream_format = 'sse' if 'text/event-stream' in request.headers.get('Accept', '') else 'ndjson'
+    
+    patent_numbers = search_params['patent_numbers']
+    # The session cookie cannot change once streaming starts, so count guest usage up front
+    record_guest_patent_search(len(patent_numbers))
+    scraper = get_scraper_instance()
+    
+    def generate():
+        start_time = time.time()
+        total = len(patent_numbers)
+        succeeded = 0
+        try:
+            results = scraper.iter_patents_batch(
+                patent_numbers,
+                crawl_specification=search_params['crawl_specification'],
+                selected_fields=search_params['selected_fields']
+            )
+            for index, result in results:
+                if result.success:
+                    succeeded += 1
+                yield format_stream_record({'type': 'result', 'index': index, 'total': total, **result.to_dict()}, stream_format)
+            
+            yield format_stream_record({
+                'type': 'summary',
+                'total': total,
+                'succeeded': succeeded,
+                'failed': total - succeeded,
+                'processing_time': time.time() - start_time
+            }, stream_format)
+        except Exception as e:
+            print(f"Scraper error: {traceback.format_exc()}")
+            yield format_stream_record({'type': 'error', 'error': f"Failed to scrape patents: {str(e)}"}, stream_format)
+    
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    response = Response(generate(), mimetype=mimetype)
+    # Stop reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @patent_bp.route('/patent/analyze', methods=['POST'])
 def analyze_patent():
     """
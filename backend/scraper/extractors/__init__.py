@@ -0,0 +1,24 @@
+"""
+Field extractors for Google Patents pages.
+
+Importing this package registers every extractor in ``EXTRACTORS``.
+"""
+
+from .registry import (
+    EXTRACTORS,
+    ExtractionContext,
+    FieldExtractor,
+    LazyFieldLoader,
+    plan_extractors,
+    register,
+)
+from . import bibliographic, specification, citations, events, classification, family  # noqa: F401
+
+__all__ = [
+    'EXTRACTORS',
+    'ExtractionContext',
+    'FieldExtractor',
+    'LazyFieldLoader',
+    'plan_extractors',
+    'register',
+]
@@ -0,0 +1,295 @@
+"""
+Bibliographic extractors: title, abstract, parties, dates, PDF link and drawings.
+"""
+
+import logging
+import re
+
+from .registry import ExtractionContext, register
+
+logger = logging.getLogger(__name__)
+
+_PDF_HASH_PATTERN = re.compile(r'patentimages\.storage\.googleapis\.com/([^/]+/[^/]+/[^/]+/[^/]+)/')
+_DRAWING_URL_HINTS = ['patentimages', '/patents/US', '/patents/CN', '/patents/EP', '/patents/WO', 'patent', 'drawing']
+
+
+@register('bibliographic', ('title', 'abstract', 'inventors', 'assignees', 'application_date', 'publication_date'), always=True)
+def extract_bibliographic(ctx: ExtractionContext):
+    """Extract core bibliographic data, preferring JSON-LD over HTML."""
+    soup = ctx.soup
+    patent_number = ctx.patent_number
+    item = ctx.json_ld_patent()
+
+    title = item.get('name', '') if item else ''
+    abstract = item.get('abstract', '') if item else ''
+    inventors = [inv.get('name', '') for inv in item.get('inventor', [])] if item else []
+    application_date = item.get('filingDate', '') if item else ''
+    publication_date = item.get('publicationDate', '') if item else ''
+    assignees = [ass.get('name', '') for ass in item.get('assignee', [])] if item else []
+
+    # Fallback to HTML parsing
+    if not title:
+        title_elem = soup.find('h1')
+        if title_elem:
+            title = title_elem.get_text().strip()
+
+    # Clean up title - remove Google Patents suffix and patent number prefix
+    if title:
+        title = title.replace(' - Google Patents', '').strip()
+        title = title.replace(f'{patent_number} - ', '').strip()
+        title = title.replace(f'{patent_number}B2 - ', '').strip()
+
+    if not abstract:
+        # Try multiple selectors for abstract
+        abstract_elem = soup.find('section', {'itemprop': 'abstract'})
+        if not abstract_elem:
+            abstract_elem = soup.find('div', {'class': 'abstract'})
+        if not abstract_elem:
+            abstract_elem = soup.find('abstract')
+
+        if abstract_elem:
+            abstract = abstract_elem.get_text(separator=' ', strip=True)
+
+    if not inventors:
+        inventors = _extract_inventors(soup)
+        logger.info(f"最终提取到 {len(inventors)} 个发明人")
+
+    if not assignees:
+        assignees = _extract_assignees(soup)
+
+    if not application_date:
+        app_date = soup.find('time', {'itemprop': 'filingDate'})
+        if app_date:
+            application_date = app_date.get_text().strip()
+
+    if not publication_date:
+        pub_date = soup.find('time', {'itemprop': 'publicationDate'})
+        if pub_date:
+            publication_date = pub_date.get_text().strip()
+
+    return {
+        'title': title,
+        'abstract': abstract,
+        'inventors': inventors,
+        'assignees': assignees,
+        'application_date': application_date,
+        'publication_date': publication_date,
+    }
+
+
+def _extract_inventors(soup):
+    inventors = []
+
+    # 方法1：从meta标签提取（最可靠）
+    meta_inventors = soup.find_all('meta', {'name': 'DC.contributor', 'scheme': 'inventor'})
+    if meta_inventors:
+        for meta in meta_inventors:
+            inventor_name = meta.get('content', '').strip()
+            if inventor_name and inventor_name not in inventors:
+                inventors.append(inventor_name)
+        logger.info(f"从meta标签提取到 {len(inventors)} 个发明人")
+
+    # 方法2：从dd标签提取（备用）
+    if not inventors:
+        inventor_section = soup.find('dd', {'itemprop': 'inventor'})
+
+        if inventor_section:
+            inventor_elements = inventor_section.find_all('span', {'itemprop': 'name'})
+
+            if inventor_elements:
+                for inv in inventor_elements:
+                    inventor_name = inv.get_text().strip()
+                    if inventor_name and inventor_name not in ['Inventor', 'Inventors'] and inventor_name not in inventors:
+                        inventors.append(inventor_name)
+            else:
+                inventor_text = inventor_section.get_text().strip()
+                if inventor_text and inventor_text not in ['Inventor', 'Inventors']:
+                    inventors.append(inventor_text)
+
+    return inventors
+
+
+def _extract_assignees(soup):
+    assignees = []
+    # Try both current and original assignees
+    assignee_section = soup.find('dd', {'itemprop': 'assigneeCurrent'})
+    if not assignee_section:
+        assignee_section = soup.find('dd', {'itemprop': 'assigneeOriginal'})
+
+    if assignee_section:
+        assignee_elements = assignee_section.find_all('span', {'itemprop': 'name'})
+
+        if assignee_elements:
+            for ass in assignee_elements:
+                assignee_name = ass.get_text().strip()
+                if assignee_name and assignee_name not in ['Assignee', 'Assignees']:
+                    assignees.append(assignee_name)
+        else:
+            assignee_text = assignee_section.get_text().strip()
+            if assignee_text and assignee_text not in ['Assignee', 'Assignees']:
+                assignees.append(assignee_text)
+
+    return assignees
+
+
+@register('priority_date', ('priority_date',))
+def extract_priority_date(ctx: ExtractionContext):
+    """Extract the priority date (优先权日期)."""
+    priority_date_elem = ctx.soup.find('time', {'itemprop': 'priorityDate'})
+    if not priority_date_elem:
+        return {}
+    priority_date = priority_date_elem.get('datetime', '') or priority_date_elem.get_text().strip()
+    logger.info(f"提取到优先权日期: {priority_date}")
+    return {'priority_date': priority_date}
+
+
+def _find_pdf_link(ctx: ExtractionContext) -> str:
+    pdf_link_elem = ctx.soup.find('a', {'itemprop': 'pdfLink'})
+    return pdf_link_elem.get('href', '') if pdf_link_elem else ''
+
+
+@register('pdf_link', ('pdf_link',), always=True)
+def extract_pdf_link(ctx: ExtractionContext):
+    """Extract the PDF link (专利原文PDF链接)."""
+    pdf_link = ctx.memo('pdf_link', lambda: _find_pdf_link(ctx))
+    if pdf_link:
+        logger.info(f"提取到PDF链接: {pdf_link}")
+    else:
+        logger.info(f"未找到PDF链接 for {ctx.patent_number}")
+    return {'pdf_link': pdf_link}
+
+
+@register('drawings', ('drawings',), always=True)
+def extract_drawings(ctx: ExtractionContext):
+    """Extract drawing image URLs using multiple strategies."""
+    soup = ctx.soup
+    patent_number = ctx.patent_number
+    crawl_full_drawings = ctx.crawl_full_drawings
+    drawings = []
+
+    # Images listed in JSON-LD (only the first one unless crawling full drawings)
+    item = ctx.json_ld_patent()
+    if item and 'image' in item:
+        images = item.get('image', [])
+        image_list = []
+
+        if isinstance(images, list):
+            for img in images:
+                if isinstance(img, str) and img:
+                    image_list.append(img)
+                elif isinstance(img, dict) and img.get('url'):
+                    image_list.append(img.get('url'))
+        elif isinstance(images, str):
+            image_list.append(images)
+        elif isinstance(images, dict) and images.get('url'):
+            image_list.append(images.get('url'))
+
+        if image_list:
+            if crawl_full_drawings:
+                drawings.extend(image_list)
+            else:
+                drawings.append(image_list[0])
+
+    try:
+        seen_images = set()
+        logger.info(f"开始提取附图 for {patent_number}")
+
+        # Strategy 0: Extract from itemprop="images" structure (most reliable)
+        # Google Patents uses: <li itemprop="images"><meta itemprop="full" content="..."></li>
+        image_items = soup.find_all('li', {'itemprop': 'images'})
+        if image_items:
+            logger.info(f"找到 {len(image_items)} 个 itemprop='images' 元素")
+            for image_item in image_items:
+                # 优先提取高清图URL
+                full_img_meta = image_item.find('meta', {'itemprop': 'full'})
+                if full_img_meta:
+                    full_img_url = full_img_meta.get('content', '')
+                    if full_img_url and full_img_url.startswith('http') and full_img_url not in seen_images:
+                        seen_images.add(full_img_url)
+                        drawings.append(full_img_url)
+                        continue
+
+                # 备用：提取缩略图URL
+                thumbnail_img = image_item.find('img', {'itemprop': 'thumbnail'})
+                if thumbnail_img:
+                    thumb_src = thumbnail_img.get('src', '')
+                    if thumb_src:
+                        if thumb_src.startswith('//'):
+                            thumb_src = f'https:{thumb_src}'
+                        if thumb_src.startswith('http') and thumb_src not in seen_images:
+                            seen_images.add(thumb_src)
+                            drawings.append(thumb_src)
+
+        # Strategy 1: Construct image URLs from the PDF link
+        # Google Patents stores images at: https://patentimages.storage.googleapis.com/{hash}/{patent_number}-{page}.png
+        if not drawings:
+            pdf_url = ctx.memo('pdf_link', lambda: _find_pdf_link(ctx))
+
+            if pdf_url:
+                logger.info(f"使用PDF链接构造图片: {pdf_url}")
+                match = _PDF_HASH_PATTERN.search(pdf_url)
+                if match:
+                    hash_path = match.group(1)
+                    max_pages = 5 if crawl_full_drawings else 1
+                    for page in range(1, max_pages + 1):
+                        drawings.append(f"https://patentimages.storage.googleapis.com/{hash_path}/{patent_number}-{page:04d}.png")
+
+        # Strategy 2: Find figure elements (fallback, usually empty in static HTML)
+        if not drawings:
+            figures = soup.find_all('figure')
+            logger.info(f"找到 {len(figures)} 个 figure 元素")
+            for figure in figures:
+                img = figure.find('img')
+                if img and img.get('src'):
+                    img_src = img.get('src')
+                    if img_src.startswith('//'):
+                        img_src = f'https:{img_src}'
+                    elif img_src.startswith('/'):
+                        img_src = f'https://patents.google.com{img_src}'
+
+                    if img_src.startswith('http') and img_src not in seen_images:
+                        width = img.get('width', '0')
+                        height = img.get('height', '0')
+                        try:
+                            if width and width.isdigit() and int(width) < 100:
+                                continue
+                            if height and height.isdigit() and int(height) < 100:
+                                continue
+                        except Exception:
+                            pass
+
+                        seen_images.add(img_src)
+                        drawings.append(img_src)
+
+                        if not crawl_full_drawings:
+                            break
+
+        # Strategy 3: Find all img tags with patent-related URLs (fallback)
+        if not drawings:
+            logger.info("Strategy 2 failed, trying Strategy 3: all img tags")
+            for img in soup.find_all('img'):
+                img_src = img.get('src', '')
+                if not img_src:
+                    continue
+
+                if img_src.startswith('//'):
+                    img_src = f'https:{img_src}'
+                elif img_src.startswith('/'):
+                    img_src = f'https://patents.google.com{img_src}'
+
+                if any(pattern in img_src for pattern in _DRAWING_URL_HINTS):
+                    if img_src not in seen_images and len(img_src) > 50:
+                        seen_images.add(img_src)
+                        drawings.append(img_src)
+
+                        if not crawl_full_drawings:
+                            break
+
+        logger.info(f"最终提取到 {len(drawings)} 张附图")
+    except Exception as e:
+        logger.warning(f"Error extracting drawings from HTML for {patent_number}: {e}")
+
+    if not drawings:
+        logger.warning(f"⚠️ No drawings found for {patent_number}. Google Patents loads images dynamically with JavaScript.")
+
+    return {'drawings': drawings}
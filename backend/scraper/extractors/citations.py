@@ -0,0 +1,176 @@
+"""
+Citation extractors: cited patents, citing patents and similar documents.
+"""
+
+import logging
+
+from .registry import ExtractionContext, absolute_link, register, text_of
+
+logger = logging.getLogger(__name__)
+
+
+@register('patent_citations', ('patent_citations',), requires_specification=True)
+def extract_patent_citations(ctx: ExtractionContext):
+    """Extract cited patents (引用的专利)."""
+    soup = ctx.soup
+    citations = []
+
+    # 方法1：查找带有backwardReferences属性的tr元素
+    all_refs = soup.find_all('tr', {'itemprop': 'backwardReferencesOrig'}) + \
+        soup.find_all('tr', {'itemprop': 'backwardReferencesFamily'})
+
+    if all_refs:
+        logger.info(f"找到 {len(all_refs)} 个引用专利")
+        for row in all_refs:
+            try:
+                pub_num_elem = row.find('span', {'itemprop': 'publicationNumber'})
+                if not pub_num_elem:
+                    continue
+
+                patent_num = pub_num_elem.get_text().strip()
+                link_elem = row.find('a')
+                link = link_elem.get('href', '') if link_elem else ''
+
+                # 审查员引用标记（examinerCited）
+                examiner_cited = row.find('span', {'itemprop': 'examinerCited'})
+                is_examiner_cited = examiner_cited is not None and '*' in examiner_cited.get_text()
+
+                if patent_num:
+                    citations.append({
+                        'patent_number': patent_num,
+                        'title': text_of(row.find('td', {'itemprop': 'title'})),
+                        'priority_date': text_of(row.find('td', {'itemprop': 'priorityDate'})),
+                        'publication_date': text_of(row.find('td', {'itemprop': 'publicationDate'})),
+                        'assignee': text_of(row.find('span', {'itemprop': 'assigneeOriginal'})),
+                        'link': f"https://patents.google.com{link}" if link.startswith('/') else link,
+                        'examiner_cited': is_examiner_cited
+                    })
+            except Exception as e:
+                logger.warning(f"Error parsing citation row: {e}")
+                continue
+    else:
+        # 方法2：查找包含Citations的h2标题
+        citations_h2 = None
+        for h2 in soup.find_all('h2'):
+            if 'Citations' in h2.get_text():
+                citations_h2 = h2
+                break
+
+        citations_table = citations_h2.find_next('table') if citations_h2 else None
+        if citations_table:
+            for row in citations_table.find_all('tr')[1:]:  # Skip header row
+                try:
+                    cells = row.find_all('td')
+                    if len(cells) >= 2:
+                        patent_link = cells[0].find('a')
+                        if patent_link:
+                            citations.append({
+                                'patent_number': patent_link.get_text().strip(),
+                                'title': cells[4].get_text().strip() if len(cells) > 4 else '',
+                                'priority_date': cells[1].get_text().strip() if len(cells) > 1 else '',
+                                'publication_date': cells[2].get_text().strip() if len(cells) > 2 else '',
+                                'assignee': cells[3].get_text().strip() if len(cells) > 3 else ''
+                            })
+                except Exception as e:
+                    logger.warning(f"Error parsing citation table row: {e}")
+                    continue
+
+    logger.info(f"提取到 {len(citations)} 条引用专利")
+    return {'patent_citations': citations}  # 不限制数量，提取所有引用专利
+
+
+@register('cited_by', ('cited_by',), requires_specification=True)
+def extract_cited_by(ctx: ExtractionContext):
+    """Extract citing patents (被引用的专利)."""
+    soup = ctx.soup
+    cited_by = []
+
+    # 方法1: Family section中的"Families Citing this family"（信息最完整）
+    family_section = ctx.family_section()
+    if family_section:
+        families_citing_h2 = None
+        for h2 in family_section.find_all('h2'):
+            if 'Families Citing this family' in h2.get_text():
+                families_citing_h2 = h2
+                break
+
+        citing_table = families_citing_h2.find_next('table') if families_citing_h2 else None
+        if citing_table:
+            for row in citing_table.find_all('tr', {'itemprop': 'forwardReferencesFamily'}):
+                try:
+                    pub_num_elem = row.find('span', {'itemprop': 'publicationNumber'})
+                    examiner_cited_elem = row.find('span', {'itemprop': 'examinerCited'})
+
+                    if pub_num_elem:
+                        cited_by.append({
+                            'patent_number': pub_num_elem.get_text().strip(),
+                            'language': text_of(row.find('span', {'itemprop': 'primaryLanguage'})),
+                            'examiner_cited': '*' in examiner_cited_elem.get_text() if examiner_cited_elem else False,
+                            'priority_date': text_of(row.find('td', {'itemprop': 'priorityDate'})),
+                            'publication_date': text_of(row.find('td', {'itemprop': 'publicationDate'})),
+                            'assignee': text_of(row.find('span', {'itemprop': 'assigneeOriginal'})),
+                            'title': text_of(row.find('td', {'itemprop': 'title'})),
+                            'link': absolute_link(row.find('a'))
+                        })
+                except Exception as e:
+                    logger.warning(f"Error parsing cited by row: {e}")
+                    continue
+
+    if cited_by:
+        logger.info(f"提取到 {len(cited_by)} 个被引用专利")
+        return {'cited_by': cited_by[:20]}  # 限制前20条
+
+    # 方法2: "Cited By"表格
+    cited_by_h3 = soup.find('h3', {'id': 'citedBy'})
+    cited_by_table = cited_by_h3.find_next('table') if cited_by_h3 else None
+    if cited_by_table:
+        for row in cited_by_table.find_all('tr')[1:]:  # Skip header row
+            try:
+                cells = row.find_all('td')
+                if len(cells) >= 2:
+                    patent_link = cells[0].find('a')
+                    if patent_link:
+                        cited_by.append({
+                            'patent_number': patent_link.get_text().strip(),
+                            'title': cells[1].get_text().strip() if len(cells) > 1 else ''
+                        })
+            except Exception as e:
+                logger.warning(f"Error parsing cited by row: {e}")
+                continue
+
+    if not cited_by:
+        logger.info("⚠️ Cited by data not found (likely requires JavaScript rendering)")
+    return {'cited_by': cited_by[:20]}  # 限制前20条
+
+
+@register('similar_documents', ('similar_documents',), requires_specification=True)
+def extract_similar_documents(ctx: ExtractionContext):
+    """Extract similar documents (相似文档)."""
+    similar_documents = []
+    similar_rows = ctx.soup.find_all('tr', {'itemprop': 'similarDocuments'})
+
+    if similar_rows:
+        logger.info(f"找到 {len(similar_rows)} 个相似文档")
+        for row in similar_rows:
+            try:
+                is_patent_elem = row.find('meta', {'itemprop': 'isPatent'})
+                is_patent = is_patent_elem.get('content', 'false') == 'true' if is_patent_elem else False
+
+                if is_patent:
+                    patent_link = row.find('a')
+                    if patent_link:
+                        patent_number = text_of(row.find('span', {'itemprop': 'publicationNumber'}))
+                        link = patent_link.get('href', '')
+
+                        if patent_number:
+                            similar_documents.append({
+                                'patent_number': patent_number,
+                                'language': text_of(row.find('span', {'itemprop': 'primaryLanguage'})),
+                                'link': f"https://patents.google.com{link}" if link.startswith('/') else link
+                            })
+            except Exception as e:
+                logger.warning(f"Error parsing similar document row: {e}")
+                continue
+
+    logger.info(f"提取到 {len(similar_documents)} 个相似文档")
+    return {'similar_documents': similar_documents[:10]}  # 限制前10条
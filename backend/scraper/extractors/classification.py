@@ -0,0 +1,129 @@
+"""
+Classification extractors: CPC classifications, landscapes and external links.
+"""
+
+import logging
+
+from .registry import ExtractionContext, register
+
+logger = logging.getLogger(__name__)
+
+
+def _meta_is_true(item, itemprop: str) -> bool:
+    meta = item.find('meta', {'itemprop': itemprop})
+    return bool(meta and meta.get('content') == 'true')
+
+
+@register('classifications', ('classifications',))
+def extract_classifications(ctx: ExtractionContext):
+    """Extract CPC classifications (CPC分类信息)."""
+    soup = ctx.soup
+    classifications = []
+
+    if soup.find('section'):
+        # 每个ul代表一个完整的分类路径
+        for ul in soup.find_all('ul', {'itemprop': 'classifications'}):
+            classification_items = ul.find_all('li', {'itemprop': 'classifications'})
+            if not classification_items:
+                continue
+
+            codes = []
+            descriptions = []
+            is_cpc = False
+            is_leaf = False
+
+            for item in classification_items:
+                code_elem = item.find('span', {'itemprop': 'Code'})
+                desc_elem = item.find('span', {'itemprop': 'Description'})
+
+                if code_elem:
+                    codes.append(code_elem.get_text().strip())
+                if desc_elem:
+                    descriptions.append(desc_elem.get_text().strip())
+
+                if _meta_is_true(item, 'IsCPC'):
+                    is_cpc = True
+                if _meta_is_true(item, 'Leaf'):
+                    is_leaf = True
+
+            if codes:
+                classifications.append({
+                    'code': ' → '.join(codes),  # 完整分类路径
+                    'description': ' → '.join(descriptions),
+                    'leaf_code': codes[-1],  # 最终分类代码
+                    'leaf_description': descriptions[-1] if descriptions else '',
+                    'is_cpc': is_cpc,
+                    'is_leaf': is_leaf
+                })
+
+    logger.info(f"提取到 {len(classifications)} 个分类信息")
+    return {'classifications': classifications[:20]}  # 限制前20条
+
+
+@register('landscapes', ('landscapes',))
+def extract_landscapes(ctx: ExtractionContext):
+    """Extract technology landscapes (技术领域)."""
+    landscapes = []
+
+    landscapes_section = None
+    for section in ctx.soup.find_all('section'):
+        h2 = section.find('h2')
+        if h2 and 'Landscapes' in h2.get_text():
+            landscapes_section = section
+            break
+
+    if landscapes_section:
+        for item in landscapes_section.find_all('li', {'itemprop': 'landscapes'}):
+            name_elem = item.find('span', {'itemprop': 'name'})
+            type_elem = item.find('span', {'itemprop': 'type'})
+
+            if name_elem:
+                landscapes.append({
+                    'name': name_elem.get_text().strip(),
+                    'type': type_elem.get_text().strip() if type_elem else ''
+                })
+
+    logger.info(f"提取到 {len(landscapes)} 个技术领域")
+    return {'landscapes': landscapes}
+
+
+def _collect_link(external_links, item, url_elem) -> None:
+    id_elem = item.find('meta', {'itemprop': 'id'})
+    text_elem = item.find('span', {'itemprop': 'text'})
+
+    if id_elem and url_elem:
+        link_id = id_elem.get('content', '')
+        link_url = url_elem.get('href', '')
+        link_text = text_elem.get_text().strip() if text_elem else link_id
+
+        if link_id and link_url:
+            external_links[link_id] = {
+                'text': link_text,
+                'url': link_url
+            }
+
+
+@register('external_links', ('external_links',))
+def extract_external_links(ctx: ExtractionContext):
+    """Extract external links (外部链接)."""
+    soup = ctx.soup
+    external_links = {}
+
+    # 方法1: 直接查找所有带有itemprop='links'的li元素
+    link_items = soup.find_all('li', {'itemprop': 'links'})
+
+    if link_items:
+        for item in link_items:
+            _collect_link(external_links, item, item.find('a', {'itemprop': 'url'}))
+    else:
+        # 方法2: 查找Links标题后的ul
+        for h2 in soup.find_all('h2'):
+            if 'Links' in h2.get_text():
+                links_ul = h2.find_next('ul')
+                if links_ul:
+                    for item in links_ul.find_all('li'):
+                        _collect_link(external_links, item, item.find('a'))
+                break
+
+    logger.info(f"提取到 {len(external_links)} 个外部链接")
+    return {'external_links': external_links}
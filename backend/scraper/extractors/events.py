@@ -0,0 +1,117 @@
+"""
+Event extractors: events timeline and legal events.
+"""
+
+import logging
+
+from .registry import ExtractionContext, register, text_of
+
+logger = logging.getLogger(__name__)
+
+
+def _flag(elem) -> bool:
+    return elem.get('content', 'false') == 'true' if elem else False
+
+
+@register('events_timeline', ('events_timeline',), requires_specification=True)
+def extract_events_timeline(ctx: ExtractionContext):
+    """Extract the events timeline (申请、公开、授权等关键事件)."""
+    events_timeline = []
+    event_elements = ctx.soup.find_all('dd', {'itemprop': 'events'})
+
+    if event_elements:
+        logger.info(f"找到 {len(event_elements)} 个时间轴事件（events格式）")
+        for event_dd in event_elements:
+            try:
+                date_elem = event_dd.find('time', {'itemprop': 'date'})
+                event_date = date_elem.get('datetime', '') if date_elem else ''
+                if not event_date and date_elem:
+                    event_date = date_elem.get_text().strip()
+
+                event_title = text_of(event_dd.find('span', {'itemprop': 'title'}))
+                event_type = text_of(event_dd.find('span', {'itemprop': 'type'}))
+
+                if event_title:
+                    events_timeline.append({
+                        'date': event_date,
+                        'title': event_title,
+                        'type': event_type,
+                        'is_critical': _flag(event_dd.find('span', {'itemprop': 'critical'})),
+                        'is_current': _flag(event_dd.find('span', {'itemprop': 'current'})),
+                        'document_id': text_of(event_dd.find('span', {'itemprop': 'documentId'})),
+                        'description': f"{event_title} ({event_type})" if event_type else event_title
+                    })
+            except Exception as e:
+                logger.warning(f"Error parsing event dd: {e}")
+                continue
+
+    logger.info(f"提取到 {len(events_timeline)} 个时间轴事件")
+    return {'events_timeline': events_timeline[:20]}  # 限制前20条
+
+
+@register('legal_events', ('legal_events',), requires_specification=True)
+def extract_legal_events(ctx: ExtractionContext):
+    """Extract legal events (USPTO法律状态代码：FEPP, STPP, AS等)."""
+    soup = ctx.soup
+    legal_events = []
+
+    # 方法1：查找带有legalEvents属性的tr元素
+    legal_event_rows = soup.find_all('tr', {'itemprop': 'legalEvents'})
+
+    if legal_event_rows:
+        logger.info(f"找到 {len(legal_event_rows)} 个法律事件（legalEvents格式）")
+        for row in legal_event_rows:
+            try:
+                date_elem = row.find('time', {'itemprop': 'date'})
+                event_date = date_elem.get('datetime', '') if date_elem else ''
+                if not event_date:
+                    # 尝试从第一个td获取日期
+                    event_date = text_of(row.find('td'))
+
+                event_code = text_of(row.find('td', {'itemprop': 'code'}))
+                event_title = text_of(row.find('td', {'itemprop': 'title'}))
+
+                free_format_text = ''
+                for attr in row.find_all('p', {'itemprop': 'attributes'}):
+                    label = attr.find('strong', {'itemprop': 'label'})
+                    value = attr.find('span', {'itemprop': 'value'})
+                    if label and value and label.get_text().strip() == 'Free format text':
+                        free_format_text = value.get_text().strip()
+                        break
+
+                legal_events.append({
+                    'date': event_date,
+                    'code': event_code,
+                    'title': event_title,
+                    'description': f"{event_title} - {free_format_text}" if free_format_text else event_title,
+                    'free_format_text': free_format_text
+                })
+            except Exception as e:
+                logger.warning(f"Error parsing legal event row: {e}")
+                continue
+
+    # 方法2：查找包含Legal Events的h2标题（备用）
+    if not legal_events:
+        legal_h2 = None
+        for h2 in soup.find_all('h2'):
+            if 'Legal Events' in h2.get_text():
+                legal_h2 = h2
+                break
+
+        legal_table = legal_h2.find_next('table') if legal_h2 else None
+        if legal_table:
+            for row in legal_table.find_all('tr')[1:]:  # Skip header row
+                try:
+                    cells = row.find_all('td')
+                    if len(cells) >= 2:
+                        legal_events.append({
+                            'date': cells[0].get_text().strip(),
+                            'code': cells[1].get_text().strip() if len(cells) > 1 else '',
+                            'description': cells[2].get_text().strip() if len(cells) > 2 else cells[1].get_text().strip()
+                        })
+                except Exception as e:
+                    logger.warning(f"Error parsing legal event table row: {e}")
+                    continue
+
+    logger.info(f"提取到 {len(legal_events)} 个法律事件")
+    return {'legal_events': legal_events[:30]}  # 限制前30条
@@ -0,0 +1,118 @@
+"""
+Family extractor: family ID, family applications and country status.
+"""
+
+import logging
+
+from .registry import ExtractionContext, absolute_link, register, text_of
+
+logger = logging.getLogger(__name__)
+
+
+def _find_h2(section, text: str):
+    for h2 in section.find_all('h2'):
+        if text in h2.get_text():
+            return h2
+    return None
+
+
+@register('family', ('family_id', 'family_applications', 'country_status'), requires_specification=True)
+def extract_family(ctx: ExtractionContext):
+    """Extract family information (同族信息)."""
+    family_section = ctx.family_section()
+    if not family_section:
+        return {}
+
+    result = {}
+
+    # 提取Family ID
+    family_id_h2 = _find_h2(family_section, 'ID=')
+    if family_id_h2:
+        result['family_id'] = family_id_h2.get_text().strip().replace('ID=', '').strip()
+        logger.info(f"提取到同族ID: {result['family_id']}")
+
+    # 同族申请 - 方法1: Family Applications表格
+    family_applications = []
+    family_apps_h2 = _find_h2(family_section, 'Family Applications')
+    family_table = family_apps_h2.find_next('table') if family_apps_h2 else None
+    if family_table:
+        for row in family_table.find_all('tr', {'itemprop': 'applications'}):
+            try:
+                app_num_elem = row.find('span', {'itemprop': 'applicationNumber'})
+                if app_num_elem:
+                    family_applications.append({
+                        'application_number': app_num_elem.get_text().strip(),
+                        'status': text_of(row.find('span', {'itemprop': 'ifiStatus'})),
+                        'expiration': text_of(row.find('span', {'itemprop': 'ifiExpiration'})),
+                        'publication_number': text_of(row.find('span', {'itemprop': 'representativePublication'})),
+                        'language': text_of(row.find('span', {'itemprop': 'primaryLanguage'})),
+                        'priority_date': text_of(row.find('td', {'itemprop': 'priorityDate'})),
+                        'filing_date': text_of(row.find('td', {'itemprop': 'filingDate'})),
+                        'title': text_of(row.find('td', {'itemprop': 'title'})),
+                        'link': absolute_link(row.find('a'))
+                    })
+            except Exception as e:
+                logger.warning(f"Error parsing family application row: {e}")
+                continue
+
+    # 方法2: 补充"Also Published As"部分的worldwide application信息（docdbFamily）
+    also_published_rows = ctx.soup.find_all('tr', {'itemprop': 'docdbFamily'})
+    if also_published_rows:
+        logger.info(f"找到 {len(also_published_rows)} 个worldwide application (docdbFamily)")
+        for row in also_published_rows:
+            try:
+                pub_num_elem = row.find('span', {'itemprop': 'publicationNumber'})
+                if not pub_num_elem:
+                    continue
+
+                pub_number = pub_num_elem.get_text().strip()
+                already_exists = any(app.get('publication_number') == pub_number for app in family_applications)
+
+                if not already_exists:
+                    family_applications.append({
+                        'application_number': '',  # docdbFamily通常没有申请号
+                        'status': '',
+                        'expiration': '',
+                        'publication_number': pub_number,
+                        'language': text_of(row.find('span', {'itemprop': 'primaryLanguage'})),
+                        'priority_date': '',
+                        'filing_date': '',
+                        'publication_date': text_of(row.find('td', {'itemprop': 'publicationDate'})),
+                        'title': '',
+                        'link': absolute_link(row.find('a')),
+                        'source': 'worldwide'  # 标记来源
+                    })
+            except Exception as e:
+                logger.warning(f"Error parsing docdbFamily row: {e}")
+                continue
+
+    result['family_applications'] = family_applications[:30]
+    logger.info(f"提取到 {len(family_applications)} 个同族申请（包含worldwide application）")
+
+    # 国家状态
+    country_status = []
+    country_status_h2 = _find_h2(family_section, 'Country Status')
+    country_table = country_status_h2.find_next('table') if country_status_h2 else None
+    if country_table:
+        for row in country_table.find_all('tr', {'itemprop': 'countryStatus'}):
+            try:
+                country_code_elem = row.find('span', {'itemprop': 'countryCode'})
+                num_elem = row.find('span', {'itemprop': 'num'})
+                this_country_elem = row.find('meta', {'itemprop': 'thisCountry'})
+
+                if country_code_elem:
+                    country_status.append({
+                        'country_code': country_code_elem.get_text().strip(),
+                        'count': num_elem.get_text().strip() if num_elem else '1',
+                        'publication_number': text_of(row.find('span', {'itemprop': 'representativePublication'})),
+                        'language': text_of(row.find('span', {'itemprop': 'primaryLanguage'})),
+                        'is_this_country': this_country_elem.get('content') == 'true' if this_country_elem else False,
+                        'link': absolute_link(row.find('a'))
+                    })
+            except Exception as e:
+                logger.warning(f"Error parsing country status row: {e}")
+                continue
+
+    result['country_status'] = country_status
+    logger.info(f"提取到 {len(country_status)} 个国家状态")
+    return result
@@ -0,0 +1,175 @@
+"""
+Registry of per-field extractors.
+
+Each extractor owns one section of the Google Patents page and produces one or
+more SimplePatentData fields. Only extractors whose fields were requested are
+planned, and planned extractors run on first access of one of their fields.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def text_of(elem) -> str:
+    """Stripped text of an element, or '' if it is missing."""
+    return elem.get_text().strip() if elem else ''
+
+
+def absolute_link(link_elem) -> str:
+    """href of a link element, resolved against patents.google.com."""
+    if not link_elem:
+        return ''
+    href = link_elem.get('href', '')
+    return f"https://patents.google.com{href}" if href.startswith('/') else href
+
+
+class ExtractionContext:
+    """Parsed page plus lookups shared by several extractors."""
+
+    def __init__(self, soup, patent_number: str, url: str, crawl_specification: bool = False,
+                 crawl_full_drawings: bool = False):
+        self.soup = soup
+        self.patent_number = patent_number
+        self.url = url
+        self.crawl_specification = crawl_specification
+        self.crawl_full_drawings = crawl_full_drawings
+        self._memo: Dict[str, Any] = {}
+
+    def memo(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Compute a value once per page."""
+        value = self._memo.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self._memo[key] = value
+        return value
+
+    def json_ld_patent(self) -> Dict[str, Any]:
+        """The JSON-LD item of @type Patent, or an empty dict."""
+        return self.memo('json_ld_patent', self._find_json_ld_patent)
+
+    def _find_json_ld_patent(self) -> Dict[str, Any]:
+        try:
+            json_ld = self.soup.find('script', type='application/ld+json')
+            if json_ld:
+                ld_data = json.loads(json_ld.string)
+                for item in ld_data.get('@graph', []):
+                    if item.get('@type') == 'Patent':
+                        return item
+        except Exception as e:
+            logger.warning(f"Error parsing JSON-LD for {self.patent_number}: {e}")
+        return {}
+
+    def family_section(self):
+        """The <section itemprop="family"> element, or None."""
+        return self.memo('family_section', lambda: self.soup.find('section', {'itemprop': 'family'}))
+
+    def release(self) -> None:
+        """Drop the parse tree once no extractor needs it any more."""
+        self.soup = None
+        self._memo.clear()
+
+
+@dataclass(frozen=True)
+class FieldExtractor:
+    """One registered extractor."""
+    name: str
+    fields: Tuple[str, ...]
+    func: Callable[[ExtractionContext], Dict[str, Any]]
+    requires_specification: bool = False
+    always: bool = False
+
+    def is_needed(self, crawl_specification: bool, selected_fields: Optional[List[str]]) -> bool:
+        """Whether this extractor should run for the given request options."""
+        if self.requires_specification and not crawl_specification:
+            return False
+        if self.always or not selected_fields:
+            return True
+        return any(field in selected_fields for field in self.fields)
+
+    def run(self, context: ExtractionContext) -> Dict[str, Any]:
+        """Run the extractor, returning no values if it fails."""
+        try:
+            return self.func(context) or {}
+        except Exception as e:
+            logger.warning(f"Error extracting {self.name} for {context.patent_number}: {e}")
+            return {}
+
+
+EXTRACTORS: Dict[str, FieldExtractor] = {}
+
+
+def register(name: str, fields: Tuple[str, ...], requires_specification: bool = False, always: bool = False):
+    """
+    Register an extractor function.
+
+    Args:
+        name: Extractor name (used in logs)
+        fields: SimplePatentData fields produced by the function
+        requires_specification: Only run when crawl_specification is enabled
+        always: Run regardless of selected_fields (core data clients expect on every result)
+    """
+    def decorator(func: Callable[[ExtractionContext], Dict[str, Any]]):
+        EXTRACTORS[name] = FieldExtractor(name, tuple(fields), func, requires_specification, always)
+        return func
+    return decorator
+
+
+def plan_extractors(crawl_specification: bool = False, selected_fields: Optional[List[str]] = None) -> List[FieldExtractor]:
+    """Get the extractors needed for the given request options, in registration order."""
+    return [
+        extractor for extractor in EXTRACTORS.values()
+        if extractor.is_needed(crawl_specification, selected_fields)
+    ]
+
+
+class LazyFieldLoader:
+    """
+    Resolves planned fields of a SimplePatentData on first access.
+
+    The parse tree is released as soon as every planned field has been resolved.
+    """
+
+    def __init__(self, context: ExtractionContext, extractors: List[FieldExtractor]):
+        self.context = context
+        self.pending: Dict[str, FieldExtractor] = {}
+        for extractor in extractors:
+            for field in extractor.fields:
+                self.pending[field] = extractor
+        self._lock = threading.RLock()
+
+    def resolve(self, target: Any, field: str) -> None:
+        """Run the extractor that produces ``field`` and store all its outputs on ``target``."""
+        with self._lock:
+            extractor = self.pending.get(field)
+            if extractor is None:
+                return
+
+            values = extractor.run(self.context)
+            for name in extractor.fields:
+                if self.pending.get(name) is extractor:
+                    del self.pending[name]
+                    if name in values:
+                        object.__setattr__(target, name, values[name])
+
+            if not self.pending:
+                self.context.release()
+
+    def resolve_all(self, target: Any) -> None:
+        """Resolve every pending field."""
+        with self._lock:
+            while self.pending:
+                self.resolve(target, next(iter(self.pending)))
+
+    def discard(self, field: str) -> None:
+        """Forget a pending field that was assigned explicitly."""
+        with self._lock:
+            self.pending.pop(field, None)
+            if not self.pending:
+                self.context.release()
@@ -0,0 +1,162 @@
+"""
+Specification extractors: claims and description.
+"""
+
+import logging
+import re
+
+from .registry import ExtractionContext, register
+
+logger = logging.getLogger(__name__)
+
+_CLAIM_SPLIT_PATTERN = re.compile(r'(\d+)\.\s*(.+?)(?=\d+\.|$)', re.DOTALL)
+
+
+def _find_claims_section(soup):
+    # Strategy 1: Try section with itemprop='claims'
+    claims_section = soup.find('section', {'itemprop': 'claims'})
+    if not claims_section:
+        # Strategy 2: Try div with class='claims'
+        claims_section = soup.find('div', {'class': 'claims'})
+    if not claims_section:
+        # Strategy 3: Try to find by text content
+        for section in soup.find_all('section'):
+            if 'claims' in section.get('class', []) or 'Claims' in section.get_text()[:100]:
+                return section
+    return claims_section
+
+
+@register('claims', ('claims',), always=True)
+def extract_claims(ctx: ExtractionContext):
+    """
+    Extract claims, marking dependent claims.
+
+    Claims are formatted as "[num] text" or "[num][从属] text" when Google
+    Patents marks them up as <li class="claim"> / <li class="claim-dependent">.
+    """
+    claims = []
+    claims_section = _find_claims_section(ctx.soup)
+
+    if claims_section:
+        # Google Patents uses <li class="claim"> for independent claims
+        # and <li class="claim-dependent"> for dependent claims
+        claim_li_elements = claims_section.find_all('li', class_=['claim', 'claim-dependent'])
+
+        if claim_li_elements:
+            logger.info(f"找到 {len(claim_li_elements)} 个<li>权利要求元素")
+            for li in claim_li_elements:
+                is_dependent = 'claim-dependent' in li.get('class', [])
+
+                claim_div = li.find('div', {'class': 'claim'})
+                if claim_div:
+                    claim_num = claim_div.get('num', '')
+                    prefix = f"[{claim_num}][从属] " if is_dependent else f"[{claim_num}] "
+                    claim_texts = claim_div.find_all('div', {'class': 'claim-text'})
+
+                    if claim_texts:
+                        full_claim_text = ' '.join([ct.get_text(strip=True) for ct in claim_texts])
+                        if full_claim_text and len(full_claim_text) > 10:
+                            claims.append(prefix + full_claim_text)
+                    else:
+                        claim_text = claim_div.get_text(separator=' ', strip=True)
+                        if claim_text and len(claim_text) > 10:
+                            claims.append(prefix + claim_text)
+        else:
+            # Fallback: Find all claim divs with 'num' attribute (most reliable)
+            claim_elements = claims_section.find_all('div', {'num': True, 'class': 'claim'})
+
+            if claim_elements:
+                logger.info(f"找到 {len(claim_elements)} 个带num属性的claim元素")
+                for claim in claim_elements:
+                    claim_texts = claim.find_all('div', {'class': 'claim-text'})
+
+                    if claim_texts:
+                        full_claim_text = ' '.join([ct.get_text(strip=True) for ct in claim_texts])
+                        if full_claim_text and len(full_claim_text) > 10:
+                            claims.append(full_claim_text)
+                    else:
+                        claim_text = claim.get_text(separator=' ', strip=True)
+                        if claim_text and len(claim_text) > 10:
+                            claims.append(claim_text)
+            else:
+                # Fallback: Find all divs with class 'claim' (without num attribute)
+                logger.info("未找到带num属性的claim，尝试查找所有class='claim'的div")
+                claim_elements = claims_section.find_all('div', {'class': 'claim'})
+
+                if claim_elements:
+                    seen_claims = set()
+                    for claim in claim_elements:
+                        claim_text = claim.get_text(separator=' ', strip=True)
+                        if claim_text and len(claim_text) > 10:
+                            # Use first 50 chars as identifier for deduplication
+                            claim_id = claim_text[:50]
+                            if claim_id not in seen_claims:
+                                seen_claims.add(claim_id)
+                                claims.append(claim_text)
+                else:
+                    # Last resort: Split by claim numbers using regex
+                    logger.info("未找到claim元素，尝试使用正则表达式分割")
+                    full_text = claims_section.get_text(separator='\n', strip=True)
+                    for num, text in _CLAIM_SPLIT_PATTERN.findall(full_text):
+                        claim_text = f"{num}. {text.strip()}"
+                        if len(claim_text) > 10:
+                            claims.append(claim_text)
+
+    logger.info(f"提取到 {len(claims)} 条权利要求")
+    return {'claims': claims}
+
+
+@register('description', ('description',), requires_specification=True)
+def extract_description(ctx: ExtractionContext):
+    """Extract the full description, keeping paragraph structure."""
+    soup = ctx.soup
+    description = ''
+
+    description_section = soup.find('section', {'itemprop': 'description'})
+    if not description_section:
+        description_section = soup.find('div', {'class': 'description'})
+    if not description_section:
+        description_section = soup.find('description')
+    if not description_section:
+        # Try to find all sections after abstract
+        abstract_section = soup.find('section', {'itemprop': 'abstract'})
+        if abstract_section:
+            description_section = abstract_section.find_next_sibling()
+
+    if description_section:
+        # 方法1: 提取带有段落结构的说明书（保留换行）
+        paragraphs = description_section.find_all('div', {'class': 'description-paragraph'})
+
+        if paragraphs:
+            logger.info(f"找到 {len(paragraphs)} 个说明书段落")
+            paragraph_texts = []
+            for para in paragraphs:
+                para_text = para.get_text(separator=' ', strip=True)
+                if para_text:
+                    paragraph_texts.append(para_text)
+
+            # 用双换行符连接段落，保留原网页的段落结构
+            description = '\n\n'.join(paragraph_texts)
+        else:
+            # 方法2: 没有段落结构时，提取heading和div
+            content_div = description_section.find('div', {'itemprop': 'content'})
+            if content_div:
+                text_parts = []
+                for elem in content_div.find_all(['heading', 'div']):
+                    if elem.name == 'heading':
+                        heading_text = elem.get_text(strip=True)
+                        if heading_text:
+                            text_parts.append(f"\n{heading_text}\n")
+                    elif elem.name == 'div' and 'description-paragraph' in elem.get('class', []):
+                        para_text = elem.get_text(separator=' ', strip=True)
+                        if para_text:
+                            text_parts.append(para_text + '\n')
+
+                description = ''.join(text_parts).strip()
+            else:
+                # 方法3: 最后备用方案，直接提取所有文本
+                description = description_section.get_text(separator=' ', strip=True)
+
+        logger.info(f"提取到说明书，长度: {len(description)} 字符")
+
+    return {'description': description}
@@ -0,0 +1,204 @@
+"""
+HTML parser backends for the patent scraper.
+
+``bs4`` builds a full BeautifulSoup tree. ``lxml`` keeps the page as a raw
+lxml tree and answers the extractors' ``find``/``find_all`` lookups with XPath
+expressions that are compiled once per process and shared by every page, which
+is considerably faster and lighter on memory for multi-megabyte patent pages.
+
+Both backends expose the same small subset of the BeautifulSoup API, so the
+registered extractors run unchanged on either one.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+PARSERS = ('bs4', 'lxml')
+
+# Strings inside these tags are not text content (BeautifulSoup's get_text skips them too)
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+_HAS_NON_TEXT = etree.XPath('boolean(descendant::script | descendant::style | descendant::template)')
+
+_AXES = {
+    'descendant': 'descendant::{test}',
+    'next': '(descendant::{test} | following::{test})',
+    'next_sibling': 'following-sibling::{test}',
+}
+
+_queries: Dict[Tuple, Tuple[etree.XPath, Tuple[str, ...]]] = {}
+_queries_lock = threading.Lock()
+
+
+def parse_html(html: str, parser: str = 'bs4'):
+    """
+    Parse a patent page with the given backend.
+
+    Args:
+        html: Page HTML
+        parser: 'bs4' (BeautifulSoup tree) or 'lxml' (raw lxml tree with precompiled XPath)
+
+    Returns:
+        A BeautifulSoup object or an LxmlNode wrapping the document root
+    """
+    if parser == 'bs4':
+        return BeautifulSoup(html, 'lxml')
+    if parser == 'lxml':
+        root = etree.HTML(html) if html else None
+        return LxmlNode(root if root is not None else etree.Element('html'))
+    raise ValueError(f"Unknown parser backend: {parser} (expected one of {', '.join(PARSERS)})")
+
+
+def _normalize_filters(attrs: Optional[dict], kwargs: dict) -> List[Tuple[str, object]]:
+    filters = dict(attrs or {})
+    for key, value in kwargs.items():
+        filters['class' if key == 'class_' else key] = value
+    return list(filters.items())
+
+
+def _compile(axis: str, name, filters: List[Tuple[str, object]], first: bool) -> Tuple[etree.XPath, Tuple[str, ...]]:
+    """Get the compiled XPath for a lookup shape; attribute values are passed as variables."""
+    shape = []
+    for key, value in filters:
+        if value is True:
+            shape.append((key, True))
+        elif isinstance(value, (list, tuple)):
+            shape.append((key, len(value)))
+        else:
+            shape.append((key, 1))
+    names = tuple(name) if isinstance(name, (list, tuple)) else name
+    cache_key = (axis, names, tuple(shape), first)
+
+    query = _queries.get(cache_key)
+    if query is not None:
+        return query
+
+    if names is None:
+        test = '*'
+    elif isinstance(names, tuple):
+        test = '*[' + ' or '.join(f'self::{n}' for n in names) + ']'
+    else:
+        test = names
+
+    variables = []
+    for key, count in shape:
+        if count is True:
+            test += f'[@{key}]'
+            continue
+        alternatives = []
+        for _ in range(count):
+            var = f'v{len(variables)}'
+            variables.append(var)
+            if key == 'class':
+                # class is multi-valued: match one whitespace-separated token or the whole value
+                alternatives.append(f"@class=${var} or contains(concat(' ', normalize-space(@class), ' '), concat(' ', ${var}, ' '))")
+            else:
+                alternatives.append(f'@{key}=${var}')
+        test += '[' + ' or '.join(alternatives) + ']'
+
+    expression = _AXES[axis].format(test=test)
+    if first:
+        expression = f'({expression})[1]' if axis == 'descendant' else f'{expression}[1]'
+
+    with _queries_lock:
+        query = _queries.setdefault(cache_key, (etree.XPath(expression), tuple(variables)))
+    return query
+
+
+class LxmlNode:
+    """
+    BeautifulSoup-compatible view of an lxml element.
+
+    Implements the lookups used by the extractors: find, find_all, find_next,
+    find_next_sibling, get, get_text, string and name.
+    """
+
+    __slots__ = ('element',)
+
+    def __init__(self, element):
+        self.element = element
+
+    def __repr__(self) -> str:
+        return f"<LxmlNode {self.element.tag}>"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, LxmlNode) and other.element is self.element
+
+    def __hash__(self) -> int:
+        return id(self.element)
+
+    @property
+    def name(self) -> str:
+        return self.element.tag
+
+    def get(self, key: str, default=None):
+        """Attribute value; ``class`` is returned as a list of tokens like BeautifulSoup does."""
+        value = self.element.get(key)
+        if value is None:
+            return default
+        return value.split() if key == 'class' else value
+
+    def _select(self, axis: str, name, attrs, kwargs, first: bool) -> List['LxmlNode']:
+        filters = _normalize_filters(attrs, kwargs)
+        xpath, variables = _compile(axis, name, filters, first)
+
+        values = {}
+        names = iter(variables)
+        for _, value in filters:
+            if value is True:
+                continue
+            for item in (value if isinstance(value, (list, tuple)) else (value,)):
+                values[next(names)] = item
+
+        return [LxmlNode(element) for element in xpath(self.element, **values)]
+
+    def find(self, name=None, attrs=None, **kwargs) -> Optional['LxmlNode']:
+        found = self._select('descendant', name, attrs, kwargs, first=True)
+        return found[0] if found else None
+
+    def find_all(self, name=None, attrs=None, **kwargs) -> List['LxmlNode']:
+        return self._select('descendant', name, attrs, kwargs, first=False)
+
+    def find_next(self, name=None, attrs=None, **kwargs) -> Optional['LxmlNode']:
+        found = self._select('next', name, attrs, kwargs, first=True)
+        return found[0] if found else None
+
+    def find_next_sibling(self, name=None, attrs=None, **kwargs) -> Optional['LxmlNode']:
+        found = self._select('next_sibling', name, attrs, kwargs, first=True)
+        return found[0] if found else None
+
+    def _strings(self):
+        element = self.element
+        if element.tag in _NON_TEXT_TAGS or not _HAS_NON_TEXT(element):
+            return element.itertext()
+        return self._text_walk(element)
+
+    @staticmethod
+    def _text_walk(element):
+        if element.text:
+            yield element.text
+        for child in element:
+            if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+                yield from LxmlNode._text_walk(child)
+            if child.tail:
+                yield child.tail
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        strings = self._strings()
+        if strip:
+            strings = (s for s in (s.strip() for s in strings) if s)
+        return separator.join(strings)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    @property
+    def string(self) -> Optional[str]:
+        """The element's only text child, or None when it has child elements."""
+        element = self.element
+        if len(element):
+            return None
+        return element.text
@@ -0,0 +1,363 @@
+"""
+Two-tier cache for Google Patents pages.
+
+Tier 1 is an in-process LRU of extracted patent data. Tier 2 is a SQLite
+database shared by all workers on the host, holding the zlib-compressed raw
+HTML per patent number and the extracted data per (patent number, extraction
+options, page content hash). Parsed entries are addressed by the hash of the
+page they were extracted from, so a re-fetched but unchanged page keeps its
+parsed results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def make_options_key(crawl_specification: bool = False, crawl_full_drawings: bool = False,
+                     selected_fields: Optional[List[str]] = None) -> str:
+    """Build the cache key part describing which fields were extracted."""
+    fields = ','.join(sorted(set(selected_fields))) if selected_fields else '*'
+    return f"spec={int(bool(crawl_specification))}|draw={int(bool(crawl_full_drawings))}|fields={fields}"
+
+
+class PatentPageCache:
+    """
+    Caches raw patent HTML and extracted patent data.
+
+    Features:
+    - In-memory LRU for extracted data (bounded by entry count)
+    - SQLite store for compressed HTML and extracted data (bounded by bytes)
+    - TTL expiry on both tiers
+    - Hit/miss counters per tier
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: float = 24 * 3600,
+                 memory_entries: int = 256, max_disk_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize cache.
+
+        Args:
+            db_path: SQLite file for the persistent tier (None = memory only)
+            ttl_seconds: Maximum age of cached entries
+            memory_entries: Maximum number of extracted results kept in memory
+            max_disk_bytes: Size budget of the persistent tier
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'data_misses': 0,
+            'page_hits': 0,
+            'page_misses': 0,
+            'evictions': 0,
+        }
+
+        if self.db_path:
+            try:
+                self._open_db()
+            except Exception as e:
+                logger.warning(f"Patent cache disk tier disabled ({self.db_path}): {e}")
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_page(self, patent_number: str) -> Optional[str]:
+        """
+        Get cached raw HTML for a patent.
+
+        Returns:
+            HTML text or None if not cached/expired
+        """
+        row = self._execute_fetchone(
+            'SELECT html, fetched_at FROM pages WHERE patent_number = ?', (patent_number,)
+        )
+        with self._lock:
+            if row is None or self._is_expired(row[1]):
+                self._stats['page_misses'] += 1
+                return None
+            self._stats['page_hits'] += 1
+        self._touch('pages', 'patent_number = ?', (patent_number,))
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def set_page(self, patent_number: str, html: str) -> str:
+        """
+        Store raw HTML for a patent.
+
+        Returns:
+            Content hash of the page
+        """
+        raw = html.encode('utf-8')
+        content_hash = hashlib.sha256(raw).hexdigest()
+        if self._conn is None:
+            return content_hash
+
+        blob = zlib.compress(raw, 6)
+        now = time.time()
+        self._execute(
+            'INSERT OR REPLACE INTO pages (patent_number, content_hash, html, size, fetched_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (patent_number, content_hash, blob, len(blob), now, now)
+        )
+        self._enforce_disk_budget()
+        return content_hash
+
+    def get_page_hash(self, patent_number: str) -> Optional[str]:
+        """Get the content hash of the cached page for a patent."""
+        row = self._execute_fetchone(
+            'SELECT content_hash, fetched_at FROM pages WHERE patent_number = ?', (patent_number,)
+        )
+        if row is None or self._is_expired(row[1]):
+            return None
+        return row[0]
+
+    def get_data(self, patent_number: str, options_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get extracted patent data.
+
+        Args:
+            patent_number: Patent number
+            options_key: Extraction options (see make_options_key)
+
+        Returns:
+            Dict of SimplePatentData fields or None
+        """
+        key = (patent_number, options_key)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, data = entry
+                if self._is_expired(stored_at):
+                    del self._memory[key]
+                else:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return json.loads(json.dumps(data))
+
+        row = self._execute_fetchone(
+            'SELECT d.payload, d.stored_at FROM data d JOIN pages p '
+            'ON p.patent_number = d.patent_number AND p.content_hash = d.content_hash '
+            'WHERE d.patent_number = ? AND d.options_key = ?',
+            (patent_number, options_key)
+        )
+        if row is not None and not self._is_expired(row[1]):
+            data = json.loads(zlib.decompress(row[0]).decode('utf-8'))
+            self._touch('data', 'patent_number = ? AND options_key = ?', key)
+            with self._lock:
+                self._stats['disk_hits'] += 1
+                self._remember(key, row[1], data)
+            return json.loads(json.dumps(data))
+
+        with self._lock:
+            self._stats['data_misses'] += 1
+        return None
+
+    def set_data(self, patent_number: str, options_key: str, data: Dict[str, Any],
+                 content_hash: Optional[str] = None) -> None:
+        """
+        Store extracted patent data.
+
+        Args:
+            patent_number: Patent number
+            options_key: Extraction options (see make_options_key)
+            data: Dict of SimplePatentData fields
+            content_hash: Hash of the page the data was extracted from
+        """
+        now = time.time()
+        key = (patent_number, options_key)
+        snapshot = json.loads(json.dumps(data))
+
+        with self._lock:
+            self._remember(key, now, snapshot)
+
+        if self._conn is None:
+            return
+
+        if content_hash is None:
+            content_hash = self.get_page_hash(patent_number)
+            if content_hash is None:
+                return
+
+        blob = zlib.compress(json.dumps(snapshot, ensure_ascii=False).encode('utf-8'), 6)
+        self._execute(
+            'INSERT OR REPLACE INTO data (patent_number, options_key, content_hash, payload, size, stored_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (patent_number, options_key, content_hash, blob, len(blob), now, now)
+        )
+        self._enforce_disk_budget()
+
+    def invalidate(self, patent_number: str) -> None:
+        """Drop every cached entry for a patent."""
+        with self._lock:
+            for key in [k for k in self._memory if k[0] == patent_number]:
+                del self._memory[key]
+        self._execute('DELETE FROM data WHERE patent_number = ?', (patent_number,))
+        self._execute('DELETE FROM pages WHERE patent_number = ?', (patent_number,))
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._memory.clear()
+        self._execute('DELETE FROM data')
+        self._execute('DELETE FROM pages')
+
+    def cleanup_expired(self) -> int:
+        """
+        Remove expired entries from both tiers.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for key in [k for k, (t, _) in self._memory.items() if t < cutoff]:
+                del self._memory[key]
+                removed += 1
+        if self._conn is not None:
+            with self._lock:
+                removed += self._conn.execute('DELETE FROM data WHERE stored_at < ?', (cutoff,)).rowcount
+                removed += self._conn.execute('DELETE FROM pages WHERE fetched_at < ?', (cutoff,)).rowcount
+                self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and tier sizes."""
+        with self._lock:
+            result = dict(self._stats)
+            result['memory_entries'] = len(self._memory)
+
+        lookups = result['memory_hits'] + result['disk_hits'] + result['data_misses']
+        result['hit_rate'] = (result['memory_hits'] + result['disk_hits']) / lookups if lookups else 0.0
+        result['disk_enabled'] = self._conn is not None
+
+        if self._conn is not None:
+            pages = self._execute_fetchone('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages')
+            data = self._execute_fetchone('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM data')
+            result['disk_pages'] = pages[0]
+            result['disk_data_entries'] = data[0]
+            result['disk_bytes'] = pages[1] + data[1]
+
+        return result
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _open_db(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'patent_number TEXT PRIMARY KEY, content_hash TEXT NOT NULL, html BLOB NOT NULL, '
+            'size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS data ('
+            'patent_number TEXT NOT NULL, options_key TEXT NOT NULL, content_hash TEXT NOT NULL, '
+            'payload BLOB NOT NULL, size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL, '
+            'PRIMARY KEY (patent_number, options_key))'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_data_accessed ON data (accessed_at)')
+        conn.commit()
+        self._conn = conn
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl_seconds
+
+    def _remember(self, key: Tuple[str, str], stored_at: float, data: Dict[str, Any]) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        self._memory[key] = (stored_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(sql, params)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Patent cache write failed: {e}")
+
+    def _execute_fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                return self._conn.execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Patent cache read failed: {e}")
+            return None
+
+    def _touch(self, table: str, where: str, params: tuple) -> None:
+        self._execute(f'UPDATE {table} SET accessed_at = ? WHERE {where}', (time.time(),) + tuple(params))
+
+    def _enforce_disk_budget(self) -> None:
+        """Evict least recently used disk entries until under the size budget."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                total = self._conn.execute(
+                    'SELECT (SELECT COALESCE(SUM(size), 0) FROM pages) + (SELECT COALESCE(SUM(size), 0) FROM data)'
+                ).fetchone()[0]
+                if total <= self.max_disk_bytes:
+                    return
+
+                # Evict down to 90% of the budget to avoid evicting on every insert
+                target = self.max_disk_bytes * 0.9
+                candidates = self._conn.execute(
+                    "SELECT 'data', patent_number, options_key, size, accessed_at FROM data "
+                    "UNION ALL SELECT 'pages', patent_number, '', size, accessed_at FROM pages "
+                    "ORDER BY accessed_at ASC"
+                ).fetchall()
+                for table, patent_number, options_key, size, _ in candidates:
+                    if total <= target:
+                        break
+                    if table == 'data':
+                        self._conn.execute(
+                            'DELETE FROM data WHERE patent_number = ? AND options_key = ?',
+                            (patent_number, options_key)
+                        )
+                    else:
+                        self._conn.execute('DELETE FROM pages WHERE patent_number = ?', (patent_number,))
+                    total -= size
+                    self._stats['evictions'] += 1
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Patent cache eviction failed: {e}")
@@ -0,0 +1,125 @@
+"""
+Token-bucket rate limiting for the patent scraper.
+
+Replaces the fixed ``time.sleep(delay)`` between requests with a per-host
+budget that concurrent workers share, so a batch can overlap network latency
+without exceeding the politeness limit towards Google Patents.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``acquire`` blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Tokens added per second (must be > 0)
+            capacity: Maximum burst size
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def try_acquire(self) -> float:
+        """
+        Try to take one token without blocking.
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds to wait before retrying
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a token is available.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if a token was taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """Keeps one TokenBucket per host."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize limiter.
+
+        Args:
+            rate: Requests per second allowed for each host
+            capacity: Burst size for each host
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, host: str) -> TokenBucket:
+        """Get or create the bucket for a host."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the host of ``url`` to have budget for one more request.
+
+        Args:
+            url: Request URL
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if the request may proceed, False on timeout
+        """
+        host = urlparse(url).netloc or url
+        return self.get_bucket(host).acquire(timeout=timeout)
@@ -0,0 +1,163 @@
+"""
+Pool of HTTP sessions for the patent scraper.
+
+``requests.Session`` is not safe for concurrent use, so each request checks a
+session out of the pool for its exclusive use and returns it afterwards.
+Every session has its own connection pool and retries transient failures
+with jittered exponential backoff.
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class SessionPoolTimeout(requests.exceptions.RequestException):
+    """No session became available within the checkout timeout."""
+
+
+def build_retry(retries: int, backoff_factor: float, backoff_jitter: float) -> Retry:
+    """Retry policy for idempotent requests: connection errors, 429 and 5xx responses."""
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+class SessionPool:
+    """Fixed-size pool of requests sessions with checkout/checkin per request."""
+
+    def __init__(self, size: int = 4, pool_maxsize: int = 2, retries: int = 2, backoff_factor: float = 0.5,
+                 backoff_jitter: float = 0.5, headers: Optional[Dict[str, str]] = None,
+                 checkout_timeout: Optional[float] = 30.0,
+                 session_factory: Optional[Callable[[], requests.Session]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Number of sessions (maximum concurrent requests)
+            pool_maxsize: Keep-alive connections per host for each session
+            retries: Retries for connection errors, 429 and 5xx responses
+            backoff_factor: Base of the exponential backoff between retries in seconds
+            backoff_jitter: Maximum random delay added to each backoff in seconds
+            headers: Default headers for every session
+            checkout_timeout: Seconds to wait for a free session (None = wait forever)
+            session_factory: Create sessions (defaults to tuned requests.Session objects)
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._retry = build_retry(retries, backoff_factor, backoff_jitter)
+        self._pool_maxsize = pool_maxsize
+        self._headers = dict(headers or {})
+        factory = session_factory or self._create_session
+
+        self._sessions = [factory() for _ in range(size)]
+        self._available: 'queue.LifoQueue' = queue.LifoQueue()
+        for session in self._sessions:
+            self._available.put(session)
+
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'peak_in_use': 0,
+            'wait_seconds': 0.0,
+            'busy_seconds': 0.0
+        }
+        self._created_at = time.monotonic()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # One connection pool per host (patents.google.com, patentimages...), sized for sequential reuse
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self._pool_maxsize, max_retries=self._retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self._headers)
+        return session
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[requests.Session]:
+        """
+        Borrow a session for the duration of the ``with`` block.
+
+        Raises:
+            SessionPoolTimeout: If no session is free within the timeout
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+        try:
+            session = self._available.get_nowait()
+            waited = False
+        except queue.Empty:
+            waited = True
+            try:
+                session = self._available.get(timeout=timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                raise SessionPoolTimeout(f"No scraper session available within {timeout}s (pool size {self.size})")
+
+        checked_out = time.monotonic()
+        with self._lock:
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+            if waited:
+                self._stats['waits'] += 1
+                self._stats['wait_seconds'] += checked_out - start
+
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._stats['busy_seconds'] += time.monotonic() - checked_out
+            self._available.put(session)
+
+    def stats(self) -> Dict[str, float]:
+        """Pool utilization metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+            in_use = self._in_use
+        elapsed = max(time.monotonic() - self._created_at, 1e-9)
+        checkouts = stats['checkouts']
+        return {
+            'size': self.size,
+            'in_use': in_use,
+            'available': self.size - in_use,
+            'utilization': in_use / self.size,
+            'average_utilization': min(1.0, stats['busy_seconds'] / (elapsed * self.size)),
+            'peak_in_use': stats['peak_in_use'],
+            'checkouts': checkouts,
+            'waits': stats['waits'],
+            'timeouts': stats['timeouts'],
+            'avg_wait_ms': stats['wait_seconds'] * 1000 / checkouts if checkouts else 0.0
+        }
+
+    def close(self) -> None:
+        """Close every session."""
+        for session in self._sessions:
+            session.close()
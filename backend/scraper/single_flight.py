@@ -0,0 +1,78 @@
+"""
+Single-flight coalescing of concurrent calls.
+
+Concurrent callers asking for the same key wait on one shared execution
+instead of each doing the work. A caller can also join an in-flight call
+under a different key when that call's result covers what it needs.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same (or a covering) key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._stats = {'executions': 0, 'shared': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           covers: Optional[Callable[[Hashable], bool]] = None) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` unless an equivalent call is already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Work to run when no in-flight call can be joined
+            covers: Optional predicate telling whether the in-flight call with the
+                given key also satisfies this one
+
+        Returns:
+            Tuple of (result, shared); shared is True when the result came from
+            another caller's execution. Exceptions raised by ``fn`` propagate to
+            every waiting caller.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None and covers is not None:
+                for in_flight_key, in_flight in self._calls.items():
+                    if covers(in_flight_key):
+                        future = in_flight
+                        break
+
+            if future is not None:
+                self._stats['shared'] += 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                self._stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Number of calls currently executing."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Executions started and calls served from another caller's execution."""
+        with self._lock:
+            return {**self._stats, 'in_flight': len(self._calls)}
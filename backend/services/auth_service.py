@@ -8,14 +8,26 @@ import json
 import os
 import random
 import string
+import threading
 import time
+from collections import OrderedDict
 from flask import request, session
 from werkzeug.security import check_password_hash, generate_password_hash
-from backend.config import USERS_FILE, MAX_IPS_PER_USER, BASE_DIR
+from backend.config import (
+    USERS_FILE, MAX_IPS_PER_USER, BASE_DIR, AUTH_IP_CACHE_TTL_SECONDS, AUTH_IP_CACHE_MAX_ENTRIES
+)
 from backend.extensions import get_db_pool
 
 PASSWORD_RESET_FILE = os.path.join(BASE_DIR, 'backend', 'user_management', 'password_reset.json')
 
+# (username, ip) -> expires_at for allowed bindings, least recently used first.
+# Denials are never cached: a binding added on another worker (login) must be
+# honoured on the next request, or that worker keeps clearing the session.
+# Bindings removed on other workers are seen after the TTL.
+_ip_cache = OrderedDict()
+_ip_cache_lock = threading.Lock()
+_ip_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
 
 class AuthService:
     """Service for handling authentication operations."""
@@ -334,6 +346,8 @@ class AuthService:
                     )
                 
                 conn.commit()
+                # The new IP is allowed now and the oldest one may have been removed
+                AuthService.invalidate_ip_cache(username)
                 return True
                 
         except Exception as e:
@@ -348,6 +362,10 @@ class AuthService:
         """
         Verify if user IP is registered.
         
+        Allowed bindings are cached for AUTH_IP_CACHE_TTL_SECONDS, so most
+        requests skip the database (see invalidate_ip_cache). Denials always
+        re-check the database.
+        
         Args:
             username: Username
             client_ip: Client IP address
@@ -359,6 +377,16 @@ class AuthService:
         if not db_pool:
             return True  # Skip verification if no database
         
+        key = (username, client_ip)
+        if AUTH_IP_CACHE_TTL_SECONDS > 0:
+            with _ip_cache_lock:
+                expires_at = _ip_cache.get(key)
+                if expires_at is not None and expires_at > time.monotonic():
+                    _ip_cache.move_to_end(key)
+                    _ip_cache_stats['hits'] += 1
+                    return True
+                _ip_cache_stats['misses'] += 1
+        
         conn = None
         try:
             conn = db_pool.getconn()
@@ -367,7 +395,15 @@ class AuthService:
                     "SELECT 1 FROM user_ips WHERE username = %s AND ip_address = %s;",
                     (username, client_ip)
                 )
-                return cur.fetchone() is not None
+                allowed = cur.fetchone() is not None
+            
+            if allowed and AUTH_IP_CACHE_TTL_SECONDS > 0:
+                with _ip_cache_lock:
+                    _ip_cache[key] = time.monotonic() + AUTH_IP_CACHE_TTL_SECONDS
+                    _ip_cache.move_to_end(key)
+                    while len(_ip_cache) > AUTH_IP_CACHE_MAX_ENTRIES:
+                        _ip_cache.popitem(last=False)
+            return allowed
         except Exception as e:
             print(f"IP验证时发生数据库错误: {e}")
             return True  # Allow access on error
@@ -375,6 +411,37 @@ class AuthService:
             if conn:
                 db_pool.putconn(conn)
     
+    @staticmethod
+    def invalidate_ip_cache(username=None):
+        """
+        Drop cached IP verification results.
+        
+        Args:
+            username: Only drop this user's entries (None = all users)
+        """
+        with _ip_cache_lock:
+            if username is None:
+                _ip_cache.clear()
+            else:
+                for key in [key for key in _ip_cache if key[0] == username]:
+                    del _ip_cache[key]
+            _ip_cache_stats['invalidations'] += 1
+    
+    @staticmethod
+    def get_ip_cache_stats():
+        """
+        Get IP verification cache counters.
+        
+        Returns:
+            dict: hits, misses, invalidations, entries and hit_rate
+        """
+        with _ip_cache_lock:
+            stats = dict(_ip_cache_stats)
+            stats['entries'] = len(_ip_cache)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+    
     @staticmethod
     def init_database():
         """Initialize database tables."""
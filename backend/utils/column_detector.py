@@ -2,6 +2,10 @@
 智能列识别工具
 
 自动识别Excel文件中的专利号列和权利要求列
+
+每列取前10个非空值作为样本，所有列的样本合并为一个Series后用pandas字符串
+方法一次完成匹配（每类特征一个合并后的预编译正则），再按列汇总计分；
+识别结果随Excel解析快照保存，不会在每次请求时重新计算。
 """
 
 import re
@@ -97,82 +101,118 @@ class ColumnDetector:
             r'[A-Z]{1,4}\d{6,20}[A-Z]{0,3}\d{0,2}',  # 灵活的字母数字组合
         ]
     
-    def detect_patent_number_column(self, df: pd.DataFrame) -> Optional[Dict]:
+        # 权利要求内容特征词汇
+        self.claims_indicators = [
+            '权利要求', 'claim', '一种', '包括', '其特征在于', 'comprising',
+            'characterized', 'wherein', '所述', 'said', 'the method',
+            'the apparatus', 'the system'
+        ]
+        
+        # 每类特征合并为一个预编译正则（与逐个re.search任一匹配等价）
+        self._patent_number_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in self.patent_number_patterns))
+        self._claims_indicator_regex = re.compile(
+            '|'.join(re.escape(indicator.lower()) for indicator in self.claims_indicators)
+        )
+    
+    def _sample_values(self, df: pd.DataFrame, limit: int = 10) -> pd.Series:
+        """
+        所有列的样本值
+        
+        Args:
+            df: pandas DataFrame
+            limit: 每列样本数
+            
+        Returns:
+            pd.Series: 每列前limit个非空值（转为字符串），索引为(列位置, 样本序号)
+        """
+        # 多数列在前几十行就有足够的非空值，只有不够时才扫描整列
+        head = df.head(limit * 10)
+        parts = {}
+        for position in range(df.shape[1]):
+            column = head.iloc[:, position].dropna()
+            if len(column) < limit and len(head) < len(df):
+                column = df.iloc[:, position].dropna()
+            parts[position] = column.head(limit).astype(str).reset_index(drop=True)
+        
+        if not parts:
+            return pd.Series([], dtype=object)
+        return pd.concat(parts)
+    
+    def _column_keyword(self, col_name, keywords: List[str]) -> Optional[str]:
+        """列名中包含的第一个关键词（按关键词优先级）"""
+        col_name_lower = str(col_name).lower()
+        for keyword in keywords:
+            if keyword.lower() in col_name_lower:
+                return keyword
+        return None
+    
+    def detect_patent_number_column(self, df: pd.DataFrame, samples: pd.Series = None) -> Optional[Dict]:
         """
         检测专利号列
         
         Args:
             df: pandas DataFrame
+            samples: 样本值（见_sample_values，不传时从df提取）
             
         Returns:
             dict: 检测结果，包含列名、置信度、匹配原因
         """
+        if samples is None:
+            samples = self._sample_values(df)
+        
+        # 所有列的样本一次完成匹配，再按列汇总
+        by_column = samples.index.get_level_values(0) if len(samples) else []
+        value_clean = samples.str.strip().str.upper()
+        # 太短（少于5个字符）不太可能是专利号
+        format_matches = (value_clean.str.len() >= 5) & value_clean.str.contains(self._patent_number_regex)
+        stripped = samples.str.strip()
+        letters_and_numbers = stripped.str.contains(r'[A-Za-z]') & stripped.str.contains(r'\d')
+        
+        sample_counts = samples.groupby(by_column).size().to_dict()
+        format_counts = format_matches.groupby(by_column).sum().to_dict()
+        avg_lengths = samples.str.len().groupby(by_column).mean().to_dict()
+        letter_number_counts = letters_and_numbers.groupby(by_column).sum().to_dict()
+        
         results = []
         
-        for col_name in df.columns:
+        for position, col_name in enumerate(df.columns):
             score = 0
             reasons = []
             
             # 1. 检查列名关键词匹配
-            col_name_lower = str(col_name).lower()
-            for keyword in self.patent_number_keywords:
-                if keyword.lower() in col_name_lower:
-                    # 根据关键词重要性给分
-                    if keyword.lower() in ['专利号', 'patent number', '公开号']:
-                        score += 50
-                        reasons.append(f"列名包含高优先级关键词: {keyword}")
-                    else:
-                        score += 30
-                        reasons.append(f"列名包含关键词: {keyword}")
-                    break
+            keyword = self._column_keyword(col_name, self.patent_number_keywords)
+            if keyword is not None:
+                # 根据关键词重要性给分
+                if keyword.lower() in ['专利号', 'patent number', '公开号']:
+                    score += 50
+                    reasons.append(f"列名包含高优先级关键词: {keyword}")
+                else:
+                    score += 30
+                    reasons.append(f"列名包含关键词: {keyword}")
             
-            # 2. 检查数据内容格式
-            sample_data = df[col_name].dropna().astype(str).head(10)
-            if len(sample_data) > 0:
-                patent_format_matches = 0
-                total_samples = len(sample_data)
-                
-                for value in sample_data:
-                    value_clean = str(value).strip().upper()
-                    if len(value_clean) < 5:  # 太短不太可能是专利号
-                        continue
-                        
-                    # 检查是否匹配专利号格式
-                    for pattern in self.patent_number_patterns:
-                        if re.search(pattern, value_clean):
-                            patent_format_matches += 1
-                            break
+            total_samples = sample_counts.get(position, 0)
+            if total_samples > 0:
+                # 2. 检查数据内容格式
+                format_match_rate = format_counts[position] / total_samples
+                if format_match_rate >= 0.8:
+                    score += 40
+                    reasons.append(f"数据格式高度匹配专利号格式 ({format_match_rate:.1%})")
+                elif format_match_rate >= 0.5:
+                    score += 25
+                    reasons.append(f"数据格式部分匹配专利号格式 ({format_match_rate:.1%})")
+                elif format_match_rate >= 0.2:
+                    score += 10
+                    reasons.append(f"数据格式少量匹配专利号格式 ({format_match_rate:.1%})")
                 
-                # 计算格式匹配率
-                if total_samples > 0:
-                    format_match_rate = patent_format_matches / total_samples
-                    if format_match_rate >= 0.8:
-                        score += 40
-                        reasons.append(f"数据格式高度匹配专利号格式 ({format_match_rate:.1%})")
-                    elif format_match_rate >= 0.5:
-                        score += 25
-                        reasons.append(f"数据格式部分匹配专利号格式 ({format_match_rate:.1%})")
-                    elif format_match_rate >= 0.2:
-                        score += 10
-                        reasons.append(f"数据格式少量匹配专利号格式 ({format_match_rate:.1%})")
-            
-            # 3. 检查数据长度特征
-            if len(sample_data) > 0:
-                avg_length = sample_data.str.len().mean()
+                # 3. 检查数据长度特征
+                avg_length = avg_lengths[position]
                 if 8 <= avg_length <= 20:  # 专利号通常在这个长度范围
                     score += 10
                     reasons.append(f"数据长度符合专利号特征 (平均{avg_length:.1f}字符)")
-            
-            # 4. 检查是否包含专利号特征字符
-            if len(sample_data) > 0:
-                has_letters_and_numbers = 0
-                for value in sample_data:
-                    value_str = str(value).strip()
-                    if re.search(r'[A-Za-z]', value_str) and re.search(r'\d', value_str):
-                        has_letters_and_numbers += 1
                 
-                if has_letters_and_numbers > 0:
-                    letter_number_rate = has_letters_and_numbers / len(sample_data)
+                # 4. 检查是否包含专利号特征字符
+                if letter_number_counts[position] > 0:
+                    letter_number_rate = letter_number_counts[position] / total_samples
                     if letter_number_rate >= 0.5:
                         score += 15
                         reasons.append(f"数据包含字母数字组合特征 ({letter_number_rate:.1%})")
@@ -183,7 +223,7 @@ class ColumnDetector:
                     'score': score,
                     'confidence': min(score / 100, 1.0),  # 转换为0-1的置信度
                     'reasons': reasons,
-                    'sample_data': sample_data.head(3).tolist()
+                    'sample_data': samples[position].head(3).tolist() if total_samples else []
                 })
         
             # 按分数排序，返回最佳匹配
@@ -193,67 +233,58 @@ class ColumnDetector:
         
         return None
     
-    def detect_claims_column(self, df: pd.DataFrame) -> Optional[Dict]:
+    def detect_claims_column(self, df: pd.DataFrame, samples: pd.Series = None) -> Optional[Dict]:
         """
         检测权利要求列
         
         Args:
             df: pandas DataFrame
+            samples: 样本值（见_sample_values，不传时从df提取）
             
         Returns:
             dict: 检测结果，包含列名、置信度、匹配原因
         """
+        if samples is None:
+            samples = self._sample_values(df)
+        
+        # 所有列的样本一次完成匹配，再按列汇总
+        by_column = samples.index.get_level_values(0) if len(samples) else []
+        # 检查是否包含权利要求特征词汇
+        content_matches = samples.str.strip().str.lower().str.contains(self._claims_indicator_regex)
+        
+        sample_counts = samples.groupby(by_column).size().to_dict()
+        content_counts = content_matches.groupby(by_column).sum().to_dict()
+        avg_lengths = samples.str.len().groupby(by_column).mean().to_dict()
+        
         results = []
         
-        for col_name in df.columns:
+        for position, col_name in enumerate(df.columns):
             score = 0
             reasons = []
             
             # 1. 检查列名关键词匹配
-            col_name_lower = str(col_name).lower()
-            for keyword in self.claims_keywords:
-                if keyword.lower() in col_name_lower:
-                    if keyword.lower() in ['权利要求', 'claims', 'claim']:
-                        score += 50
-                        reasons.append(f"列名包含高优先级关键词: {keyword}")
-                    else:
-                        score += 30
-                        reasons.append(f"列名包含关键词: {keyword}")
-                    break
+            keyword = self._column_keyword(col_name, self.claims_keywords)
+            if keyword is not None:
+                if keyword.lower() in ['权利要求', 'claims', 'claim']:
+                    score += 50
+                    reasons.append(f"列名包含高优先级关键词: {keyword}")
+                else:
+                    score += 30
+                    reasons.append(f"列名包含关键词: {keyword}")
             
-            # 2. 检查数据内容特征
-            sample_data = df[col_name].dropna().astype(str).head(10)
-            if len(sample_data) > 0:
-                claims_content_matches = 0
-                
-                for value in sample_data:
-                    value_str = str(value).strip()
-                    
-                    # 检查是否包含权利要求特征词汇
-                    claims_indicators = [
-                        '权利要求', 'claim', '一种', '包括', '其特征在于', 'comprising',
-                        'characterized', 'wherein', '所述', 'said', 'the method',
-                        'the apparatus', 'the system'
-                    ]
-                    
-                    for indicator in claims_indicators:
-                        if indicator.lower() in value_str.lower():
-                            claims_content_matches += 1
-                            break
+            total_samples = sample_counts.get(position, 0)
+            if total_samples > 0:
+                # 2. 计算内容匹配率
+                content_match_rate = content_counts[position] / total_samples
+                if content_match_rate >= 0.6:
+                    score += 40
+                    reasons.append(f"内容高度匹配权利要求特征 ({content_match_rate:.1%})")
+                elif content_match_rate >= 0.3:
+                    score += 25
+                    reasons.append(f"内容部分匹配权利要求特征 ({content_match_rate:.1%})")
                 
-                # 计算内容匹配率
-                if len(sample_data) > 0:
-                    content_match_rate = claims_content_matches / len(sample_data)
-                    if content_match_rate >= 0.6:
-                        score += 40
-                        reasons.append(f"内容高度匹配权利要求特征 ({content_match_rate:.1%})")
-                    elif content_match_rate >= 0.3:
-                        score += 25
-                        reasons.append(f"内容部分匹配权利要求特征 ({content_match_rate:.1%})")
-            
-            # 3. 检查文本长度（权利要求通常较长）
-            if len(sample_data) > 0:
-                avg_length = sample_data.str.len().mean()
+                # 3. 检查文本长度（权利要求通常较长）
+                avg_length = avg_lengths[position]
                 if avg_length >= 50:  # 权利要求通常比较长
                     score += 20
                     reasons.append(f"文本长度符合权利要求特征 (平均{avg_length:.0f}字符)")
@@ -267,7 +298,7 @@ class ColumnDetector:
                     'score': score,
                     'confidence': min(score / 100, 1.0),
                     'reasons': reasons,
-                    'sample_data': sample_data.head(2).tolist()
+                    'sample_data': samples[position].head(2).tolist() if total_samples else []
                 })
         
         # 按分数排序，返回最佳匹配
@@ -287,8 +318,9 @@ class ColumnDetector:
         Returns:
             dict: 包含专利号列和权利要求列的检测结果
         """
-        patent_column = self.detect_patent_number_column(df)
-        claims_column = self.detect_claims_column(df)
+        samples = self._sample_values(df)
+        patent_column = self.detect_patent_number_column(df, samples)
+        claims_column = self.detect_claims_column(df, samples)
         
         return {
             'patent_number_column': patent_column,
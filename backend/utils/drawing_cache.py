@@ -3,230 +3,335 @@ Drawing OCR Cache Manager
 
 Manages caching of OCR results for patent drawings to improve performance
 and provide cache update notifications to users.
+
+OCR results are addressed by OCR mode and image content hash (see
+make_cache_key), so the same drawing uploaded again - under any file name -
+reuses its earlier recognition. Tier 1 is an in-process LRU bounded by bytes;
+tier 2 is a SQLite database shared by all workers on the host, also bounded
+by bytes and evicted least recently used first.
 """
 
+import hashlib
 import json
-import time
+import logging
 import os
-from typing import Dict, Optional
-from pathlib import Path
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DB_FILENAME = 'drawing_ocr_cache.db'
+
+
+def make_cache_key(ocr_mode: str, image_data: bytes) -> Tuple[str, str]:
+    """
+    Build the cache key of an OCR result.
+
+    Args:
+        ocr_mode: OCR engine ('rapidocr', 'glm_ocr', 'paddle_ocr')
+        image_data: Raw image bytes
+
+    Returns:
+        (cache_key, image_hash)
+    """
+    image_hash = hashlib.md5(image_data).hexdigest()
+    return f"{ocr_mode}_{image_hash}", image_hash
 
 
 class DrawingCacheManager:
     """
     Manages OCR result caching for patent drawings.
-    
+
     Features:
-    - In-memory cache for fast access
-    - Persistent cache storage (optional)
+    - In-memory LRU cache for fast access (bounded by bytes)
+    - Persistent SQLite cache storage shared across workers (optional, bounded by bytes)
     - Cache expiration (default: 7 days)
-    - Cache key based on image content hash
+    - Cache key based on OCR mode and image content hash
+    - Hit/miss counters per tier
     """
-    
-    def __init__(self, cache_dir: Optional[str] = None, max_age_days: int = 7):
+
+    def __init__(self, cache_dir: Optional[str] = None, max_age_days: float = 7,
+                 max_memory_bytes: int = 64 * 1024 * 1024, max_disk_bytes: int = 256 * 1024 * 1024):
         """
         Initialize cache manager.
-        
+
         Args:
             cache_dir: Directory for persistent cache storage (None = memory only)
             max_age_days: Maximum cache age in days (default: 7)
+            max_memory_bytes: Size budget of the in-memory tier
+            max_disk_bytes: Size budget of the persistent tier
         """
-        self.cache = {}  # In-memory cache
         self.cache_dir = cache_dir
         self.max_age_seconds = max_age_days * 24 * 60 * 60
-        
-        # Create cache directory if specified
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        # In-memory cache: key -> (cached data, size in bytes), least recently used first
+        self.cache: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+        }
+
         if self.cache_dir:
-            Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
-            self._load_persistent_cache()
-    
+            try:
+                self._open_db()
+            except Exception as e:
+                logger.warning(f"Drawing cache disk tier disabled ({self.cache_dir}): {e}")
+                self._conn = None
+
     def get_cache(self, cache_key: str) -> Optional[Dict]:
         """
         Get cached OCR result.
-        
+
         Args:
-            cache_key: Cache key (typically: filename_hash)
-            
+            cache_key: Cache key (see make_cache_key)
+
         Returns:
             Cached result dict or None if not found/expired
         """
         # Check in-memory cache first
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            
-            # Check if expired
-            if self._is_expired(cached_data):
-                del self.cache[cache_key]
-                return None
-            
-            return cached_data
-        
+        with self._lock:
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                cached_data = entry[0]
+
+                # Check if expired
+                if self._is_expired(cached_data):
+                    self._forget(cache_key)
+                else:
+                    self.cache.move_to_end(cache_key)
+                    self._stats['memory_hits'] += 1
+                    return json.loads(json.dumps(cached_data))
+
         # Check persistent cache if enabled
-        if self.cache_dir:
-            cached_data = self._load_from_disk(cache_key)
-            if cached_data and not self._is_expired(cached_data):
-                # Load into memory cache
-                self.cache[cache_key] = cached_data
-                return cached_data
-        
+        row = self._execute_fetchone('SELECT payload FROM entries WHERE cache_key = ?', (cache_key,))
+        if row is not None:
+            cached_data = json.loads(zlib.decompress(row[0]).decode('utf-8'))
+            if not self._is_expired(cached_data):
+                self._execute('UPDATE entries SET accessed_at = ? WHERE cache_key = ?', (time.time(), cache_key))
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+                    # Load into memory cache
+                    self._remember(cache_key, cached_data)
+                return json.loads(json.dumps(cached_data))
+
+        with self._lock:
+            self._stats['misses'] += 1
         return None
-    
+
     def set_cache(self, cache_key: str, data: Dict) -> None:
         """
         Save OCR result to cache.
-        
+
         Args:
             cache_key: Cache key
             data: OCR result data to cache
         """
         # Add timestamp
-        cached_data = {
+        cached_data = json.loads(json.dumps({
             **data,
             'timestamp': time.time()
-        }
-        
+        }))
+
         # Save to memory cache
-        self.cache[cache_key] = cached_data
-        
+        with self._lock:
+            self._remember(cache_key, cached_data)
+
         # Save to persistent cache if enabled
-        if self.cache_dir:
-            self._save_to_disk(cache_key, cached_data)
-    
+        if self._conn is not None:
+            blob = zlib.compress(json.dumps(cached_data, ensure_ascii=False).encode('utf-8'), 6)
+            now = time.time()
+            self._execute(
+                'INSERT OR REPLACE INTO entries (cache_key, payload, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (cache_key, blob, len(blob), cached_data['timestamp'], now)
+            )
+            self._enforce_disk_budget()
+
     def has_cache(self, cache_key: str) -> bool:
         """
         Check if cache exists for given key.
-        
+
         Args:
             cache_key: Cache key
-            
+
         Returns:
             True if cache exists and not expired
         """
         return self.get_cache(cache_key) is not None
-    
+
     def clear_cache(self, cache_key: Optional[str] = None) -> None:
         """
         Clear cache.
-        
+
         Args:
             cache_key: Specific key to clear (None = clear all)
         """
+        with self._lock:
+            if cache_key:
+                # Clear specific cache
+                self._forget(cache_key)
+            else:
+                # Clear all cache
+                self.cache.clear()
+                self._memory_bytes = 0
+
         if cache_key:
-            # Clear specific cache
-            if cache_key in self.cache:
-                del self.cache[cache_key]
-            
-            if self.cache_dir:
-                cache_file = self._get_cache_file_path(cache_key)
-                if cache_file.exists():
-                    cache_file.unlink()
+            self._execute('DELETE FROM entries WHERE cache_key = ?', (cache_key,))
         else:
-            # Clear all cache
-            self.cache.clear()
-            
-            if self.cache_dir:
-                for cache_file in Path(self.cache_dir).glob('*.json'):
-                    cache_file.unlink()
-    
+            self._execute('DELETE FROM entries')
+
     def cleanup_expired(self) -> int:
         """
         Remove expired cache entries.
-        
+
         Returns:
             Number of entries removed
         """
         removed_count = 0
-        
+
         # Clean memory cache
-        expired_keys = [
-            key for key, data in self.cache.items()
-            if self._is_expired(data)
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
-            removed_count += 1
-        
+        with self._lock:
+            expired_keys = [
+                key for key, (data, _) in self.cache.items()
+                if self._is_expired(data)
+            ]
+            for key in expired_keys:
+                self._forget(key)
+                removed_count += 1
+
         # Clean persistent cache
-        if self.cache_dir:
-            for cache_file in Path(self.cache_dir).glob('*.json'):
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    if self._is_expired(data):
-                        cache_file.unlink()
-                        removed_count += 1
-                except Exception:
-                    # Remove corrupted cache files
-                    cache_file.unlink()
-                    removed_count += 1
-        
+        if self._conn is not None:
+            cutoff = time.time() - self.max_age_seconds
+            try:
+                with self._lock:
+                    removed_count += self._conn.execute(
+                        'DELETE FROM entries WHERE stored_at < ?', (cutoff,)
+                    ).rowcount
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Drawing cache cleanup failed: {e}")
+
         return removed_count
-    
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and tier sizes."""
+        with self._lock:
+            result = dict(self._stats)
+            result['memory_entries'] = len(self.cache)
+            result['memory_bytes'] = self._memory_bytes
+
+        lookups = result['memory_hits'] + result['disk_hits'] + result['misses']
+        result['hit_rate'] = (result['memory_hits'] + result['disk_hits']) / lookups if lookups else 0.0
+        result['disk_enabled'] = self._conn is not None
+
+        if self._conn is not None:
+            row = self._execute_fetchone('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries')
+            if row is not None:
+                result['disk_entries'] = row[0]
+                result['disk_bytes'] = row[1]
+
+        return result
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _open_db(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        conn = sqlite3.connect(os.path.join(self.cache_dir, CACHE_DB_FILENAME), timeout=10,
+                               check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'cache_key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, '
+            'stored_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)')
+        conn.commit()
+        self._conn = conn
+
     def _is_expired(self, cached_data: Dict) -> bool:
         """Check if cached data is expired."""
         timestamp = cached_data.get('timestamp', 0)
         age = time.time() - timestamp
         return age > self.max_age_seconds
-    
-    def _get_cache_file_path(self, cache_key: str) -> Path:
-        """Get file path for cache key."""
-        # Sanitize cache key for filename
-        safe_key = cache_key.replace('/', '_').replace('\\', '_')
-        return Path(self.cache_dir) / f"{safe_key}.json"
-    
-    def _load_from_disk(self, cache_key: str) -> Optional[Dict]:
-        """Load cache from disk."""
-        cache_file = self._get_cache_file_path(cache_key)
-        
-        if not cache_file.exists():
-            return None
-        
+
+    def _remember(self, cache_key: str, cached_data: Dict) -> None:
+        """Insert into the memory LRU, evicting down to the byte budget (caller holds the lock)."""
+        size = len(json.dumps(cached_data, ensure_ascii=False).encode('utf-8'))
+        self._forget(cache_key)
+        if size > self.max_memory_bytes:
+            return
+        self.cache[cache_key] = (cached_data, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self.cache.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._stats['evictions'] += 1
+
+    def _forget(self, cache_key: str) -> None:
+        """Remove from the memory tier (caller holds the lock)."""
+        entry = self.cache.pop(cache_key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        if self._conn is None:
+            return
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"[WARNING] Failed to load cache from {cache_file}: {e}")
+            with self._lock:
+                self._conn.execute(sql, params)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Drawing cache write failed: {e}")
+
+    def _execute_fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        if self._conn is None:
             return None
-    
-    def _save_to_disk(self, cache_key: str, data: Dict) -> None:
-        """Save cache to disk."""
-        cache_file = self._get_cache_file_path(cache_key)
-        
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[WARNING] Failed to save cache to {cache_file}: {e}")
-    
-    def _load_persistent_cache(self) -> None:
-        """Load all persistent cache into memory on startup."""
-        if not self.cache_dir:
-            return
-        
-        cache_dir_path = Path(self.cache_dir)
-        if not cache_dir_path.exists():
+            with self._lock:
+                return self._conn.execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Drawing cache read failed: {e}")
+            return None
+
+    def _enforce_disk_budget(self) -> None:
+        """Evict least recently used disk entries until under the size budget."""
+        if self._conn is None:
             return
-        
-        for cache_file in cache_dir_path.glob('*.json'):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Skip expired cache
-                if self._is_expired(data):
-                    cache_file.unlink()
-                    continue
-                
-                # Extract cache key from filename
-                cache_key = cache_file.stem
-                self.cache[cache_key] = data
-                
-            except Exception as e:
-                print(f"[WARNING] Failed to load cache file {cache_file}: {e}")
-                # Remove corrupted file
-                try:
-                    cache_file.unlink()
-                except Exception:
-                    pass
+        try:
+            with self._lock:
+                total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+                if total <= self.max_disk_bytes:
+                    return
+
+                # Evict down to 90% of the budget to avoid evicting on every insert
+                target = self.max_disk_bytes * 0.9
+                candidates = self._conn.execute(
+                    'SELECT cache_key, size FROM entries ORDER BY accessed_at ASC'
+                ).fetchall()
+                for cache_key, size in candidates:
+                    if total <= target:
+                        break
+                    self._conn.execute('DELETE FROM entries WHERE cache_key = ?', (cache_key,))
+                    total -= size
+                    self._stats['evictions'] += 1
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Drawing cache eviction failed: {e}")
@@ -0,0 +1,227 @@
+"""
+Excel解析结果快照
+
+上传的工作表解析一次后按列写入单个快照文件：每列为偏移量数组加UTF-8数据块，
+另有一个空值标记数组；列信息、智能列识别结果和文件信息保存在文件头（JSON）中。
+文件头同时记录源文件的大小和修改时间，源文件变化后快照作废。
+
+读取时通过mmap映射文件，只解析文件头；分页只解码所请求的行，搜索只解码
+被搜索的一列，不需要重新读取工作表；专利号搜索索引随打开的快照缓存。
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional
+
+from backend.utils.patent_search_index import PatentNumberIndex
+
+MAGIC = b'XLSNAP01'
+FORMAT_VERSION = 1
+_HEADER_LENGTH = struct.Struct('<Q')
+_ALIGNMENT = 8
+
+# 每列的区域后缀 -> array类型码
+_REGION_TYPES = {
+    'offsets': 'Q',
+    'nulls': 'B',
+    'data': 'B',
+}
+
+
+def source_signature(file_path: str, header_row: int) -> Dict[str, Any]:
+    """源文件标识：文件内容或标题行变化后快照作废"""
+    stat = os.stat(file_path)
+    return {
+        'file_path': os.path.abspath(file_path),
+        'file_size': stat.st_size,
+        'file_mtime': stat.st_mtime_ns,
+        'header_row': header_row,
+    }
+
+
+def save_workbook_snapshot(path: str, signature: Dict[str, Any], meta: Dict[str, Any],
+                           column_names: List[Any], column_values: List[List[Optional[str]]]) -> None:
+    """
+    写入快照文件（先写临时文件再替换，读者不会看到半个文件）
+
+    Args:
+        path: 快照文件路径
+        signature: 源文件标识（见source_signature）
+        meta: 列信息、智能列识别结果等随快照保存的JSON数据
+        column_names: 列名（按列顺序）
+        column_values: 每列的单元格值（已转为字符串，空值为None）
+    """
+    total_rows = len(column_values[0]) if column_values else 0
+    buffers = {}
+    for j, values in enumerate(column_values):
+        offsets = array('Q', [0])
+        nulls = array('B')
+        parts = []
+        for value in values:
+            encoded = b'' if value is None else value.encode('utf-8')
+            parts.append(encoded)
+            nulls.append(value is None)
+            offsets.append(offsets[-1] + len(encoded))
+        buffers[f'c{j}_offsets'] = offsets.tobytes()
+        buffers[f'c{j}_nulls'] = nulls.tobytes()
+        buffers[f'c{j}_data'] = b''.join(parts)
+
+    layout = {}
+    offset = 0
+    for name, data in buffers.items():
+        layout[name] = [offset, len(data)]
+        offset = _align(offset + len(data))
+
+    header = {
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'signature': signature,
+        'total_rows': total_rows,
+        'column_names': column_names,
+        'meta': meta,
+        'regions': layout,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    data_start = _align(len(MAGIC) + _HEADER_LENGTH.size + len(header_bytes))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in buffers.items():
+            f.write(b'\0' * (data_start + layout[name][0] - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+class WorkbookSnapshot:
+    """
+    只读打开的快照文件
+
+    rows()返回的行与parse_excel_file的data项格式相同：
+    {'row_index': Excel行号, 'data': {列名: 值或None}}
+    """
+
+    def __init__(self, path: str):
+        """
+        打开快照文件
+
+        Args:
+            path: 快照文件路径
+
+        Raises:
+            ValueError: 文件格式不正确
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"不是Excel快照文件: {path}")
+            header_start = len(MAGIC) + _HEADER_LENGTH.size
+            (header_length,) = _HEADER_LENGTH.unpack_from(self._mmap, len(MAGIC))
+            header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+            if header.get('version') != FORMAT_VERSION or header.get('byteorder') != sys.byteorder:
+                raise ValueError(f"不支持的快照文件版本或字节序: {path}")
+        except Exception:
+            self._mmap.close()
+            raise
+
+        data_start = _align(header_start + header_length)
+        self._view = memoryview(self._mmap)
+        self._regions = {
+            name: self._view[data_start + offset:data_start + offset + length].cast(_REGION_TYPES[name.split('_')[-1]])
+            for name, (offset, length) in header['regions'].items()
+        }
+        self.signature = header['signature']
+        self.total_rows = header['total_rows']
+        self.column_names = header['column_names']
+        self.meta = header['meta']
+        self.header_row = self.signature['header_row']
+        self._column_positions = {name: j for j, name in enumerate(self.column_names)}
+        self._decoded_columns: Dict[int, List[Optional[str]]] = {}
+        self._patent_indexes: Dict[int, PatentNumberIndex] = {}
+
+    def __len__(self) -> int:
+        return self.total_rows
+
+    def __enter__(self) -> 'WorkbookSnapshot':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_current(self, signature: Dict[str, Any]) -> bool:
+        """快照是否仍对应该源文件"""
+        return self.signature == signature
+
+    def value(self, column: int, row: int) -> Optional[str]:
+        """解码第column列第row行（从0开始）的单元格"""
+        if self._regions[f'c{column}_nulls'][row]:
+            return None
+        offsets = self._regions[f'c{column}_offsets']
+        return self._regions[f'c{column}_data'][offsets[row]:offsets[row + 1]].tobytes().decode('utf-8')
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """解码一行"""
+        return {
+            'row_index': row + self.header_row + 1,  # Excel行号（从1开始）
+            'data': {name: self.value(j, row) for j, name in enumerate(self.column_names)}
+        }
+
+    def rows(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """解码[start, stop)范围内的行"""
+        return [self.row(row) for row in range(max(0, start), min(stop, self.total_rows))]
+
+    def column_values(self, column_name: Any) -> List[Optional[str]]:
+        """
+        解码一整列（首次访问时解码并缓存）
+
+        Raises:
+            KeyError: 列不存在
+        """
+        j = self._column_positions[column_name]
+        values = self._decoded_columns.get(j)
+        if values is None:
+            nulls = self._regions[f'c{j}_nulls']
+            offsets = self._regions[f'c{j}_offsets']
+            data = self._regions[f'c{j}_data'].tobytes()
+            values = [
+                None if nulls[row] else data[offsets[row]:offsets[row + 1]].decode('utf-8')
+                for row in range(self.total_rows)
+            ]
+            self._decoded_columns[j] = values
+        return values
+
+    def patent_index(self, column_name: Any) -> PatentNumberIndex:
+        """
+        一列的专利号搜索索引（首次访问时建立并缓存）
+
+        Raises:
+            KeyError: 列不存在
+        """
+        j = self._column_positions[column_name]
+        index = self._patent_indexes.get(j)
+        if index is None:
+            index = PatentNumberIndex(self.column_values(column_name))
+            self._patent_indexes[j] = index
+        return index
+
+    def close(self) -> None:
+        """释放映射（之后不能再读取数据）"""
+        for region in self._regions.values():
+            region.release()
+        self._regions = {}
+        self._view.release()
+        self._mmap.close()
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
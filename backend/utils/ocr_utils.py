@@ -11,13 +11,20 @@ This module provides helper functions for OCR processing, including:
 """
 
 import re
+import time
 import logging
-from typing import List, Dict, Tuple, Optional
+import threading
+import multiprocessing
+import multiprocessing.connection
+from collections import deque
+from typing import List, Dict, Tuple, Optional, Union
 from io import BytesIO
 import numpy as np
 import cv2
 from PIL import Image
 
+from backend.config import OCR_WORKERS, OCR_WORKER_MEMORY_MB
+
 try:
     import psutil
     PSUTIL_AVAILABLE = True
@@ -31,6 +38,23 @@ logger = logging.getLogger(__name__)
 # Global OCR engine instance (singleton pattern)
 _ocr_engine = None
 
+# Seconds to wait for a new OCR worker to load its models
+OCR_WORKER_START_TIMEOUT = 120
+# Seconds between checks for a free worker while all are busy with other requests
+OCR_WORKER_POLL_INTERVAL = 0.1
+
+# Adaptive OCR: the enhanced (CLAHE) pass runs over the whole page only when
+# the original pass finds fewer confident markers than this; otherwise only
+# regions around low-confidence detections are re-recognized.
+ADAPTIVE_MIN_MARKERS = 3
+# Detections below this confidence are re-recognized (matches the drawing
+# marker endpoints' confidence filter)
+ADAPTIVE_LOW_CONFIDENCE = 80.0
+# Padding (pixels) around a low-confidence detection when cropping
+ADAPTIVE_CROP_PADDING = 24
+# With more low-confidence regions than this, one full-page pass is cheaper
+ADAPTIVE_MAX_CROPS = 40
+
 
 def initialize_ocr_engine():
     """
@@ -208,6 +232,23 @@ def preprocess_image_for_ocr(image: np.ndarray) -> List[np.ndarray]:
     processed_images.append(image.copy())
 
     # 2. 灰度化 + 对比度增强（CLAHE）- 效果最好的预处理
+    enhanced = enhance_image_for_ocr(image)
+    if enhanced is not None:
+        processed_images.append(enhanced)
+
+    return processed_images
+
+
+def enhance_image_for_ocr(image: np.ndarray) -> Optional[np.ndarray]:
+    """
+    灰度化 + 对比度增强（CLAHE）
+
+    Args:
+        image: 输入图像（BGR或灰度）
+
+    Returns:
+        Optional[np.ndarray]: 增强后的图像（BGR格式），失败时返回None
+    """
     try:
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
@@ -217,12 +258,139 @@ def preprocess_image_for_ocr(image: np.ndarray) -> List[np.ndarray]:
         # CLAHE (Contrast Limited Adaptive Histogram Equalization)
         clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
         enhanced = clahe.apply(gray)
-        processed_images.append(cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR))
+        return cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR)
 
     except Exception as e:
         logger.warning(f"Image preprocessing failed: {str(e)}, using original image only")
+        return None
 
-    return processed_images
+
+def select_low_confidence_regions(
+    detections: List[Dict],
+    image_shape: Tuple[int, ...],
+    min_confidence: float = ADAPTIVE_LOW_CONFIDENCE,
+    padding: int = ADAPTIVE_CROP_PADDING
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Get the image regions around low-confidence detections.
+
+    Only short texts (possible markers) are considered. Each region is the
+    detection's bounding box plus padding, clipped to the image; overlapping
+    regions are merged so every pixel is recognized at most once.
+
+    Args:
+        detections: Detections in unified format (see transform_rapidocr_result)
+        image_shape: Shape of the page image (height, width[, channels])
+        min_confidence: Detections below this confidence are selected
+        padding: Padding around each bounding box in pixels
+
+    Returns:
+        List[Tuple[int, int, int, int]]: Regions as (x0, y0, x1, y1)
+    """
+    height, width = image_shape[:2]
+    regions = []
+
+    for detection in detections:
+        if detection['confidence'] >= min_confidence or len(detection['number'].strip()) > 8:
+            continue
+        half_w = detection['width'] / 2 + padding
+        half_h = detection['height'] / 2 + padding
+        x0 = max(0, int(detection['x'] - half_w))
+        y0 = max(0, int(detection['y'] - half_h))
+        x1 = min(width, int(detection['x'] + half_w) + 1)
+        y1 = min(height, int(detection['y'] + half_h) + 1)
+        if x1 > x0 and y1 > y0:
+            regions.append((x0, y0, x1, y1))
+
+    # Merge overlapping regions until none overlap
+    merged = True
+    while merged:
+        merged = False
+        result = []
+        for region in sorted(regions):
+            for i, other in enumerate(result):
+                if region[0] < other[2] and other[0] < region[2] and region[1] < other[3] and other[1] < region[3]:
+                    result[i] = (min(region[0], other[0]), min(region[1], other[1]),
+                                 max(region[2], other[2]), max(region[3], other[3]))
+                    merged = True
+                    break
+            else:
+                result.append(region)
+        regions = result
+
+    return regions
+
+
+def _run_ocr_pass(ocr_engine, image: np.ndarray, label: str) -> List[Dict]:
+    """
+    Run the OCR engine on one image and transform its results.
+
+    Returns:
+        List[Dict]: Detections in unified format (empty if the pass failed)
+    """
+    try:
+        result, elapse = ocr_engine(image)
+
+        # Handle elapse time
+        if elapse is not None:
+            if isinstance(elapse, (list, tuple)):
+                total_time = sum(elapse) if elapse else 0
+                logger.info(f"OCR {label} completed in {total_time:.2f}s")
+            else:
+                logger.info(f"OCR {label} completed in {elapse:.2f}s")
+
+        if result and len(result) > 0:
+            transformed = transform_rapidocr_result(result)
+            logger.info(f"OCR {label} detected {len(transformed)} items")
+            return transformed
+
+    except Exception as e:
+        logger.warning(f"OCR {label} failed: {str(e)}")
+
+    return []
+
+
+def _adaptive_ocr_passes(ocr_engine, image: np.ndarray) -> List[Dict]:
+    """
+    Recognize a page with the original image first, enhancing only where needed.
+
+    - Few confident markers on the original pass: run the enhanced pass over
+      the whole page (faint or low-contrast drawings)
+    - Otherwise: run the enhanced pass only on crops around low-confidence
+      detections, mapped back to page coordinates
+
+    Returns:
+        List[Dict]: Detections of all passes (not yet filtered/deduplicated)
+    """
+    all_results = _run_ocr_pass(ocr_engine, image, 'original')
+
+    # filter_alphanumeric_markers normalizes texts in place, so filter copies
+    markers = filter_alphanumeric_markers([dict(r) for r in all_results])
+    confident_count = sum(1 for m in markers if m['confidence'] >= ADAPTIVE_LOW_CONFIDENCE)
+    regions = select_low_confidence_regions(all_results, image.shape)
+
+    if confident_count >= ADAPTIVE_MIN_MARKERS and not regions:
+        logger.info(f"Adaptive OCR: {confident_count} confident markers, enhanced pass skipped")
+        return all_results
+
+    enhanced = enhance_image_for_ocr(image)
+    if enhanced is None:
+        return all_results
+
+    if confident_count < ADAPTIVE_MIN_MARKERS or len(regions) > ADAPTIVE_MAX_CROPS:
+        logger.info(f"Adaptive OCR: {confident_count} confident markers, {len(regions)} regions, "
+                    f"running enhanced pass on full page")
+        all_results.extend(_run_ocr_pass(ocr_engine, enhanced, 'enhanced'))
+        return all_results
+
+    logger.info(f"Adaptive OCR: re-recognizing {len(regions)} low-confidence regions")
+    for x0, y0, x1, y1 in regions:
+        for detection in _run_ocr_pass(ocr_engine, enhanced[y0:y1, x0:x1], f'crop ({x0},{y0})'):
+            detection['x'] += x0
+            detection['y'] += y0
+            all_results.append(detection)
+
+    return all_results
 
 
 def filter_alphanumeric_markers(ocr_results: List[Dict]) -> List[Dict]:
@@ -287,11 +455,94 @@ def filter_alphanumeric_markers(ocr_results: List[Dict]) -> List[Dict]:
     return filtered
 
 
+def recognize_image(image_data: bytes, adaptive: bool = True) -> List[Dict]:
+    """
+    Recognize the markers in one image in the current thread.
+    
+    Args:
+        image_data: Raw image bytes (PNG, JPEG, etc.)
+        adaptive: Run the contrast-enhanced pass only where the original pass
+            is not confident (see _adaptive_ocr_passes); False always runs
+            both passes over the whole page
+        
+    Returns:
+        List[Dict]: Detected markers (see perform_ocr)
+    
+    Raises:
+        RuntimeError: If RapidOCR initialization fails
+        ValueError: If image_data is invalid
+    """
+    # Check memory availability before processing
+    check_memory_available(required_mb=OCR_WORKER_MEMORY_MB)
+    
+    # Initialize OCR engine (singleton)
+    logger.info("Initializing RapidOCR engine...")
+    ocr_engine = initialize_ocr_engine()
+    logger.info("RapidOCR engine ready")
+    
+    # Convert image bytes to numpy array using Pillow (more reliable for various formats)
+    try:
+        # Use Pillow to decode image (supports more formats than OpenCV)
+        pil_image = Image.open(BytesIO(image_data))
+        
+        # Convert to RGB if needed (handle RGBA, grayscale, etc.)
+        if pil_image.mode not in ('RGB', 'L'):
+            pil_image = pil_image.convert('RGB')
+        
+        # Convert PIL Image to numpy array for OpenCV
+        image = np.array(pil_image)
+        
+        # Convert RGB to BGR for OpenCV (if color image)
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        
+        if image is None or image.size == 0:
+            raise ValueError("Failed to decode image data")
+            
+    except Exception as e:
+        logger.error(f"Failed to decode image: {str(e)}")
+        raise ValueError(f"Invalid image data: {str(e)}")
+    
+    img_shape = image.shape
+    if adaptive:
+        logger.info(f"Starting adaptive OCR on image of size {img_shape[0]}x{img_shape[1]}")
+        all_results = _adaptive_ocr_passes(ocr_engine, image)
+    else:
+        # 多尺度预处理：生成多个候选图像
+        logger.info(f"Starting multi-scale OCR on image of size {img_shape[0]}x{img_shape[1]}")
+        
+        processed_images = preprocess_image_for_ocr(image)
+        logger.info(f"Generated {len(processed_images)} preprocessed variants")
+        
+        # 对每个预处理图像进行OCR，合并结果
+        all_results = []
+        for idx, proc_img in enumerate(processed_images):
+            all_results.extend(_run_ocr_pass(ocr_engine, proc_img, f'variant {idx+1}'))
+    
+    if not all_results:
+        logger.info("No text detected in any image variant")
+        return []
+    
+    # 合并和去重所有结果
+    logger.info(f"Total detections before deduplication: {len(all_results)}")
+    
+    # Filter to only include alphanumeric markers
+    filtered_results = filter_alphanumeric_markers(all_results)
+    
+    # 去重（位置相近的保留置信度最高的）
+    deduplicated_results = deduplicate_results(filtered_results, position_threshold=30)
+    
+    logger.info(f"OCR completed: {len(deduplicated_results)} unique markers detected")
+    
+    return deduplicated_results
+
+
 def perform_ocr(
     image_data: bytes,
     use_angle_cls: bool = True,
     use_text_score: bool = True,
-    timeout_seconds: int = 60
+    timeout_seconds: int = 60,
+    adaptive: bool = True
 ) -> List[Dict]:
     """
     Perform OCR on image data using RapidOCR.
@@ -301,11 +552,17 @@ def perform_ocr(
     - Alphanumeric markers (numbers, letters, combinations)
     - Consistent marker height with guide lines
     
+    Runs in the shared OCR worker pool (see perform_ocr_batch), so a
+    recognition that exceeds the timeout is actually stopped.
+    
     Args:
         image_data: Raw image bytes (PNG, JPEG, etc.)
         use_angle_cls: Whether to use angle classification for rotated text
         use_text_score: Whether to return confidence scores
         timeout_seconds: Maximum processing time in seconds (default: 60)
+        adaptive: Run the contrast-enhanced pass only where the original pass
+            is not confident (see _adaptive_ocr_passes); False always runs
+            both passes over the whole page
         
     Returns:
         List[Dict]: Detected text regions with format:
@@ -326,7 +583,19 @@ def perform_ocr(
         ValueError: If image_data is invalid
         TimeoutError: If processing exceeds timeout_seconds
     """
-    import time
+    result = perform_ocr_batch([image_data], timeout_seconds=timeout_seconds, adaptive=adaptive)[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _perform_ocr_in_thread(image_data: bytes, timeout_seconds: int = 60, adaptive: bool = True) -> List[Dict]:
+    """
+    Recognize one image in a daemon thread of this process.
+    
+    Used when the OCR worker pool is disabled or unavailable. A thread cannot
+    be stopped, so on timeout it keeps running in the background.
+    """
     from threading import Thread
     
     result_container = {'result': None, 'error': None}
@@ -334,87 +603,7 @@ def perform_ocr(
     def ocr_worker():
         """Worker function to run OCR in a separate thread."""
         try:
-            # Check memory availability before processing
-            check_memory_available(required_mb=500)
-            
-            # Initialize OCR engine (singleton)
-            logger.info("Initializing RapidOCR engine...")
-            ocr_engine = initialize_ocr_engine()
-            logger.info("RapidOCR engine ready")
-            
-            # Convert image bytes to numpy array using Pillow (more reliable for various formats)
-            try:
-                # Use Pillow to decode image (supports more formats than OpenCV)
-                pil_image = Image.open(BytesIO(image_data))
-                
-                # Convert to RGB if needed (handle RGBA, grayscale, etc.)
-                if pil_image.mode not in ('RGB', 'L'):
-                    pil_image = pil_image.convert('RGB')
-                
-                # Convert PIL Image to numpy array for OpenCV
-                image = np.array(pil_image)
-                
-                # Convert RGB to BGR for OpenCV (if color image)
-                if len(image.shape) == 3 and image.shape[2] == 3:
-                    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-                
-                if image is None or image.size == 0:
-                    raise ValueError("Failed to decode image data")
-                    
-            except Exception as e:
-                logger.error(f"Failed to decode image: {str(e)}")
-                raise ValueError(f"Invalid image data: {str(e)}")
-            
-            # 多尺度预处理：生成多个候选图像
-            img_shape = image.shape
-            logger.info(f"Starting multi-scale OCR on image of size {img_shape[0]}x{img_shape[1]}")
-            
-            processed_images = preprocess_image_for_ocr(image)
-            logger.info(f"Generated {len(processed_images)} preprocessed variants")
-            
-            # 对每个预处理图像进行OCR，合并结果
-            all_results = []
-            
-            for idx, proc_img in enumerate(processed_images):
-                try:
-                    result, elapse = ocr_engine(proc_img)
-                    
-                    # Handle elapse time
-                    if elapse is not None:
-                        if isinstance(elapse, (list, tuple)):
-                            total_time = sum(elapse) if elapse else 0
-                            logger.info(f"OCR variant {idx+1} completed in {total_time:.2f}s")
-                        else:
-                            logger.info(f"OCR variant {idx+1} completed in {elapse:.2f}s")
-                    
-                    if result and len(result) > 0:
-                        # Transform and add to results
-                        transformed = transform_rapidocr_result(result)
-                        all_results.extend(transformed)
-                        logger.info(f"Variant {idx+1} detected {len(transformed)} items")
-                        
-                except Exception as e:
-                    logger.warning(f"OCR variant {idx+1} failed: {str(e)}")
-                    continue
-            
-            if not all_results:
-                logger.info("No text detected in any image variant")
-                result_container['result'] = []
-                return
-            
-            # 合并和去重所有结果
-            logger.info(f"Total detections before deduplication: {len(all_results)}")
-            
-            # Filter to only include alphanumeric markers
-            filtered_results = filter_alphanumeric_markers(all_results)
-            
-            # 去重（位置相近的保留置信度最高的）
-            deduplicated_results = deduplicate_results(filtered_results, position_threshold=30)
-            
-            logger.info(f"OCR completed: {len(deduplicated_results)} unique markers detected")
-            
-            result_container['result'] = deduplicated_results
-            
+            result_container['result'] = recognize_image(image_data, adaptive)
         except Exception as e:
             result_container['error'] = e
     
@@ -442,10 +631,308 @@ def perform_ocr(
     return result_container['result']
 
 
+def _init_ocr_worker() -> None:
+    """OCR worker process initializer: load the RapidOCR models once per worker."""
+    try:
+        initialize_ocr_engine()
+    except RuntimeError as e:
+        # Reported by each recognition instead of breaking the worker
+        logger.error(f"OCR worker initialization failed: {str(e)}")
+
+
+def _recognize_in_worker(job: Tuple[bytes, bool]) -> List[Dict]:
+    """Recognize one image in an OCR worker process."""
+    image_data, adaptive = job
+    return recognize_image(image_data, adaptive)
+
+
+def _ocr_worker_main(conn) -> None:
+    """
+    OCR worker process main loop.
+    
+    Reports ready once the engine is loaded, then answers each (task, job)
+    message with ('ok', result) or ('error', exception) until the pipe closes.
+    """
+    _init_ocr_worker()
+    conn.send(('ready', None))
+    while True:
+        try:
+            task, job = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = ('ok', task(job))
+        except Exception as e:
+            reply = ('error', e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Result or exception could not be pickled
+            conn.send(('error', RuntimeError(f"OCR processing error: {str(e)}")))
+
+
+class _OcrWorker:
+    """One OCR worker process and the pipe to it."""
+    
+    def __init__(self):
+        # spawn: the web server has other threads, do not fork their locks
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_ocr_worker_main, args=(child_conn,),
+                                       name='ocr-worker', daemon=True)
+        self.process.start()
+        child_conn.close()
+        # Wait for the models to load, so a job's timeout only covers its recognition
+        try:
+            ready = self.conn.poll(OCR_WORKER_START_TIMEOUT) and self.conn.recv()[0] == 'ready'
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.kill()
+            raise RuntimeError("OCR worker failed to start")
+    
+    def kill(self) -> None:
+        """Stop the worker process, interrupting whatever it is running."""
+        try:
+            self.process.kill()
+            self.process.join(timeout=5)
+        except Exception:
+            pass
+        self.conn.close()
+
+
+class _OcrWorkerPool:
+    """
+    OCR worker processes shared by all requests of this server process.
+    
+    A worker runs one job at a time for the batch that acquired it. At most
+    OCR_WORKERS workers exist; they are started on demand and a worker that
+    is killed (timeout) or dies is replaced by the next acquire.
+    """
+    
+    def __init__(self):
+        self._idle: List[_OcrWorker] = []
+        self._size = 0  # idle + acquired + starting workers
+        self._condition = threading.Condition()
+    
+    def acquire(self, block: bool = True) -> Optional[_OcrWorker]:
+        """
+        Get an idle worker, starting one if below OCR_WORKERS.
+        
+        Args:
+            block: Wait for a worker released by another batch
+            
+        Returns:
+            _OcrWorker, or None if none is free and block is False
+            
+        Raises:
+            OSError, RuntimeError: If a new worker cannot be started
+        """
+        with self._condition:
+            while True:
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.process.is_alive():
+                        return worker
+                    # Died while idle (e.g. killed for memory)
+                    self._size -= 1
+                    worker.kill()
+                if self._size < OCR_WORKERS:
+                    self._size += 1
+                    break
+                if not block:
+                    return None
+                self._condition.wait()
+        try:
+            return _OcrWorker()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+    
+    def release(self, worker: _OcrWorker) -> None:
+        """Return a worker that finished its job."""
+        with self._condition:
+            self._idle.append(worker)
+            self._condition.notify()
+    
+    def discard(self, worker: _OcrWorker) -> None:
+        """Kill an acquired worker (timed out or crashed); its slot is freed."""
+        worker.kill()
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+    
+    def close(self) -> None:
+        """Stop the idle workers (workers running a job are discarded by their batch)."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for worker in idle:
+            worker.kill()
+
+
+# Shared OCR workers (each worker process holds its own engine)
+_ocr_pool = _OcrWorkerPool()
+
+
+def get_ocr_concurrency(max_workers: Optional[int] = None) -> int:
+    """
+    Number of images to recognize at the same time.
+    
+    Bounded by the worker pool size and by the memory currently available
+    (OCR_WORKER_MEMORY_MB per running recognition, see check_memory_available).
+    
+    Args:
+        max_workers: Upper bound (default: OCR_WORKERS)
+        
+    Returns:
+        int: At least 1
+    """
+    limit = max(1, min(max_workers or OCR_WORKERS, OCR_WORKERS))
+    if PSUTIL_AVAILABLE:
+        try:
+            available_mb = psutil.virtual_memory().available / (1024 * 1024)
+            limit = min(limit, int(available_mb // OCR_WORKER_MEMORY_MB))
+        except Exception as e:
+            logger.warning(f"Memory check failed: {str(e)}")
+    return max(1, limit)
+
+
+def perform_ocr_batch(
+    images: List[bytes],
+    timeout_seconds: int = 60,
+    adaptive: bool = True,
+    max_workers: Optional[int] = None
+) -> List[Union[List[Dict], Exception]]:
+    """
+    Recognize several images concurrently in the shared OCR worker pool.
+    
+    Each worker process holds its own initialized RapidOCR engine. At most
+    get_ocr_concurrency() images run at once; each gets timeout_seconds from
+    when a worker starts it, and a timed-out recognition is stopped by killing
+    only its worker (replaced for later images). Without workers (OCR_WORKERS=0,
+    or they cannot start) images are recognized one at a time in this process.
+    
+    Args:
+        images: Raw image bytes per drawing
+        timeout_seconds: Maximum processing time per image in seconds
+        adaptive: See perform_ocr
+        max_workers: Upper bound on concurrency (default: OCR_WORKERS)
+        
+    Returns:
+        List: For each image in order, its detected markers (see perform_ocr)
+            or the exception it failed with (TimeoutError, ValueError, RuntimeError)
+    """
+    jobs = [(image_data, adaptive) for image_data in images]
+    results: List[Union[List[Dict], Exception, None]] = [None] * len(jobs)
+    
+    if OCR_WORKERS > 0 and jobs:
+        remaining = _run_in_ocr_pool(_recognize_in_worker, jobs, results,
+                                     get_ocr_concurrency(max_workers), timeout_seconds)
+    else:
+        remaining = list(range(len(jobs)))
+    
+    for index in remaining:
+        try:
+            results[index] = _perform_ocr_in_thread(images[index], timeout_seconds, adaptive)
+        except Exception as e:
+            results[index] = e
+    
+    return results
+
+
+def _run_in_ocr_pool(task, jobs: List, results: List, limit: int, timeout_seconds: float) -> List[int]:
+    """
+    Run task(job) for every job on the shared OCR workers, at most `limit` at a time.
+    
+    Each job's timeout starts when a worker receives it, so waiting for a
+    worker held by another request does not count. A timed-out job is stopped
+    by killing only the worker running it; other jobs are not affected.
+    Results (or exceptions) are stored in `results` by job index.
+    
+    Returns:
+        List[int]: Indexes of jobs that could not run on a worker (workers unavailable)
+    """
+    queue = deque(range(len(jobs)))
+    running = {}  # worker connection -> (worker, job index, deadline)
+    unavailable = False
+    
+    try:
+        while running or (queue and not unavailable):
+            while queue and not unavailable and len(running) < limit:
+                try:
+                    # Block only when nothing of this batch is running
+                    worker = _ocr_pool.acquire(block=not running)
+                except (OSError, RuntimeError) as e:
+                    logger.warning(f"OCR workers unavailable, recognizing in-process: {str(e)}")
+                    unavailable = True
+                    break
+                if worker is None:
+                    break
+                index = queue.popleft()
+                try:
+                    worker.conn.send((task, jobs[index]))
+                except OSError as e:
+                    logger.error(f"OCR worker crashed: {str(e)}")
+                    results[index] = RuntimeError(f"OCR processing error: {str(e)}")
+                    _ocr_pool.discard(worker)
+                    continue
+                except Exception as e:
+                    # Job could not be pickled; the worker did not receive it
+                    results[index] = e
+                    _ocr_pool.release(worker)
+                    continue
+                running[worker.conn] = (worker, index, time.monotonic() + timeout_seconds)
+            
+            if not running:
+                continue
+            
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            wait_seconds = max(0.0, next_deadline - time.monotonic())
+            if queue and not unavailable and len(running) < limit:
+                # Workers are busy with other requests: check again shortly
+                wait_seconds = min(wait_seconds, OCR_WORKER_POLL_INTERVAL)
+            
+            for conn in multiprocessing.connection.wait(list(running), timeout=wait_seconds):
+                worker, index, _ = running.pop(conn)
+                try:
+                    _, value = conn.recv()
+                except (EOFError, OSError):
+                    # The worker died (e.g. killed for memory): report this image only
+                    logger.error(f"OCR worker crashed: exit code {worker.process.exitcode}")
+                    results[index] = RuntimeError("OCR processing error: OCR worker exited unexpectedly")
+                    _ocr_pool.discard(worker)
+                    continue
+                results[index] = value
+                _ocr_pool.release(worker)
+            
+            now = time.monotonic()
+            expired = [conn for conn, (_, _, deadline) in running.items()
+                       if deadline <= now and not conn.poll()]
+            for conn in expired:
+                worker, index, _ = running.pop(conn)
+                logger.error(f"OCR processing timeout after {timeout_seconds} seconds")
+                results[index] = TimeoutError(f"OCR processing exceeded {timeout_seconds} seconds timeout")
+                _ocr_pool.discard(worker)
+    finally:
+        # Interrupted: workers still running this batch's jobs cannot be reused
+        for worker, _, _ in running.values():
+            _ocr_pool.discard(worker)
+    
+    return sorted(queue)
+
+
 def deduplicate_results(results: List[Dict], position_threshold: int = 20) -> List[Dict]:
     """
     去除位置相近的重复识别结果，保留置信度最高的。
     
+    按阈值大小的网格分桶，每个结果只与相邻9个格子中相同标记的已保留结果比较
+    （距离小于阈值的两点所在格子最多相差一格）。结果与逐一比较一致：与最早保留的
+    重复项合并，置信度更高时用新结果覆盖该项（包括位置）。
+    
     Args:
         results: 原始识别结果列表，每项包含:
             - number: 识别的数字/标记
@@ -460,27 +947,46 @@ def deduplicate_results(results: List[Dict], position_threshold: int = 20) -> Li
     if not results:
         return []
     
+    if position_threshold <= 0:
+        # 距离不会小于0，没有重复项
+        return [result.copy() for result in results]
+    
+    threshold_sq = position_threshold * position_threshold
+    coords = np.array([(result['x'], result['y']) for result in results], dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        cells = np.floor(coords / position_threshold).astype(np.int64).tolist()
+    
     deduplicated = []
+    kept_cells = []  # 已保留结果所在的格子
+    buckets = {}     # (标记, 格子x, 格子y) -> 已保留结果的下标
     
-    for result in results:
-        is_duplicate = False
+    for result, (cell_x, cell_y) in zip(results, cells):
+        number = result['number']
+        x, y = result['x'], result['y']
         
-        for existing in deduplicated:
-            # 检查是否是相同数字且位置相近
-            if existing['number'] == result['number']:
-                distance = ((existing['x'] - result['x']) ** 2 + 
-                           (existing['y'] - result['y']) ** 2) ** 0.5
-                
-                if distance < position_threshold:
-                    # 是重复项，保留置信度更高的
-                    if result['confidence'] > existing['confidence']:
-                        # 替换为置信度更高的结果
-                        existing.update(result)
-                    is_duplicate = True
-                    break
+        # 相邻格子中距离小于阈值、最早保留的相同标记
+        match = None
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for index in buckets.get((number, cell_x + dx, cell_y + dy), ()):
+                    if match is not None and index > match:
+                        continue
+                    existing = deduplicated[index]
+                    if (existing['x'] - x) ** 2 + (existing['y'] - y) ** 2 < threshold_sq:
+                        match = index
         
-        if not is_duplicate:
+        if match is None:
+            buckets.setdefault((number, cell_x, cell_y), []).append(len(deduplicated))
+            kept_cells.append((cell_x, cell_y))
             deduplicated.append(result.copy())
+        elif result['confidence'] > deduplicated[match]['confidence']:
+            # 替换为置信度更高的结果，位置随之移动到新格子
+            deduplicated[match].update(result)
+            old_cell_x, old_cell_y = kept_cells[match]
+            if (old_cell_x, old_cell_y) != (cell_x, cell_y):
+                buckets[(number, old_cell_x, old_cell_y)].remove(match)
+                buckets.setdefault((number, cell_x, cell_y), []).append(match)
+                kept_cells[match] = (cell_x, cell_y)
     
     return deduplicated
 
@@ -0,0 +1,151 @@
+"""
+专利号搜索索引
+
+为上传的Excel文件中的专利号列建立内存索引，供输入即搜索的/api/excel/<file_id>/search
+使用，避免每次按键都对整列做大小写转换和子串扫描。
+
+规范化键：
+    紧凑键    小写，去掉空白和标点（"CN 1234567-A" -> "cn1234567a"）
+    号码键    紧凑键再去掉国家代码前缀和文献种类代码后缀（-> "1234567"）
+
+索引：
+    紧凑键 -> 行号            精确匹配
+    号码键 -> 行号            同一号码的不同写法或不同种类代码（国家代码都存在时须相同）
+    三元组 -> 行号（升序）     子串匹配的候选行
+
+匹配度与原搜索一致：与查询完全相同（忽略大小写和标点）为1.0，其余匹配为0.8。
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 空白、标点和下划线
+_SEPARATORS = re.compile(r'[\W_]+')
+# 国家代码（两个字母）+ 号码 + 种类代码（一个字母，可带一位数字）
+_CORE_NUMBER = re.compile(r'^([a-z]{2})?(.*?\d)(?:[a-z]\d?)?$')
+
+GRAM_SIZE = 3
+
+EXACT_MATCH_SCORE = 1.0
+PARTIAL_MATCH_SCORE = 0.8
+
+
+def compact_key(value: str) -> str:
+    """紧凑键：小写并去掉空白和标点"""
+    return _SEPARATORS.sub('', value.lower())
+
+
+def split_key(compact: str) -> Tuple[str, str]:
+    """拆分紧凑键为（国家代码, 号码键），没有国家代码时为空字符串"""
+    match = _CORE_NUMBER.match(compact)
+    if not match:
+        return '', compact
+    return match.group(1) or '', match.group(2)
+
+
+def core_key(compact: str) -> str:
+    """号码键：去掉国家代码和种类代码（不含数字时与紧凑键相同）"""
+    return split_key(compact)[1]
+
+
+class PatentNumberIndex:
+    """一列专利号的搜索索引"""
+
+    def __init__(self, values: List[Optional[str]]):
+        """
+        建立索引
+
+        Args:
+            values: 按行排列的单元格值（空值为None）
+        """
+        self.values = values
+        self._compact: List[str] = []
+        self._countries: List[str] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._core: Dict[str, List[int]] = {}
+        self._grams: Dict[str, List[int]] = {}
+
+        for row, value in enumerate(values):
+            compact = compact_key(value) if value else ''
+            self._compact.append(compact)
+            country, core = split_key(compact) if compact else ('', '')
+            self._countries.append(country)
+            if not compact:
+                continue
+            self._exact.setdefault(compact, []).append(row)
+            self._core.setdefault(core, []).append(row)
+            for gram in {compact[i:i + GRAM_SIZE] for i in range(len(compact) - GRAM_SIZE + 1)}:
+                self._grams.setdefault(gram, []).append(row)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[int, float]]:
+        """
+        搜索专利号
+
+        完全匹配的行排在前面，其余匹配（子串或同一号码）按行号顺序。
+
+        Args:
+            query: 查询字符串（可以是专利号的任意部分）
+            limit: 返回结果数量限制
+
+        Returns:
+            list: [(行号, 匹配度), ...]
+        """
+        query = query.strip().lower()
+        compact = compact_key(query)
+        if limit <= 0 or not query:
+            return []
+        if not compact:
+            # 查询只有标点：按原方式逐行匹配
+            return self._scan(query, limit)
+
+        exact_rows = self._exact.get(compact, [])[:limit]
+        results = [(row, EXACT_MATCH_SCORE) for row in exact_rows]
+        remaining = limit - len(results)
+        if remaining <= 0:
+            return results
+
+        exact = set(exact_rows)
+        wanted = remaining + len(exact)
+        partial = set(self._substring_rows(compact, wanted))
+        partial.update(self._same_number_rows(compact))
+        partial.difference_update(exact)
+        results.extend((row, PARTIAL_MATCH_SCORE) for row in sorted(partial)[:remaining])
+        return results
+
+    def _same_number_rows(self, compact: str) -> List[int]:
+        """号码键相同的行；查询和单元格都带国家代码时要求国家代码相同（不同局的同号文献是不同专利）"""
+        country, core = split_key(compact)
+        rows = self._core.get(core, [])
+        if not country:
+            return rows
+        return [row for row in rows if self._countries[row] in ('', country)]
+
+    def _substring_rows(self, compact: str, wanted: int) -> List[int]:
+        """紧凑键包含查询的前wanted行（按行号）"""
+        if len(compact) >= GRAM_SIZE:
+            # 只需检查出现次数最少的三元组所在的行
+            grams = {compact[i:i + GRAM_SIZE] for i in range(len(compact) - GRAM_SIZE + 1)}
+            candidates = min((self._grams.get(gram, []) for gram in grams), key=len)
+        else:
+            candidates = range(len(self._compact))
+
+        rows = []
+        for row in candidates:
+            if compact in self._compact[row]:
+                rows.append(row)
+                if len(rows) >= wanted:
+                    break
+        return rows
+
+    def _scan(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        results = []
+        for row, value in enumerate(self.values):
+            if value and query in value.lower():
+                results.append((row, EXACT_MATCH_SCORE if query == value.lower() else PARTIAL_MATCH_SCORE))
+                if len(results) >= limit:
+                    break
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
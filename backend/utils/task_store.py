@@ -0,0 +1,325 @@
+"""
+Shared store for background task state.
+
+Claims processing runs in a background thread of whichever gunicorn worker
+accepted the request, while status polls may land on any worker. The task
+store keeps each task's status, progress and result reference where every
+worker can see it:
+
+- SQLiteTaskStore: one WAL-mode SQLite file shared by the workers on a host
+- RedisTaskStore: any client speaking the Redis hash commands
+- MemoryTaskStore: a per-process dict (single worker, tests)
+
+A task is a flat dict of JSON-serializable fields. update() applies all
+given fields in one step, so readers never see a half-applied change, and
+every write refreshes the task's TTL.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TASK_STORE_BACKENDS = ('sqlite', 'redis', 'memory')
+
+
+class TaskStore(ABC):
+    """Interface of a task store."""
+
+    def __init__(self, ttl_seconds: float = 24 * 3600):
+        """
+        Initialize store.
+
+        Args:
+            ttl_seconds: Time after the last write at which a task expires
+        """
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def create(self, task_id: str, fields: Dict[str, Any]) -> None:
+        """Create a task, replacing any existing task with the same ID."""
+        pass
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a task's fields, or None if missing/expired."""
+        pass
+
+    @abstractmethod
+    def update(self, task_id: str, **fields: Any) -> bool:
+        """
+        Atomically set some fields of an existing task.
+
+        Returns:
+            False if the task does not exist (it is not re-created)
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, task_id: str) -> None:
+        """Remove a task."""
+        pass
+
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryTaskStore(TaskStore):
+    """Task store local to the current process."""
+
+    def __init__(self, ttl_seconds: float = 24 * 3600):
+        super().__init__(ttl_seconds)
+        self._tasks: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def create(self, task_id: str, fields: Dict[str, Any]) -> None:
+        with self._lock:
+            self._tasks[task_id] = (time.time() + self.ttl_seconds, _copy(fields))
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._tasks.get(task_id)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._tasks[task_id]
+                return None
+            return _copy(entry[1])
+
+    def update(self, task_id: str, **fields: Any) -> bool:
+        with self._lock:
+            entry = self._tasks.get(task_id)
+            if entry is None or entry[0] < time.time():
+                self._tasks.pop(task_id, None)
+                return False
+            data = dict(entry[1])
+            data.update(_copy(fields))
+            self._tasks[task_id] = (time.time() + self.ttl_seconds, data)
+            return True
+
+    def delete(self, task_id: str) -> None:
+        with self._lock:
+            self._tasks.pop(task_id, None)
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Task store backed by a SQLite database in WAL mode.
+
+    WAL lets status polls from every worker read while the processing worker
+    writes. Updates run in an IMMEDIATE transaction, so concurrent writers
+    from different processes are serialized.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 24 * 3600):
+        """
+        Initialize store.
+
+        Args:
+            db_path: SQLite file shared by all workers
+            ttl_seconds: Time after the last write at which a task expires
+        """
+        super().__init__(ttl_seconds)
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = self._open_db()
+
+    def create(self, task_id: str, fields: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('DELETE FROM tasks WHERE expires_at < ?', (now,))
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO tasks (task_id, data, expires_at) VALUES (?, ?, ?)',
+                    (task_id, json.dumps(fields, ensure_ascii=False), now + self.ttl_seconds)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM tasks WHERE task_id = ? AND expires_at >= ?', (task_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, task_id: str, **fields: Any) -> bool:
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    'SELECT data FROM tasks WHERE task_id = ? AND expires_at >= ?', (task_id, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute('COMMIT')
+                    return False
+                data = json.loads(row[0])
+                data.update(fields)
+                self._conn.execute(
+                    'UPDATE tasks SET data = ?, expires_at = ? WHERE task_id = ?',
+                    (json.dumps(data, ensure_ascii=False), now + self.ttl_seconds, task_id)
+                )
+                self._conn.execute('COMMIT')
+                return True
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def delete(self, task_id: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM tasks WHERE task_id = ?', (task_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _open_db(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None: transactions are managed explicitly above
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS tasks ('
+            'task_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_expires ON tasks (expires_at)')
+        return conn
+
+
+class RedisTaskStore(TaskStore):
+    """
+    Task store backed by Redis hashes.
+
+    Each task is one hash whose fields hold JSON-encoded values. create()
+    goes through a MULTI/EXEC pipeline; update() runs a Lua script so the
+    existence check, the field writes and the expiry happen in one atomic
+    step (a task deleted or expired concurrently is never re-created as a
+    partial hash). Redis removes expired tasks itself.
+    """
+
+    # KEYS[1] = task key, ARGV[1] = TTL seconds, ARGV[2..] = field/value pairs
+    UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+if #ARGV > 1 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+    def __init__(self, client, ttl_seconds: float = 24 * 3600, prefix: str = 'claims_task:'):
+        """
+        Initialize store.
+
+        Args:
+            client: Redis client (redis.Redis or a compatible object)
+            ttl_seconds: Time after the last write at which a task expires
+            prefix: Key prefix for task hashes
+        """
+        super().__init__(ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+        self._update_script = client.register_script(self.UPDATE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisTaskStore':
+        """Create a store connected to a Redis URL (requires the redis package)."""
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("RedisTaskStore requires the 'redis' package: pip install redis") from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def create(self, task_id: str, fields: Dict[str, Any]) -> None:
+        key = self._key(task_id)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(key)
+        if fields:
+            pipe.hset(key, mapping=self._encode(fields))
+        pipe.expire(key, self._ttl())
+        pipe.execute()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.hgetall(self._key(task_id))
+        if not raw:
+            return None
+        return {_text(name): json.loads(_text(value)) for name, value in raw.items()}
+
+    def update(self, task_id: str, **fields: Any) -> bool:
+        args = [self._ttl()]
+        for name, value in self._encode(fields).items():
+            args.extend((name, value))
+        return bool(self._update_script(keys=[self._key(task_id)], args=args))
+
+    def delete(self, task_id: str) -> None:
+        self.client.delete(self._key(task_id))
+
+    def close(self) -> None:
+        close = getattr(self.client, 'close', None)
+        if close:
+            close()
+
+    def _key(self, task_id: str) -> str:
+        return f"{self.prefix}{task_id}"
+
+    def _ttl(self) -> int:
+        return max(1, int(math.ceil(self.ttl_seconds)))
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        return {name: json.dumps(value, ensure_ascii=False) for name, value in fields.items()}
+
+
+def create_task_store(backend: str = 'sqlite', db_path: Optional[str] = None,
+                      redis_url: Optional[str] = None, ttl_seconds: float = 24 * 3600) -> TaskStore:
+    """
+    Create the configured task store.
+
+    Falls back to a per-process store (with a warning) when the configured
+    backend cannot be opened, so the application still starts.
+
+    Args:
+        backend: One of TASK_STORE_BACKENDS
+        db_path: SQLite file for the sqlite backend
+        redis_url: Connection URL for the redis backend
+        ttl_seconds: Task expiry
+    """
+    if backend not in TASK_STORE_BACKENDS:
+        raise ValueError(f"Unknown task store backend: {backend} (expected one of {TASK_STORE_BACKENDS})")
+
+    try:
+        if backend == 'sqlite' and db_path:
+            return SQLiteTaskStore(db_path, ttl_seconds=ttl_seconds)
+        if backend == 'redis' and redis_url:
+            return RedisTaskStore.from_url(redis_url, ttl_seconds=ttl_seconds)
+    except Exception as e:
+        logger.warning(f"Task store backend '{backend}' unavailable, tasks are per-process: {e}")
+
+    if backend != 'memory':
+        logger.warning(f"Task store backend '{backend}' is not configured, tasks are per-process")
+    return MemoryTaskStore(ttl_seconds=ttl_seconds)
+
+
+def _copy(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Detach stored values from the caller's objects."""
+    return json.loads(json.dumps(fields))
+
+
+def _text(value) -> str:
+    return value.decode('utf-8') if isinstance(value, bytes) else value
@@ -4,7 +4,8 @@
 定义了专利权利要求处理系统中使用的所有数据结构和接口。
 """
 
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 from abc import ABC, abstractmethod
 
@@ -64,6 +65,44 @@ class ProcessedClaims:
     processing_errors: List[ProcessingError]
     claims_data: List[ClaimInfo]
     patent_numbers: Optional[List[str]] = None  # 关联的专利公开号列表
+    
+    # 专利号/行索引 -> 权利要求位置，首次查询时构建（构建后不应再修改claims_data）
+    _patent_index: Optional[Dict[str, List[int]]] = field(default=None, init=False, repr=False, compare=False)
+    _row_index: Optional[Dict[int, List[int]]] = field(default=None, init=False, repr=False, compare=False)
+    _row_keys: Optional[List[int]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def claims_for_patent(self, patent_number: str) -> List[ClaimInfo]:
+        """指定专利号的权利要求（按原顺序）"""
+        if self._patent_index is None:
+            self._build_indexes()
+        return [self.claims_data[i] for i in self._patent_index.get(patent_number, ())]
+    
+    def claims_for_row(self, row_index: int) -> List[ClaimInfo]:
+        """指定Excel行的权利要求（按原顺序）"""
+        if self._row_index is None:
+            self._build_indexes()
+        return [self.claims_data[i] for i in self._row_index.get(row_index, ())]
+    
+    def claims_in_rows(self, start: int, stop: int) -> List[ClaimInfo]:
+        """行索引在[start, stop)范围内的权利要求（按行排序）"""
+        if self._row_keys is None:
+            self._build_indexes()
+        claims = []
+        for row in self._row_keys[bisect_left(self._row_keys, start):bisect_left(self._row_keys, stop)]:
+            claims.extend(self.claims_data[i] for i in self._row_index[row])
+        return claims
+    
+    def _build_indexes(self) -> None:
+        patent_index: Dict[str, List[int]] = {}
+        row_index: Dict[int, List[int]] = {}
+        for position, claim in enumerate(self.claims_data):
+            if claim.patent_number is not None:
+                patent_index.setdefault(claim.patent_number, []).append(position)
+            if claim.row_index is not None:
+                row_index.setdefault(claim.row_index, []).append(position)
+        self._patent_index = patent_index
+        self._row_index = row_index
+        self._row_keys = sorted(row_index)
 
 
 # 抽象接口定义
@@ -4,13 +4,14 @@
 包含所有核心处理组件的实现。
 """
 
-from .excel_processor import ExcelProcessor
+from .excel_processor import ExcelProcessor, ColumnNotFoundError
 from .language_detector import LanguageDetector
 from .claims_parser import ClaimsParser
 from .claims_classifier import ClaimsClassifier
 
 __all__ = [
     "ExcelProcessor",
+    "ColumnNotFoundError",
     "LanguageDetector", 
     "ClaimsParser",
     "ClaimsClassifier"
@@ -5,10 +5,31 @@
 """
 
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from ..models import ClaimsClassifierInterface, ClaimInfo
 
 
+# 提取引用前跳过的权利要求序号（按顺序取第一个匹配的格式）
+_CLAIM_NUMBER_PREFIX = re.compile(
+    r'^(?:\s*\d+\s*[\.、\)\:]*'            # 数字+标点
+    r'|\s*claim\s+\d+\s*[\.\:]\s*'          # claim 1:
+    r'|\s*claims\s+\d+\s*[\.\:]\s*'         # claims 1:
+    r'|\s*anspruch\s+\d+\s*[\.\:]\s*'       # Anspruch 1:
+    r'|\s*ansprüche\s+\d+\s*[\.\:]\s*'      # Ansprüche 1:
+    r'|\s*权利要求\s*\d+\s*[\.\:]\s*)',      # 权利要求1:
+    re.IGNORECASE
+)
+
+# 以权利要求序号开头的文本（只有无序号引用时视为独立权利要求）
+_INDEPENDENT_NUMBER_PREFIX = re.compile(
+    r'^\s*(?:\d+\s*[\.、\)\:]\s*'          # 数字+标点
+    r'|claim\s+\d+\s*[\.\:]\s*'             # claim 1:
+    r'|anspruch\s+\d+\s*[\.\:]\s*'          # Anspruch 1:
+    r'|权利要求\s*\d+\s*[\.\:]\s*)',         # 权利要求1:
+    re.IGNORECASE
+)
+
+
 class ClaimsClassifier(ClaimsClassifierInterface):
     """权利要求分类器"""
     
@@ -68,16 +89,106 @@ class ClaimsClassifier(ClaimsClassifierInterface):
         self._compile_patterns()
     
     def _compile_patterns(self):
-        """编译正则表达式模式"""
-        self.reference_patterns = {}
-        
-        for language, keywords in self.reference_keywords.items():
-            patterns = []
-            for keyword in keywords:
-                # 匹配"权利要求1"、"claim 1"、"claims 1 to 10"等格式
-                pattern = rf'{re.escape(keyword)}\s*((?:\d+\s*[-~至到to]\s*\d+)|\d+)(?:\s*[,，]\s*(?:\d+\s*[-~至到to]\s*\d+|\d+))*'
-                patterns.append(re.compile(pattern, re.IGNORECASE))
-            self.reference_patterns[language] = patterns
+        """
+        编译各语言的引用语法
+        
+        每种语言一条锚点正则找出文本中所有可能开始引用的位置（零宽匹配，允许重叠），
+        在每个位置上用预编译的规则做锚定匹配，一次扫描得到全部引用。
+        
+        引用只取决于关键词结束的位置和其后的序号，因此只需匹配每种语言中不以其他
+        关键词结尾的关键词（如"根据权利要求"以"权利要求"结尾，只需匹配后者）。
+        """
+        self._grammars = {}
+        for language in list(self.reference_keywords) + [None]:
+            self._grammars[language] = self._compile_grammar(language)
+    
+    def _compile_grammar(self, language) -> Dict[str, any]:
+        """
+        编译一种语言的引用语法（language为None时表示其他未列出的语言）
+        
+        Args:
+            language: 语言类型
+            
+        Returns:
+            语法字典
+        """
+        keywords = [keyword.lower() for keyword in self.get_reference_keywords(language)]
+        
+        # 不以其他关键词结尾的关键词
+        suffixes = []
+        for keyword in keywords:
+            if keyword not in suffixes and not any(
+                    other != keyword and keyword.endswith(other) for other in keywords):
+                suffixes.append(keyword)
+        
+        # 每个关键词按其结尾的关键词分组，用于定位完整关键词（保留关键词顺序）
+        keyword_groups = {suffix: [] for suffix in suffixes}
+        for index, keyword in enumerate(keywords):
+            suffix = min((s for s in suffixes if keyword.endswith(s)), key=len)
+            keyword_groups[suffix].append((index, len(keyword), re.compile(re.escape(keyword), re.IGNORECASE)))
+        
+        # 关键词之后的序号或范围（"1"、"1-3"、"1至3"），逗号后的序号不计入
+        reference_tail = re.compile(r'\s*(\d+)(?:\s*([-~至到])\s*(\d+))?')
+        
+        # 特定语言的连接词格式，每种格式只取文本中第一次出现
+        # ('range': 起止两组；'alternatives': 取组内全部数字；'ranges': 按连接词拆分后逐段解析)
+        rules = []
+        if language in ['en', 'other']:
+            # "claims 1 to 10"
+            rules.append(('range', re.compile(r'claim[s]?\s+(\d+)\s+to\s+(\d+)', re.IGNORECASE)))
+        if language in ['de', 'other']:
+            # "Anspruch 1 bis 3"
+            rules.append(('range', re.compile(r'anspruch[s]?\s+(\d+)\s+bis\s+(\d+)', re.IGNORECASE)))
+        if language in ['en', 'de', 'other']:
+            # "claim 1 or 2"、"claim 1 und 2"
+            rules.append(('alternatives', re.compile(r'claim[s]?\s+(\d+(?:\s*(?:or|und)\s*\d+)+)', re.IGNORECASE)))
+        if language in ['de', 'other']:
+            # "Anspruch 1 und 2"、"Anspruch 1 oder 2"
+            rules.append(('alternatives', re.compile(r'anspruch[s]?\s+(\d+(?:\s*(?:und|oder)\s*\d+)+)', re.IGNORECASE)))
+        if language in ['zh', 'other']:
+            # "权利要求1或2"
+            rules.append(('alternatives', re.compile(r'权利要求\s*(\d+(?:\s*或\s*\d+)+)', re.IGNORECASE)))
+        if language in ['en', 'other']:
+            # "claims 1 to 3 and 5 to 7"（连接词拆分区分大小写）
+            rules.append(('ranges', re.compile(
+                r'claim[s]?\s+((?:\d+\s*to\s*\d+)(?:\s*and\s*(?:\d+\s*to\s*\d+|\d+))*)', re.IGNORECASE),
+                re.compile(r'\s*and\s*'), re.compile(r'(\d+)\s*to\s*(\d+)', re.IGNORECASE)))
+        if language in ['de', 'other']:
+            # "Anspruch 1 bis 3 und 5 bis 7"
+            rules.append(('ranges', re.compile(
+                r'anspruch[s]?\s+((?:\d+\s*bis\s*\d+)(?:\s*und\s*(?:\d+\s*bis\s*\d+|\d+))*)', re.IGNORECASE),
+                re.compile(r'\s*und\s*'), re.compile(r'(\d+)\s*bis\s*(\d+)', re.IGNORECASE)))
+        if language in ['zh', 'other']:
+            # "权利要求1至3和5至7"
+            rules.append(('ranges', re.compile(
+                r'权利要求\s*((?:\d+\s*(?:至|到)\s*\d+)(?:\s*和\s*(?:\d+\s*(?:至|到)\s*\d+|\d+))*)', re.IGNORECASE),
+                re.compile(r'\s*和\s*'), re.compile(r'(\d+)\s*(?:至|到)\s*(\d+)', re.IGNORECASE)))
+        
+        # 所有规则可能开始的位置
+        starts = set(suffixes)
+        starts.update(re.match(r'claim|anspruch|权利要求', rule[1].pattern).group() for rule in rules)
+        anchor = '|'.join(re.escape(start) for start in sorted(starts, key=len, reverse=True))
+        
+        # 没有找到引用时用于判断是否提及权利要求的词
+        phrases = {
+            'en': ['claims', 'claim'],
+            'de': ['anspruch', 'ansprüche', 'anspruchs'],
+            'zh': ['权利要求'],
+            'other': ['claim', 'claims']
+        }
+        phrases = phrases.get(language, phrases['other'])
+        forward_keywords = self.forward_reference_keywords.get(
+            language, self.forward_reference_keywords.get('other', []))
+        
+        return {
+            'anchor': re.compile(f'(?={anchor})', re.IGNORECASE),
+            'suffixes': [(re.compile(re.escape(suffix), re.IGNORECASE), keyword_groups[suffix]) for suffix in suffixes],
+            'reference_tail': reference_tail,
+            'rules': rules,
+            'phrases': re.compile('|'.join(re.escape(phrase) for phrase in phrases), re.IGNORECASE),
+            'forward': re.compile('|'.join(re.escape(keyword) for keyword in forward_keywords), re.IGNORECASE)
+                       if forward_keywords else None,
+        }
     
     def classify_claim_type(self, claim_text: str, language: str) -> str:
         """
@@ -90,35 +201,33 @@ class ClaimsClassifier(ClaimsClassifierInterface):
         Returns:
             权利要求类型 ('independent' 或 'dependent')
         """
+        return self.analyze_claim(claim_text, language)[0]
+    
+    def analyze_claim(self, claim_text: str, language: str) -> Tuple[str, List]:
+        """
+        分类权利要求类型并提取引用（一次解析）
+        
+        Args:
+            claim_text: 权利要求文本
+            language: 语言类型
+            
+        Returns:
+            (权利要求类型, 引用列表)，独立权利要求的引用列表为空
+        """
         if not claim_text or not claim_text.strip():
-            return 'independent'
+            return 'independent', []
         
-        # 检查是否包含引用关键词
         referenced_claims = self.extract_referenced_claims(claim_text, language)
         
         # 特殊处理：如果引用列表只包含'all'，且文本开头是权利要求序号格式
         # 则可能是独立权利要求被错误分类
         # 注意：'previous'引用不需要这个特殊处理，因为它明确表示引用前面的权利要求
-        if referenced_claims == ['all']:
-            # 检查文本开头是否是权利要求序号格式
-            import re
-            # 匹配各种权利要求序号格式
-            number_patterns = [
-                r'^\s*\d+\s*[\.、\)\:]\s*',  # 数字+标点
-                r'^\s*claim\s+\d+\s*[\.\:]\s*',  # claim 1:
-                r'^\s*anspruch\s+\d+\s*[\.\:]\s*',  # Anspruch 1:
-                r'^\s*权利要求\s*\d+\s*[\.\:]\s*',  # 权利要求1:
-            ]
-            
-            for pattern in number_patterns:
-                if re.search(pattern, claim_text, re.IGNORECASE):
-                    # 这可能是独立权利要求
-                    return 'independent'
+        if referenced_claims == ['all'] and _INDEPENDENT_NUMBER_PREFIX.search(claim_text):
+            return 'independent', []
         
         if referenced_claims:
-            return 'dependent'
-        else:
-            return 'independent'
+            return 'dependent', referenced_claims
+        return 'independent', []
     
     def extract_referenced_claims(self, claim_text: str, language: str) -> List[int]:
         """
@@ -129,349 +238,125 @@ class ClaimsClassifier(ClaimsClassifierInterface):
             language: 语言类型
             
         Returns:
-            引用的权利要求序号列表
+            引用的权利要求序号列表；只有引用关键词没有序号时为['all']，
+            带向前引用关键词（如"前述权利要求"）时为['previous']
         """
         if not claim_text or not claim_text.strip():
             return []
         
-        # 首先跳过权利要求序号部分
-        import re
-        
-        # 匹配各种权利要求序号格式
-        number_patterns = [
-            r'^\s*\d+\s*[\.、\)\:]*',  # 数字+标点
-            r'^\s*claim\s+\d+\s*[\.\:]\s*',  # claim 1:
-            r'^\s*claims\s+\d+\s*[\.\:]\s*',  # claims 1:
-            r'^\s*anspruch\s+\d+\s*[\.\:]\s*',  # Anspruch 1:
-            r'^\s*ansprüche\s+\d+\s*[\.\:]\s*',  # Ansprüche 1:
-            r'^\s*权利要求\s*\d+\s*[\.\:]\s*',  # 权利要求1:
-        ]
-        
         # 移除开头的权利要求序号
         cleaned_text = claim_text
-        for pattern in number_patterns:
-            match = re.search(pattern, cleaned_text, re.IGNORECASE)
-            if match:
-                cleaned_text = cleaned_text[match.end():]
-                break
+        match = _CLAIM_NUMBER_PREFIX.search(cleaned_text)
+        if match:
+            cleaned_text = cleaned_text[match.end():]
         
+        grammar = self._grammars.get(language) or self._grammars[None]
         referenced_claims = set()
         has_reference_keywords = False
+        keyword_ends = []
+        matched_rules = set()
         
-        # 获取对应语言的模式，如果没有则使用通用模式
-        patterns = self.reference_patterns.get(language, self.reference_patterns.get('other', []))
-        
-        # 首先使用正则表达式模式匹配
-        for pattern in patterns:
-            matches = pattern.findall(cleaned_text)
-            if matches:
-                has_reference_keywords = True
-                for match in matches:
-                    # 预处理：将"to"替换为"-"以便_parse_claim_numbers能正确处理
-                    processed_match = re.sub(r'\s*to\s*', '-', match, flags=re.IGNORECASE)
-                    # 解析序号字符串，支持范围和列表格式
-                    numbers = self._parse_claim_numbers(processed_match)
-                    referenced_claims.update(numbers)
-        
-        # 专门处理"claims 1 to 10"格式 - 无论是否已经找到引用
-        if language in ['en', 'other']:
-            # 匹配"claims 1 to 10"、"claim 1 to 3"等格式
-            to_pattern = re.search(r'claim[s]?\s+(\d+)\s+to\s+(\d+)', cleaned_text, re.IGNORECASE)
-            if to_pattern:
-                start = int(to_pattern.group(1))
-                end = int(to_pattern.group(2))
-                referenced_claims.update(range(start, end + 1))
-                has_reference_keywords = True
-
-        # 专门处理德语"Anspruch 1 bis 3"格式
-        if language in ['de', 'other']:
-            # 匹配"Anspruch 1 bis 3"、"Ansprüche 1 bis 10"等格式
-            bis_pattern = re.search(r'anspruch[s]?\s+(\d+)\s+bis\s+(\d+)', cleaned_text, re.IGNORECASE)
-            if bis_pattern:
-                start = int(bis_pattern.group(1))
-                end = int(bis_pattern.group(2))
-                referenced_claims.update(range(start, end + 1))
-                has_reference_keywords = True
-
-        # 专门处理"claim 1 or 2"、"claim 1 und 2"等格式
-        if language in ['en', 'de', 'other']:
-            # 英文和通用情况：匹配"claim 1 or 2"、"claim 1 or 2 or 3"等格式
-            or_und_pattern = re.search(r'claim[s]?\s+(\d+(?:\s*(?:or|und)\s*\d+)+)', cleaned_text, re.IGNORECASE)
-            if or_und_pattern:
-                numbers_str = or_und_pattern.group(1)
-                # 分割并提取所有数字
-                numbers = re.findall(r'\d+', numbers_str)
-                for num_str in numbers:
-                    referenced_claims.add(int(num_str))
-                has_reference_keywords = True
-
-        # 专门处理德语"Anspruch 1 und 2"等格式
-        if language in ['de', 'other']:
-            # 德语情况：匹配"Anspruch 1 und 2"、"Anspruch 1 und 2 und 3"等格式
-            anspruch_pattern = re.search(r'anspruch[s]?\s+(\d+(?:\s*(?:und|oder)\s*\d+)+)', cleaned_text, re.IGNORECASE)
-            if anspruch_pattern:
-                numbers_str = anspruch_pattern.group(1)
-                # 分割并提取所有数字
-                numbers = re.findall(r'\d+', numbers_str)
-                for num_str in numbers:
-                    referenced_claims.add(int(num_str))
-                has_reference_keywords = True
-
-        # 专门处理中文"权利要求1或2"格式
-        if language in ['zh', 'other']:
-            # 匹配"权利要求1或2"、"权利要求1或2或3"等格式
-            chinese_or_pattern = re.search(r'权利要求\s*(\d+(?:\s*或\s*\d+)+)', cleaned_text, re.IGNORECASE)
-            if chinese_or_pattern:
-                numbers_str = chinese_or_pattern.group(1)
-                # 分割并提取所有数字
-                numbers = re.findall(r'\d+', numbers_str)
-                for num_str in numbers:
-                    referenced_claims.add(int(num_str))
-                has_reference_keywords = True
-        
-        # 专门处理多个范围的情况，如"claims 1 to 3 and 5 to 7"
-        if language in ['en', 'other']:
-            # 匹配多个范围格式："claims 1 to 3 and 5 to 7"
-            multiple_range_pattern = re.search(r'claim[s]?\s+((?:\d+\s*to\s*\d+)(?:\s*and\s*(?:\d+\s*to\s*\d+|\d+))*)', cleaned_text, re.IGNORECASE)
-            if multiple_range_pattern:
-                ranges_str = multiple_range_pattern.group(1)
-                # 处理多个范围
-                range_parts = re.split(r'\s*and\s*', ranges_str)
-                for part in range_parts:
-                    # 检查是否为范围
-                    range_match = re.search(r'(\d+)\s*to\s*(\d+)', part, re.IGNORECASE)
-                    if range_match:
-                        start = int(range_match.group(1))
-                        end = int(range_match.group(2))
-                        referenced_claims.update(range(start, end + 1))
-                    else:
-                        # 单个数字
-                        digit_match = re.search(r'\d+', part)
-                        if digit_match:
-                            referenced_claims.add(int(digit_match.group()))
-                has_reference_keywords = True
-        
-        # 专门处理德语多个范围的情况，如"Anspruch 1 bis 3 und 5 bis 7"
-        if language in ['de', 'other']:
-            # 匹配多个范围格式："Anspruch 1 bis 3 und 5 bis 7"
-            multiple_range_pattern = re.search(r'anspruch[s]?\s+((?:\d+\s*bis\s*\d+)(?:\s*und\s*(?:\d+\s*bis\s*\d+|\d+))*)', cleaned_text, re.IGNORECASE)
-            if multiple_range_pattern:
-                ranges_str = multiple_range_pattern.group(1)
-                # 处理多个范围
-                range_parts = re.split(r'\s*und\s*', ranges_str)
-                for part in range_parts:
-                    # 检查是否为范围
-                    range_match = re.search(r'(\d+)\s*bis\s*(\d+)', part, re.IGNORECASE)
-                    if range_match:
-                        start = int(range_match.group(1))
-                        end = int(range_match.group(2))
-                        referenced_claims.update(range(start, end + 1))
-                    else:
-                        # 单个数字
-                        digit_match = re.search(r'\d+', part)
-                        if digit_match:
-                            referenced_claims.add(int(digit_match.group()))
-                has_reference_keywords = True
-        
-        # 专门处理中文多个范围的情况，如"权利要求1至3和5至7"
-        if language in ['zh', 'other']:
-            # 匹配多个范围格式："权利要求1至3和5至7"
-            multiple_range_pattern = re.search(r'权利要求\s*((?:\d+\s*(?:至|到)\s*\d+)(?:\s*和\s*(?:\d+\s*(?:至|到)\s*\d+|\d+))*)', cleaned_text, re.IGNORECASE)
-            if multiple_range_pattern:
-                ranges_str = multiple_range_pattern.group(1)
-                # 处理多个范围
-                range_parts = re.split(r'\s*和\s*', ranges_str)
-                for part in range_parts:
-                    # 检查是否为范围
-                    range_match = re.search(r'(\d+)\s*(?:至|到)\s*(\d+)', part, re.IGNORECASE)
-                    if range_match:
-                        start = int(range_match.group(1))
-                        end = int(range_match.group(2))
-                        referenced_claims.update(range(start, end + 1))
-                    else:
-                        # 单个数字
-                        digit_match = re.search(r'\d+', part)
-                        if digit_match:
-                            referenced_claims.add(int(digit_match.group()))
-                has_reference_keywords = True
-        
-        # 辅助函数：检查文本中是否包含向前引用关键词
-        def has_forward_reference_keywords(text, lang):
-            """
-            检查文本中是否包含向前引用关键词
-            
-            Args:
-                text: 待检查的文本
-                lang: 语言类型
-                
-            Returns:
-                是否包含向前引用关键词
-            """
-            forward_keywords = self.forward_reference_keywords.get(lang, self.forward_reference_keywords.get('other', []))
-            for keyword in forward_keywords:
-                # 对于中文、德语等需要灵活匹配的语言，不使用严格的单词边界
-                # 直接检查关键词是否存在于文本中（忽略大小写）
-                if re.search(re.escape(keyword), text, re.IGNORECASE):
-                    return True
-            return False
-        
-        # 辅助函数：检查关键词附近是否有向前引用关键词
-        def has_forward_reference_nearby(keyword_start, keyword_end, text, lang):
-            """
-            检查关键词附近是否有向前引用关键词
+        for anchor in grammar['anchor'].finditer(cleaned_text):
+            position = anchor.start()
             
-            Args:
-                keyword_start: 关键词开始位置
-                keyword_end: 关键词结束位置
-                text: 完整文本
-                lang: 语言类型
-                
-            Returns:
-                是否在附近有向前引用关键词
-            """
-            # 检查关键词前后50个字符范围内是否有向前引用关键词
-            context_start = max(0, keyword_start - 50)
-            context_end = min(len(text), keyword_end + 50)
-            context_text = text[context_start:context_end]
-            return has_forward_reference_keywords(context_text, lang)
-        
-        # 检查是否包含引用关键词但没有找到数字
-        if has_reference_keywords and not referenced_claims:
-            # 检查是否有单独的引用关键词出现（如"权利要求"、"claims"）
-            keywords = self.reference_keywords.get(language, self.reference_keywords.get('other', []))
-            for keyword in keywords:
-                # 找到关键词在文本中的位置
-                keyword_matches = list(re.finditer(rf'{re.escape(keyword)}', cleaned_text, re.IGNORECASE))
-                for match in keyword_matches:
-                    # 提取关键词前后的文本（各三个单词）
-                    keyword_start = match.start()
-                    keyword_end = match.end()
-                    
-                    # 提取关键词前后的文本
-                    text_before = cleaned_text[:keyword_start]
-                    text_after = cleaned_text[keyword_end:]
-                    
-                    # 分词并检查是否有数字
-                    words_before = text_before.split()[-3:]  # 前三个单词
-                    words_after = text_after.split()[:3]   # 后三个单词
-                    
-                    # 检查周边单词是否包含数字
-                    has_number_nearby = False
-                    all_surrounding_words = words_before + words_after
-                    
-                    for word in all_surrounding_words:
-                        if any(char.isdigit() for char in word):
-                            has_number_nearby = True
-                            break
-                    
-                    # 如果周边三个单词以内没有数字
-                    if not has_number_nearby:
-                        # 检查是否有向前引用关键词
-                        if has_forward_reference_nearby(keyword_start, keyword_end, cleaned_text, language):
-                            # 向前引用：只引用前面的所有序号
-                            return ['previous']
-                        else:
-                            # 默认引用全部
-                            return ['all']
-        
-        # 额外检查：直接检查文本中是否包含引用关键词，即使正则表达式没有匹配
-        # 这是为了处理只有关键词而没有数字的情况
-        if not has_reference_keywords:
-            keywords = self.reference_keywords.get(language, self.reference_keywords.get('other', []))
-            for keyword in keywords:
-                if re.search(rf'{re.escape(keyword)}', cleaned_text, re.IGNORECASE):
-                    # 检查关键词周边是否有数字
-                    keyword_matches = list(re.finditer(rf'{re.escape(keyword)}', cleaned_text, re.IGNORECASE))
-                    for match in keyword_matches:
-                        keyword_start = match.start()
-                        keyword_end = match.end()
-                        
-                        text_before = cleaned_text[:keyword_start]
-                        text_after = cleaned_text[keyword_end:]
-                        
-                        words_before = text_before.split()[-3:]
-                        words_after = text_after.split()[:3]
-                        
-                        has_number_nearby = False
-                        all_surrounding_words = words_before + words_after
-                        
-                        for word in all_surrounding_words:
-                            if any(char.isdigit() for char in word):
-                                has_number_nearby = True
-                                break
-                        
-                        if not has_number_nearby:
-                            # 检查是否有向前引用关键词
-                            if has_forward_reference_nearby(keyword_start, keyword_end, cleaned_text, language):
-                                # 向前引用：只引用前面的所有序号
-                                return ['previous']
-                            else:
-                                # 默认引用全部
-                                return ['all']
-        
-        # 特殊检查：如果文本中包含相关短语，即使没有找到具体序号，也应识别为从权
-        if not has_reference_keywords:
-            # 检查是否包含相关短语
-            has_relevant_phrases = False
-            lang_keywords = {
-                'en': ['claims', 'claim'],
-                'de': ['anspruch', 'ansprüche', 'anspruchs'],
-                'zh': ['权利要求'],
-                'other': ['claim', 'claims']
-            }
-            
-            for phrase in lang_keywords.get(language, lang_keywords['other']):
-                if re.search(rf'{re.escape(phrase)}', cleaned_text, re.IGNORECASE):
-                    has_relevant_phrases = True
-                    break
+            # 关键词+序号（"权利要求1"、"claim 1-3"）
+            for suffix, keyword_group in grammar['suffixes']:
+                keyword = suffix.match(cleaned_text, position)
+                if not keyword:
+                    continue
+                keyword_ends.append((keyword.end(), keyword_group))
+                tail = grammar['reference_tail'].match(cleaned_text, keyword.end())
+                if tail:
+                    has_reference_keywords = True
+                    start = int(tail.group(1))
+                    if tail.group(3) is None:
+                        referenced_claims.add(start)
+                    else:
+                        referenced_claims.update(range(start, int(tail.group(3)) + 1))
             
-            if has_relevant_phrases:
-                # 检查是否有向前引用关键词
-                if has_forward_reference_keywords(cleaned_text, language):
+            # 连接词格式
+            for rule in grammar['rules']:
+                if rule[1] in matched_rules:
+                    continue
+                match = rule[1].match(cleaned_text, position)
+                if not match:
+                    continue
+                matched_rules.add(rule[1])
+                has_reference_keywords = True
+                referenced_claims.update(self._rule_numbers(rule, match))
+        
+        # 有引用关键词但没有找到序号：按关键词优先级找第一个周边没有数字的关键词
+        if not referenced_claims:
+            for keyword_start, keyword_end in self._keyword_occurrences(cleaned_text, keyword_ends):
+                words_before = cleaned_text[:keyword_start].split()[-3:]  # 前三个单词
+                words_after = cleaned_text[keyword_end:].split()[:3]   # 后三个单词
+                if any(char.isdigit() for word in words_before + words_after for char in word):
+                    continue
+                # 检查关键词前后50个字符范围内是否有向前引用关键词
+                context_text = cleaned_text[max(0, keyword_start - 50):keyword_end + 50]
+                if grammar['forward'] and grammar['forward'].search(context_text):
                     # 向前引用：只引用前面的所有序号
                     return ['previous']
-                else:
-                    # 默认引用全部
-                    return ['all']
+                # 默认引用全部
+                return ['all']
+        
+        # 特殊检查：如果文本中包含相关短语，即使没有找到具体序号，也应识别为从权
+        if not has_reference_keywords and grammar['phrases'].search(cleaned_text):
+            if grammar['forward'] and grammar['forward'].search(cleaned_text):
+                return ['previous']
+            return ['all']
         
-        return sorted(list(referenced_claims))
+        return sorted(referenced_claims)
     
-    def _parse_claim_numbers(self, number_string: str) -> List[int]:
+    def _rule_numbers(self, rule: tuple, match) -> List[int]:
         """
-        解析权利要求序号字符串
-
+        解析连接词格式匹配到的序号
+        
         Args:
-            number_string: 序号字符串，如"1-3,5"、"1 to 10"、"1 or 2"、"1 und 2"、"1 to 3 and 5"
-
+            rule: 规则（见_compile_grammar）
+            match: 规则的匹配结果
+            
         Returns:
             序号列表
         """
+        kind = rule[0]
+        if kind == 'range':
+            return list(range(int(match.group(1)), int(match.group(2)) + 1))
+        if kind == 'alternatives':
+            return [int(number) for number in re.findall(r'\d+', match.group(1))]
+        
+        # 多个范围："1 to 3 and 5"
         numbers = []
-
-        # 处理连接词：将"or"、"und"、"and"、"bis"、"或"替换为逗号，以便后续处理
-        processed_string = re.sub(r'\s*(?:or|und|and|bis|或)\s*', ',', number_string, flags=re.IGNORECASE)
-
-        # 分割逗号分隔的部分
-        parts = re.split(r'[,，]', processed_string)
-
-        for part in parts:
-            part = part.strip()
-
-            # 检查是否为范围格式（如"1-3"、"1至3"、"1 to 10"、"1 bis 3"）
-            # 匹配包含"to"、"至"、"到"、"bis"作为单词的范围格式
-            range_match = re.search(r'(\d+)\s*(?:[-~至到]|to|bis)\s*(\d+)', part, re.IGNORECASE)
+        for part in rule[2].split(match.group(1)):
+            range_match = rule[3].search(part)
             if range_match:
-                start = int(range_match.group(1))
-                end = int(range_match.group(2))
-                numbers.extend(range(start, end + 1))
+                numbers.extend(range(int(range_match.group(1)), int(range_match.group(2)) + 1))
             else:
-                # 单个数字
                 digit_match = re.search(r'\d+', part)
                 if digit_match:
                     numbers.append(int(digit_match.group()))
-
         return numbers
     
+    def _keyword_occurrences(self, text: str, keyword_ends: List[tuple]) -> List[tuple]:
+        """
+        文本中出现的全部引用关键词，按关键词优先级和位置排序
+        
+        Args:
+            text: 权利要求文本
+            keyword_ends: 扫描时找到的(结束位置, 以该处结尾的关键词列表)
+            
+        Returns:
+            [(开始位置, 结束位置), ...]
+        """
+        occurrences = []
+        for end, keyword_group in keyword_ends:
+            for index, length, keyword in keyword_group:
+                start = end - length
+                if start >= 0 and keyword.match(text, start):
+                    occurrences.append((index, start, end))
+        occurrences.sort()
+        return [(start, end) for _, start, end in occurrences]
+    
     def get_reference_keywords(self, language: str) -> List[str]:
         """
         获取指定语言的引用关键词
@@ -43,6 +43,13 @@ class ClaimsParser(ClaimsParserInterface):
         # 编译正则表达式
         self.compiled_patterns = [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in self.number_patterns]
         
+        # 单次扫描：所有模式都只能在行首匹配，先定位每个行首及其后第一个非空白字符，
+        # 再只用首字符可能匹配的那部分模式（合并为一个前瞻正则）在该位置匹配
+        self._line_start_pattern = re.compile(r'^(?=\s*(\S))', re.MULTILINE)
+        self._pattern_leads = [self._pattern_lead(pattern) for pattern in self.number_patterns]
+        self._lead_scanners: Dict[str, Optional[Tuple[re.Pattern, Tuple[int, ...]]]] = {}
+        self._scanners_by_subset: Dict[Tuple[int, ...], Tuple[re.Pattern, Tuple[int, ...]]] = {}
+        
         # 序号重启检测的阈值
         self.restart_threshold = 5  # 如果序号差异超过此值，可能是重启
     
@@ -59,50 +66,117 @@ class ClaimsParser(ClaimsParserInterface):
         if not text or not text.strip():
             return []
         
-        # 存储找到的序号及其位置和匹配长度
-        numbers_with_info = []
+        return [number for _, _, number, _ in self._select_longest_matches(self._scan_number_matches(text))]
+    
+    def _scan_number_matches(self, text: str) -> List[Tuple[int, int, int, int]]:
+        """
+        一次扫描找出所有序号模式的匹配
         
-        # 使用所有模式尝试提取序号
-        for pattern in self.compiled_patterns:
-            matches = pattern.finditer(text)
-            for match in matches:
-                try:
-                    number = int(match.group(1))
-                    if 1 <= number <= 1000:  # 合理的权利要求序号范围
-                        # 存储序号、位置和匹配长度，用于去重和排序
-                        numbers_with_info.append({
-                            'number': number,
-                            'start': match.start(),
-                            'end': match.end(),
-                            'length': match.end() - match.start()
-                        })
-                except (ValueError, IndexError):
+        结果与逐个模式 finditer 后按位置排序完全一致：每个模式的匹配互不重叠，
+        同一位置按模式顺序排列。
+        
+        Args:
+            text: 权利要求文本
+            
+        Returns:
+            (起始位置, 结束位置, 序号, 模式索引) 元组列表，按起始位置排列
+        """
+        matches = []
+        # 每个模式上一次匹配的结束位置（模拟 finditer 不重叠的搜索起点）
+        next_allowed = [0] * len(self.number_patterns)
+        lead_scanners = self._lead_scanners
+        
+        for line_match in self._line_start_pattern.finditer(text):
+            lead = line_match.group(1)
+            scanner = lead_scanners.get(lead, False)
+            if scanner is False:
+                scanner = self._scanner_for_lead(lead)
+            if scanner is None:
+                continue
+            
+            combined, indexes = scanner
+            position_match = combined.match(text, line_match.start())
+            if position_match is None:
+                continue
+            start = line_match.start()
+            spans = position_match.regs
+            # 第i个候选模式的完整匹配在分组 2i+1，序号在分组 2i+2
+            for i, k in enumerate(indexes):
+                end = spans[2 * i + 1][1]
+                if end < 0 or start < next_allowed[k]:
                     continue
+                next_allowed[k] = end
+                number_start, number_end = spans[2 * i + 2]
+                number = int(text[number_start:number_end])
+                if 1 <= number <= 1000:  # 合理的权利要求序号范围
+                    matches.append((start, end, number, k))
         
-        # 按位置排序
-        numbers_with_info.sort(key=lambda x: x['start'])
+        return matches
+    
+    @staticmethod
+    def _pattern_lead(pattern: str) -> Optional[re.Pattern]:
+        """
+        序号模式在行首空白之后第一个字符的匹配规则
         
-        # 去重：如果多个匹配重叠，选择匹配长度最长的
-        unique_numbers = []
-        i = 0
-        while i < len(numbers_with_info):
-            current = numbers_with_info[i]
-            overlapping = [current]
+        Returns:
+            匹配首字符的正则；无法确定时返回None（该模式在每个行首都尝试）
+        """
+        prefix = r'^\s*'
+        if not pattern.startswith(prefix):
+            return None
+        rest = pattern[len(prefix):]
+        if rest.startswith(r'(\d+)'):
+            return re.compile(r'\d')
+        if rest and rest[0] not in '\\()[]{}.*+?|^$':
+            return re.compile(re.escape(rest[0]), re.IGNORECASE)
+        return None
+    
+    def _scanner_for_lead(self, lead: str) -> Optional[Tuple[re.Pattern, Tuple[int, ...]]]:
+        """获取行首首字符对应的候选模式合并正则（按首字符缓存）"""
+        indexes = tuple(
+            k for k, lead_pattern in enumerate(self._pattern_leads)
+            if lead_pattern is None or lead_pattern.fullmatch(lead)
+        )
+        scanner = None
+        if indexes:
+            scanner = self._scanners_by_subset.get(indexes)
+            if scanner is None:
+                patterns = [self.number_patterns[k] for k in indexes]
+                combined = re.compile(
+                    '^' + ''.join(f'(?:(?=({pattern[1:] if pattern.startswith("^") else pattern}))|)' for pattern in patterns),
+                    re.IGNORECASE | re.MULTILINE
+                )
+                scanner = self._scanners_by_subset[indexes] = (combined, indexes)
+        self._lead_scanners[lead] = scanner
+        return scanner
+    
+    @staticmethod
+    def _select_longest_matches(matches: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+        """
+        去除重叠匹配：与当前匹配重叠的一组中保留匹配长度最长的（长度相同取先出现的）
+        
+        Args:
+            matches: _scan_number_matches 的结果
             
-            # 找到所有重叠的匹配
+        Returns:
+            去重后的匹配元组列表
+        """
+        selected = []
+        i = 0
+        count = len(matches)
+        while i < count:
+            best = matches[i]
+            group_end = best[1]
+            best_length = best[1] - best[0]
             j = i + 1
-            while j < len(numbers_with_info) and numbers_with_info[j]['start'] < current['end']:
-                overlapping.append(numbers_with_info[j])
+            while j < count and matches[j][0] < group_end:
+                length = matches[j][1] - matches[j][0]
+                if length > best_length:
+                    best, best_length = matches[j], length
                 j += 1
-            
-            # 选择匹配长度最长的
-            best_match = max(overlapping, key=lambda x: x['length'])
-            unique_numbers.append(best_match['number'])
-            
-            # 跳过所有重叠的匹配
+            selected.append(best)
             i = j
-        
-        return unique_numbers
+        return selected
     
     def split_claims_by_numbers(self, text: str) -> Dict[int, str]:
         """
@@ -182,44 +256,17 @@ class ClaimsParser(ClaimsParserInterface):
         if not text or not text.strip():
             return {}
         
-        # 找到所有序号位置，包含匹配的模式信息
-        number_positions = []
-        
-        for pattern in self.compiled_patterns:
-            for match in pattern.finditer(text):
-                try:
-                    number = int(match.group(1))
-                    if 1 <= number <= 1000:
-                        # 存储开始位置、结束位置、序号和匹配的完整文本
-                        number_positions.append({
-                            'start': match.start(),
-                            'end': match.end(),
-                            'number': number,
-                            'matched_text': match.group(0),
-                            'pattern': pattern.pattern
-                        })
-                except (ValueError, IndexError):
-                    continue
-        
-        # 按位置排序并去重（同一位置可能有多个模式匹配）
-        number_positions.sort(key=lambda x: x['start'])
-        
-        # 去重：如果多个模式匹配同一位置，选择匹配文本最长的
-        unique_positions = []
-        i = 0
-        while i < len(number_positions):
-            current = number_positions[i]
-            # 检查是否有重叠的匹配
-            overlapping = [current]
-            j = i + 1
-            while j < len(number_positions) and number_positions[j]['start'] < current['end']:
-                overlapping.append(number_positions[j])
-                j += 1
-            
-            # 选择匹配文本最长的
-            best_match = max(overlapping, key=lambda x: len(x['matched_text']))
-            unique_positions.append(best_match)
-            i = j
+        # 找到所有序号位置并去重（同一位置可能有多个模式匹配，选择匹配文本最长的）
+        unique_positions = [
+            {
+                'start': start,
+                'end': end,
+                'number': number,
+                'matched_text': text[start:end],
+                'pattern': self.number_patterns[k]
+            }
+            for start, end, number, k in self._select_longest_matches(self._scan_number_matches(text))
+        ]
         
         if not unique_positions:
             return {}
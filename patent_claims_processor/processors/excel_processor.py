@@ -5,10 +5,28 @@ Excel处理器实现
 """
 
 import pandas as pd
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 import os
+import openpyxl
 from ..models import ExcelProcessorInterface
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # 可选依赖：安装后用于更快的流式读取
+    CalamineWorkbook = None
+
+# 流式读取时每块的行数
+STREAM_CHUNK_SIZE = 1000
+
+
+class ColumnNotFoundError(ValueError):
+    """工作表中不存在请求的列"""
+    
+    def __init__(self, column_name: str, available_columns: List[str]):
+        super().__init__(f"列 '{column_name}' 不存在")
+        self.column_name = column_name
+        self.available_columns = available_columns
+
 
 class ExcelProcessor(ExcelProcessorInterface):
     """Excel文件处理器"""
@@ -83,6 +101,159 @@ class ExcelProcessor(ExcelProcessorInterface):
         column_data = df[column_name].astype(str).tolist()
         return [data for data in column_data if data and data.strip() and data != 'nan']
     
+    def read_header(self, file_path: str, sheet_name: str = None) -> List[str]:
+        """
+        只读取工作表的表头行
+        
+        Args:
+            file_path: Excel文件路径
+            sheet_name: 工作表名称，None表示第一个工作表
+            
+        Returns:
+            列名列表（与pandas读取的列名一致）
+        """
+        rows = self._iter_sheet_rows(file_path, sheet_name)
+        try:
+            return self._make_header(next(rows, ()))
+        finally:
+            rows.close()
+    
+    def iter_column_chunks(self, file_path: str, column_names: Sequence[str], sheet_name: str = None,
+                           optional_columns: Sequence[str] = (),
+                           chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict[str, List[Optional[str]]]]:
+        """
+        流式按行块读取指定列，不加载整个工作表
+        
+        Args:
+            file_path: Excel文件路径
+            column_names: 必需的列名，不存在时抛出ColumnNotFoundError
+            sheet_name: 工作表名称，None表示第一个工作表
+            optional_columns: 可选的列名，不存在时忽略
+            chunk_size: 每块的行数
+            
+        Yields:
+            列名到单元格文本列表的字典（空单元格为None），各列按行对齐
+        """
+        if not self.validate_excel_file(file_path):
+            raise ValueError(f"不支持的文件格式: {file_path}")
+        
+        rows = self._iter_sheet_rows(file_path, sheet_name)
+        try:
+            header = self._make_header(next(rows, ()))
+            for column_name in column_names:
+                if column_name not in header:
+                    raise ColumnNotFoundError(column_name, header)
+            
+            columns = list(dict.fromkeys(
+                list(column_names) + [name for name in optional_columns if name and name in header]
+            ))
+            indexes = [header.index(name) for name in columns]
+            chunk = {name: [] for name in columns}
+            count = 0
+            for row in rows:
+                for name, index in zip(columns, indexes):
+                    chunk[name].append(self._cell_to_text(row[index] if index < len(row) else None))
+                count += 1
+                if count >= chunk_size:
+                    yield chunk
+                    chunk = {name: [] for name in columns}
+                    count = 0
+            if count:
+                yield chunk
+        finally:
+            rows.close()
+    
+    def read_columns(self, file_path: str, column_names: Sequence[str], sheet_name: str = None,
+                     optional_columns: Sequence[str] = ()) -> Dict[str, List[str]]:
+        """
+        流式读取指定列的数据，过滤规则与get_column_data一致
+        
+        只保留所需列的文本，内存占用与其他列的大小无关。
+        
+        Args:
+            file_path: Excel文件路径
+            column_names: 必需的列名
+            sheet_name: 工作表名称
+            optional_columns: 可选的列名，不存在时结果中不包含该列
+            
+        Returns:
+            列名到非空单元格文本列表的字典
+        """
+        result = None
+        for chunk in self.iter_column_chunks(file_path, column_names, sheet_name, optional_columns):
+            if result is None:
+                result = {name: [] for name in chunk}
+            for name, values in chunk.items():
+                result[name].extend(value for value in values if self._is_filled(value))
+        if result is None:
+            # 只有表头没有数据行
+            header = self.read_header(file_path, sheet_name)
+            result = {name: [] for name in list(column_names) + [n for n in optional_columns if n and n in header]}
+        return result
+    
+    def _iter_sheet_rows(self, file_path: str, sheet_name: str = None) -> Iterator[Sequence[Any]]:
+        """逐行读取工作表的原始值（只读流式模式）"""
+        if CalamineWorkbook is not None:
+            workbook = CalamineWorkbook.from_path(file_path)
+            if sheet_name is None:
+                sheet = workbook.get_sheet_by_index(0)
+            else:
+                sheet = workbook.get_sheet_by_name(sheet_name)
+            for row in sheet.iter_rows():
+                yield [None if value == '' else value for value in row]
+            return
+        
+        if os.path.splitext(file_path)[1].lower() == '.xls':
+            # openpyxl不支持旧版.xls格式，退回pandas读取
+            df = pd.read_excel(file_path, sheet_name=sheet_name if sheet_name is not None else 0,
+                               header=None, dtype=object)
+            for row in df.itertuples(index=False, name=None):
+                yield [None if pd.isna(value) else value for value in row]
+            return
+        
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if sheet_name is None:
+                worksheet = workbook.worksheets[0]
+            elif sheet_name in workbook.sheetnames:
+                worksheet = workbook[sheet_name]
+            else:
+                raise ValueError(f"工作表 '{sheet_name}' 不存在")
+            yield from worksheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _make_header(row: Sequence[Any]) -> List[str]:
+        """按pandas的规则生成列名（空列名为Unnamed: N，重复列名加.1、.2后缀）"""
+        header = []
+        seen = {}
+        for index, value in enumerate(row):
+            name = f"Unnamed: {index}" if value is None or value == '' else ExcelProcessor._cell_to_text(value)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            seen.setdefault(name, 0)
+            header.append(name)
+        return header
+    
+    @staticmethod
+    def _cell_to_text(value: Any) -> Optional[str]:
+        """单元格值转为文本（与pandas读取后astype(str)的结果一致）"""
+        if value is None:
+            return None
+        if isinstance(value, float):
+            if value != value:  # NaN
+                return None
+            if value.is_integer():
+                return str(int(value))
+        return str(value)
+    
+    @staticmethod
+    def _is_filled(text: Optional[str]) -> bool:
+        """是否为非空单元格"""
+        return bool(text and text.strip() and text != 'nan')
+    
     def validate_excel_file(self, file_path: str) -> bool:
         """
         验证Excel文件格式
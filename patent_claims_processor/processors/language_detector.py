@@ -5,11 +5,25 @@
 """
 
 import re
+import string
 from typing import List, Tuple
-from langdetect import detect, LangDetectException
+from langdetect import detect, DetectorFactory, LangDetectException
 from ..models import LanguageDetectorInterface
 
 
+# langdetect默认每次检测使用随机种子，同一文本可能得到不同结果
+DetectorFactory.seed = 0
+
+# 字符分类表：str.translate一次遍历后按标记计数
+# （标记都是ASCII字母，而原文中的ASCII字母都映射为'L'，不会与标记混淆）
+_SCRIPT_TABLE = {}
+_SCRIPT_TABLE.update(dict.fromkeys(range(0x4e00, 0xa000), 'H'))  # CJK统一汉字
+_SCRIPT_TABLE.update(dict.fromkeys(range(0x3040, 0x3100), 'K'))  # 平假名、片假名
+_SCRIPT_TABLE.update(dict.fromkeys(range(0x00c0, 0x0250), 'A'))  # 带重音的拉丁字母
+del _SCRIPT_TABLE[0xd7], _SCRIPT_TABLE[0xf7]                     # ×、÷
+_SCRIPT_TABLE.update(dict.fromkeys(map(ord, string.ascii_letters), 'L'))  # 英文字母
+
+
 class LanguageDetector(LanguageDetectorInterface):
     """语言检测器"""
     
@@ -25,15 +39,23 @@ class LanguageDetector(LanguageDetectorInterface):
             'other': 1
         }
         
-        # 中文字符正则表达式（CJK统一汉字）
-        self.chinese_pattern = re.compile(r'[\u4e00-\u9fff]+')
+        # langdetect前去掉数字和标点
+        self.langdetect_noise_pattern = re.compile(r'[0-9\.\,\;\:\(\)\[\]\{\}]')
+        self.whitespace_pattern = re.compile(r'\s+')
+        
+        # 德语关键词
+        german_keywords = ['anspruch', 'ansprüche', 'anspruchs', 'gemäß', 'dadurch', 'dadurch gekennzeichnet']
+        self.german_pattern = re.compile('|'.join(german_keywords), re.IGNORECASE)
         
-        # 日语特有字符正则表达式
-        self.hiragana_pattern = re.compile(r'[\u3040-\u309f]+')  # 平假名
-        self.katakana_pattern = re.compile(r'[\u30a0-\u30ff]+')  # 片假名
+        # 德语常用词（纯ASCII的德语文本与英文字符分布相同，出现时交给langdetect判断）
+        self.german_word_pattern = re.compile(
+            r'\b(?:und|oder|der|des|dem|den|ein|eine|einen|einem|einer|eines|mit|nach|zur|zum|'
+            r'von|auf|bei|ist|wobei|umfassend|aufweisend)\b', re.IGNORECASE
+        )
         
-        # 英文字符正则表达式
-        self.english_pattern = re.compile(r'[a-zA-Z]+')
+        # 日语关键词（作为辅助判断）
+        japanese_keywords = ['請求項', 'に記載', 'において', 'であって', 'することを特徴とする']
+        self.japanese_pattern = re.compile('|'.join(japanese_keywords))
     
     def detect_language(self, text: str) -> str:
         """
@@ -48,42 +70,46 @@ class LanguageDetector(LanguageDetectorInterface):
         if not text or not text.strip():
             return 'other'
         
-        # 【关键修复】先检测日语特有字符（平假名和片假名）
-        # 这是区分日语和中文的关键！
-        hiragana_matches = self.hiragana_pattern.findall(text)
-        hiragana_chars = sum(len(match) for match in hiragana_matches)
-        
-        katakana_matches = self.katakana_pattern.findall(text)
-        katakana_chars = sum(len(match) for match in katakana_matches)
-        
-        japanese_kana_chars = hiragana_chars + katakana_chars
-        
-        # 统计汉字（中日共享）
-        chinese_matches = self.chinese_pattern.findall(text)
-        chinese_chars = sum(len(match) for match in chinese_matches)
+        # 一次遍历统计各类字符
+        # 【关键修复】日语特有字符（平假名和片假名）是区分日语和中文的关键！
+        scripts = text.translate(_SCRIPT_TABLE)
+        japanese_kana_chars = scripts.count('K')
+        chinese_chars = scripts.count('H')  # 汉字（中日共享）
+        english_chars = scripts.count('L')
+        accented_chars = scripts.count('A')
         
-        # 统计英文字符
-        english_matches = self.english_pattern.findall(text)
-        english_chars = sum(len(match) for match in english_matches)
-        
-        total_chars = len(text.replace(' ', '').replace('\n', '').replace('\t', ''))
+        total_chars = len(text) - text.count(' ') - text.count('\n') - text.count('\t')
         
         if total_chars == 0:
             return 'other'
         
         # 计算各类字符比例
-        kana_ratio = japanese_kana_chars / total_chars if total_chars > 0 else 0
-        kanji_ratio = chinese_chars / total_chars if total_chars > 0 else 0
-        english_ratio = english_chars / total_chars if total_chars > 0 else 0
+        kana_ratio = japanese_kana_chars / total_chars
+        kanji_ratio = chinese_chars / total_chars
+        english_ratio = english_chars / total_chars
         
         # 【关键判断】如果包含假名（平假名或片假名），很可能是日语
         if kana_ratio > 0.05:  # 假名占比超过5%，判定为日语
             return 'ja'
         
+        has_japanese_keywords = bool(self.japanese_pattern.search(text))
+        
+        # 字符分布明确时直接判定，不调用langdetect
+        if kana_ratio > 0.01 and kanji_ratio > 0.1:
+            # 假名+汉字组合
+            return 'ja'
+        if japanese_kana_chars == 0 and kanji_ratio > 0.1 and chinese_chars >= english_chars:
+            # 以汉字为主且没有假名
+            return 'ja' if has_japanese_keywords else 'zh'
+        if (english_ratio >= 0.6 and chinese_chars == 0 and japanese_kana_chars == 0 and accented_chars == 0
+                and not self.german_pattern.search(text) and not self.german_word_pattern.search(text)):
+            # 只有英文字母且没有德语特征
+            return 'en'
+        
         # 使用langdetect进行辅助检测
         try:
-            clean_text = re.sub(r'[0-9\.\,\;\:\(\)\[\]\{\}]', ' ', text)
-            clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+            clean_text = self.langdetect_noise_pattern.sub(' ', text)
+            clean_text = self.whitespace_pattern.sub(' ', clean_text).strip()
             
             if len(clean_text) > 10:
                 detected_lang = detect(clean_text)
@@ -104,14 +130,7 @@ class LanguageDetector(LanguageDetectorInterface):
             pass
         
         # 德语关键词检测
-        german_keywords = ['anspruch', 'ansprüche', 'anspruchs', 'gemäß', 'dadurch', 'dadurch gekennzeichnet']
-        german_pattern = re.compile('|'.join(german_keywords), re.IGNORECASE)
-        has_german_keywords = bool(german_pattern.search(text))
-        
-        # 日语关键词检测（作为辅助判断）
-        japanese_keywords = ['請求項', 'に記載', 'において', 'であって', 'することを特徴とする']
-        japanese_pattern = re.compile('|'.join(japanese_keywords))
-        has_japanese_keywords = bool(japanese_pattern.search(text))
+        has_german_keywords = bool(self.german_pattern.search(text))
         
         # 最终判断逻辑
         if has_japanese_keywords or (kana_ratio > 0.01 and kanji_ratio > 0.1):
@@ -6,8 +6,10 @@
 
 from .processing_service import ProcessingService
 from .export_service import ExportService
+from .claims_job import ClaimsJob
 
 __all__ = [
     "ProcessingService",
-    "ExportService"
+    "ExportService",
+    "ClaimsJob"
 ]
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+可续跑的权利要求处理任务
+
+将工作表按固定行数分块处理，每完成一块就把该块结果写入检查点目录。
+进程重启或任务中断后，新的任务对象从最后一个已完成的块继续处理，
+已完成的块不再重复计算。
+
+检查点目录结构：
+    manifest.json      任务标识（文件、列、分块大小、行数）和已完成块数
+    chunk_000000.json  各块的权利要求、错误和语言分布
+    job.lock           运行租约，文件修改时间作为心跳
+
+运行期间由后台线程定期续期租约（读取文件、处理单块耗时较长时租约也不会失效）。
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from ..models import ProcessedClaims
+from .processing_service import ProcessingService
+
+
+class ClaimsJob:
+    """分块处理、逐块保存检查点的权利要求处理任务"""
+
+    MANIFEST_FILE = 'manifest.json'
+    LOCK_FILE = 'job.lock'
+
+    def __init__(self, service: ProcessingService, checkpoint_dir: str, file_path: str, column_name: str,
+                 sheet_name: str = None, patent_column_name: str = None, stale_seconds: float = 120):
+        """
+        初始化任务
+
+        Args:
+            service: 处理服务，分块大小和工作进程数取自该服务
+            checkpoint_dir: 检查点目录（每个任务一个）
+            file_path: Excel文件路径
+            column_name: 包含权利要求的列名
+            sheet_name: 工作表名称
+            patent_column_name: 包含专利公开号的列名
+            stale_seconds: 运行租约超过该时间未续期即视为失效，可由其他进程接管；
+                运行期间每隔该时间的三分之一续期一次
+        """
+        self.service = service
+        self.checkpoint_dir = checkpoint_dir
+        self.file_path = file_path
+        self.column_name = column_name
+        self.sheet_name = sheet_name
+        self.patent_column_name = patent_column_name
+        self.stale_seconds = stale_seconds
+        self.owner = uuid.uuid4().hex
+        self._locked = False
+
+    def acquire(self) -> bool:
+        """
+        获取运行租约，保证同一时刻只有一个进程处理该任务
+
+        Returns:
+            是否获取成功（租约被其他进程持有且未失效时返回False）
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        lock_path = os.path.join(self.checkpoint_dir, self.LOCK_FILE)
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) < self.stale_seconds:
+                        return False
+                    # 持有者已停止续期（进程退出或被终止），接管任务
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.owner)
+            self._locked = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """释放运行租约（租约已被其他进程接管时保留对方的租约）"""
+        if not self._locked:
+            return
+        self._locked = False
+        if self._owns_lock():
+            try:
+                os.remove(os.path.join(self.checkpoint_dir, self.LOCK_FILE))
+            except OSError:
+                pass
+
+    def heartbeat(self) -> None:
+        """续期运行租约"""
+        if self._locked and self._owns_lock():
+            try:
+                os.utime(os.path.join(self.checkpoint_dir, self.LOCK_FILE))
+            except OSError:
+                pass
+
+    def _keep_alive(self, stop: threading.Event, heartbeat_callback: Optional[Callable[[], None]]) -> None:
+        """心跳线程：定期续期租约并调用heartbeat_callback，直到stop被设置"""
+        while not stop.wait(max(self.stale_seconds / 3, 0.05)):
+            self.heartbeat()
+            if heartbeat_callback:
+                try:
+                    heartbeat_callback()
+                except Exception:
+                    pass
+
+    def _owns_lock(self) -> bool:
+        try:
+            with open(os.path.join(self.checkpoint_dir, self.LOCK_FILE), 'r') as f:
+                return f.read() == self.owner
+        except OSError:
+            return False
+
+    def run(self, progress_callback: Callable[[int, int], None] = None,
+            preloaded_columns: Dict[str, List[str]] = None,
+            should_stop: Callable[[], bool] = None,
+            heartbeat_callback: Callable[[], None] = None) -> Optional[ProcessedClaims]:
+        """
+        处理尚未完成的块并返回完整结果
+
+        运行期间后台线程定期续期租约，并调用heartbeat_callback（例如更新任务状态的
+        最后更新时间），避免读取文件或处理单块耗时超过stale_seconds时被误判为中断。
+
+        Args:
+            progress_callback: 进度回调函数，接收(已完成行数, 总行数)，每完成一块调用一次
+            preloaded_columns: 已通过ExcelProcessor.read_columns读取的列数据
+            should_stop: 每块完成后调用，返回True时暂停处理（检查点保留，可稍后续跑）
+            heartbeat_callback: 心跳回调函数，运行期间每隔stale_seconds/3调用一次
+
+        Returns:
+            处理结果；暂停时返回None
+
+        Raises:
+            ColumnNotFoundError: 列不存在
+        """
+        stop = threading.Event()
+        keep_alive = threading.Thread(target=self._keep_alive, args=(stop, heartbeat_callback), daemon=True)
+        keep_alive.start()
+        try:
+            return self._run(progress_callback, preloaded_columns, should_stop)
+        finally:
+            stop.set()
+            keep_alive.join()
+
+    def _run(self, progress_callback, preloaded_columns, should_stop) -> Optional[ProcessedClaims]:
+        columns = preloaded_columns
+        if columns is None or self.column_name not in columns:
+            optional_columns = [self.patent_column_name] if self.patent_column_name else []
+            columns = self.service.excel_processor.read_columns(
+                self.file_path, [self.column_name], self.sheet_name, optional_columns=optional_columns
+            )
+
+        column_data = columns[self.column_name]
+        patent_data = columns.get(self.patent_column_name, []) if self.patent_column_name else []
+        total_cells = len(column_data)
+        row_patent_numbers, patent_numbers = self.service._collect_patent_numbers(patent_data, total_cells)
+
+        chunk_size = self.service.chunk_size
+        completed = self._load_manifest(total_cells, chunk_size)
+        processed = min(completed * chunk_size, total_cells)
+        if processed and progress_callback:
+            progress_callback(processed, total_cells)
+
+        chunks = self.service._split_chunks(column_data, row_patent_numbers, processed)
+        for (start, cells, _), chunk_result in self.service._iter_chunk_results(chunks):
+            self._save_chunk(completed, chunk_result)
+            completed += 1
+            self._write_json(self.MANIFEST_FILE, dict(self._signature(total_cells, chunk_size),
+                                                      completed_chunks=completed))
+            self.heartbeat()
+
+            processed = start + len(cells)
+            self.service.processing_state['current_cell_index'] = processed - 1
+            if progress_callback:
+                progress_callback(processed, total_cells)
+            if should_stop and processed < total_cells and should_stop():
+                return None
+
+        all_claims, processing_errors, language_distribution = [], [], {}
+        for index in range(completed):
+            chunk = self._read_json(self._chunk_file(index))
+            all_claims.extend(self.service._dict_to_claim(claim) for claim in chunk['claims'])
+            processing_errors.extend(self.service._dict_to_error(error) for error in chunk['errors'])
+            for lang, count in chunk['language_distribution'].items():
+                language_distribution[lang] = language_distribution.get(lang, 0) + count
+
+        return self.service._build_processed_claims(
+            total_cells, all_claims, processing_errors, language_distribution, patent_numbers
+        )
+
+    def cleanup(self) -> None:
+        """删除检查点目录（结果保存后调用）"""
+        self._locked = False
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+
+    def _signature(self, total_cells: int, chunk_size: int) -> Dict[str, Any]:
+        """任务标识：文件或参数变化后已有检查点作废"""
+        stat = os.stat(self.file_path)
+        return {
+            'file_path': os.path.abspath(self.file_path),
+            'file_size': stat.st_size,
+            'file_mtime': stat.st_mtime_ns,
+            'column_name': self.column_name,
+            'sheet_name': self.sheet_name,
+            'patent_column_name': self.patent_column_name,
+            'chunk_size': chunk_size,
+            'total_cells': total_cells
+        }
+
+    def _load_manifest(self, total_cells: int, chunk_size: int) -> int:
+        """
+        读取检查点，返回可复用的连续已完成块数
+
+        检查点与当前任务不匹配或块文件缺失时，从缺失处重新开始。
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        signature = self._signature(total_cells, chunk_size)
+        completed = 0
+        try:
+            manifest = self._read_json(self.MANIFEST_FILE)
+            if {key: manifest.get(key) for key in signature} == signature:
+                completed = int(manifest.get('completed_chunks', 0))
+        except (OSError, ValueError):
+            pass
+
+        for index in range(completed):
+            if not os.path.exists(os.path.join(self.checkpoint_dir, self._chunk_file(index))):
+                completed = index
+                break
+
+        self._write_json(self.MANIFEST_FILE, dict(signature, completed_chunks=completed))
+        return completed
+
+    def _save_chunk(self, index: int, chunk_result) -> None:
+        claims, errors, language_distribution = chunk_result
+        self._write_json(self._chunk_file(index), {
+            'claims': [self.service._claim_to_dict(claim) for claim in claims],
+            'errors': [self.service._error_to_dict(error) for error in errors],
+            'language_distribution': language_distribution
+        })
+
+    @staticmethod
+    def _chunk_file(index: int) -> str:
+        return f"chunk_{index:06d}.json"
+
+    def _read_json(self, name: str) -> Dict[str, Any]:
+        with open(os.path.join(self.checkpoint_dir, name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_json(self, name: str, data: Dict[str, Any]) -> None:
+        """先写临时文件再替换，进程在写入途中退出也不会留下残缺的检查点"""
+        path = os.path.join(self.checkpoint_dir, name)
+        tmp_path = f"{path}.{self.owner}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -6,33 +6,118 @@
 
 import time
 import json
+import hashlib
 import os
-from typing import List, Dict, Optional, Any
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from dataclasses import replace
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 
 from ..models import (
     ProcessingServiceInterface, ClaimInfo, ProcessingResult, 
     ProcessingError, ProcessedClaims, ProcessingReport, ValidationError
 )
-from ..processors import ExcelProcessor, LanguageDetector, ClaimsParser, ClaimsClassifier
+from ..processors import ExcelProcessor, LanguageDetector, ClaimsParser, ClaimsClassifier, ColumnNotFoundError
+
+
+# 多进程处理：进程池在同一进程内复用，避免每个任务重复启动工作进程和初始化解析器
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+# 工作进程内预先初始化的处理服务（包含解析器、分类器和语言检测器）
+_worker_service = None
+
+
+def _init_worker() -> None:
+    """工作进程初始化：创建处理服务，后续所有块复用"""
+    global _worker_service
+    _worker_service = ProcessingService()
+
+
+def _process_chunk_in_worker(chunk: Tuple[int, List[str], List[Optional[str]]]):
+    """
+    在工作进程中处理一块连续的单元格
+    
+    Args:
+        chunk: (起始行索引, 单元格文本列表, 对应的专利公开号列表)
+        
+    Returns:
+        (权利要求列表, 错误列表, 语言分布, 本块的解析缓存(命中数, 未命中数))
+    """
+    start_index, cells, row_patent_numbers = chunk
+    service = _worker_service or ProcessingService()
+    hits, misses = service._cell_cache_hits, service._cell_cache_misses
+    claims, errors, language_distribution = [], [], {}
+    service._process_cells(cells, row_patent_numbers, start_index, claims, errors, language_distribution)
+    cache_counts = (service._cell_cache_hits - hits, service._cell_cache_misses - misses)
+    return claims, errors, language_distribution, cache_counts
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """获取（必要时创建）共享进程池"""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != workers:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False, cancel_futures=True)
+            # Web服务中存在多个线程，使用spawn避免fork继承锁状态
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+            _process_pool_workers = workers
+        return _process_pool
+
+
+def _reset_process_pool() -> None:
+    """丢弃共享进程池（工作进程崩溃后调用，下次使用时重建）"""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+        _process_pool_workers = 0
 
 
 class ProcessingService(ProcessingServiceInterface):
     """处理服务"""
     
-    def __init__(self, enable_recovery: bool = False, recovery_file: str = None):
+    def __init__(self, enable_recovery: bool = False, recovery_file: str = None,
+                 workers: int = 1, chunk_size: int = 500, parallel_threshold: int = 2000,
+                 cell_cache_size: int = 4096):
         """
         初始化处理服务
         
         Args:
             enable_recovery: 是否启用中断恢复功能（默认关闭以提升性能）
             recovery_file: 恢复文件路径，如果为None则自动生成
+            workers: 并行处理的工作进程数，1表示在当前进程顺序处理
+            chunk_size: 并行处理时每块的行数
+            parallel_threshold: 行数达到该值才启用并行处理
+            cell_cache_size: 单元格解析缓存的最大条目数，0表示不缓存
         """
         self.excel_processor = ExcelProcessor()
         self.language_detector = LanguageDetector()
         self.claims_parser = ClaimsParser()
         self.claims_classifier = ClaimsClassifier()
         
+        # 并行处理配置
+        self.workers = max(1, int(workers or 1))
+        self.chunk_size = max(1, int(chunk_size))
+        self.parallel_threshold = max(0, int(parallel_threshold))
+        
+        # 单元格解析缓存（LRU）：预处理后文本的哈希 -> 权利要求解析结果
+        self.cell_cache_size = max(0, int(cell_cache_size))
+        self._cell_cache: OrderedDict = OrderedDict()
+        self._cell_cache_hits = 0
+        self._cell_cache_misses = 0
+        
         # 中断恢复相关 - 默认关闭以提升性能
         # 在生产环境中，worker进程很稳定，中断恢复功能几乎用不到
         # 频繁的磁盘I/O会严重影响处理速度（可降低30-50%性能）
@@ -49,7 +134,8 @@ class ProcessingService(ProcessingServiceInterface):
     
     def process_excel_file(self, file_path: str, column_name: str, 
                           sheet_name: str = None, patent_column_name: str = None, 
-                          resume: bool = False, progress_callback=None) -> ProcessedClaims:
+                          resume: bool = False, progress_callback=None,
+                          preloaded_columns: Dict[str, List[str]] = None) -> ProcessedClaims:
         """
         处理Excel文件
         
@@ -60,6 +146,7 @@ class ProcessingService(ProcessingServiceInterface):
             patent_column_name: 包含专利公开号的列名
             resume: 是否从中断点恢复处理
             progress_callback: 进度回调函数，接收(current, total)参数
+            preloaded_columns: 已通过ExcelProcessor.read_columns读取的列数据，提供时不再读取文件
             
         Returns:
             处理结果
@@ -95,145 +182,78 @@ class ProcessingService(ProcessingServiceInterface):
                 )
                 return self._create_error_result([error])
             
-            # 读取Excel文件
-            try:
-                df = self.excel_processor.read_excel_file(file_path, sheet_name)
-            except Exception as e:
-                error = ProcessingError(
-                    error_type="file_read_error",
-                    cell_index=-1,
-                    error_message=f"读取Excel文件失败: {str(e)}",
-                    suggested_action="请检查文件是否被其他程序占用，或者工作表名称是否正确",
-                    severity="critical"
-                )
-                return self._create_error_result([error])
-            
-            # 验证列是否存在
-            if column_name not in df.columns:
-                available_columns = list(df.columns)
-                error = ProcessingError(
-                    error_type="column_not_found_error",
-                    cell_index=-1,
-                    error_message=f"列'{column_name}'不存在",
-                    suggested_action=f"请选择以下可用列之一: {available_columns}",
-                    severity="critical"
-                )
-                return self._create_error_result([error])
+            # 流式读取所需列（已由调用方读取时直接复用，避免重复读取文件）
+            optional_columns = [patent_column_name] if patent_column_name else []
+            columns = preloaded_columns
+            if columns is None or column_name not in columns:
+                try:
+                    columns = self.excel_processor.read_columns(
+                        file_path, [column_name], sheet_name, optional_columns=optional_columns
+                    )
+                except ColumnNotFoundError as e:
+                    error = ProcessingError(
+                        error_type="column_not_found_error",
+                        cell_index=-1,
+                        error_message=f"列'{column_name}'不存在",
+                        suggested_action=f"请选择以下可用列之一: {e.available_columns}",
+                        severity="critical"
+                    )
+                    return self._create_error_result([error])
+                except Exception as e:
+                    error = ProcessingError(
+                        error_type="file_read_error",
+                        cell_index=-1,
+                        error_message=f"读取Excel文件失败: {str(e)}",
+                        suggested_action="请检查文件是否被其他程序占用，或者工作表名称是否正确",
+                        severity="critical"
+                    )
+                    return self._create_error_result([error])
             
             # 获取列数据
-            column_data = self.excel_processor.get_column_data(df, column_name)
+            column_data = columns[column_name]
             
             # 获取专利公开号列数据（如果提供）
-            patent_data = []
-            if patent_column_name and patent_column_name in df.columns:
-                patent_data = self.excel_processor.get_column_data(df, patent_column_name)
+            patent_data = columns.get(patent_column_name, []) if patent_column_name else []
+            
+            total_cells = len(column_data)
+            row_patent_numbers, patent_numbers = self._collect_patent_numbers(patent_data, total_cells)
             
             # 处理每个单元格
             all_claims = []
             processing_errors = []
             language_distribution = {}
-            patent_numbers = []
-            total_cells = len(column_data)
             
-            for i, cell_text in enumerate(column_data):
-                self.processing_state['current_cell_index'] = i
-                
+            if self._use_parallel(total_cells):
+                self._process_cells_parallel(
+                    column_data, row_patent_numbers, all_claims, processing_errors,
+                    language_distribution, progress_callback
+                )
+            else:
                 # 调用进度回调（优化频率，每10行或每5%更新一次）
-                if progress_callback:
-                    update_interval = max(10, total_cells // 20)  # 至少每10行，或每5%
-                    if i % update_interval == 0 or i == total_cells - 1:
-                        progress_callback(i + 1, total_cells)
+                update_interval = max(10, total_cells // 20)  # 至少每10行，或每5%
+                # 即使启用中断恢复，也只在关键节点保存（每2000行或每20%）
+                save_interval = max(2000, total_cells // 5)
                 
-                try:
-                    # 获取当前行的专利公开号（如果有）
-                    patent_number = None
-                    if patent_data and i < len(patent_data):
-                        patent_value = patent_data[i]
-                        if patent_value and patent_value.strip():
-                            patent_number = patent_value.strip()
-                            if patent_number not in patent_numbers:
-                                patent_numbers.append(patent_number)
-                    
-                    # 处理单元格 - 增强容错处理
-                    cell_claims = self._process_single_cell_with_recovery(cell_text, i)
-                    
-                    if cell_claims:
-                        # 关联专利公开号到权利要求
-                        for claim in cell_claims:
-                            claim.patent_number = patent_number
-                            claim.row_index = i
-                        
-                        all_claims.extend(cell_claims)
-                        
-                        # 统计语言分布
-                        for claim in cell_claims:
-                            lang = claim.language
-                            language_distribution[lang] = language_distribution.get(lang, 0) + 1
-                    else:
-                        # 记录空单元格或无效内容
-                        if not cell_text or not cell_text.strip():
-                            # 空单元格 - 保留空值行信息，以保持与元数据表格的一致
-                            # 创建一个空的权利要求信息，仅包含行索引和专利号
-                            from ..models import ClaimInfo
-                            empty_claim = ClaimInfo(
-                                claim_number=0,
-                                claim_type="independent",
-                                claim_text="",
-                                language="other",
-                                referenced_claims=[],
-                                original_text="",
-                                confidence_score=0.0,
-                                patent_number=patent_number,
-                                row_index=i
-                            )
-                            all_claims.append(empty_claim)
-                        else:
-                            # 有内容但无法解析 - 记录警告
-                            error = ProcessingError(
-                                error_type="cell_parsing_warning",
-                                cell_index=i,
-                                error_message="单元格包含文本但未能识别权利要求格式",
-                                suggested_action="请检查文本格式是否符合权利要求标准",
-                                severity="warning"
-                            )
-                            processing_errors.append(error)
-                        
-                except Exception as e:
-                    # 单元格处理失败 - 记录错误但继续处理 (需求 7.2)
-                    error = ProcessingError(
-                        error_type="cell_processing_error",
-                        cell_index=i,
-                        error_message=f"处理单元格失败: {str(e)}",
-                        suggested_action="请检查单元格内容格式，或联系技术支持",
-                        severity="error"
-                    )
-                    processing_errors.append(error)
+                def on_row(i):
+                    self.processing_state['current_cell_index'] = i
+                    if progress_callback and (i % update_interval == 0 or i == total_cells - 1):
+                        progress_callback(i + 1, total_cells)
                 
-                # 保存处理状态 (需求 7.4) - 默认关闭以提升性能
-                # 性能优化：中断恢复功能在生产环境中几乎用不到，但会严重影响性能
-                # 频繁的磁盘I/O可降低30-50%的处理速度
-                # 如果需要启用，可在初始化时设置 enable_recovery=True
-                if self.enable_recovery:
-                    # 即使启用，也只在关键节点保存（每2000行或每20%）
-                    save_interval = max(2000, total_cells // 5)
-                    if i % save_interval == 0:
+                def after_row(i):
+                    # 保存处理状态 (需求 7.4) - 默认关闭以提升性能
+                    # 性能优化：中断恢复功能在生产环境中几乎用不到，但会严重影响性能
+                    # 频繁的磁盘I/O可降低30-50%的处理速度
+                    # 如果需要启用，可在初始化时设置 enable_recovery=True
+                    if self.enable_recovery and i % save_interval == 0:
                         self._save_processing_state(all_claims, processing_errors, language_distribution)
+                
+                self._process_cells(
+                    column_data, row_patent_numbers, 0, all_claims, processing_errors,
+                    language_distribution, on_row=on_row, after_row=after_row
+                )
             
-            # 统计结果
-            independent_count = sum(1 for claim in all_claims if claim.claim_type == 'independent')
-            dependent_count = sum(1 for claim in all_claims if claim.claim_type == 'dependent')
-            
-            processing_time = time.time() - start_time
-            
-            result = ProcessedClaims(
-                total_cells_processed=len(column_data),
-                total_claims_extracted=len(all_claims),
-                language_distribution=language_distribution,
-                independent_claims_count=independent_count,
-                dependent_claims_count=dependent_count,
-                processing_errors=processing_errors,
-                claims_data=all_claims,
-                patent_numbers=patent_numbers if patent_numbers else None
+            result = self._build_processed_claims(
+                len(column_data), all_claims, processing_errors, language_distribution, patent_numbers
             )
             
             # 清理恢复文件
@@ -254,6 +274,192 @@ class ProcessingService(ProcessingServiceInterface):
             
             return self._create_error_result([error])
     
+    @staticmethod
+    def _build_processed_claims(total_cells: int, all_claims: List[ClaimInfo],
+                                processing_errors: List[ProcessingError],
+                                language_distribution: Dict[str, int],
+                                patent_numbers: List[str]) -> ProcessedClaims:
+        """汇总统计并创建处理结果"""
+        independent_count = sum(1 for claim in all_claims if claim.claim_type == 'independent')
+        dependent_count = sum(1 for claim in all_claims if claim.claim_type == 'dependent')
+        
+        return ProcessedClaims(
+            total_cells_processed=total_cells,
+            total_claims_extracted=len(all_claims),
+            language_distribution=language_distribution,
+            independent_claims_count=independent_count,
+            dependent_claims_count=dependent_count,
+            processing_errors=processing_errors,
+            claims_data=all_claims,
+            patent_numbers=patent_numbers if patent_numbers else None
+        )
+    
+    @classmethod
+    def _collect_patent_numbers(cls, patent_data: List[str], total_cells: int) -> Tuple[List[Optional[str]], List[str]]:
+        """
+        每行的专利公开号（空值为None），以及按首次出现顺序去重后的专利号列表
+        """
+        row_patent_numbers = [
+            cls._normalize_patent_value(patent_data[i]) if i < len(patent_data) else None
+            for i in range(total_cells)
+        ] if patent_data else [None] * total_cells
+        patent_numbers = list(dict.fromkeys(number for number in row_patent_numbers if number))
+        return row_patent_numbers, patent_numbers
+    
+    @staticmethod
+    def _normalize_patent_value(patent_value) -> Optional[str]:
+        """单元格中的专利公开号，空值返回None"""
+        if patent_value and patent_value.strip():
+            return patent_value.strip()
+        return None
+    
+    def _process_cells(self, cells: List[str], row_patent_numbers: List[Optional[str]], start_index: int,
+                       all_claims: List[ClaimInfo], processing_errors: List[ProcessingError],
+                       language_distribution: Dict[str, int], on_row=None, after_row=None) -> None:
+        """
+        顺序处理一段连续的单元格，结果追加到传入的列表和统计中
+        
+        Args:
+            cells: 单元格文本列表
+            row_patent_numbers: 与cells对齐的专利公开号列表
+            start_index: cells[0]在整列中的行索引
+            all_claims: 权利要求结果列表（追加）
+            processing_errors: 处理错误列表（追加）
+            language_distribution: 语言分布统计（累加）
+            on_row: 每行处理前的回调，接收行索引
+            after_row: 每行处理后的回调，接收行索引
+        """
+        for offset, cell_text in enumerate(cells):
+            i = start_index + offset
+            if on_row:
+                on_row(i)
+            
+            try:
+                # 当前行的专利公开号（如果有）
+                patent_number = row_patent_numbers[offset]
+                
+                # 处理单元格 - 增强容错处理
+                cell_claims = self._process_single_cell_with_recovery(cell_text, i)
+                
+                if cell_claims:
+                    # 关联专利公开号到权利要求
+                    for claim in cell_claims:
+                        claim.patent_number = patent_number
+                        claim.row_index = i
+                    
+                    all_claims.extend(cell_claims)
+                    
+                    # 统计语言分布
+                    for claim in cell_claims:
+                        lang = claim.language
+                        language_distribution[lang] = language_distribution.get(lang, 0) + 1
+                else:
+                    # 记录空单元格或无效内容
+                    if not cell_text or not cell_text.strip():
+                        # 空单元格 - 保留空值行信息，以保持与元数据表格的一致
+                        # 创建一个空的权利要求信息，仅包含行索引和专利号
+                        empty_claim = ClaimInfo(
+                            claim_number=0,
+                            claim_type="independent",
+                            claim_text="",
+                            language="other",
+                            referenced_claims=[],
+                            original_text="",
+                            confidence_score=0.0,
+                            patent_number=patent_number,
+                            row_index=i
+                        )
+                        all_claims.append(empty_claim)
+                    else:
+                        # 有内容但无法解析 - 记录警告
+                        error = ProcessingError(
+                            error_type="cell_parsing_warning",
+                            cell_index=i,
+                            error_message="单元格包含文本但未能识别权利要求格式",
+                            suggested_action="请检查文本格式是否符合权利要求标准",
+                            severity="warning"
+                        )
+                        processing_errors.append(error)
+                    
+            except Exception as e:
+                # 单元格处理失败 - 记录错误但继续处理 (需求 7.2)
+                error = ProcessingError(
+                    error_type="cell_processing_error",
+                    cell_index=i,
+                    error_message=f"处理单元格失败: {str(e)}",
+                    suggested_action="请检查单元格内容格式，或联系技术支持",
+                    severity="error"
+                )
+                processing_errors.append(error)
+            
+            if after_row:
+                after_row(i)
+    
+    def _use_parallel(self, total_cells: int) -> bool:
+        """是否使用多进程并行处理（小文件进程间通信开销大于收益）"""
+        return self.workers > 1 and total_cells >= max(self.parallel_threshold, 2 * self.chunk_size)
+    
+    def _process_cells_parallel(self, column_data: List[str], row_patent_numbers: List[Optional[str]],
+                                all_claims: List[ClaimInfo], processing_errors: List[ProcessingError],
+                                language_distribution: Dict[str, int], progress_callback=None) -> None:
+        """
+        多进程并行处理单元格
+        
+        列数据按chunk_size分块交给进程池，每个工作进程持有预先初始化的解析器、
+        分类器和语言检测器。结果按块顺序合并，与顺序处理的输出完全一致。
+        """
+        total_cells = len(column_data)
+        chunks = self._split_chunks(column_data, row_patent_numbers)
+        
+        for (start, cells, _), (chunk_claims, chunk_errors, chunk_languages) in self._iter_chunk_results(chunks):
+            all_claims.extend(chunk_claims)
+            processing_errors.extend(chunk_errors)
+            for lang, count in chunk_languages.items():
+                language_distribution[lang] = language_distribution.get(lang, 0) + count
+            processed = start + len(cells)
+            self.processing_state['current_cell_index'] = processed - 1
+            if progress_callback:
+                progress_callback(processed, total_cells)
+            if self.enable_recovery:
+                self._save_processing_state(all_claims, processing_errors, language_distribution)
+    
+    def _split_chunks(self, column_data: List[str], row_patent_numbers: List[Optional[str]],
+                      start_index: int = 0) -> List[Tuple[int, List[str], List[Optional[str]]]]:
+        """从start_index开始按chunk_size将列数据切分为(起始行索引, 单元格, 专利公开号)块"""
+        return [
+            (start, column_data[start:start + self.chunk_size], row_patent_numbers[start:start + self.chunk_size])
+            for start in range(start_index, len(column_data), self.chunk_size)
+        ]
+    
+    def _iter_chunk_results(self, chunks: List[Tuple[int, List[str], List[Optional[str]]]]):
+        """
+        按顺序逐块处理，产出(块, (权利要求列表, 错误列表, 语言分布))
+        
+        块数足够多时交给进程池处理；进程池不可用（如受限环境、工作进程崩溃）时，
+        剩余的块在当前进程顺序处理。
+        """
+        done = 0
+        if self.workers > 1 and len(chunks) > 1:
+            try:
+                executor = _get_process_pool(self.workers)
+                # executor.map按提交顺序返回结果，保证合并顺序确定
+                for chunk, chunk_result in zip(chunks, executor.map(_process_chunk_in_worker, chunks)):
+                    done += 1
+                    # 工作进程各自缓存解析结果，命中统计汇总到当前服务
+                    *chunk_result, (hits, misses) = chunk_result
+                    self._cell_cache_hits += hits
+                    self._cell_cache_misses += misses
+                    yield chunk, tuple(chunk_result)
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                print(f"Warning: 多进程处理失败，回退到顺序处理: {e}")
+                _reset_process_pool()
+        
+        for chunk in chunks[done:]:
+            start, cells, row_patent_numbers = chunk
+            claims, errors, language_distribution = [], [], {}
+            self._process_cells(cells, row_patent_numbers, start, claims, errors, language_distribution)
+            yield chunk, (claims, errors, language_distribution)
+    
     def process_single_cell(self, cell_text: str) -> List[ClaimInfo]:
         """
         处理单个单元格的权利要求文本
@@ -270,6 +476,9 @@ class ProcessingService(ProcessingServiceInterface):
         """
         处理单个单元格的权利要求文本（带容错处理）
         
+        预处理后内容相同的单元格（如同族专利、重复导出的行）解析结果相同，
+        从解析缓存中复制已有结果，只更新行索引。
+        
         Args:
             cell_text: 单元格文本内容
             cell_index: 单元格索引
@@ -281,6 +490,38 @@ class ProcessingService(ProcessingServiceInterface):
         if not cell_text or not cell_text.strip():
             return []
         
+        if not self.cell_cache_size:
+            return self._parse_cell_text(cell_text, cell_index)
+        
+        key = hashlib.blake2b(self._preprocess_text(cell_text).encode('utf-8'), digest_size=16).digest()
+        templates = self._cell_cache.get(key)
+        if templates is not None:
+            self._cell_cache.move_to_end(key)
+            self._cell_cache_hits += 1
+        else:
+            self._cell_cache_misses += 1
+            templates = self._parse_cell_text(cell_text, None)
+            self._cell_cache[key] = templates
+            if len(self._cell_cache) > self.cell_cache_size:
+                self._cell_cache.popitem(last=False)
+        
+        # 返回副本：调用方会设置专利公开号等字段，不能修改缓存中的结果
+        return [
+            replace(claim, referenced_claims=list(claim.referenced_claims), row_index=cell_index)
+            for claim in templates
+        ]
+    
+    def _parse_cell_text(self, cell_text: str, cell_index: Optional[int]) -> List[ClaimInfo]:
+        """
+        解析并分类单个单元格中的权利要求
+        
+        Args:
+            cell_text: 非空的单元格文本内容
+            cell_index: 单元格索引
+            
+        Returns:
+            权利要求信息列表
+        """
         try:
             # 需求 3.3: 尽可能提取有效内容，即使格式不规范
             
@@ -309,19 +550,8 @@ class ProcessingService(ProcessingServiceInterface):
                     # 检测当前权利要求的语言
                     claim_language = self.language_detector.detect_language(normalized_text)
                     
-                    # 分类权利要求类型
-                    claim_type = self.claims_classifier.classify_claim_type(normalized_text, claim_language)
-                    
-                    # 提取引用关系
-                    referenced_claims = []
-                    if claim_type == 'dependent':
-                        try:
-                            referenced_claims = self.claims_classifier.extract_referenced_claims(
-                                normalized_text, claim_language
-                            )
-                        except Exception:
-                            # 引用提取失败时，仍然标记为从属权利要求但引用为空
-                            pass
+                    # 分类权利要求类型并提取引用关系
+                    claim_type, referenced_claims = self.claims_classifier.analyze_claim(normalized_text, claim_language)
                     
                     # 处理特殊引用标记
                     resolved_references = []
@@ -733,9 +963,27 @@ class ProcessingService(ProcessingServiceInterface):
             'column_name': self.processing_state.get('column_name'),
             'sheet_name': self.processing_state.get('sheet_name'),
             'recovery_enabled': self.enable_recovery,
+            'workers': self.workers,
+            'cell_cache': self.get_cell_cache_statistics(),
             'recovery_file_exists': os.path.exists(self.recovery_file) if self.recovery_file else False
         }
     
+    def get_cell_cache_statistics(self) -> Dict[str, Any]:
+        """
+        获取单元格解析缓存统计信息
+        
+        Returns:
+            缓存大小、命中数、未命中数和命中率
+        """
+        lookups = self._cell_cache_hits + self._cell_cache_misses
+        return {
+            'size': len(self._cell_cache),
+            'max_size': self.cell_cache_size,
+            'hits': self._cell_cache_hits,
+            'misses': self._cell_cache_misses,
+            'hit_rate': self._cell_cache_hits / lookups if lookups else 0.0
+        }
+    
     def validate_input_data(self, file_path: str, column_name: str, 
                           sheet_name: str = None) -> List[ProcessingError]:
         """
@@ -785,10 +1033,9 @@ class ProcessingService(ProcessingServiceInterface):
                     severity="error"
                 ))
             
-            # 验证列
-            df = self.excel_processor.read_excel_file(file_path, sheet_name)
-            if column_name not in df.columns:
-                available_columns = list(df.columns)
+            # 验证列（只读取表头）
+            available_columns = self.excel_processor.read_header(file_path, sheet_name)
+            if column_name not in available_columns:
                 errors.append(ProcessingError(
                     error_type="column_not_found",
                     cell_index=-1,
@@ -0,0 +1,361 @@
+"""
+处理结果的列式二进制存储
+
+将ProcessedClaims按列写入单个文件：数值列为定长数组，文本列为偏移量数组加
+UTF-8数据块，类型/语言/专利号使用字典编码。按专利号和按行的索引保存为
+权利要求位置区间，同样以数组形式存放。文件头（JSON）只保存汇总信息和各列
+在文件中的位置。
+
+读取时通过mmap映射文件，只解析很小的文件头；单个专利或单行的权利要求按
+索引直接从映射区解码，不需要反序列化整个结果。
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from ..models import ClaimInfo, ProcessedClaims, ProcessingError
+
+MAGIC = b'PCLAIMS1'
+FORMAT_VERSION = 1
+_HEADER_LENGTH = struct.Struct('<Q')
+_ALIGNMENT = 8
+
+# 区域名 -> array类型码
+_COLUMN_TYPES = {
+    # 每条权利要求一项
+    'claim_number': 'i',
+    'row_index': 'q',
+    'confidence_score': 'd',
+    'claim_type': 'i',
+    'language': 'i',
+    'patent_number': 'i',
+    # 文本列：偏移量数组 + UTF-8数据块
+    'claim_text_offsets': 'Q',
+    'claim_text_data': 'B',
+    'original_text_offsets': 'Q',
+    'original_text_data': 'B',
+    'referenced_offsets': 'Q',
+    'referenced_values': 'i',
+    # 专利号字典（编码 -> 专利号）
+    'patent_dict_offsets': 'Q',
+    'patent_dict_data': 'B',
+    # 索引：每个键对应的[起始, 结束)位置区间，平铺存放
+    'patent_range_offsets': 'Q',
+    'patent_ranges': 'Q',
+    'row_keys': 'q',
+    'row_range_offsets': 'Q',
+    'row_ranges': 'Q',
+    # 按需解码的JSON数据
+    'patent_numbers_json': 'B',
+    'processing_errors_json': 'B',
+}
+
+
+def save_processed_claims(path: str, result: ProcessedClaims) -> None:
+    """
+    将处理结果写入列式结果文件（先写临时文件再替换，读者不会看到半个文件）
+
+    Args:
+        path: 结果文件路径
+        result: 处理结果
+    """
+    claims = result.claims_data
+    columns = {name: array(code) for name, code in _COLUMN_TYPES.items()}
+    dictionaries = {'claim_type': {}, 'language': {}, 'patent_number': {}}
+    text_parts = {'claim_text': [], 'original_text': []}
+    patent_ranges: List[List[int]] = []
+    row_ranges: Dict[int, List[int]] = {}
+
+    for name in ('claim_text_offsets', 'original_text_offsets', 'referenced_offsets'):
+        columns[name].append(0)
+
+    for position, claim in enumerate(claims):
+        columns['claim_number'].append(claim.claim_number)
+        columns['row_index'].append(-1 if claim.row_index is None else claim.row_index)
+        columns['confidence_score'].append(claim.confidence_score)
+        for name in ('claim_type', 'language', 'patent_number'):
+            value = getattr(claim, name)
+            code = -1 if value is None else dictionaries[name].setdefault(value, len(dictionaries[name]))
+            columns[name].append(code)
+
+        for name in ('claim_text', 'original_text'):
+            encoded = (getattr(claim, name) or '').encode('utf-8')
+            text_parts[name].append(encoded)
+            offsets = columns[f'{name}_offsets']
+            offsets.append(offsets[-1] + len(encoded))
+
+        columns['referenced_values'].extend(claim.referenced_claims or [])
+        columns['referenced_offsets'].append(len(columns['referenced_values']))
+
+        if claim.patent_number is not None:
+            code = columns['patent_number'][-1]
+            if code == len(patent_ranges):
+                patent_ranges.append([])
+            _add_to_ranges(patent_ranges[code], position)
+        if claim.row_index is not None:
+            _add_to_ranges(row_ranges.setdefault(claim.row_index, []), position)
+
+    patents = list(dictionaries.pop('patent_number'))
+    _pack_strings(patents, columns['patent_dict_offsets'])
+    _pack_ranges([patent_ranges[code] for code in range(len(patents))],
+                 columns['patent_range_offsets'], columns['patent_ranges'])
+    columns['row_keys'].extend(sorted(row_ranges))
+    _pack_ranges([row_ranges[row] for row in columns['row_keys']],
+                 columns['row_range_offsets'], columns['row_ranges'])
+
+    buffers = {name: column.tobytes() for name, column in columns.items()}
+    buffers['claim_text_data'] = b''.join(text_parts['claim_text'])
+    buffers['original_text_data'] = b''.join(text_parts['original_text'])
+    buffers['patent_dict_data'] = ''.join(patents).encode('utf-8')
+    buffers['patent_numbers_json'] = _dump_json(result.patent_numbers)
+    buffers['processing_errors_json'] = _dump_json([asdict(error) for error in result.processing_errors])
+
+    layout = {}
+    offset = 0
+    for name, data in buffers.items():
+        layout[name] = [offset, len(data)]
+        offset = _align(offset + len(data))
+
+    header = {
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'count': len(claims),
+        'summary': {
+            'total_cells_processed': result.total_cells_processed,
+            'total_claims_extracted': result.total_claims_extracted,
+            'language_distribution': result.language_distribution,
+            'independent_claims_count': result.independent_claims_count,
+            'dependent_claims_count': result.dependent_claims_count,
+            'error_count': len(result.processing_errors),
+        },
+        'dictionaries': {name: list(values) for name, values in dictionaries.items()},
+        'columns': layout,
+    }
+    header_bytes = _dump_json(header)
+    data_start = _align(len(MAGIC) + _HEADER_LENGTH.size + len(header_bytes))
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in buffers.items():
+            f.write(b'\0' * (data_start + layout[name][0] - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ClaimsResultFile:
+    """
+    只读打开的列式结果文件
+
+    属性与ProcessedClaims一致，可直接替代ProcessedClaims使用。claims_data、
+    processing_errors和patent_numbers在首次访问时才解码；按专利号、按行读取
+    时只解码对应的权利要求。
+    """
+
+    def __init__(self, path: str):
+        """
+        打开结果文件
+
+        Args:
+            path: 结果文件路径
+
+        Raises:
+            ValueError: 文件格式不正确
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"不是权利要求结果文件: {path}")
+            header_start = len(MAGIC) + _HEADER_LENGTH.size
+            (header_length,) = _HEADER_LENGTH.unpack_from(self._mmap, len(MAGIC))
+            header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+            if header.get('version') != FORMAT_VERSION or header.get('byteorder') != sys.byteorder:
+                raise ValueError(f"不支持的结果文件版本或字节序: {path}")
+        except Exception:
+            self._mmap.close()
+            raise
+
+        data_start = _align(header_start + header_length)
+        self._view = memoryview(self._mmap)
+        self._columns = {
+            name: self._view[data_start + offset:data_start + offset + length].cast(_COLUMN_TYPES[name])
+            for name, (offset, length) in header['columns'].items()
+        }
+        self._dictionaries = header['dictionaries']
+        self._count = header['count']
+        self._claims: Optional[List[ClaimInfo]] = None
+        self._errors: Optional[List[ProcessingError]] = None
+        self._patent_numbers = None
+        self._patent_codes: Optional[Dict[str, int]] = None
+
+        summary = header['summary']
+        self.total_cells_processed = summary['total_cells_processed']
+        self.total_claims_extracted = summary['total_claims_extracted']
+        self.language_distribution = summary['language_distribution']
+        self.independent_claims_count = summary['independent_claims_count']
+        self.dependent_claims_count = summary['dependent_claims_count']
+        self.error_count = summary['error_count']
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> 'ClaimsResultFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def claims_data(self) -> List[ClaimInfo]:
+        """全部权利要求（首次访问时解码并缓存）"""
+        if self._claims is None:
+            self._claims = self.claims_slice(0, self._count)
+        return self._claims
+
+    @property
+    def processing_errors(self) -> List[ProcessingError]:
+        """处理错误列表（首次访问时解码并缓存）"""
+        if self._errors is None:
+            self._errors = [ProcessingError(**error) for error in self._load_json('processing_errors_json')]
+        return self._errors
+
+    @property
+    def patent_numbers(self) -> Optional[List[str]]:
+        """关联的专利公开号列表（首次访问时解码并缓存）"""
+        if self._patent_numbers is None:
+            self._patent_numbers = self._load_json('patent_numbers_json')
+        return self._patent_numbers
+
+    def claim(self, position: int) -> ClaimInfo:
+        """解码指定位置的权利要求"""
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        columns = self._columns
+        row_index = columns['row_index'][position]
+        patent_code = columns['patent_number'][position]
+        references = columns['referenced_offsets']
+        return ClaimInfo(
+            claim_number=columns['claim_number'][position],
+            claim_type=self._lookup('claim_type', position),
+            claim_text=self._string('claim_text', position),
+            language=self._lookup('language', position),
+            referenced_claims=columns['referenced_values'][references[position]:references[position + 1]].tolist(),
+            original_text=self._string('original_text', position),
+            confidence_score=columns['confidence_score'][position],
+            patent_number=None if patent_code < 0 else self._string('patent_dict', patent_code),
+            row_index=None if row_index < 0 else row_index
+        )
+
+    def claims_slice(self, start: int, stop: int) -> List[ClaimInfo]:
+        """解码位置在[start, stop)范围内的权利要求"""
+        return [self.claim(position) for position in range(max(0, start), min(stop, self._count))]
+
+    def claims_for_patent(self, patent_number: str) -> List[ClaimInfo]:
+        """指定专利号的权利要求（按原顺序）"""
+        if self._patent_codes is None:
+            offsets = self._columns['patent_dict_offsets']
+            self._patent_codes = {self._string('patent_dict', code): code for code in range(len(offsets) - 1)}
+        code = self._patent_codes.get(patent_number)
+        return [] if code is None else self._claims_in_ranges('patent', code)
+
+    def claims_for_row(self, row_index: int) -> List[ClaimInfo]:
+        """指定Excel行的权利要求（按原顺序）"""
+        keys = self._columns['row_keys']
+        slot = bisect_left(keys, row_index)
+        if slot == len(keys) or keys[slot] != row_index:
+            return []
+        return self._claims_in_ranges('row', slot)
+
+    def claims_in_rows(self, start: int, stop: int) -> List[ClaimInfo]:
+        """行索引在[start, stop)范围内的权利要求（按行排序）"""
+        keys = self._columns['row_keys']
+        claims = []
+        for slot in range(bisect_left(keys, start), bisect_left(keys, stop)):
+            claims.extend(self._claims_in_ranges('row', slot))
+        return claims
+
+    def to_processed_claims(self) -> ProcessedClaims:
+        """完整解码为ProcessedClaims"""
+        return ProcessedClaims(
+            total_cells_processed=self.total_cells_processed,
+            total_claims_extracted=self.total_claims_extracted,
+            language_distribution=dict(self.language_distribution),
+            independent_claims_count=self.independent_claims_count,
+            dependent_claims_count=self.dependent_claims_count,
+            processing_errors=list(self.processing_errors),
+            claims_data=list(self.claims_data),
+            patent_numbers=list(self.patent_numbers) if self.patent_numbers is not None else None
+        )
+
+    def close(self) -> None:
+        """释放映射（之后不能再读取权利要求）"""
+        for column in self._columns.values():
+            column.release()
+        self._columns = {}
+        self._view.release()
+        self._mmap.close()
+
+    def _claims_in_ranges(self, index: str, slot: int) -> List[ClaimInfo]:
+        offsets = self._columns[f'{index}_range_offsets']
+        ranges = self._columns[f'{index}_ranges']
+        claims = []
+        for i in range(offsets[slot], offsets[slot + 1], 2):
+            claims.extend(self.claims_slice(ranges[i], ranges[i + 1]))
+        return claims
+
+    def _lookup(self, name: str, position: int) -> Optional[str]:
+        code = self._columns[name][position]
+        return None if code < 0 else self._dictionaries[name][code]
+
+    def _string(self, name: str, position: int) -> str:
+        offsets = self._columns[f'{name}_offsets']
+        return self._columns[f'{name}_data'][offsets[position]:offsets[position + 1]].tobytes().decode('utf-8')
+
+    def _load_json(self, name: str):
+        return json.loads(self._columns[name].tobytes().decode('utf-8'))
+
+
+def load_processed_claims(path: str) -> ClaimsResultFile:
+    """打开列式结果文件"""
+    return ClaimsResultFile(path)
+
+
+def _add_to_ranges(ranges: List[int], position: int) -> None:
+    """将位置加入平铺的区间列表[起始, 结束, ...]（相邻位置合并为一个区间）"""
+    if ranges and ranges[-1] == position:
+        ranges[-1] = position + 1
+    else:
+        ranges.extend((position, position + 1))
+
+
+def _pack_ranges(range_lists: List[List[int]], offsets: array, values: array) -> None:
+    offsets.append(0)
+    for ranges in range_lists:
+        values.extend(ranges)
+        offsets.append(len(values))
+
+
+def _pack_strings(strings: List[str], offsets: array) -> None:
+    offsets.append(0)
+    for value in strings:
+        offsets.append(offsets[-1] + len(value.encode('utf-8')))
+
+
+def _dump_json(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
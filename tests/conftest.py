@@ -8,14 +8,22 @@ import pytest
 import pandas as pd
 import tempfile
 import os
+from collections import Counter
 from typing import Dict, Any
 
-from patent_claims_processor.models import ClaimInfo, ExcelInputData
+from patent_claims_processor.models import ClaimInfo, ExcelInputData, ProcessedClaims
 from patent_claims_processor.processors import (
     ExcelProcessor, LanguageDetector, ClaimsParser, ClaimsClassifier
 )
 from patent_claims_processor.services import ProcessingService
 
+# 标准权利要求单元格：zh/en为两项权利要求（第2项引用第1项），none为无编号文本
+CLAIMS_CELLS = {
+    'zh': "1. 一种数据处理装置，包括处理器。\n2. 根据权利要求1所述的装置，其特征在于，还包括存储器。",
+    'en': "1. A device comprising a processor.\n2. The device of claim 1, further comprising a memory.",
+    'none': '没有编号的文本',
+}
+
 
 @pytest.fixture
 def sample_excel_data():
@@ -110,4 +118,125 @@ def multilingual_claims_text():
     
     1. A computer system comprising a processor and memory.
     2. The computer system of claim 1, wherein the processor is a multi-core processor.
-    """
\ No newline at end of file
+    """
+
+
+@pytest.fixture
+def make_claim():
+    """
+    权利要求信息工厂
+
+    make_claim(序号, 行号, 专利号, 文本, 引用)：有引用的为从属权利要求，
+    文本以非ASCII字符开头的语言为zh，否则为en。
+    """
+    def make(number, row=0, patent='CN1A', text='一种装置。', references=()):
+        return ClaimInfo(
+            claim_number=number,
+            claim_type='dependent' if references else 'independent',
+            claim_text=text,
+            language='zh' if text and ord(text[0]) > 127 else 'en',
+            referenced_claims=list(references),
+            original_text=f'{number}. {text}',
+            confidence_score=0.8,
+            patent_number=patent,
+            row_index=row
+        )
+    return make
+
+
+@pytest.fixture
+def make_processed_claims():
+    """
+    处理结果工厂
+
+    make_processed_claims(权利要求列表, 错误列表, 专利号列表)：数量、语言分布和
+    处理的单元格数（不同行号的个数）按权利要求列表统计。
+    """
+    def make(claims, errors=(), patent_numbers=None):
+        independent = sum(1 for claim in claims if claim.claim_type == 'independent')
+        return ProcessedClaims(
+            total_cells_processed=len({claim.row_index for claim in claims if claim.row_index is not None}),
+            total_claims_extracted=len(claims),
+            language_distribution=dict(Counter(claim.language for claim in claims)),
+            independent_claims_count=independent,
+            dependent_claims_count=len(claims) - independent,
+            processing_errors=list(errors),
+            claims_data=list(claims),
+            patent_numbers=patent_numbers
+        )
+    return make
+
+
+@pytest.fixture
+def claims_cells():
+    """标准权利要求单元格文本（见CLAIMS_CELLS）"""
+    return dict(CLAIMS_CELLS)
+
+
+@pytest.fixture
+def make_claims_workbook(tmp_path):
+    """
+    权利要求Excel工作簿工厂
+
+    make_claims_workbook(行数, cell, patent, 文件名)：在tmp_path下写入Claims和Patent两列，
+    第i行为cell(i)和patent(i)，返回文件路径。cell返回CLAIMS_CELLS的键（zh/en/none）
+    或直接返回单元格文本；默认奇数行中文、偶数行英文，专利号为CN{i}A。
+    """
+    def make(count, cell=lambda i: 'zh' if i % 2 else 'en', patent=lambda i: f'CN{i}A', name='claims.xlsx'):
+        rows = []
+        for i in range(count):
+            text = cell(i)
+            rows.append({'Claims': CLAIMS_CELLS.get(text, text), 'Patent': patent(i)})
+        path = tmp_path / name
+        pd.DataFrame(rows).to_excel(path, index=False)
+        return str(path)
+    return make
+
+
+@pytest.fixture
+def summarize_result():
+    """
+    处理结果摘要
+
+    summarize_result(ProcessedClaims)：权利要求（含行号、专利号、引用、原文和置信度）、
+    错误、语言分布（保留顺序）、专利号和处理的单元格数，用于逐项比较两次处理的结果。
+    """
+    def summarize(result):
+        return (
+            [(c.row_index, c.patent_number, c.claim_number, c.claim_type, c.language, c.referenced_claims,
+              c.claim_text, c.original_text, c.confidence_score) for c in result.claims_data],
+            [(e.error_type, e.cell_index, e.severity) for e in result.processing_errors],
+            list(result.language_distribution.items()),
+            result.patent_numbers,
+            result.total_cells_processed,
+        )
+    return summarize
+
+
+@pytest.fixture
+def claims_client(tmp_path, monkeypatch):
+    """
+    权利要求接口测试客户端
+
+    任务目录为tmp_path/tasks，任务存储和结果缓存为测试独立的内存实例，
+    会话中已登录。其他配置（上传目录、分块大小、任务存储后端等）由测试
+    自行用monkeypatch覆盖。
+    """
+    from flask import Flask
+
+    import backend.routes.claims as claims_routes
+    from backend.utils.task_store import MemoryTaskStore
+
+    tasks_folder = tmp_path / 'tasks'
+    tasks_folder.mkdir()
+    monkeypatch.setattr(claims_routes, 'TASKS_FOLDER', str(tasks_folder))
+    monkeypatch.setattr(claims_routes, 'task_store', MemoryTaskStore())
+    monkeypatch.setattr(claims_routes, '_task_results', claims_routes.OrderedDict())
+
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(claims_routes.claims_bp, url_prefix='/api')
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user'] = 'tester'
+    return client
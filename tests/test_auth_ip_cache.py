@@ -0,0 +1,160 @@
+"""
+IP绑定校验缓存测试
+
+验证verify_user_ip在缓存有效期内不再查询数据库、manage_user_ip变更绑定后缓存立即失效，
+以及数据库连接池的借出统计。
+"""
+
+import threading
+
+import psycopg2
+import psycopg2.pool
+import pytest
+
+import backend.services.auth_service as auth_service
+from backend.extensions import InstrumentedConnectionPool
+from backend.services.auth_service import AuthService
+
+
+class FakeCursor:
+    """按user_ips表内容应答SELECT/INSERT，记录执行的语句"""
+
+    def __init__(self, db):
+        self.db = db
+        self.row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.db.queries.append(sql)
+        if sql.startswith('SELECT 1'):
+            self.row = (1,) if params in self.db.bindings else None
+        elif sql.startswith('SELECT COUNT'):
+            self.row = (sum(1 for user, _ in self.db.bindings if user == params[0]),)
+        elif sql.startswith('INSERT'):
+            self.db.bindings.add(params)
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeDb:
+    """模拟连接池：每次借出返回同一个假连接"""
+
+    def __init__(self, bindings=()):
+        self.bindings = set(bindings)
+        self.queries = []
+
+    def getconn(self):
+        return self
+
+    def putconn(self, conn):
+        pass
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDb({('alice', '10.0.0.1')})
+    monkeypatch.setattr(auth_service, 'get_db_pool', lambda: fake)
+    monkeypatch.setattr(auth_service, 'AUTH_IP_CACHE_TTL_SECONDS', 30)
+    AuthService.invalidate_ip_cache()
+    yield fake
+    AuthService.invalidate_ip_cache()
+
+
+class TestIpVerificationCache:
+    """IP绑定校验缓存测试类"""
+
+    def test_repeat_verification_skips_database(self, db):
+        """测试缓存有效期内已绑定IP只查询一次数据库，未绑定IP每次都查询"""
+        for _ in range(5):
+            assert AuthService.verify_user_ip('alice', '10.0.0.1')
+            assert not AuthService.verify_user_ip('alice', '10.0.0.2')
+
+        assert len(db.queries) == 6
+        stats = AuthService.get_ip_cache_stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (4, 6, 1)
+
+    def test_denied_ip_rechecked_after_binding_added_elsewhere(self, db):
+        """测试被拒绝的IP在其他工作进程登录绑定后（本进程缓存未失效）立即放行"""
+        assert not AuthService.verify_user_ip('alice', '10.0.0.2')
+
+        db.bindings.add(('alice', '10.0.0.2'))
+
+        assert AuthService.verify_user_ip('alice', '10.0.0.2')
+
+    def test_manage_user_ip_invalidates(self, db):
+        """测试登录绑定新IP后，该用户的缓存结果立即失效"""
+        assert not AuthService.verify_user_ip('alice', '10.0.0.2')
+
+        assert AuthService.manage_user_ip('alice', '10.0.0.2')
+
+        assert AuthService.verify_user_ip('alice', '10.0.0.2')
+
+    def test_expired_entry_is_rechecked(self, db):
+        """测试缓存过期后重新查询数据库"""
+        AuthService.verify_user_ip('alice', '10.0.0.1')
+        db.bindings.clear()
+        auth_service._ip_cache[('alice', '10.0.0.1')] = 0
+
+        assert not AuthService.verify_user_ip('alice', '10.0.0.1')
+
+    def test_ttl_zero_disables_cache(self, db, monkeypatch):
+        """测试TTL为0时每次都查询数据库"""
+        monkeypatch.setattr(auth_service, 'AUTH_IP_CACHE_TTL_SECONDS', 0)
+
+        AuthService.verify_user_ip('alice', '10.0.0.1')
+        AuthService.verify_user_ip('alice', '10.0.0.1')
+
+        assert len(db.queries) == 2
+
+
+class FakeConnection:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestInstrumentedConnectionPool:
+    """连接池统计测试类"""
+
+    def test_checkout_metrics(self, monkeypatch):
+        """测试多线程借出归还后的统计，以及连接耗尽计数"""
+        monkeypatch.setattr(psycopg2, 'connect', lambda *args, **kwargs: FakeConnection())
+        pool = InstrumentedConnectionPool(0, 2, dsn='postgresql://test')
+        barrier = threading.Barrier(2)
+
+        def borrow():
+            conn = pool.getconn()
+            barrier.wait()
+            pool.putconn(conn)
+
+        threads = [threading.Thread(target=borrow) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        held = [pool.getconn(), pool.getconn()]
+        with pytest.raises(psycopg2.pool.PoolError):
+            pool.getconn()
+        for conn in held:
+            pool.putconn(conn)
+
+        stats = pool.stats()
+        assert stats['checkouts'] == 4
+        assert stats['in_use'] == 0
+        assert stats['peak_in_use'] == 2
+        assert stats['exhausted'] == 1
+        assert stats['max_connections'] == 2
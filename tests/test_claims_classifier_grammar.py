@@ -0,0 +1,150 @@
+"""
+权利要求引用语法测试
+
+使用基于属性的测试验证预编译的单次扫描引用语法与逐关键词、逐格式匹配的
+原实现结果完全一致。
+"""
+
+import re
+
+from hypothesis import given, settings, strategies as st
+
+from patent_claims_processor.processors.claims_classifier import ClaimsClassifier
+
+classifier = ClaimsClassifier()
+
+TOKENS = [
+    '1', '2', '3', '10', '0', ' ', '  ', '\n', ',', '，', '-', '~', '至', '到', 'to', ' to ', 't',
+    ' bis ', ' or ', ' und ', ' oder ', ' and ', ' AND ', '或', '和', '.', ':', '、', ')',
+    'claim', 'claims', 'Claim ', 'CLAIMS ', 'claimed', 'as claimed in', 'according to claim', 'of claim',
+    'preceding', 'the above claims', 'aforementioned', 'anspruch', 'Anspruch ', 'Ansprüche ', 'anspruchs',
+    'vorstehende ansprüche', 'obig', '权利要求', '根据权利要求', '前述', '上述', '所述', '一种装置',
+    'wherein', 'x' * 30,
+]
+
+# 原实现中各语言的连接词格式：(适用语言, 正则, 类型)
+LEGACY_RULES = [
+    (['en', 'other'], r'claim[s]?\s+(\d+)\s+to\s+(\d+)', 'range'),
+    (['de', 'other'], r'anspruch[s]?\s+(\d+)\s+bis\s+(\d+)', 'range'),
+    (['en', 'de', 'other'], r'claim[s]?\s+(\d+(?:\s*(?:or|und)\s*\d+)+)', 'alternatives'),
+    (['de', 'other'], r'anspruch[s]?\s+(\d+(?:\s*(?:und|oder)\s*\d+)+)', 'alternatives'),
+    (['zh', 'other'], r'权利要求\s*(\d+(?:\s*或\s*\d+)+)', 'alternatives'),
+    (['en', 'other'], r'claim[s]?\s+((?:\d+\s*to\s*\d+)(?:\s*and\s*(?:\d+\s*to\s*\d+|\d+))*)',
+     (r'\s*and\s*', r'(\d+)\s*to\s*(\d+)')),
+    (['de', 'other'], r'anspruch[s]?\s+((?:\d+\s*bis\s*\d+)(?:\s*und\s*(?:\d+\s*bis\s*\d+|\d+))*)',
+     (r'\s*und\s*', r'(\d+)\s*bis\s*(\d+)')),
+    (['zh', 'other'], r'权利要求\s*((?:\d+\s*(?:至|到)\s*\d+)(?:\s*和\s*(?:\d+\s*(?:至|到)\s*\d+|\d+))*)',
+     (r'\s*和\s*', r'(\d+)\s*(?:至|到)\s*(\d+)')),
+]
+
+LEGACY_PHRASES = {'en': ['claims', 'claim'], 'de': ['anspruch', 'ansprüche', 'anspruchs'],
+                  'zh': ['权利要求'], 'other': ['claim', 'claims']}
+
+
+def legacy_parse(number_string):
+    """原_parse_claim_numbers"""
+    numbers = []
+    processed = re.sub(r'\s*(?:or|und|and|bis|或)\s*', ',', number_string, flags=re.IGNORECASE)
+    for part in re.split(r'[,，]', processed):
+        range_match = re.search(r'(\d+)\s*(?:[-~至到]|to|bis)\s*(\d+)', part.strip(), re.IGNORECASE)
+        if range_match:
+            numbers.extend(range(int(range_match.group(1)), int(range_match.group(2)) + 1))
+        else:
+            digit_match = re.search(r'\d+', part)
+            if digit_match:
+                numbers.append(int(digit_match.group()))
+    return numbers
+
+
+def legacy_extract(text, language):
+    """逐关键词、逐格式匹配的参考实现（原实现）"""
+    if not text or not text.strip():
+        return []
+    for pattern in [r'^\s*\d+\s*[\.、\)\:]*', r'^\s*claim\s+\d+\s*[\.\:]\s*', r'^\s*claims\s+\d+\s*[\.\:]\s*',
+                    r'^\s*anspruch\s+\d+\s*[\.\:]\s*', r'^\s*ansprüche\s+\d+\s*[\.\:]\s*',
+                    r'^\s*权利要求\s*\d+\s*[\.\:]\s*']:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            text = text[match.end():]
+            break
+
+    keywords = classifier.reference_keywords.get(language, classifier.reference_keywords['other'])
+    forward = classifier.forward_reference_keywords.get(language, classifier.forward_reference_keywords['other'])
+    referenced, has_keywords = set(), False
+
+    for keyword in keywords:
+        pattern = (rf'{re.escape(keyword)}\s*((?:\d+\s*[-~至到to]\s*\d+)|\d+)'
+                   rf'(?:\s*[,，]\s*(?:\d+\s*[-~至到to]\s*\d+|\d+))*')
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            has_keywords = True
+            referenced.update(legacy_parse(re.sub(r'\s*to\s*', '-', match, flags=re.IGNORECASE)))
+
+    for languages, pattern, kind in LEGACY_RULES:
+        match = re.search(pattern, text, re.IGNORECASE) if language in languages else None
+        if not match:
+            continue
+        has_keywords = True
+        if kind == 'range':
+            referenced.update(range(int(match.group(1)), int(match.group(2)) + 1))
+        elif kind == 'alternatives':
+            referenced.update(int(number) for number in re.findall(r'\d+', match.group(1)))
+        else:
+            for part in re.split(kind[0], match.group(1)):
+                range_match = re.search(kind[1], part, re.IGNORECASE)
+                if range_match:
+                    referenced.update(range(int(range_match.group(1)), int(range_match.group(2)) + 1))
+                elif re.search(r'\d+', part):
+                    referenced.add(int(re.search(r'\d+', part).group()))
+
+    def has_forward(context):
+        return any(re.search(re.escape(keyword), context, re.IGNORECASE) for keyword in forward)
+
+    if not referenced:
+        for keyword in keywords:
+            for match in re.finditer(re.escape(keyword), text, re.IGNORECASE):
+                words = text[:match.start()].split()[-3:] + text[match.end():].split()[:3]
+                if not any(char.isdigit() for word in words for char in word):
+                    context = text[max(0, match.start() - 50):min(len(text), match.end() + 50)]
+                    return ['previous'] if has_forward(context) else ['all']
+
+    if not has_keywords:
+        phrases = LEGACY_PHRASES.get(language, LEGACY_PHRASES['other'])
+        if any(re.search(re.escape(phrase), text, re.IGNORECASE) for phrase in phrases):
+            return ['previous'] if has_forward(text) else ['all']
+
+    return sorted(referenced)
+
+
+claim_text = st.lists(st.sampled_from(TOKENS), max_size=16).map(''.join)
+language = st.sampled_from(['zh', 'en', 'de', 'other', 'ja'])
+
+
+class TestReferenceGrammar:
+    """引用语法一致性测试类"""
+
+    @settings(max_examples=1000, deadline=None)
+    @given(claim_text, language)
+    def test_matches_legacy_extraction(self, text, lang):
+        """测试引用提取结果与原实现一致"""
+        assert classifier.extract_referenced_claims(text, lang) == legacy_extract(text, lang)
+
+    @settings(max_examples=300, deadline=None)
+    @given(claim_text, language)
+    def test_analyze_claim_matches_separate_calls(self, text, lang):
+        """测试一次解析的类型和引用与分别调用的结果一致"""
+        claim_type, references = classifier.analyze_claim(text, lang)
+
+        assert claim_type == classifier.classify_claim_type(text, lang)
+        expected = classifier.extract_referenced_claims(text, lang) if claim_type == 'dependent' else []
+        assert references == expected
+
+    def test_examples(self):
+        """测试典型的引用写法"""
+        assert classifier.analyze_claim('2. 根据权利要求1至3和5所述的装置', 'zh') == ('dependent', [1, 2, 3, 5])
+        assert classifier.analyze_claim('The device of claims 1 to 3 and 5 to 6', 'en') == (
+            'dependent', [1, 2, 3, 5, 6])
+        assert classifier.analyze_claim('Vorrichtung nach Anspruch 1 oder 2', 'de') == ('dependent', [1, 2])
+        assert classifier.analyze_claim('A device according to any preceding claim', 'en') == (
+            'dependent', ['previous'])
+        assert classifier.analyze_claim('1. 一种装置，包括处理器。', 'zh') == ('independent', [])
+        assert classifier.analyze_claim('', 'en') == ('independent', [])
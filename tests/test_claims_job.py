@@ -0,0 +1,167 @@
+"""
+可续跑的权利要求处理任务测试
+
+验证分块检查点、中断后续跑的结果与一次性处理一致，以及运行租约。
+"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import backend.routes.claims as claims_routes
+from patent_claims_processor.services import ClaimsJob, ProcessingService
+
+@pytest.fixture
+def excel_file(make_claims_workbook):
+    return make_claims_workbook(23, cell=lambda i: 'none' if i % 10 == 4 else ('zh' if i % 2 else 'en'),
+                                patent=lambda i: f'CN{i % 5}A')
+
+
+def make_job(excel_file, checkpoint_dir, **kwargs):
+    return ClaimsJob(ProcessingService(chunk_size=5), str(checkpoint_dir), excel_file, 'Claims',
+                     patent_column_name='Patent', **kwargs)
+
+
+class TestClaimsJob:
+    """分块检查点任务测试类"""
+
+    def test_result_matches_single_pass(self, excel_file, tmp_path, summarize_result):
+        """测试分块处理结果与process_excel_file一致"""
+        expected = ProcessingService().process_excel_file(excel_file, 'Claims', patent_column_name='Patent')
+        progress = []
+
+        result = make_job(excel_file, tmp_path / 'job').run(progress_callback=lambda c, t: progress.append(c))
+
+        assert summarize_result(result) == summarize_result(expected)
+        assert progress == [5, 10, 15, 20, 23]
+
+    def test_resume_skips_completed_chunks(self, excel_file, tmp_path, summarize_result, monkeypatch):
+        """测试中断后新任务对象从最后完成的块继续"""
+        expected = make_job(excel_file, tmp_path / 'reference').run()
+
+        first = make_job(excel_file, tmp_path / 'job')
+        assert first.run(should_stop=lambda: first.service.processing_state['current_cell_index'] >= 9) is None
+
+        second = make_job(excel_file, tmp_path / 'job')
+        processed_starts = []
+        original = second.service._process_cells
+
+        def record(cells, row_patent_numbers, start_index, *args, **kwargs):
+            processed_starts.append(start_index)
+            return original(cells, row_patent_numbers, start_index, *args, **kwargs)
+
+        monkeypatch.setattr(second.service, '_process_cells', record)
+        result = second.run()
+
+        assert processed_starts == [10, 15, 20]
+        assert summarize_result(result) == summarize_result(expected)
+
+    def test_changed_file_discards_checkpoint(self, excel_file, tmp_path, claims_cells):
+        """测试文件变化后检查点作废"""
+        job = make_job(excel_file, tmp_path / 'job')
+        job.run(should_stop=lambda: True)
+
+        rows = {'Claims': [claims_cells['en']] * 3, 'Patent': ['US1'] * 3}
+        pd.DataFrame(rows).to_excel(excel_file, index=False)
+        result = make_job(excel_file, tmp_path / 'job').run()
+
+        assert result.total_cells_processed == 3
+        assert result.patent_numbers == ['US1']
+
+    def test_lease(self, excel_file, tmp_path):
+        """测试运行租约：有效租约不可重复获取，失效租约可接管"""
+        first = make_job(excel_file, tmp_path / 'job', stale_seconds=60)
+        second = make_job(excel_file, tmp_path / 'job', stale_seconds=60)
+
+        assert first.acquire()
+        assert not second.acquire()
+
+        lock_path = os.path.join(str(tmp_path / 'job'), ClaimsJob.LOCK_FILE)
+        os.utime(lock_path, (time.time() - 120, time.time() - 120))
+        assert second.acquire()
+
+        first.release()
+        assert os.path.exists(lock_path)
+        second.release()
+        assert not os.path.exists(lock_path)
+
+    def test_lease_renewed_during_long_steps(self, excel_file, tmp_path, monkeypatch):
+        """测试读取文件和处理单块耗时超过失效时间时，租约和任务心跳仍持续续期"""
+        job = make_job(excel_file, tmp_path / 'job', stale_seconds=0.3)
+        rival = make_job(excel_file, tmp_path / 'job', stale_seconds=0.3)
+        heartbeats, taken_over = [], []
+        read_columns = job.service.excel_processor.read_columns
+        process_cells = job.service._process_cells
+
+        def slow_read(*args, **kwargs):
+            time.sleep(0.8)
+            taken_over.append(rival.acquire())
+            return read_columns(*args, **kwargs)
+
+        def slow_chunk(*args, **kwargs):
+            time.sleep(0.8)
+            taken_over.append(rival.acquire())
+            return process_cells(*args, **kwargs)
+
+        monkeypatch.setattr(job.service.excel_processor, 'read_columns', slow_read)
+        monkeypatch.setattr(job.service, '_process_cells', slow_chunk)
+        assert job.acquire()
+
+        job.run(should_stop=lambda: True, heartbeat_callback=lambda: heartbeats.append(time.time()))
+
+        assert taken_over == [False, False]
+        assert len(heartbeats) >= 4
+        count = len(heartbeats)
+        time.sleep(0.3)
+        assert len(heartbeats) == count
+        job.release()
+
+
+@pytest.fixture
+def client(claims_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(claims_routes, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setattr(claims_routes, 'CLAIMS_PROCESSING_WORKERS', 1)
+    monkeypatch.setattr(claims_routes, 'CLAIMS_PROCESSING_CHUNK_SIZE', 5)
+    return claims_client
+
+
+class TestClaimsRoutesJob:
+    """任务续跑接口测试类"""
+
+    def test_stale_task_resumes_on_status_poll(self, client, excel_file, monkeypatch):
+        """测试worker退出后，查询状态时从检查点继续处理直到完成"""
+        task_id = 'task_claims'
+        file_id = os.path.basename(excel_file)
+        job = ClaimsJob(ProcessingService(chunk_size=5), claims_routes.get_job_dir(task_id), excel_file,
+                        'Claims', patent_column_name='Patent')
+        job.run(should_stop=lambda: True)
+        claims_routes.task_store.create(task_id, {
+            'status': 'processing', 'progress': 21, 'message': '正在处理... (5/23)', 'error': None,
+            'file_id': file_id, 'sheet_name': None, 'column_name': 'Claims', 'patent_column_name': 'Patent',
+            'start_time': time.time() - 600, 'updated_at': time.time() - 600, 'summary': None, 'result_ref': None
+        })
+        monkeypatch.setattr(claims_routes, 'start_claims_job',
+                            lambda *args: claims_routes.run_claims_job(*args))
+
+        client.get(f'/api/claims/status/{task_id}')
+        data = client.get(f'/api/claims/status/{task_id}').get_json()['data']
+
+        assert data['status'] == 'completed'
+        assert data['summary']['total_cells_processed'] == 23
+        assert not os.path.exists(claims_routes.get_job_dir(task_id))
+
+    def test_active_task_is_not_resumed(self, client, monkeypatch):
+        """测试仍在更新进度的任务不会被重复启动"""
+        claims_routes.task_store.create('task_busy', {
+            'status': 'processing', 'progress': 10, 'message': '正在处理...', 'file_id': 'x.xlsx',
+            'column_name': 'Claims', 'start_time': time.time() - 600, 'updated_at': time.time()
+        })
+
+        def fail(*args):
+            raise AssertionError("job restarted")
+
+        monkeypatch.setattr(claims_routes, 'start_claims_job', fail)
+
+        assert client.get('/api/claims/status/task_busy').get_json()['data']['status'] == 'processing'
@@ -0,0 +1,89 @@
+"""
+权利要求序号单次扫描测试
+
+使用基于属性的测试验证合并扫描与逐模式匹配的结果完全一致。
+"""
+
+from hypothesis import given, settings, strategies as st
+
+from patent_claims_processor.processors.claims_parser import ClaimsParser
+
+parser = ClaimsParser()
+
+TOKENS = [
+    '1', '2', '12', '0', '999', '1001', '.', '、', ')', '：', ' ', '  ', '\n', '\n\n', '\t',
+    '第', '项', '条', '权利要求', '权项', 'claim', 'Claim ', 'CLAIM', 'claims',
+    'revendication ', 'Anspruch ', 'ansprüche ', '特許請求の範囲 ', '請求項 ',
+    'reivindicación ', 'rivendicazione ', 'abc', '一种装置', 'CNA', 'wherein',
+]
+
+
+def legacy_matches(text):
+    """逐个模式 finditer 后排序去重的参考实现（原实现）"""
+    numbers_with_info = []
+    for pattern in parser.compiled_patterns:
+        for match in pattern.finditer(text):
+            number = int(match.group(1))
+            if 1 <= number <= 1000:
+                numbers_with_info.append({
+                    'number': number,
+                    'start': match.start(),
+                    'end': match.end(),
+                    'length': match.end() - match.start()
+                })
+
+    numbers_with_info.sort(key=lambda x: x['start'])
+
+    unique = []
+    i = 0
+    while i < len(numbers_with_info):
+        current = numbers_with_info[i]
+        overlapping = [current]
+        j = i + 1
+        while j < len(numbers_with_info) and numbers_with_info[j]['start'] < current['end']:
+            overlapping.append(numbers_with_info[j])
+            j += 1
+        best = max(overlapping, key=lambda x: x['length'])
+        unique.append((best['start'], best['end'], best['number']))
+        i = j
+    return unique
+
+
+claim_text = st.lists(st.sampled_from(TOKENS), max_size=40).map(''.join)
+
+
+class TestCombinedScanner:
+    """合并扫描一致性测试类"""
+
+    @settings(max_examples=400, deadline=None)
+    @given(claim_text)
+    def test_matches_per_pattern_reference(self, text):
+        """测试合并扫描与逐模式匹配的去重结果一致"""
+        selected = parser._select_longest_matches(parser._scan_number_matches(text))
+
+        assert [(start, end, number) for start, end, number, _ in selected] == legacy_matches(text)
+
+    @settings(max_examples=200, deadline=None)
+    @given(claim_text)
+    def test_extract_claim_numbers_matches_reference(self, text):
+        """测试extract_claim_numbers结果与原实现一致"""
+        expected = [number for _, _, number in legacy_matches(text)] if text.strip() else []
+
+        assert parser.extract_claim_numbers(text) == expected
+
+    def test_multilanguage_cell(self):
+        """测试多语言单元格"""
+        text = (
+            "1. 一种装置，包括处理器。\n2. 根据权利要求1所述的装置。\n"
+            "CNA\nClaim 1 A device comprising a processor.\nclaim 2 The device of claim 1.\n"
+            "Anspruch 1 Vorrichtung.\n請求項 1 装置。"
+        )
+
+        assert parser.extract_claim_numbers(text) == [1, 2, 1, 2, 1, 1]
+
+    def test_match_records_pattern(self):
+        """测试匹配元组记录模式索引"""
+        (start, end, number, k), = parser._scan_number_matches("第3项 内容")
+
+        assert (start, number) == (0, 3)
+        assert parser.number_patterns[k] == r'^\s*第\s*(\d+)\s*项\s*'
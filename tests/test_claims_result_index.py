@@ -0,0 +1,117 @@
+"""
+权利要求结果索引与分页测试
+
+验证ProcessedClaims按专利号、按行的索引，以及/claims/result按行区间分页。
+"""
+
+import pickle
+
+import pytest
+
+import backend.routes.claims as claims_routes
+from patent_claims_processor.models import ProcessingError
+from patent_claims_processor.services.result_storage import ClaimsResultFile, save_processed_claims
+
+
+@pytest.fixture
+def make_result(make_claim, make_processed_claims):
+    """每行两条权利要求，专利CN1A分布在第0、3、6、9行"""
+    def make(rows=10):
+        claims = []
+        for row in range(rows):
+            patent = 'CN1A' if row % 3 == 0 else f'US{row}B'
+            claims.append(make_claim(1, row, patent, f'claim 1 of row {row}'))
+            claims.append(make_claim(2, row, patent, f'claim 2 of row {row}', [1]))
+        errors = [ProcessingError('cell_parsing_warning', row, '未识别', '检查格式', 'warning') for row in (1, 7)]
+        return make_processed_claims(claims, errors)
+    return make
+
+
+class TestProcessedClaimsIndexes:
+    """ProcessedClaims索引测试类"""
+
+    def test_indexes_are_built_lazily(self, make_result):
+        """测试索引在首次查询时才建立"""
+        result = make_result()
+        assert result._patent_index is None
+
+        result.claims_for_row(0)
+
+        assert result._patent_index is not None
+        assert result._row_index is not None
+
+    def test_claims_for_patent_spans_non_adjacent_rows(self, make_result):
+        """测试同一专利分布在不相邻的行"""
+        result = make_result()
+
+        assert [c.row_index for c in result.claims_for_patent('CN1A')] == [0, 0, 3, 3, 6, 6, 9, 9]
+        assert result.claims_for_patent('EP9') == []
+
+    def test_claims_for_row_and_range(self, make_result):
+        """测试按行和按行区间读取"""
+        result = make_result()
+
+        assert [c.claim_number for c in result.claims_for_row(4)] == [1, 2]
+        assert result.claims_for_row(42) == []
+        assert [c.row_index for c in result.claims_in_rows(2, 5)] == [2, 2, 3, 3, 4, 4]
+        assert result.claims_in_rows(8, 100) == result.claims_data[16:]
+
+    def test_indexes_do_not_affect_equality_or_pickle(self, make_result):
+        """测试索引不影响比较和序列化"""
+        result = make_result()
+        result.claims_for_patent('CN1A')
+
+        assert result == make_result()
+        assert pickle.loads(pickle.dumps(result)).claims_for_row(5) == result.claims_for_row(5)
+
+    def test_result_file_range_matches(self, make_result, tmp_path):
+        """测试列式结果文件的行区间读取与内存结果一致"""
+        result = make_result()
+        path = str(tmp_path / 'result.claims')
+        save_processed_claims(path, result)
+
+        with ClaimsResultFile(path) as stored:
+            for start, stop in [(0, 3), (2, 5), (9, 20), (20, 30)]:
+                assert stored.claims_in_rows(start, stop) == result.claims_in_rows(start, stop)
+
+
+@pytest.fixture
+def client(claims_client, make_result):
+    claims_routes.save_task_to_disk('task_p', {'status': 'completed', 'result': make_result()})
+    return claims_client
+
+
+class TestPaginatedResult:
+    """结果分页接口测试类"""
+
+    def test_page_by_row_range(self, client):
+        """测试按行区间返回权利要求和错误"""
+        data = client.get('/api/claims/result/task_p?row_start=6&row_count=3').get_json()['data']
+
+        assert sorted({c['row_index'] for c in data['claims']}) == [6, 7, 8]
+        assert [e['cell_index'] for e in data['errors']] == [7]
+        assert data['pagination'] == {'row_start': 6, 'row_count': 3, 'total_rows': 10, 'has_more': True}
+        assert data['summary']['total_claims_extracted'] == 20
+
+    def test_last_page(self, client):
+        """测试最后一页"""
+        data = client.get('/api/claims/result/task_p?row_start=8').get_json()['data']
+
+        assert len(data['claims']) == 4
+        assert data['pagination']['has_more'] is False
+
+    def test_page_size_is_capped(self, client, monkeypatch):
+        """测试每页行数不超过上限"""
+        monkeypatch.setattr(claims_routes, 'MAX_RESULT_PAGE_ROWS', 4)
+
+        data = client.get('/api/claims/result/task_p?row_start=0&row_count=100').get_json()['data']
+
+        assert data['pagination']['row_count'] == 4
+        assert len(data['claims']) == 8
+
+    def test_without_paging_returns_everything(self, client):
+        """测试不带分页参数时返回全部结果"""
+        data = client.get('/api/claims/result/task_p').get_json()['data']
+
+        assert len(data['claims']) == 20
+        assert 'pagination' not in data
@@ -0,0 +1,131 @@
+"""
+列式结果文件测试
+
+验证写入后读取的结果与原ProcessedClaims完全一致，以及按专利号、按行的索引读取。
+"""
+
+import json
+
+import pytest
+
+import backend.routes.claims as claims_routes
+from patent_claims_processor.models import ProcessedClaims, ProcessingError
+from patent_claims_processor.services.result_storage import ClaimsResultFile, save_processed_claims
+
+
+@pytest.fixture
+def make_result(make_claim, make_processed_claims):
+    """同一专利分布在不相邻的行，包含空文本、无专利号和无行号的权利要求"""
+    def make():
+        claims = [
+            make_claim(1, 0, 'CN1A'),
+            make_claim(2, 0, 'CN1A', '根据权利要求1所述的装置 😀', [1]),
+            make_claim(1, 1, 'US2B', 'A device.'),
+            make_claim(2, 1, 'US2B', 'The device of claim 1.', [1]),
+            make_claim(0, 2, None, ''),
+            make_claim(1, 3, 'CN1A', 'Another version of CN1A.'),
+            make_claim(3, None, None, 'No row.', [1, 2]),
+        ]
+        errors = [ProcessingError('cell_parsing_warning', 2, '未识别', '检查格式', 'warning')]
+        return make_processed_claims(claims, errors, patent_numbers=['CN1A', 'US2B'])
+    return make
+
+
+@pytest.fixture
+def result_file(tmp_path, make_result):
+    path = str(tmp_path / 'result.claims')
+    save_processed_claims(path, make_result())
+    with ClaimsResultFile(path) as result:
+        yield result
+
+
+class TestClaimsResultFile:
+    """列式结果文件测试类"""
+
+    def test_round_trip(self, make_result, result_file):
+        """测试完整读取结果与原结果一致"""
+        assert result_file.to_processed_claims() == make_result()
+        assert len(result_file) == 7
+        assert result_file.error_count == 1
+
+    def test_claims_for_patent_spans_non_adjacent_rows(self, result_file):
+        """测试按专利号读取（同一专利分布在不相邻的行）"""
+        claims = result_file.claims_for_patent('CN1A')
+
+        assert [(c.row_index, c.claim_number) for c in claims] == [(0, 1), (0, 2), (3, 1)]
+        assert claims[1].referenced_claims == [1]
+        assert result_file.claims_for_patent('EP9') == []
+
+    def test_claims_for_row(self, result_file):
+        """测试按行读取"""
+        assert [c.claim_text for c in result_file.claims_for_row(1)] == ['A device.', 'The device of claim 1.']
+        assert result_file.claims_for_row(2)[0].patent_number is None
+        assert result_file.claims_for_row(99) == []
+
+    def test_empty_result(self, tmp_path):
+        """测试空结果"""
+        path = str(tmp_path / 'empty.claims')
+        empty = ProcessedClaims(0, 0, {}, 0, 0, [], [], None)
+        save_processed_claims(path, empty)
+
+        with ClaimsResultFile(path) as result:
+            assert result.to_processed_claims() == empty
+            assert result.claims_for_patent('CN1A') == []
+
+    def test_rejects_other_files(self, tmp_path):
+        """测试拒绝非结果文件"""
+        path = tmp_path / 'task.json'
+        path.write_text('{"status": "completed"}')
+
+        with pytest.raises(ValueError):
+            ClaimsResultFile(str(path))
+
+
+class TestClaimsRoutesResultFiles:
+    """任务结果文件接口测试类"""
+
+    def test_task_file_holds_only_the_reference(self, claims_client, make_result, tmp_path):
+        """测试任务JSON只保存结果引用，结果写入列式文件"""
+        claims_routes.save_task_to_disk('task_a', {'status': 'completed', 'result': make_result()})
+
+        task = json.loads((tmp_path / 'tasks' / 'task_a.json').read_text(encoding='utf-8'))
+
+        assert 'result' not in task
+        assert task['result_ref'] == 'task_a'
+        assert task['summary']['total_claims_extracted'] == 7
+        assert (tmp_path / 'tasks' / 'task_a.claims').exists()
+
+    def test_legacy_json_result_is_converted(self, claims_client, make_result, tmp_path):
+        """测试旧版本内嵌JSON结果的任务文件在首次读取时转换"""
+        result = make_result()
+        legacy = {
+            'status': 'completed', 'progress': 100, 'message': '处理完成',
+            'result': {
+                'total_cells_processed': result.total_cells_processed,
+                'total_claims_extracted': result.total_claims_extracted,
+                'language_distribution': result.language_distribution,
+                'independent_claims_count': result.independent_claims_count,
+                'dependent_claims_count': result.dependent_claims_count,
+                'claims_data': [claim.__dict__ for claim in result.claims_data],
+                'processing_errors': [error.__dict__ for error in result.processing_errors],
+            }
+        }
+        task_file = tmp_path / 'tasks' / 'task_b.json'
+        task_file.write_text(json.dumps(legacy, ensure_ascii=False, indent=2), encoding='utf-8')
+
+        data = claims_client.get('/api/claims/result/task_b').get_json()['data']
+
+        assert [c['claim_text'] for c in data['claims']] == [c.claim_text for c in result.claims_data]
+        assert 'result' not in json.loads(task_file.read_text(encoding='utf-8'))
+        assert (tmp_path / 'tasks' / 'task_b.claims').exists()
+
+    def test_visualization_reads_one_patent(self, claims_client, make_result):
+        """测试引证图接口按专利号读取权利要求"""
+        claims_routes.save_task_to_disk('task_c', {'status': 'completed', 'result': make_result()})
+
+        data = claims_client.post('/api/claims/visualization/task_c',
+                                  json={'patent_number': 'US2B'}).get_json()['data']
+        missing = claims_client.post('/api/claims/visualization/task_c', json={'row_index': 42})
+
+        assert data['claims_count'] == 2
+        assert missing.status_code == 404
@@ -0,0 +1,280 @@
+"""
+权利要求处理任务状态存储测试
+
+Redis后端使用内存中的假客户端，不需要Redis服务。
+"""
+
+import threading
+import time
+
+import pytest
+
+import backend.routes.claims as claims_routes
+from backend.utils.task_store import (
+    MemoryTaskStore, RedisTaskStore, SQLiteTaskStore, TaskStore, create_task_store
+)
+
+
+class FakeRedis:
+    """实现任务存储所用Redis命令的内存假客户端"""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.RLock()
+
+    def _alive(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def hset(self, name, mapping=None):
+        with self.lock:
+            self._alive(name)
+            self.data.setdefault(name, {}).update(
+                {k.encode(): v.encode() for k, v in mapping.items()}
+            )
+            return len(mapping)
+
+    def hgetall(self, name):
+        with self.lock:
+            return dict(self.data[name]) if self._alive(name) else {}
+
+    def exists(self, name):
+        with self.lock:
+            return int(self._alive(name))
+
+    def expire(self, name, seconds):
+        with self.lock:
+            if not self._alive(name):
+                return False
+            self.expires[name] = time.time() + seconds
+            return True
+
+    def delete(self, name):
+        with self.lock:
+            self.expires.pop(name, None)
+            return int(self.data.pop(name, None) is not None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        assert script == RedisTaskStore.UPDATE_SCRIPT
+
+        def update(keys, args):
+            # 与Lua脚本相同：在一次加锁内检查、写入并刷新过期时间
+            key, ttl, pairs = keys[0], args[0], args[1:]
+            with self.lock:
+                if not self._alive(key):
+                    return 0
+                if pairs:
+                    self.hset(key, mapping=dict(zip(pairs[::2], pairs[1::2])))
+                self.expire(key, ttl)
+                return 1
+        return update
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        with self.client.lock:
+            return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'redis'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        store = MemoryTaskStore()
+    elif request.param == 'sqlite':
+        store = SQLiteTaskStore(str(tmp_path / 'tasks.db'))
+    else:
+        store = RedisTaskStore(FakeRedis())
+    yield store
+    store.close()
+
+
+class TestTaskStore:
+    """任务存储后端测试类"""
+
+    def test_create_get_update_delete(self, store):
+        """测试基本读写"""
+        store.create('t1', {'status': 'processing', 'progress': 0, 'summary': None})
+
+        assert store.update('t1', progress=40, message='正在处理... (4/10)')
+        assert store.get('t1') == {
+            'status': 'processing', 'progress': 40, 'summary': None, 'message': '正在处理... (4/10)'
+        }
+
+        store.delete('t1')
+        assert store.get('t1') is None
+
+    def test_update_missing_task_is_not_recreated(self, store):
+        """测试更新不存在的任务返回False且不创建任务"""
+        assert store.update('missing', progress=10) is False
+        assert store.get('missing') is None
+
+    def test_create_replaces_existing_task(self, store):
+        """测试重新创建任务覆盖旧字段"""
+        store.create('t1', {'status': 'failed', 'error': 'boom'})
+        store.create('t1', {'status': 'processing'})
+
+        assert store.get('t1') == {'status': 'processing'}
+
+    def test_ttl_expiry(self, store):
+        """测试任务过期"""
+        store.ttl_seconds = 1
+        store.create('t1', {'status': 'processing'})
+        assert store.get('t1') is not None
+
+        time.sleep(1.1)
+
+        assert store.get('t1') is None
+        assert store.update('t1', progress=50) is False
+
+    def test_returned_dict_is_a_copy(self, store):
+        """测试修改返回值不影响存储内容"""
+        store.create('t1', {'status': 'processing', 'summary': {'error_count': 0}})
+        task = store.get('t1')
+        task['summary']['error_count'] = 99
+
+        assert store.get('t1')['summary'] == {'error_count': 0}
+
+
+class TestRedisTaskStore:
+    """Redis后端测试类"""
+
+    def test_update_racing_delete_never_leaves_partial_task(self):
+        """测试更新与删除并发时不会留下缺少status的任务"""
+        store = RedisTaskStore(FakeRedis())
+        stop = threading.Event()
+
+        def report_progress():
+            while not stop.is_set():
+                store.update('t1', progress=50)
+
+        thread = threading.Thread(target=report_progress)
+        thread.start()
+        try:
+            for _ in range(2000):
+                store.create('t1', {'status': 'processing'})
+                store.delete('t1')
+                task = store.get('t1')
+                assert task is None or 'status' in task
+        finally:
+            stop.set()
+            thread.join()
+
+        assert store.get('t1') is None
+
+    def test_task_store_is_abstract(self):
+        """测试接口不能直接实例化"""
+        with pytest.raises(TypeError):
+            TaskStore()
+
+
+class TestSQLiteAcrossWorkers:
+    """SQLite后端多worker共享测试类"""
+
+    def test_concurrent_updates_from_separate_connections(self, tmp_path):
+        """测试不同连接的并发更新互不丢失"""
+        db_path = str(tmp_path / 'tasks.db')
+        stores = [SQLiteTaskStore(db_path) for _ in range(4)]
+        stores[0].create('t1', {'status': 'processing'})
+
+        def work(index):
+            for i in range(20):
+                stores[index].update('t1', **{f'w{index}': i})
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        task = stores[3].get('t1')
+        assert task == {'status': 'processing', 'w0': 19, 'w1': 19, 'w2': 19, 'w3': 19}
+        for store in stores:
+            store.close()
+
+    def test_factory(self, tmp_path):
+        """测试按配置创建后端"""
+        assert isinstance(create_task_store('sqlite', db_path=str(tmp_path / 'a.db')), SQLiteTaskStore)
+        assert isinstance(create_task_store('memory'), MemoryTaskStore)
+        assert isinstance(create_task_store('redis'), MemoryTaskStore)
+        with pytest.raises(ValueError):
+            create_task_store('mongo')
+
+
+@pytest.fixture
+def result(make_claim, make_processed_claims):
+    return make_processed_claims([make_claim(1, 0, 'CN1A')])
+
+
+@pytest.fixture
+def worker_app(claims_client, tmp_path, monkeypatch):
+    """模拟两个worker：各自有独立的存储连接和结果缓存，共享同一数据库文件"""
+    db_path = str(tmp_path / 'tasks.db')
+    producer = SQLiteTaskStore(db_path)
+    monkeypatch.setattr(claims_routes, 'task_store', SQLiteTaskStore(db_path))
+    yield claims_client, producer
+    producer.close()
+    claims_routes.task_store.close()
+
+
+class TestClaimsRoutesWithTaskStore:
+    """任务状态接口测试类"""
+
+    def test_progress_visible_on_other_worker(self, worker_app):
+        """测试另一个worker写入的进度可直接查询到"""
+        client, producer = worker_app
+        producer.create('task_a', {'status': 'processing', 'progress': 0, 'message': '正在处理...',
+                                   'summary': None, 'result_ref': None})
+        producer.update('task_a', progress=35, message='正在处理... (35/100)')
+
+        data = client.get('/api/claims/status/task_a').get_json()['data']
+
+        assert data['status'] == 'processing'
+        assert data['progress'] == 35
+        assert data['message'] == '正在处理... (35/100)'
+
+    def test_completed_task_summary_and_result(self, worker_app, result):
+        """测试完成后的摘要来自任务存储，完整结果按引用从磁盘加载"""
+        client, producer = worker_app
+        claims_routes.save_task_to_disk('task_b', {'status': 'completed', 'progress': 100, 'result': result})
+        producer.create('task_b', {'status': 'completed', 'progress': 100, 'message': '处理完成',
+                                   'summary': claims_routes.build_result_summary(result), 'result_ref': 'task_b'})
+
+        status = client.get('/api/claims/status/task_b').get_json()['data']
+        detail = client.get('/api/claims/result/task_b').get_json()['data']
+
+        assert status['summary']['total_claims_extracted'] == 1
+        assert detail['claims'][0]['claim_text'] == '一种装置。'
+        assert 'task_b' in claims_routes._task_results
+
+    def test_legacy_disk_task_is_registered(self, worker_app, result):
+        """测试仅存在于磁盘的旧任务在首次访问时登记到任务存储"""
+        client, producer = worker_app
+        claims_routes.save_task_to_disk('task_c', {'status': 'completed', 'progress': 100,
+                                                   'message': '处理完成', 'result': result})
+
+        data = client.get('/api/claims/status/task_c').get_json()['data']
+
+        assert data['summary']['total_cells_processed'] == 1
+        assert producer.get('task_c')['result_ref'] == 'task_c'
+
+    def test_unknown_task(self, worker_app):
+        """测试任务不存在"""
+        client, _ = worker_app
+
+        assert client.get('/api/claims/status/nope').get_json()['data']['status'] == 'not_found'
+        assert client.get('/api/claims/result/nope').status_code == 404
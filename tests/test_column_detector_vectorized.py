@@ -0,0 +1,71 @@
+"""
+智能列识别向量化测试
+
+验证合并后的预编译正则与逐个匹配等价、样本值与逐列dropna().head(10)一致，
+以及analyze_all_columns只提取一次样本。
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from hypothesis import given, settings, strategies as st
+
+from backend.utils.column_detector import ColumnDetector
+
+detector = ColumnDetector()
+
+
+class TestVectorizedColumnDetector:
+    """向量化列识别测试类"""
+
+    @settings(max_examples=300, deadline=None)
+    @given(st.text(alphabet='CNUSEPZLAB0123456789.-/ 一种所述claimwhere', max_size=30))
+    def test_combined_patterns_match_any_pattern(self, value):
+        """测试合并正则与逐个正则任一匹配的结果相同"""
+        upper = value.strip().upper()
+        expected = any(re.search(pattern, upper) for pattern in detector.patent_number_patterns)
+        assert bool(detector._patent_number_regex.search(upper)) == expected
+
+        lower = value.strip().lower()
+        expected = any(indicator.lower() in lower for indicator in detector.claims_indicators)
+        assert bool(detector._claims_indicator_regex.search(lower)) == expected
+
+    def test_samples_match_per_column_head(self):
+        """测试样本值与逐列dropna().astype(str).head(10)一致，包括前面大量空值的列"""
+        rows = 500
+        df = pd.DataFrame({
+            '公开号': [f'CN{i}A' for i in range(rows)],
+            'sparse': [i if i > 480 else None for i in range(rows)],
+            'empty': [np.nan] * rows,
+            'Score': [i / 3 for i in range(rows)],
+        })
+
+        samples = detector._sample_values(df)
+
+        for position, column in enumerate(df.columns):
+            expected = df[column].dropna().astype(str).head(10).tolist()
+            actual = samples[position].tolist() if expected else []
+            assert actual == expected
+
+    def test_analyze_all_columns_samples_once(self, monkeypatch):
+        """测试分析所有列时两类检测共用一次样本提取"""
+        df = pd.DataFrame({
+            '公开号': ['CN1234567A', 'US7654321B2'],
+            '权利要求': ['1. 一种装置，其特征在于包括壳体和设置在壳体内的电路板。'] * 2,
+        })
+        calls = []
+        original = ColumnDetector._sample_values
+        monkeypatch.setattr(ColumnDetector, '_sample_values',
+                            lambda self, frame: calls.append(frame) or original(self, frame))
+
+        result = ColumnDetector().analyze_all_columns(df)
+
+        assert len(calls) == 1
+        assert result['patent_number_column']['column_name'] == '公开号'
+        assert result['claims_column']['column_name'] == '权利要求'
+
+    def test_empty_frame(self):
+        """测试没有列或没有行的表格"""
+        assert detector.detect_patent_number_column(pd.DataFrame()) is None
+        assert detector.detect_claims_column(pd.DataFrame({'权利要求': []})) is not None
@@ -0,0 +1,161 @@
+"""
+附图OCR结果缓存测试
+
+验证两级缓存的读写、过期、按字节淘汰，以及附图标记接口重复请求时不再重复OCR。
+"""
+
+import base64
+import time
+
+import pytest
+from flask import Flask
+
+from backend.utils.drawing_cache import DrawingCacheManager, make_cache_key
+
+OCR_RESULTS = [
+    {'number': '1', 'x': 100, 'y': 120, 'width': 20, 'height': 20, 'confidence': 95},
+    {'number': '2', 'x': 300, 'y': 80, 'width': 20, 'height': 20, 'confidence': 90},
+]
+
+
+def entry(name='a.png', results=OCR_RESULTS):
+    return {'drawing_name': name, 'ocr_results': results, 'image_hash': 'h', 'ocr_mode': 'rapidocr'}
+
+
+class TestDrawingCacheManager:
+    """DrawingCacheManager测试类"""
+
+    def test_key_depends_on_mode_and_content_only(self):
+        """测试缓存键由OCR模式和图片内容决定"""
+        key, image_hash = make_cache_key('rapidocr', b'image')
+
+        assert key == f'rapidocr_{image_hash}'
+        assert make_cache_key('glm_ocr', b'image')[0] != key
+        assert make_cache_key('rapidocr', b'other')[0] != key
+
+    def test_disk_tier_shared_between_instances(self, tmp_path):
+        """测试持久层在新实例（如另一个worker）中命中"""
+        first = DrawingCacheManager(cache_dir=str(tmp_path))
+        first.set_cache('k', entry())
+        second = DrawingCacheManager(cache_dir=str(tmp_path))
+
+        cached = second.get_cache('k')
+        again = second.get_cache('k')
+
+        assert cached['ocr_results'] == OCR_RESULTS
+        assert again['timestamp'] == cached['timestamp']
+        stats = second.stats()
+        assert (stats['disk_hits'], stats['memory_hits'], stats['misses']) == (1, 1, 0)
+        first.close()
+        second.close()
+
+    def test_returned_results_are_copies(self):
+        """测试修改返回结果不影响缓存"""
+        cache = DrawingCacheManager()
+        cache.set_cache('k', entry())
+        cache.get_cache('k')['ocr_results'][0]['number'] = '99'
+
+        assert cache.get_cache('k')['ocr_results'][0]['number'] == '1'
+
+    def test_expiry(self, tmp_path):
+        """测试过期条目在两级缓存中均不返回"""
+        cache = DrawingCacheManager(cache_dir=str(tmp_path), max_age_days=1 / 86400)
+        cache.set_cache('k', entry())
+        time.sleep(1.1)
+
+        assert cache.get_cache('k') is None
+        assert cache.cleanup_expired() == 1
+        assert cache.stats()['disk_entries'] == 0
+        cache.close()
+
+    def test_memory_byte_budget(self):
+        """测试内存层按字节预算淘汰最久未使用的条目"""
+        size = len(str(entry()).encode('utf-8'))
+        cache = DrawingCacheManager(max_memory_bytes=int(size * 2.5))
+        for key in ['a', 'b', 'c']:
+            cache.set_cache(key, entry(key))
+            cache.get_cache('a')
+
+        assert cache.get_cache('a') is not None
+        assert cache.get_cache('b') is None
+        assert cache.stats()['memory_bytes'] <= cache.max_memory_bytes
+
+    def test_disk_byte_budget(self, tmp_path):
+        """测试持久层按字节预算淘汰"""
+        results = [{'number': str(i), 'x': i * 7919 % 1000, 'y': i * 104729 % 1000, 'width': 20, 'height': 20,
+                    'confidence': 90} for i in range(200)]
+        cache = DrawingCacheManager(cache_dir=str(tmp_path), max_disk_bytes=4000)
+        for i in range(10):
+            cache.set_cache(f'k{i}', entry(f'{i}.png', results))
+
+        stats = cache.stats()
+        assert stats['disk_bytes'] <= 4000
+        assert 0 < stats['disk_entries'] < 10
+        assert stats['evictions'] > 0
+        cache.close()
+
+    def test_clear(self, tmp_path):
+        """测试清除单个和全部条目"""
+        cache = DrawingCacheManager(cache_dir=str(tmp_path))
+        cache.set_cache('a', entry())
+        cache.set_cache('b', entry())
+
+        cache.clear_cache('a')
+        assert not cache.has_cache('a') and cache.has_cache('b')
+
+        cache.clear_cache()
+        assert cache.stats()['memory_entries'] == 0 and cache.stats()['disk_entries'] == 0
+        cache.close()
+
+
+@pytest.fixture
+def drawing_routes():
+    # 附图标记接口依赖OpenCV（RapidOCR）
+    pytest.importorskip('cv2')
+    import backend.routes.drawing_marker as drawing_routes
+    return drawing_routes
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, drawing_routes):
+    cache = DrawingCacheManager(cache_dir=str(tmp_path))
+    monkeypatch.setattr(drawing_routes, '_cache_manager', cache)
+    monkeypatch.setattr(drawing_routes, 'validate_api_request', lambda: (True, None))
+
+    app = Flask(__name__)
+    app.register_blueprint(drawing_routes.drawing_marker_bp, url_prefix='/api')
+    yield app.test_client()
+    cache.close()
+
+
+class TestDrawingMarkerCache:
+    """附图标记接口缓存测试类"""
+
+    def test_repeat_request_skips_ocr(self, client, monkeypatch):
+        """测试同一图片（不同文件名）第二次请求直接使用缓存"""
+        import backend.utils.ocr_utils as ocr_utils
+        calls = []
+
+        def fake_ocr_batch(images):
+            calls.extend(images)
+            return [[dict(item) for item in OCR_RESULTS] for _ in images]
+
+        monkeypatch.setattr(ocr_utils, 'perform_ocr_batch', fake_ocr_batch)
+        data = base64.b64encode(b'fake image bytes').decode()
+
+        def request(name):
+            body = {
+                'drawings': [{'name': name, 'type': 'image/png', 'size': 16, 'data': data}],
+                'specification': '1. 底座\n2. 旋转臂'
+            }
+            return client.post('/api/drawing-marker/process', json=body).get_json()['data']
+
+        first = request('fig1.png')
+        second = request('fig1-copy.png')
+
+        assert len(calls) == 1
+        assert first['cache_info']['fig1.png']['has_cache'] is False
+        assert second['cache_info']['fig1-copy.png']['has_cache'] is True
+        assert second['cache_info']['_stats']['hits'] == 1
+        assert second['cache_info']['_stats']['cache']['memory_hits'] == 1
+        assert second['total_numbers'] == first['total_numbers']
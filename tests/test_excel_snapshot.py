@@ -0,0 +1,141 @@
+"""
+Excel解析快照测试
+
+验证快照中的行与parse_excel_file逐行解析结果一致，以及/api/excel接口在上传后
+直接读取快照分页和搜索、源文件变化后重新生成快照。
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask
+
+import backend.routes.excel_upload as excel_routes
+from backend.utils.excel_snapshot import WorkbookSnapshot
+
+
+def make_frame(rows=30):
+    return pd.DataFrame({
+        '公开号': [f'CN{100000 + i}A' if i % 7 else None for i in range(rows)],
+        'Claims': ['1. 一种装置。' if i % 3 else '   ' for i in range(rows)],
+        'Count': list(range(rows)),
+        'Score': [i / 4 if i % 5 else np.nan for i in range(rows)],
+    })
+
+
+@pytest.fixture
+def excel_file(tmp_path):
+    path = tmp_path / 'patents.xlsx'
+    make_frame().to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_routes, 'EXCEL_SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(excel_routes, '_snapshots', excel_routes.OrderedDict())
+
+
+class TestWorkbookSnapshot:
+    """快照文件测试类"""
+
+    @pytest.mark.parametrize('header_row', [0, 1])
+    def test_rows_match_full_parse(self, excel_file, header_row):
+        """测试快照中的行、列信息与逐行解析结果一致"""
+        expected = excel_routes.parse_excel_file(excel_file, header_row)
+
+        snapshot, error = excel_routes.load_workbook_snapshot(excel_file, header_row)
+
+        assert error is None
+        assert snapshot.total_rows == expected['total_rows']
+        assert snapshot.rows(0, snapshot.total_rows) == expected['data']
+        assert snapshot.rows(5, 8) == expected['data'][5:8]
+        assert snapshot.meta['columns'] == expected['columns']
+
+    def test_snapshot_reused_until_file_changes(self, excel_file, monkeypatch):
+        """测试快照在其他进程中也可直接打开，源文件变化后重新解析"""
+        excel_routes.load_workbook_snapshot(excel_file)
+        monkeypatch.setattr(excel_routes, '_snapshots', excel_routes.OrderedDict())
+        calls = []
+        original = excel_routes.parse_excel_file
+        monkeypatch.setattr(excel_routes, 'parse_excel_file', lambda *args, **kwargs: calls.append(args) or
+                            original(*args, **kwargs))
+
+        snapshot, _ = excel_routes.load_workbook_snapshot(excel_file)
+        assert calls == [] and snapshot.total_rows == 30
+
+        make_frame(rows=4).to_excel(excel_file, index=False)
+        os.utime(excel_file, ns=(os.stat(excel_file).st_atime_ns, os.stat(excel_file).st_mtime_ns + 10 ** 9))
+        snapshot, _ = excel_routes.load_workbook_snapshot(excel_file)
+
+        assert len(calls) == 1 and snapshot.total_rows == 4
+
+    def test_rejects_other_files(self, tmp_path):
+        """测试非快照文件无法打开"""
+        path = tmp_path / 'not_a_snapshot.snap'
+        path.write_bytes(b'PK\x03\x04' + b'\0' * 64)
+
+        with pytest.raises(ValueError):
+            WorkbookSnapshot(str(path))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_routes, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(excel_routes, 'validate_api_request', lambda: (True, None))
+    os.makedirs(str(tmp_path / 'uploads'))
+
+    app = Flask(__name__)
+    app.register_blueprint(excel_routes.excel_upload_bp)
+    return app.test_client()
+
+
+def upload(client):
+    buffer = io.BytesIO()
+    make_frame().to_excel(buffer, index=False)
+    buffer.seek(0)
+    response = client.post('/api/excel/upload', data={'file': (buffer, 'patents.xlsx')},
+                           content_type='multipart/form-data')
+    return response.get_json()['data']
+
+
+class TestExcelRoutesSnapshot:
+    """Excel接口快照测试类"""
+
+    def test_pages_and_search_read_snapshot(self, client, monkeypatch):
+        """测试上传后分页、搜索和列信息接口不再解析工作表"""
+        uploaded = upload(client)
+        assert uploaded['total_rows'] == 30
+        assert len(uploaded['preview_data']) == 10
+
+        def fail(*args, **kwargs):
+            raise AssertionError("workbook parsed again")
+
+        monkeypatch.setattr(excel_routes, 'parse_excel_file', fail)
+        file_id = uploaded['file_id']
+
+        page = client.get(f'/api/excel/{file_id}/data?page=3&page_size=12').get_json()['data']
+        assert [row['row_index'] for row in page['data']] == list(range(25, 31))
+        assert page['pagination']['total_pages'] == 3
+
+        found = client.post(f'/api/excel/{file_id}/search',
+                            json={'column_name': '公开号', 'query': 'cn100003a'}).get_json()['data']
+        assert [row['patent_number'] for row in found['results']] == ['CN100003A']
+        assert found['results'][0]['match_score'] == 1.0
+
+        columns = client.get(f'/api/excel/{file_id}/columns').get_json()['data']
+        assert [column['name'] for column in columns['columns']] == ['公开号', 'Claims', 'Count', 'Score']
+
+    def test_delete_removes_snapshot(self, client):
+        """测试删除文件时同时删除快照"""
+        file_id = upload(client)['file_id']
+        file_path = os.path.join(excel_routes.UPLOAD_FOLDER, file_id)
+        snapshot_path = excel_routes.get_snapshot_path(file_path)
+        assert os.path.exists(snapshot_path)
+
+        client.delete(f'/api/excel/{file_id}')
+
+        assert not os.path.exists(snapshot_path)
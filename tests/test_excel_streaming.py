@@ -0,0 +1,106 @@
+"""
+Excel流式分块读取测试
+
+验证只读流式读取的列数据与pandas整表读取的结果一致。
+"""
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from patent_claims_processor.processors import ColumnNotFoundError, ExcelProcessor
+from patent_claims_processor.services.processing_service import ProcessingService
+
+
+@pytest.fixture
+def workbook_file(tmp_path):
+    """包含空单元格、数字、重复列名和无名列的工作簿"""
+    path = tmp_path / 'stream.xlsx'
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Data'
+    sheet.append(['Claims', 'Patent', 'Notes', 'Notes', None])
+    for i in range(25):
+        claims = None if i % 6 == 2 else f'{i + 1}. A device of claim {i}.'
+        sheet.append([claims, 1000 + i, '  ' if i % 4 == 0 else f'note {i}', 2.5 * i, i])
+    other = workbook.create_sheet('Other')
+    other.append(['Claims'])
+    other.append(['1. 一种装置。'])
+    workbook.save(path)
+    return str(path)
+
+
+class TestExcelStreaming:
+    """ExcelProcessor流式读取测试类"""
+
+    def test_read_columns_matches_pandas(self, workbook_file):
+        """测试流式读取结果与pandas整表读取后get_column_data一致"""
+        processor = ExcelProcessor()
+        df = pd.read_excel(workbook_file, sheet_name=0, dtype=object).fillna('')
+
+        columns = processor.read_columns(workbook_file, ['Claims', 'Notes', 'Notes.1'], optional_columns=['Patent'])
+
+        for name in ['Claims', 'Patent', 'Notes', 'Notes.1']:
+            assert columns[name] == processor.get_column_data(df, name)
+
+    def test_header_follows_pandas_naming(self, workbook_file):
+        """测试重复列名和空列名的命名规则与pandas一致"""
+        header = ExcelProcessor().read_header(workbook_file)
+
+        assert header == [str(name) for name in pd.read_excel(workbook_file).columns]
+
+    def test_chunks_are_row_aligned(self, workbook_file):
+        """测试按块读取时各列按行对齐"""
+        chunks = list(ExcelProcessor().iter_column_chunks(
+            workbook_file, ['Claims', 'Patent'], chunk_size=10
+        ))
+
+        assert [len(chunk['Claims']) for chunk in chunks] == [10, 10, 5]
+        assert all(len(chunk['Claims']) == len(chunk['Patent']) for chunk in chunks)
+        assert chunks[0]['Claims'][2] is None
+        assert chunks[2]['Patent'][-1] == '1024'
+
+    def test_missing_columns(self, workbook_file):
+        """测试必需列缺失时报错，可选列缺失时忽略"""
+        processor = ExcelProcessor()
+
+        with pytest.raises(ColumnNotFoundError) as excinfo:
+            processor.read_columns(workbook_file, ['Missing'])
+        assert 'Claims' in excinfo.value.available_columns
+
+        columns = processor.read_columns(workbook_file, ['Claims'], sheet_name='Other', optional_columns=['Patent'])
+        assert columns == {'Claims': ['1. 一种装置。']}
+
+    def test_unknown_sheet(self, workbook_file):
+        """测试工作表不存在"""
+        with pytest.raises(ValueError):
+            ExcelProcessor().read_columns(workbook_file, ['Claims'], sheet_name='Nope')
+
+
+class TestProcessingServiceStreaming:
+    """处理服务复用已读取列数据测试类"""
+
+    def test_preloaded_columns_skip_file_read(self, workbook_file, monkeypatch):
+        """测试提供已读取的列数据时不再读取文件，且结果与直接处理一致"""
+        service = ProcessingService()
+        expected = service.process_excel_file(workbook_file, 'Claims', patent_column_name='Patent')
+        columns = service.excel_processor.read_columns(workbook_file, ['Claims'], optional_columns=['Patent'])
+
+        def fail(*args, **kwargs):
+            raise AssertionError("file read twice")
+
+        monkeypatch.setattr(service.excel_processor, 'read_columns', fail)
+        result = service.process_excel_file(workbook_file, 'Claims', patent_column_name='Patent',
+                                            preloaded_columns=columns)
+
+        assert result.total_cells_processed == expected.total_cells_processed == 21
+        assert result.patent_numbers == expected.patent_numbers
+        assert [(c.row_index, c.claim_number, c.claim_text) for c in result.claims_data] == \
+            [(c.row_index, c.claim_number, c.claim_text) for c in expected.claims_data]
+
+    def test_missing_column_reports_available_columns(self, workbook_file):
+        """测试列不存在时返回可用列"""
+        result = ProcessingService().process_excel_file(workbook_file, 'Missing')
+
+        assert result.processing_errors[0].error_type == 'column_not_found_error'
+        assert 'Claims' in result.processing_errors[0].suggested_action
@@ -0,0 +1,68 @@
+"""
+语言检测快速路径测试
+
+验证字符分布明确的中文、英文、日语文本不调用langdetect，德语等不明确的文本
+仍交给langdetect且结果可重复。
+"""
+
+import pytest
+from langdetect import DetectorFactory
+
+import patent_claims_processor.processors.language_detector as language_detector
+from patent_claims_processor.processors.language_detector import LanguageDetector
+
+
+@pytest.fixture
+def detector():
+    return LanguageDetector()
+
+
+@pytest.fixture
+def langdetect_calls(monkeypatch):
+    calls = []
+    original = language_detector.detect
+    monkeypatch.setattr(language_detector, 'detect', lambda text: calls.append(text) or original(text))
+    return calls
+
+
+class TestLanguageDetectorFastPath:
+    """语言检测快速路径测试类"""
+
+    @pytest.mark.parametrize('text, expected', [
+        ('1. 一种装置，包括处理器和存储器，所述处理器连接USB接口。', 'zh'),
+        ('2. 根据权利要求1所述的装置，其特征在于，还包括LED灯。', 'zh'),
+        ('A device comprising a processor and a memory, wherein the processor executes instructions.', 'en'),
+        ('The method of claim 1, wherein the signal is filtered.', 'en'),
+        ('請求項1に記載の装置であって、前記制御部は信号を処理することを特徴とする。', 'ja'),
+        # 没有假名时'請求項'仍判定为日语，与原检测器一致（属性测试生成的'一一請求項。'同样为ja）
+        ('請求項1記載装置', 'ja'),
+        ('一一請求項。', 'ja'),
+    ])
+    def test_unambiguous_text_skips_langdetect(self, detector, langdetect_calls, text, expected):
+        """测试字符分布明确的文本直接判定"""
+        assert detector.detect_language(text) == expected
+        assert langdetect_calls == []
+
+    def test_german_uses_langdetect(self, detector, langdetect_calls):
+        """测试纯ASCII的德语文本交给langdetect判断"""
+        text = 'Vorrichtung nach Anspruch 1, wobei die Welle und eine Feder in einem Rahmen gelagert sind.'
+
+        assert detector.detect_language(text) == 'de'
+        assert len(langdetect_calls) == 1
+
+    def test_langdetect_is_seeded(self, detector):
+        """测试langdetect使用固定种子，同一文本结果相同"""
+        text = 'Dispositif selon la revendication 1, dans lequel le moteur est fixé au cadre.'
+
+        assert DetectorFactory.seed == 0
+        assert len({detector.detect_language(text) for _ in range(10)}) == 1
+
+    @pytest.mark.parametrize('text, expected', [
+        ('', 'other'),
+        (' \n\t', 'other'),
+        ('12345 67890', 'other'),
+        ('HKLA', 'en'),
+    ])
+    def test_edge_cases(self, detector, text, expected):
+        """测试空文本、纯数字和与字符分类标记相同的字母"""
+        assert detector.detect_language(text) == expected
@@ -0,0 +1,107 @@
+"""
+自适应OCR测试
+
+使用假OCR引擎验证：原图识别结果可信时跳过增强识别，低置信度区域只对裁剪区域做增强识别。
+"""
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+pytest.importorskip('cv2')
+
+from PIL import Image  # noqa: E402
+
+import backend.utils.ocr_utils as ocr_utils  # noqa: E402
+
+
+def box(x, y, size=20):
+    return [[x, y], [x + size, y], [x + size, y + size], [x, y + size]]
+
+
+class FakeEngine:
+    """按调用顺序返回预设结果，并记录每次识别的图像尺寸"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.shapes = []
+
+    def __call__(self, image):
+        self.shapes.append(image.shape[:2])
+        return (self.responses.pop(0) if self.responses else []), 0.01
+
+
+@pytest.fixture
+def image_bytes():
+    buffer = BytesIO()
+    Image.fromarray(np.full((600, 800, 3), 255, dtype=np.uint8)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def run(monkeypatch, engine, image_bytes, **kwargs):
+    monkeypatch.setattr(ocr_utils, 'initialize_ocr_engine', lambda: engine)
+    monkeypatch.setattr(ocr_utils, 'OCR_WORKERS', 0)
+    return ocr_utils.perform_ocr(image_bytes, **kwargs)
+
+
+class TestAdaptiveOcr:
+    """自适应OCR测试类"""
+
+    def test_confident_page_runs_single_pass(self, monkeypatch, image_bytes):
+        """测试原图识别结果全部可信时只识别一次"""
+        engine = FakeEngine([[box(100, 100), '1', 0.95], [box(300, 100), '2', 0.9], [box(500, 100), '3', 0.92]])
+
+        results = run(monkeypatch, engine, image_bytes)
+
+        assert engine.shapes == [(600, 800)]
+        assert sorted(r['number'] for r in results) == ['1', '2', '3']
+
+    def test_low_confidence_region_is_cropped(self, monkeypatch, image_bytes):
+        """测试低置信度标记只在裁剪区域增强识别，坐标映射回整页"""
+        first = [[box(100, 100), '1', 0.95], [box(300, 100), '2', 0.9],
+                 [box(500, 100), '3', 0.92], [box(400, 400), '4', 0.5]]
+        crop = [[box(24, 24), '4', 0.93]]
+        engine = FakeEngine(first, crop)
+
+        results = run(monkeypatch, engine, image_bytes)
+
+        assert engine.shapes[0] == (600, 800)
+        assert engine.shapes[1][0] < 100 and engine.shapes[1][1] < 100
+        marker = next(r for r in results if r['number'] == '4')
+        assert marker['confidence'] == pytest.approx(93)
+        assert abs(marker['x'] - 410) <= 2 and abs(marker['y'] - 410) <= 2
+
+    def test_sparse_page_runs_full_enhanced_pass(self, monkeypatch, image_bytes):
+        """测试原图可信标记过少时对整页增强识别"""
+        engine = FakeEngine([[box(100, 100), '1', 0.95]], [[box(300, 300), '2', 0.9]])
+
+        results = run(monkeypatch, engine, image_bytes)
+
+        assert engine.shapes == [(600, 800), (600, 800)]
+        assert sorted(r['number'] for r in results) == ['1', '2']
+
+    def test_full_mode_always_runs_two_passes(self, monkeypatch, image_bytes):
+        """测试关闭自适应时始终识别原图和增强图"""
+        engine = FakeEngine([[box(100, 100), '1', 0.95], [box(300, 100), '2', 0.9], [box(500, 100), '3', 0.92]])
+
+        run(monkeypatch, engine, image_bytes, adaptive=False)
+
+        assert engine.shapes == [(600, 800), (600, 800)]
+
+
+class TestSelectLowConfidenceRegions:
+    """低置信度区域选择测试类"""
+
+    def test_regions_are_padded_clipped_and_merged(self):
+        """测试区域扩展、裁剪到图像范围并合并重叠区域"""
+        detections = [
+            {'number': '5', 'x': 10, 'y': 10, 'width': 10, 'height': 10, 'confidence': 50},
+            {'number': '6', 'x': 40, 'y': 10, 'width': 10, 'height': 10, 'confidence': 60},
+            {'number': '7', 'x': 300, 'y': 300, 'width': 10, 'height': 10, 'confidence': 99},
+            {'number': 'a long caption', 'x': 200, 'y': 200, 'width': 90, 'height': 10, 'confidence': 40},
+        ]
+
+        regions = ocr_utils.select_low_confidence_regions(detections, (400, 400), padding=10)
+
+        assert regions == [(0, 0, 56, 26)]
@@ -0,0 +1,77 @@
+"""
+附图标记OCR结果网格去重测试
+
+使用基于属性的测试验证网格分桶去重与逐一比较的原实现结果完全一致。
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+pytest.importorskip('cv2')
+
+from backend.utils.ocr_utils import deduplicate_results  # noqa: E402
+
+
+def legacy_deduplicate(results, position_threshold=20):
+    """与每个已保留结果逐一比较的参考实现（原实现）"""
+    deduplicated = []
+    for result in results:
+        is_duplicate = False
+        for existing in deduplicated:
+            if existing['number'] == result['number']:
+                distance = ((existing['x'] - result['x']) ** 2 +
+                            (existing['y'] - result['y']) ** 2) ** 0.5
+                if distance < position_threshold:
+                    if result['confidence'] > existing['confidence']:
+                        existing.update(result)
+                    is_duplicate = True
+                    break
+        if not is_duplicate:
+            deduplicated.append(result.copy())
+    return deduplicated
+
+
+# 小范围坐标让重复、跨格子和合并后移动位置的情况频繁出现
+coordinate = st.one_of(st.integers(-40, 120), st.floats(-40, 120, allow_nan=False))
+ocr_result = st.fixed_dictionaries({
+    'number': st.sampled_from(['1', '2', '10a']),
+    'x': coordinate,
+    'y': coordinate,
+    'width': st.just(20),
+    'height': st.just(16),
+    'confidence': st.integers(50, 100)
+}, optional={'source': st.sampled_from(['original', 'enhanced'])})
+
+
+class TestGridDeduplication:
+    """网格去重一致性测试类"""
+
+    @settings(max_examples=400, deadline=None)
+    @given(st.lists(ocr_result, max_size=40), st.sampled_from([0, 1, 20, 25, 30, 37.5]))
+    def test_matches_pairwise_reference(self, results, threshold):
+        """测试任意结果序列和阈值下与原实现一致"""
+        expected = legacy_deduplicate([dict(r) for r in results], threshold)
+
+        assert deduplicate_results(results, threshold) == expected
+
+    def test_input_is_not_modified(self):
+        """测试合并时不修改输入结果"""
+        results = [
+            {'number': '1', 'x': 10, 'y': 10, 'confidence': 60},
+            {'number': '1', 'x': 15, 'y': 12, 'confidence': 90},
+        ]
+
+        deduplicated = deduplicate_results(results, 20)
+
+        assert deduplicated == [{'number': '1', 'x': 15, 'y': 12, 'confidence': 90}]
+        assert results[0] == {'number': '1', 'x': 10, 'y': 10, 'confidence': 60}
+
+    def test_merged_result_moves_to_new_cell(self):
+        """测试合并后的位置用于后续比较"""
+        results = [
+            {'number': '2', 'x': 0, 'y': 0, 'confidence': 60},
+            {'number': '2', 'x': 19, 'y': 0, 'confidence': 90},
+            {'number': '2', 'x': 35, 'y': 0, 'confidence': 70},
+        ]
+
+        assert deduplicate_results(results, 20) == [{'number': '2', 'x': 19, 'y': 0, 'confidence': 90}]
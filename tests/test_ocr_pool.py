@@ -0,0 +1,146 @@
+"""
+附图OCR工作进程池测试
+
+验证多张图片并行识别时结果保持输入顺序、超时的识别被真正终止且不影响其他请求、
+并发数受可用内存限制，以及未启用工作进程时的进程内识别。
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('cv2')
+
+import backend.utils.ocr_utils as ocr_utils  # noqa: E402
+
+
+def slow_echo(job):
+    """工作进程中执行：等待指定秒数后返回输入值"""
+    value, delay = job
+    time.sleep(delay)
+    if value == 'bad':
+        raise ValueError('Invalid image data')
+    return [value]
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    ocr_utils._ocr_pool.close()
+    yield
+    ocr_utils._ocr_pool.close()
+
+
+def run_batches(batches):
+    """在多个线程中同时运行各批识别（模拟并发请求），返回各批结果"""
+    outcomes = [None] * len(batches)
+
+    def run(position, jobs, timeout_seconds):
+        results = [None] * len(jobs)
+        ocr_utils._run_in_ocr_pool(slow_echo, jobs, results, limit=2, timeout_seconds=timeout_seconds)
+        outcomes[position] = results
+
+    threads = [threading.Thread(target=run, args=(position, jobs, timeout_seconds))
+               for position, (jobs, timeout_seconds) in enumerate(batches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    return outcomes
+
+
+class TestOcrPool:
+    """OCR工作进程池测试类"""
+
+    def test_results_keep_input_order(self, monkeypatch):
+        """测试先完成的识别不打乱结果顺序，单张失败只影响该张"""
+        monkeypatch.setattr(ocr_utils, 'OCR_WORKERS', 2)
+        jobs = [('a', 0.6), ('b', 0.0), ('bad', 0.0), ('c', 0.2)]
+        results = [None] * len(jobs)
+
+        remaining = ocr_utils._run_in_ocr_pool(slow_echo, jobs, results, limit=2, timeout_seconds=30)
+
+        assert remaining == []
+        assert results[0] == ['a'] and results[1] == ['b'] and results[3] == ['c']
+        assert isinstance(results[2], ValueError)
+
+    def test_timeout_terminates_worker(self, monkeypatch):
+        """测试超时的识别被终止，其余图片照常完成，被终止的工作进程随后被替换"""
+        monkeypatch.setattr(ocr_utils, 'OCR_WORKERS', 2)
+        jobs = [('stuck', 60), ('a', 0.0), ('b', 0.0)]
+        results = [None] * len(jobs)
+
+        started = time.monotonic()
+        ocr_utils._run_in_ocr_pool(slow_echo, jobs, results, limit=2, timeout_seconds=3)
+
+        assert time.monotonic() - started < 30
+        assert isinstance(results[0], TimeoutError)
+        assert results[1:] == [['a'], ['b']]
+
+        results = [None]
+        ocr_utils._run_in_ocr_pool(slow_echo, [('c', 0.0)], results, limit=2, timeout_seconds=30)
+        assert results == [['c']]
+
+    def test_timeout_does_not_affect_concurrent_batch(self, monkeypatch):
+        """测试一个请求的识别超时只终止其所在工作进程，另一请求正在运行的识别正常完成"""
+        monkeypatch.setattr(ocr_utils, 'OCR_WORKERS', 2)
+
+        stuck, healthy = run_batches([
+            ([('stuck', 30)], 1),
+            ([('slow', 3)], 60),
+        ])
+
+        assert isinstance(stuck[0], TimeoutError)
+        assert healthy == [['slow']]
+
+    def test_waiting_for_worker_not_counted_in_timeout(self, monkeypatch):
+        """测试等待其他请求释放工作进程的时间不计入超时"""
+        monkeypatch.setattr(ocr_utils, 'OCR_WORKERS', 1)
+        # 先启动工作进程，避免两批都计入进程启动时间
+        ocr_utils._run_in_ocr_pool(slow_echo, [('warm', 0.0)], [None], limit=1, timeout_seconds=30)
+
+        first, second = run_batches([
+            ([('first', 2)], 30),
+            ([('second', 0.1)], 1.5),
+        ])
+
+        assert first == [['first']]
+        assert second == [['second']]
+
+    def test_concurrency_limited_by_memory(self, monkeypatch):
+        """测试并发数不超过可用内存可容纳的识别数，且至少为1"""
+        class FakeMemory:
+            available = 1200 * 1024 * 1024
+
+        class FakePsutil:
+            @staticmethod
+            def virtual_memory():
+                return FakeMemory
+
+        monkeypatch.setattr(ocr_utils, 'OCR_WORKERS', 4)
+        monkeypatch.setattr(ocr_utils, 'OCR_WORKER_MEMORY_MB', 500)
+        monkeypatch.setattr(ocr_utils, 'PSUTIL_AVAILABLE', True)
+        monkeypatch.setattr(ocr_utils, 'psutil', FakePsutil, raising=False)
+
+        assert ocr_utils.get_ocr_concurrency() == 2
+        assert ocr_utils.get_ocr_concurrency(max_workers=1) == 1
+
+        FakeMemory.available = 100 * 1024 * 1024
+        assert ocr_utils.get_ocr_concurrency() == 1
+
+    def test_batch_without_workers(self, monkeypatch):
+        """测试OCR_WORKERS=0时在当前进程内逐张识别"""
+        def fake_recognize(image_data, adaptive):
+            if image_data == b'bad':
+                raise ValueError('Invalid image data')
+            return [{'number': image_data.decode()}]
+
+        monkeypatch.setattr(ocr_utils, 'OCR_WORKERS', 0)
+        monkeypatch.setattr(ocr_utils, 'recognize_image', fake_recognize)
+
+        results = ocr_utils.perform_ocr_batch([b'1', b'bad', b'2'])
+
+        assert results[0] == [{'number': '1'}] and results[2] == [{'number': '2'}]
+        assert isinstance(results[1], ValueError)
+        with pytest.raises(ValueError):
+            ocr_utils.perform_ocr(b'bad')
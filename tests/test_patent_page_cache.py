@@ -0,0 +1,166 @@
+"""
+专利页面两级缓存测试
+
+使用仓库中的 Google Patents HTML 样例，不访问网络。
+"""
+
+import os
+import time
+
+import pytest
+
+from backend.scraper.patent_cache import PatentPageCache, make_options_key
+from backend.scraper.session_pool import SessionPool
+from backend.scraper.simple_scraper import SimplePatentScraper
+
+HTML_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'google patents html example.txt')
+PATENT_NUMBER = 'US12390907B2'
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.encoding = None
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """记录请求次数的假Session"""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        return FakeResponse(self.text)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def html_text():
+    with open(HTML_FIXTURE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class TestPatentPageCache:
+    """PatentPageCache测试类"""
+
+    def test_page_roundtrip_is_compressed(self, tmp_path, html_text):
+        """测试HTML压缩存储与读取"""
+        cache = PatentPageCache(db_path=str(tmp_path / 'pages.db'))
+        content_hash = cache.set_page(PATENT_NUMBER, html_text)
+
+        assert cache.get_page(PATENT_NUMBER) == html_text
+        assert cache.get_page_hash(PATENT_NUMBER) == content_hash
+        assert cache.stats()['disk_bytes'] < len(html_text.encode('utf-8')) / 2
+        cache.close()
+
+    def test_data_survives_new_instance(self, tmp_path):
+        """测试磁盘层在新实例（其他worker）中可命中"""
+        db_path = str(tmp_path / 'pages.db')
+        key = make_options_key(True, False, ['claims'])
+
+        first = PatentPageCache(db_path=db_path)
+        content_hash = first.set_page('CN1A', '<html>x</html>')
+        first.set_data('CN1A', key, {'patent_number': 'CN1A', 'claims': ['1. x']}, content_hash=content_hash)
+        first.close()
+
+        second = PatentPageCache(db_path=db_path)
+        assert second.get_data('CN1A', key)['claims'] == ['1. x']
+        assert second.stats()['disk_hits'] == 1
+        assert second.get_data('CN1A', key) is not None
+        assert second.stats()['memory_hits'] == 1
+        second.close()
+
+    def test_data_invalidated_when_page_changes(self, tmp_path):
+        """测试页面内容变化后旧的解析结果失效"""
+        db_path = str(tmp_path / 'pages.db')
+        key = make_options_key()
+
+        cache = PatentPageCache(db_path=db_path)
+        content_hash = cache.set_page('EP1A1', '<html>v1</html>')
+        cache.set_data('EP1A1', key, {'patent_number': 'EP1A1'}, content_hash=content_hash)
+        cache.close()
+
+        cache = PatentPageCache(db_path=db_path)
+        cache.set_page('EP1A1', '<html>v2</html>')
+        assert cache.get_data('EP1A1', key) is None
+        cache.close()
+
+    def test_ttl_expiry(self):
+        """测试过期条目不再命中"""
+        cache = PatentPageCache(ttl_seconds=0.05)
+        cache.set_data('US1B2', 'k', {'patent_number': 'US1B2'})
+        assert cache.get_data('US1B2', 'k') is not None
+
+        time.sleep(0.1)
+        assert cache.get_data('US1B2', 'k') is None
+        assert cache.stats()['data_misses'] == 1
+
+    def test_memory_lru_eviction(self):
+        """测试内存层按LRU淘汰"""
+        cache = PatentPageCache(memory_entries=2)
+        cache.set_data('A', 'k', {'patent_number': 'A'})
+        cache.set_data('B', 'k', {'patent_number': 'B'})
+        cache.get_data('A', 'k')
+        cache.set_data('C', 'k', {'patent_number': 'C'})
+
+        assert cache.get_data('B', 'k') is None
+        assert cache.get_data('A', 'k') is not None
+        assert cache.stats()['evictions'] == 1
+
+    def test_disk_size_budget(self, tmp_path):
+        """测试磁盘层超出容量时淘汰最久未访问的条目"""
+        cache = PatentPageCache(db_path=str(tmp_path / 'pages.db'), max_disk_bytes=4000)
+        for i in range(20):
+            cache.set_page(f'US{i}', os.urandom(600).hex())
+
+        assert cache.stats()['disk_bytes'] <= 4000
+        assert cache.get_page('US19') is not None
+        assert cache.get_page('US0') is None
+        cache.close()
+
+    def test_returned_data_is_a_copy(self):
+        """测试返回值修改不影响缓存内容"""
+        cache = PatentPageCache()
+        cache.set_data('A', 'k', {'patent_number': 'A', 'claims': ['c1']})
+        cache.get_data('A', 'k')['claims'].append('c2')
+
+        assert cache.get_data('A', 'k')['claims'] == ['c1']
+
+
+class TestScraperWithCache:
+    """SimplePatentScraper缓存集成测试类"""
+
+    def test_repeat_scrape_hits_cache(self, tmp_path, html_text):
+        """测试重复爬取不再发起网络请求"""
+        session = FakeSession(html_text)
+        scraper = SimplePatentScraper(delay=0, cache=PatentPageCache(db_path=str(tmp_path / 'pages.db')), session_pool=SessionPool(size=2, session_factory=lambda: session))
+
+        first = scraper.scrape_patent(PATENT_NUMBER, crawl_specification=True, selected_fields=['claims'])
+        second = scraper.scrape_patent(PATENT_NUMBER, crawl_specification=True, selected_fields=['claims'])
+
+        assert first.success and second.success
+        assert session.calls == 1
+        assert second.data.to_dict() == first.data.to_dict()
+        assert scraper.cache.stats()['memory_hits'] == 1
+        scraper.close()
+
+    def test_other_field_set_reuses_cached_page(self, tmp_path, html_text):
+        """测试不同字段组合复用已缓存的HTML"""
+        session = FakeSession(html_text)
+        scraper = SimplePatentScraper(delay=0, cache=PatentPageCache(db_path=str(tmp_path / 'pages.db')), session_pool=SessionPool(size=2, session_factory=lambda: session))
+
+        scraper.scrape_patent(PATENT_NUMBER, crawl_specification=True, selected_fields=['claims'])
+        family = scraper.scrape_patent(PATENT_NUMBER, crawl_specification=True,
+                                       selected_fields=['family_applications', 'country_status'])
+
+        assert family.success
+        assert family.data.family_applications
+        assert session.calls == 1
+        scraper.close()
@@ -0,0 +1,100 @@
+"""
+专利号搜索索引测试
+
+验证索引搜索与原逐行子串搜索的匹配度和顺序一致，以及规范化键带来的
+忽略标点、不同种类代码匹配，以及不同国家的同号文献不互相匹配。
+"""
+
+from hypothesis import given, settings, strategies as st
+
+from backend.utils.patent_search_index import PatentNumberIndex, compact_key, core_key, split_key
+
+
+def legacy_search(values, query, limit=50):
+    """逐行大小写无关子串匹配的参考实现（原实现），返回[(行号, 匹配度)]"""
+    query = query.strip().lower()
+    results = []
+    for row, value in enumerate(values):
+        if len(results) >= limit:
+            break
+        if value and query in value.lower():
+            results.append((row, 1.0 if query == value.lower() else 0.8))
+    results.sort(key=lambda item: item[1], reverse=True)
+    return results
+
+
+patent_value = st.one_of(
+    st.none(),
+    st.builds(lambda country, number, kind: f'{country}{number}{kind}',
+              st.sampled_from(['CN', 'US', 'ep', '']),
+              st.integers(10, 99999).map(str),
+              st.sampled_from(['A', 'B2', 'u', ''])),
+)
+query_text = st.text(alphabet='cnuseabp0123456789', min_size=1, max_size=8)
+
+
+class TestPatentNumberIndex:
+    """专利号搜索索引测试类"""
+
+    @settings(max_examples=300, deadline=None)
+    @given(st.lists(patent_value, max_size=40), query_text)
+    def test_matches_linear_scan(self, values, query):
+        """测试子串匹配部分与原实现的行、匹配度和顺序一致"""
+        expected = legacy_search(values, query, limit=1000)
+        index = PatentNumberIndex(values)
+
+        results = index.search(query, limit=1000)
+        substring_only = [(row, score) for row, score in results if query.lower() in values[row].lower()]
+
+        assert substring_only == expected
+        # 其余结果都是同一号码的其他写法，且国家代码不冲突
+        query_country, query_core = split_key(compact_key(query))
+        for row, score in results:
+            if (row, score) not in expected:
+                country, core = split_key(compact_key(values[row]))
+                assert core == query_core
+                assert not query_country or country in ('', query_country)
+
+    def test_normalized_keys(self):
+        """测试规范化键去掉标点、国家代码和种类代码"""
+        assert compact_key(' CN 1234567-A ') == 'cn1234567a'
+        assert core_key('cn1234567a') == '1234567'
+        assert core_key('us10123456b2') == '10123456'
+        assert core_key('zl2023101234567') == '2023101234567'
+        assert core_key('abc') == 'abc'
+        assert split_key('cn1234567a') == ('cn', '1234567')
+        assert split_key('1234567') == ('', '1234567')
+
+    def test_punctuation_and_kind_code_variants(self):
+        """测试带标点的查询完全匹配，不同种类代码作为部分匹配"""
+        index = PatentNumberIndex(['CN1234567A', 'US7654321B2', 'CN1234567B', None, 'cn 1234567 a'])
+
+        assert index.search('CN-1234567-A') == [(0, 1.0), (4, 1.0), (2, 0.8)]
+        assert index.search('7654321') == [(1, 0.8)]
+        assert index.search('EP999') == []
+
+    def test_other_offices_not_matched(self):
+        """测试带国家代码的查询不匹配其他国家的同号文献"""
+        index = PatentNumberIndex(['CN1234567A', 'US1234567B2', 'EP1234567', '1234567', 'WO2020123456A1'])
+
+        assert index.search('CN1234567A') == [(0, 1.0), (3, 0.8)]
+        assert index.search('CN1234567B') == [(0, 0.8), (3, 0.8)]
+        assert index.search('US2020123456') == []
+        assert index.search('1234567') == [(3, 1.0), (0, 0.8), (1, 0.8), (2, 0.8)]
+
+    def test_exact_matches_ranked_before_limit(self):
+        """测试结果数量超过限制时完全匹配仍在结果中且排在前面"""
+        values = [f'CN{100 + i}A' for i in range(200)] + ['cn12']
+
+        results = PatentNumberIndex(values).search('CN12', limit=5)
+
+        assert results[0] == (200, 1.0)
+        assert [row for row, _ in results[1:]] == [20, 21, 22, 23]
+
+    def test_short_and_punctuation_only_queries(self):
+        """测试少于三个字符和只有标点的查询"""
+        index = PatentNumberIndex(['CN1A', 'US-2B', 'CN3'])
+
+        assert index.search('cn') == [(0, 0.8), (2, 0.8)]
+        assert index.search('-') == [(1, 0.8)]
+        assert index.search('   ') == []
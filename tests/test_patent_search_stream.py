@@ -0,0 +1,149 @@
+"""
+/patent/search/stream 流式结果测试
+
+不访问网络：scrape_patent 被替换为带延迟的桩函数。
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+import backend.routes.patent as patent_routes
+from backend.scraper.simple_scraper import SimplePatentData, SimplePatentResult, SimplePatentScraper
+
+
+def make_fake_scrape(delays, active=None):
+    """按专利号延迟返回结果的桩函数，记录同时进行中的数量"""
+    lock = threading.Lock()
+    active = active if active is not None else {'now': 0, 'peak': 0}
+
+    def fake_scrape(patent_number, **kwargs):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        time.sleep(delays.get(patent_number, 0))
+        with lock:
+            active['now'] -= 1
+        if patent_number.startswith('BAD'):
+            return SimplePatentResult(patent_number=patent_number, success=False, error='not found')
+        return SimplePatentResult(
+            patent_number=patent_number,
+            success=True,
+            data=SimplePatentData(patent_number=patent_number, title=f'Title {patent_number}')
+        )
+
+    return fake_scrape
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    scraper = SimplePatentScraper(delay=0, max_concurrency=3)
+    monkeypatch.setattr(patent_routes, '_scraper_instance', scraper)
+    yield scraper
+    scraper.close()
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(patent_routes.patent_bp, url_prefix='/api')
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user'] = 'guest'
+        sess['is_guest'] = True
+    return client
+
+
+class TestIterPatentsBatch:
+    """iter_patents_batch测试类"""
+
+    def test_yields_in_completion_order_with_indexes(self):
+        """测试按完成顺序产出并携带原始索引"""
+        scraper = SimplePatentScraper(delay=0, max_concurrency=3)
+        scraper.scrape_patent = make_fake_scrape({'A': 0.15, 'B': 0.0, 'C': 0.05})
+
+        results = list(scraper.iter_patents_batch(['A', 'B', 'C']))
+
+        assert [i for i, _ in results] == [1, 2, 0]
+        assert [r.patent_number for _, r in results] == ['B', 'C', 'A']
+        scraper.close()
+
+    def test_in_flight_is_bounded(self):
+        """测试同时进行中的专利数不超过并发上限"""
+        active = {'now': 0, 'peak': 0}
+        scraper = SimplePatentScraper(delay=0, max_concurrency=2)
+        scraper.scrape_patent = make_fake_scrape({f'P{i}': 0.01 for i in range(10)}, active)
+
+        results = list(scraper.iter_patents_batch([f'P{i}' for i in range(10)]))
+
+        assert sorted(i for i, _ in results) == list(range(10))
+        assert active['peak'] <= 2
+        scraper.close()
+
+    def test_sequential_when_single_worker(self):
+        """测试单并发时按输入顺序产出"""
+        scraper = SimplePatentScraper(delay=0)
+        scraper.scrape_patent = make_fake_scrape({})
+
+        assert [i for i, _ in scraper.iter_patents_batch(['A', 'B'])] == [0, 1]
+        assert list(scraper.iter_patents_batch([])) == []
+        scraper.close()
+
+
+class TestSearchStreamRoute:
+    """流式搜索接口测试类"""
+
+    def test_ndjson_results_then_summary(self, client, scraper):
+        """测试NDJSON逐条输出结果并以汇总结束"""
+        scraper.scrape_patent = make_fake_scrape({'US1': 0.05})
+
+        response = client.post('/api/patent/search/stream', json={'patent_numbers': ['US1', 'US2', 'BAD3']})
+        records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        assert response.mimetype == 'application/x-ndjson'
+        assert [r['type'] for r in records] == ['result', 'result', 'result', 'summary']
+        assert {r['patent_number'] for r in records[:3]} == {'US1', 'US2', 'BAD3'}
+        assert all(r['total'] == 3 for r in records[:3])
+        good = next(r for r in records if r.get('patent_number') == 'US2')
+        assert good['data']['title'] == 'Title US2'
+        assert records[-1]['succeeded'] == 2
+        assert records[-1]['failed'] == 1
+
+    def test_sse_format(self, client, scraper):
+        """测试SSE格式输出"""
+        scraper.scrape_patent = make_fake_scrape({})
+
+        response = client.post('/api/patent/search/stream', json={'patent_numbers': 'US1 US2'},
+                               headers={'Accept': 'text/event-stream'})
+        events = [e for e in response.get_data(as_text=True).split('\n\n') if e]
+
+        assert response.mimetype == 'text/event-stream'
+        assert len(events) == 3
+        assert events[0].startswith('event: result\ndata: ')
+        summary = json.loads(events[-1].split('data: ', 1)[1])
+        assert events[-1].startswith('event: summary')
+        assert summary['total'] == 2
+
+    def test_validation_errors_are_plain_json(self, client, scraper):
+        """测试参数错误时返回普通JSON错误"""
+        response = client.post('/api/patent/search/stream', json={'patent_numbers': []})
+
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
+
+    def test_scraper_failure_ends_stream_with_error(self, client, scraper):
+        """测试爬取异常时以错误记录结束"""
+        def broken(*args, **kwargs):
+            raise RuntimeError('boom')
+            yield
+
+        scraper.iter_patents_batch = broken
+
+        response = client.post('/api/patent/search/stream', json={'patent_numbers': ['US1']})
+        records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        assert records == [{'type': 'error', 'error': 'Failed to scrape patents: boom'}]
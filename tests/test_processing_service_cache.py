@@ -0,0 +1,70 @@
+"""
+单元格解析缓存测试
+
+验证重复内容的单元格复用解析结果，且结果与不使用缓存时完全一致。
+"""
+
+import pytest
+
+from patent_claims_processor.services.processing_service import ProcessingService
+
+@pytest.fixture
+def excel_file(make_claims_workbook, claims_cells):
+    """同族专利重复出现相同权利要求文本（含空白差异）"""
+    zh, en = claims_cells['zh'], claims_cells['en']
+    cells = [zh, en, '  ' + zh + '\r\n', 'none', en.replace('\n', '\r\n'), zh]
+    return make_claims_workbook(30, cell=lambda i: cells[i % len(cells)], name='duplicates.xlsx')
+
+
+class TestCellCache:
+    """单元格解析缓存测试类"""
+
+    def test_results_match_uncached(self, excel_file, summarize_result):
+        """测试缓存结果与不使用缓存时一致，且重复内容命中缓存"""
+        uncached = ProcessingService(cell_cache_size=0).process_excel_file(excel_file, 'Claims',
+                                                                           patent_column_name='Patent')
+        service = ProcessingService()
+        cached = service.process_excel_file(excel_file, 'Claims', patent_column_name='Patent')
+
+        assert summarize_result(cached) == summarize_result(uncached)
+        stats = service.get_processing_statistics()['cell_cache']
+        assert stats['misses'] == 3
+        assert stats['hits'] == 27
+        assert stats['hit_rate'] == pytest.approx(0.9)
+
+    def test_returned_claims_are_copies(self, claims_cells):
+        """测试修改返回结果不影响缓存"""
+        service = ProcessingService()
+        first = service._process_single_cell_with_recovery(claims_cells['zh'], 0)
+        first[1].patent_number = 'CN1A'
+        first[1].referenced_claims.append(99)
+
+        second = service._process_single_cell_with_recovery(claims_cells['zh'], 7)
+
+        assert [c.row_index for c in second] == [7, 7]
+        assert second[1].patent_number is None
+        assert second[1].referenced_claims == [1]
+
+    def test_cache_is_bounded(self, claims_cells):
+        """测试缓存按最近使用淘汰"""
+        service = ProcessingService(cell_cache_size=2)
+        zh, en = claims_cells['zh'], claims_cells['en']
+        for i, text in enumerate([zh, en, zh, '1. Third claim text.']):
+            service._process_single_cell_with_recovery(text, i)
+
+        stats = service.get_cell_cache_statistics()
+        assert stats['size'] == 2
+        assert (stats['hits'], stats['misses']) == (1, 3)
+
+        service._process_single_cell_with_recovery(zh, 4)
+        assert service.get_cell_cache_statistics()['hits'] == 2
+
+    def test_parallel_workers_report_hits(self, excel_file):
+        """测试多进程处理时汇总工作进程的缓存统计"""
+        service = ProcessingService(workers=2, chunk_size=10, parallel_threshold=0)
+
+        service.process_excel_file(excel_file, 'Claims', patent_column_name='Patent')
+
+        stats = service.get_cell_cache_statistics()
+        assert stats['hits'] + stats['misses'] == 30
+        assert stats['hits'] > 0
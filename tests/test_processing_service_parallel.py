@@ -0,0 +1,61 @@
+"""
+ProcessingService多进程并行处理测试
+
+验证并行处理与顺序处理的结果（权利要求、错误、语言分布、专利号）完全一致。
+"""
+
+import pytest
+
+import patent_claims_processor.services.processing_service as processing_module
+from patent_claims_processor.services.processing_service import ProcessingService
+
+@pytest.fixture
+def excel_file(make_claims_workbook):
+    """中英文交替，夹杂无法解析的文本，专利号重复出现"""
+    return make_claims_workbook(60, cell=lambda i: 'none' if i % 13 == 5 else ('zh' if i % 2 else 'en'),
+                                patent=lambda i: f'CN{100 + i % 9}A')
+
+
+class TestParallelProcessing:
+    """并行处理测试类"""
+
+    def test_parallel_matches_serial(self, excel_file, summarize_result):
+        """测试并行结果与顺序结果逐项一致且按行排序"""
+        serial = ProcessingService().process_excel_file(excel_file, 'Claims', patent_column_name='Patent')
+        progress = []
+        parallel = ProcessingService(workers=2, chunk_size=7, parallel_threshold=0).process_excel_file(
+            excel_file, 'Claims', patent_column_name='Patent',
+            progress_callback=lambda current, total: progress.append((current, total))
+        )
+
+        assert summarize_result(parallel) == summarize_result(serial)
+        rows = [c.row_index for c in parallel.claims_data]
+        assert rows == sorted(rows)
+        assert progress[-1] == (60, 60)
+        assert [current for current, _ in progress] == sorted(current for current, _ in progress)
+
+    def test_small_files_stay_serial(self, excel_file, monkeypatch):
+        """测试行数低于阈值时不启动进程池"""
+        def fail(workers):
+            raise AssertionError("process pool should not be used")
+
+        monkeypatch.setattr(processing_module, '_get_process_pool', fail)
+        service = ProcessingService(workers=4)
+
+        result = service.process_excel_file(excel_file, 'Claims', patent_column_name='Patent')
+
+        assert result.total_cells_processed == 60
+        assert service.get_processing_statistics()['workers'] == 4
+
+    def test_falls_back_to_serial_when_pool_unavailable(self, excel_file, summarize_result, monkeypatch):
+        """测试进程池不可用时回退到顺序处理"""
+        def unavailable(workers):
+            raise OSError("process creation not permitted")
+
+        monkeypatch.setattr(processing_module, '_get_process_pool', unavailable)
+        serial = ProcessingService().process_excel_file(excel_file, 'Claims', patent_column_name='Patent')
+        fallback = ProcessingService(workers=2, chunk_size=7, parallel_threshold=0).process_excel_file(
+            excel_file, 'Claims', patent_column_name='Patent'
+        )
+
+        assert summarize_result(fallback) == summarize_result(serial)
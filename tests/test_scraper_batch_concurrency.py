@@ -0,0 +1,102 @@
+"""
+并发批量爬取与令牌桶限速测试
+
+不访问网络：scrape_patent 被替换为带延迟的桩函数。
+"""
+
+import random
+import threading
+import time
+
+import pytest
+
+from backend.scraper.rate_limiter import TokenBucket, HostRateLimiter
+from backend.scraper.simple_scraper import SimplePatentScraper, SimplePatentResult
+
+
+class TestTokenBucket:
+    """TokenBucket测试类"""
+
+    def test_burst_then_rate_limited(self):
+        """测试突发容量用完后按速率放行"""
+        bucket = TokenBucket(rate=20.0, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 2个突发令牌立即可用，剩余2个需要约 2/20 秒
+        assert elapsed >= 0.09
+
+    def test_acquire_timeout(self):
+        """测试等待超时返回False"""
+        bucket = TokenBucket(rate=0.5, capacity=1)
+        assert bucket.acquire() is True
+        assert bucket.acquire(timeout=0.05) is False
+
+    def test_invalid_rate(self):
+        """测试非法速率参数"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_hosts_have_independent_buckets(self):
+        """测试不同主机使用独立的令牌桶"""
+        limiter = HostRateLimiter(rate=0.5, capacity=1)
+        assert limiter.acquire('https://patents.google.com/patent/A', timeout=0) is True
+        assert limiter.acquire('https://example.com/x', timeout=0) is True
+        assert limiter.acquire('https://patents.google.com/patent/B', timeout=0.01) is False
+
+
+class TestConcurrentBatch:
+    """scrape_patents_batch 并发模式测试类"""
+
+    def _make_scraper(self, max_concurrency):
+        scraper = SimplePatentScraper(delay=0.0, max_concurrency=max_concurrency)
+        self.active = 0
+        self.peak = 0
+        lock = threading.Lock()
+
+        def fake_scrape(patent_number, **kwargs):
+            with lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(random.uniform(0.01, 0.05))
+            with lock:
+                self.active -= 1
+            return SimplePatentResult(patent_number=patent_number, success=True)
+
+        scraper.scrape_patent = fake_scrape
+        return scraper
+
+    def test_results_keep_input_order(self):
+        """测试结果顺序与输入顺序一致"""
+        scraper = self._make_scraper(max_concurrency=5)
+        numbers = [f"US{i}B2" for i in range(20)]
+
+        results = scraper.scrape_patents_batch(numbers)
+
+        assert [r.patent_number for r in results] == numbers
+        scraper.close()
+
+    def test_concurrency_is_bounded(self):
+        """测试并发数不超过配置上限"""
+        scraper = self._make_scraper(max_concurrency=3)
+        scraper.scrape_patents_batch([f"CN{i}A" for i in range(12)])
+
+        assert 1 < self.peak <= 3
+        scraper.close()
+
+    def test_sequential_when_concurrency_is_one(self):
+        """测试并发数为1时串行执行"""
+        scraper = self._make_scraper(max_concurrency=1)
+        results = scraper.scrape_patents_batch(['A', 'B', 'C'])
+
+        assert self.peak == 1
+        assert [r.patent_number for r in results] == ['A', 'B', 'C']
+        scraper.close()
+
+    def test_empty_batch(self):
+        """测试空列表"""
+        scraper = self._make_scraper(max_concurrency=4)
+        assert scraper.scrape_patents_batch([]) == []
+        scraper.close()
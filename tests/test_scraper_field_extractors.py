@@ -0,0 +1,123 @@
+"""
+按字段选择的延迟提取测试
+
+使用仓库中的 Google Patents HTML 样例，不访问网络。
+"""
+
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from backend.scraper.extractors import EXTRACTORS, plan_extractors
+from backend.scraper.simple_scraper import SimplePatentScraper
+
+HTML_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'google patents html example.txt')
+PATENT_NUMBER = 'US12390907B2'
+
+# 前端选择性爬取模式发送的字段：基础字段 + 勾选的可选字段（见 js/modules/patent-batch/field-selector.js）
+FRONTEND_BASE_FIELDS = [
+    'patent_number', 'title', 'abstract', 'applicant', 'inventor',
+    'filing_date', 'publication_date', 'priority_date', 'ipc_classification',
+]
+
+
+@pytest.fixture(scope='module')
+def html_text():
+    with open(HTML_FIXTURE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture
+def scraper():
+    scraper = SimplePatentScraper(delay=0)
+    yield scraper
+    scraper.close()
+
+
+def extract(scraper, html_text, **kwargs):
+    soup = BeautifulSoup(html_text, 'lxml')
+    return scraper._extract_patent_data(soup, PATENT_NUMBER, f'https://patents.google.com/patent/{PATENT_NUMBER}', **kwargs)
+
+
+class TestExtractorPlan:
+    """提取器计划测试类"""
+
+    def test_family_request_skips_heavy_sections(self):
+        """测试同族请求不规划说明书、引用和事件，始终提取的字段仍然规划"""
+        names = {e.name for e in plan_extractors(True, ['family_applications', 'country_status'])}
+
+        assert names == {'bibliographic', 'claims', 'pdf_link', 'drawings', 'family'}
+
+    def test_no_selection_plans_everything(self):
+        """测试未选择字段时规划全部提取器"""
+        assert len(plan_extractors(True, None)) == len(EXTRACTORS)
+
+    def test_specification_fields_need_crawl_specification(self):
+        """测试说明书类字段依赖crawl_specification"""
+        names = {e.name for e in plan_extractors(False, ['description', 'claims', 'classifications'])}
+
+        assert names == {'bibliographic', 'claims', 'pdf_link', 'drawings', 'classifications'}
+
+
+class TestLazyExtraction:
+    """延迟提取测试类"""
+
+    def test_fields_resolve_on_first_access(self, scraper, html_text):
+        """测试字段在首次访问时才提取"""
+        data = extract(scraper, html_text, crawl_specification=True)
+        loader = data.__dict__['_loader']
+
+        assert 'claims' in loader.pending
+        assert len(data.claims) == 34
+        assert 'claims' not in loader.pending
+        assert 'description' in loader.pending
+
+    def test_family_request_only_extracts_family(self, scraper, html_text):
+        """测试同族请求返回同族数据且不提取其他大字段"""
+        data = extract(scraper, html_text, crawl_specification=True,
+                       selected_fields=['family_applications', 'country_status'])
+
+        assert data.title == 'Ratcheting tool with clutch'
+        assert len(data.family_applications) == 4
+        assert len(data.country_status) == 2
+        assert data.family_id == '69141714'
+        assert data.description == ''
+        assert data.patent_citations == []
+        assert data.legal_events == []
+
+    def test_frontend_selection_keeps_claims_and_drawings(self, scraper, html_text):
+        """测试前端选择性字段列表（不含claims/drawings）仍返回权利要求和附图"""
+        selected_fields = FRONTEND_BASE_FIELDS + ['legal_events', 'description']
+
+        data = extract(scraper, html_text, crawl_specification=True, selected_fields=selected_fields)
+
+        assert len(data.claims) == 34
+        assert len(data.drawings) == 17
+        assert data.description
+        assert data.patent_citations == []
+
+    def test_parse_tree_released_after_resolution(self, scraper, html_text):
+        """测试全部字段提取后释放解析树"""
+        data = extract(scraper, html_text, crawl_specification=True, selected_fields=['claims'])
+        context = data.__dict__['_loader'].context
+
+        data.to_dict()
+
+        assert context.soup is None
+
+    def test_lazy_and_eager_results_match(self, scraper, html_text):
+        """测试延迟与立即提取结果一致"""
+        lazy = extract(scraper, html_text, crawl_specification=True, crawl_full_drawings=True)
+        eager = extract(scraper, html_text, crawl_specification=True, crawl_full_drawings=True, lazy=False)
+
+        assert lazy.to_dict() == eager.to_dict()
+
+    def test_explicit_assignment_wins(self, scraper, html_text):
+        """测试显式赋值不会被延迟提取覆盖"""
+        data = extract(scraper, html_text, crawl_specification=True)
+        data.claims = ['override']
+
+        data.resolve_all()
+
+        assert data.claims == ['override']
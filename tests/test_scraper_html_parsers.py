@@ -0,0 +1,128 @@
+"""
+HTML解析后端一致性测试
+
+lxml后端必须在仓库中的 Google Patents HTML 样例上产出与 BeautifulSoup 完全相同的 SimplePatentData。
+"""
+
+import os
+
+import pytest
+
+from backend.scraper.html_parsers import LxmlNode, parse_html
+from backend.scraper.simple_scraper import SimplePatentScraper
+
+HTML_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'google patents html example.txt')
+PATENT_NUMBER = 'US12390907B2'
+
+FIELD_SELECTIONS = [
+    None,
+    ['claims'],
+    ['family_applications', 'country_status'],
+    ['description', 'patent_citations', 'cited_by', 'legal_events', 'events_timeline',
+     'similar_documents', 'classifications', 'landscapes', 'priority_date', 'external_links'],
+]
+
+
+@pytest.fixture(scope='module')
+def html_text():
+    with open(HTML_FIXTURE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(scope='module')
+def scraper():
+    scraper = SimplePatentScraper(delay=0)
+    yield scraper
+    scraper.close()
+
+
+def extract(scraper, html_text, parser, **kwargs):
+    soup = parse_html(html_text, parser)
+    data = scraper._extract_patent_data(soup, PATENT_NUMBER, f'https://patents.google.com/patent/{PATENT_NUMBER}', **kwargs)
+    return data.to_dict()
+
+
+class TestParserParity:
+    """解析后端一致性测试类"""
+
+    @pytest.mark.parametrize('crawl_specification', [False, True])
+    @pytest.mark.parametrize('crawl_full_drawings', [False, True])
+    @pytest.mark.parametrize('selected_fields', FIELD_SELECTIONS)
+    def test_lxml_matches_bs4(self, scraper, html_text, crawl_specification, crawl_full_drawings, selected_fields):
+        """测试lxml与bs4后端提取结果一致"""
+        options = dict(crawl_specification=crawl_specification, crawl_full_drawings=crawl_full_drawings,
+                       selected_fields=selected_fields)
+
+        expected = extract(scraper, html_text, 'bs4', **options)
+        actual = extract(scraper, html_text, 'lxml', **options)
+
+        assert actual == expected
+
+    def test_lxml_extracts_full_page(self, scraper, html_text):
+        """测试lxml后端提取到完整数据"""
+        data = extract(scraper, html_text, 'lxml', crawl_specification=True, crawl_full_drawings=True)
+
+        assert data['title'] == 'Ratcheting tool with clutch'
+        assert len(data['claims']) == 34
+        assert len(data['family_applications']) == 4
+        assert len(data['patent_citations']) == 20
+        assert data['description']
+
+
+class TestLxmlNode:
+    """LxmlNode查找语义测试类"""
+
+    HTML = (
+        '<html><head><script>var x = 1;</script></head><body>'
+        '<ul><li class="claim first">A<!-- note -->B</li><li class="claim-dependent">C</li><li class="other">D</li></ul>'
+        '<h2>Links</h2><div><p>skip</p></div><table id="t"><tr><td num="1">x</td></tr></table>'
+        '<div class="outer">head <script>hidden()</script> tail</div>'
+        '</body></html>'
+    )
+
+    @pytest.fixture
+    def root(self):
+        return parse_html(self.HTML, 'lxml')
+
+    def test_class_matches_single_token(self, root):
+        """测试class按单个类名匹配"""
+        assert [li.get_text() for li in root.find_all('li', class_='claim')] == ['AB']
+        assert [li.get_text() for li in root.find_all('li', class_=['claim', 'claim-dependent'])] == ['AB', 'C']
+        assert root.find('li', {'class': 'claim first'}).get('class') == ['claim', 'first']
+
+    def test_attribute_presence_and_names(self, root):
+        """测试属性存在匹配与多标签名匹配"""
+        assert root.find('td', {'num': True}).get('num') == '1'
+        assert [n.name for n in root.find_all(['h2', 'table'])] == ['h2', 'table']
+
+    def test_find_next_and_sibling(self, root):
+        """测试find_next与find_next_sibling"""
+        h2 = root.find('h2')
+
+        assert h2.find_next('table').get('id') == 't'
+        assert h2.find_next_sibling().name == 'div'
+
+    def test_get_text_skips_scripts_and_comments(self, root):
+        """测试get_text跳过脚本与注释"""
+        outer = root.find('div', {'class': 'outer'})
+
+        assert outer.get_text(separator='|', strip=True) == 'head|tail'
+        assert root.find('script').string == 'var x = 1;'
+
+    def test_missing_lookups(self, root):
+        """测试未命中时返回None或空列表"""
+        assert root.find('section') is None
+        assert root.find_all('span', {'itemprop': 'name'}) == []
+        assert parse_html('', 'lxml').find('h1') is None
+
+    def test_unknown_parser_rejected(self):
+        """测试未知解析后端报错"""
+        with pytest.raises(ValueError):
+            parse_html(self.HTML, 'html5lib')
+        with pytest.raises(ValueError):
+            SimplePatentScraper(parser='html5lib')
+
+    def test_wraps_lxml_elements(self, root):
+        """测试返回LxmlNode包装对象"""
+        assert isinstance(root.find('ul'), LxmlNode)
+        assert root.find('ul') == root.find('ul')
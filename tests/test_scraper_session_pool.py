@@ -0,0 +1,124 @@
+"""
+爬虫HTTP会话池测试
+
+不访问网络：会话由假Session替代。
+"""
+
+import threading
+import time
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+from backend.scraper.session_pool import RETRY_STATUS_CODES, SessionPool, SessionPoolTimeout
+from backend.scraper.simple_scraper import SimplePatentScraper
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def get(self, url, timeout=None):
+        raise AssertionError("network access in test")
+
+    def close(self):
+        self.closed = True
+
+
+class TestSessionPool:
+    """SessionPool测试类"""
+
+    def test_sessions_are_exclusive(self):
+        """测试同一会话不会同时被两个请求使用"""
+        pool = SessionPool(size=2, session_factory=FakeSession)
+        holders = {}
+        overlaps = []
+        lock = threading.Lock()
+
+        def work():
+            with pool.checkout() as session:
+                with lock:
+                    if id(session) in holders:
+                        overlaps.append(session)
+                    holders[id(session)] = True
+                time.sleep(0.01)
+                with lock:
+                    del holders[id(session)]
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats()
+        assert overlaps == []
+        assert stats['checkouts'] == 8
+        assert stats['peak_in_use'] == 2
+        assert stats['waits'] > 0
+        assert stats['in_use'] == 0
+
+    def test_checkout_timeout(self):
+        """测试会话耗尽时超时报错"""
+        pool = SessionPool(size=1, session_factory=FakeSession, checkout_timeout=0.05)
+
+        with pool.checkout():
+            assert pool.stats()['utilization'] == 1.0
+            with pytest.raises(SessionPoolTimeout):
+                with pool.checkout():
+                    pass
+
+        assert pool.stats()['timeouts'] == 1
+        with pool.checkout():
+            pass
+
+    def test_session_returned_after_exception(self):
+        """测试请求异常后会话归还到池中"""
+        pool = SessionPool(size=1, session_factory=FakeSession, checkout_timeout=0.05)
+
+        with pytest.raises(RuntimeError):
+            with pool.checkout():
+                raise RuntimeError('request failed')
+
+        assert pool.stats()['available'] == 1
+
+    def test_default_sessions_retry_with_jitter(self):
+        """测试默认会话配置带抖动退避的重试"""
+        pool = SessionPool(size=2, pool_maxsize=3, retries=4, backoff_factor=0.2, backoff_jitter=0.3,
+                           headers={'User-Agent': 'test'})
+
+        with pool.checkout() as session:
+            adapter = session.get_adapter('https://patents.google.com/')
+            assert isinstance(adapter, HTTPAdapter)
+            assert adapter._pool_maxsize == 3
+            assert adapter.max_retries.total == 4
+            assert adapter.max_retries.backoff_jitter == 0.3
+            assert set(adapter.max_retries.status_forcelist) == set(RETRY_STATUS_CODES)
+            assert session.headers['User-Agent'] == 'test'
+        pool.close()
+
+    def test_close_closes_every_session(self):
+        """测试关闭会话池"""
+        sessions = []
+
+        def factory():
+            sessions.append(FakeSession())
+            return sessions[-1]
+
+        pool = SessionPool(size=3, session_factory=factory)
+        pool.close()
+
+        assert len(sessions) == 3
+        assert all(session.closed for session in sessions)
+
+    def test_scraper_reports_pool_timeout_as_request_error(self):
+        """测试会话池超时返回请求错误结果"""
+        pool = SessionPool(size=1, session_factory=FakeSession, checkout_timeout=0.01)
+        scraper = SimplePatentScraper(delay=0, session_pool=pool)
+
+        with pool.checkout():
+            result = scraper.scrape_patent('US12390907B2')
+
+        assert not result.success
+        assert result.error.startswith('Request error')
+        scraper.close()
@@ -0,0 +1,227 @@
+"""
+进行中请求合并（single-flight）测试
+
+使用仓库中的 Google Patents HTML 样例，不访问网络。
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from backend.scraper.session_pool import SessionPool
+from backend.scraper.simple_scraper import SimplePatentScraper
+from backend.scraper.single_flight import SingleFlight
+
+HTML_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'google patents html example.txt')
+PATENT_NUMBER = 'US12390907B2'
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.encoding = None
+
+    def raise_for_status(self):
+        pass
+
+
+class GatedSession:
+    """请求会阻塞直到放行的假Session，用于制造并发进行中的请求"""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self._lock:
+            self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        return FakeResponse(self.text)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def html_text():
+    with open(HTML_FIXTURE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def run_in_threads(calls):
+    results = [None] * len(calls)
+    threads = []
+    for i, call in enumerate(calls):
+        def target(i=i, call=call):
+            results[i] = call()
+        thread = threading.Thread(target=target)
+        thread.start()
+        threads.append(thread)
+    return threads, results
+
+
+class TestSingleFlight:
+    """SingleFlight测试类"""
+
+    def test_concurrent_callers_share_one_execution(self):
+        """测试相同key的并发调用只执行一次"""
+        flight = SingleFlight()
+        gate = threading.Event()
+        executions = []
+
+        def work():
+            executions.append(1)
+            gate.wait(5)
+            return 'value'
+
+        threads, results = run_in_threads([lambda: flight.do('k', work) for _ in range(5)])
+        wait_until(lambda: flight.stats()['shared'] == 4)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(executions) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert all(value == 'value' for value, _ in results)
+        assert flight.in_flight() == 0
+
+    def test_exception_reaches_every_caller(self):
+        """测试异常传递给所有等待者"""
+        flight = SingleFlight()
+        gate = threading.Event()
+        errors = []
+
+        def work():
+            gate.wait(5)
+            raise RuntimeError('boom')
+
+        def call():
+            try:
+                flight.do('k', work)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        threads, _ = run_in_threads([call, call, call])
+        wait_until(lambda: flight.stats()['shared'] == 2)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == ['boom'] * 3
+
+    def test_covering_call_is_joined(self):
+        """测试覆盖当前需求的进行中调用会被复用"""
+        flight = SingleFlight()
+        gate = threading.Event()
+
+        def big():
+            gate.wait(5)
+            return {'a', 'b'}
+
+        threads, results = run_in_threads([lambda: flight.do(frozenset('ab'), big)])
+        wait_until(lambda: flight.in_flight() == 1)
+        small_threads, small_results = run_in_threads([
+            lambda: flight.do(frozenset('a'), lambda: {'a'}, covers=lambda key: {'a'} <= key)
+        ])
+        wait_until(lambda: flight.stats()['shared'] == 1)
+        gate.set()
+        for thread in threads + small_threads:
+            thread.join()
+
+        assert small_results[0] == ({'a', 'b'}, True)
+        assert flight.stats()['executions'] == 1
+
+    def test_sequential_calls_run_again(self):
+        """测试已完成的调用不会被缓存"""
+        flight = SingleFlight()
+
+        assert flight.do('k', lambda: 1) == (1, False)
+        assert flight.do('k', lambda: 2) == (2, False)
+
+
+class TestScraperCoalescing:
+    """SimplePatentScraper请求合并测试类"""
+
+    def standalone(self, html_text, **kwargs):
+        session = GatedSession(html_text)
+        scraper = SimplePatentScraper(delay=0, coalesce=False, session_pool=SessionPool(size=2, session_factory=lambda: session))
+        session.release.set()
+        try:
+            return scraper.scrape_patent(PATENT_NUMBER, **kwargs).data.to_dict()
+        finally:
+            scraper.close()
+
+    def test_superset_request_satisfies_subsets(self, html_text):
+        """测试全字段请求满足并发的子集请求，且结果与单独爬取一致"""
+        session = GatedSession(html_text)
+        scraper = SimplePatentScraper(delay=0, session_pool=SessionPool(size=2, session_factory=lambda: session))
+        claims_only = dict(crawl_specification=True, selected_fields=['claims'])
+        family_only = dict(crawl_specification=True, selected_fields=['family_applications', 'country_status'])
+
+        leader_threads, leader = run_in_threads([lambda: scraper.scrape_patent(PATENT_NUMBER, crawl_specification=True)])
+        session.entered.wait(5)
+        threads, followers = run_in_threads([
+            lambda: scraper.scrape_patent(PATENT_NUMBER, **claims_only),
+            lambda: scraper.scrape_patent(PATENT_NUMBER, **claims_only),
+            lambda: scraper.scrape_patent(PATENT_NUMBER, **family_only),
+        ])
+        wait_until(lambda: scraper.in_flight.stats()['shared'] == 3)
+        session.release.set()
+        for thread in leader_threads + threads:
+            thread.join()
+
+        assert session.calls == 1
+        assert leader[0].success and all(result.success for result in followers)
+        assert followers[0].data.to_dict() == self.standalone(html_text, **claims_only)
+        assert followers[2].data.to_dict() == self.standalone(html_text, **family_only)
+        assert followers[0].data is not followers[1].data
+        scraper.close()
+
+    def test_non_covering_requests_fetch_separately(self, html_text):
+        """测试不能覆盖的请求各自爬取"""
+        session = GatedSession(html_text)
+        scraper = SimplePatentScraper(delay=0, session_pool=SessionPool(size=2, session_factory=lambda: session))
+
+        threads, results = run_in_threads([
+            lambda: scraper.scrape_patent(PATENT_NUMBER, selected_fields=['claims']),
+            lambda: scraper.scrape_patent(PATENT_NUMBER, crawl_specification=True, selected_fields=['description']),
+        ])
+        wait_until(lambda: session.calls == 2)
+        session.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(result.success for result in results)
+        assert scraper.in_flight.stats()['shared'] == 0
+        scraper.close()
+
+    def test_drawings_mode_must_match(self, html_text):
+        """测试附图模式不同的请求不合并"""
+        session = GatedSession(html_text)
+        scraper = SimplePatentScraper(delay=0, session_pool=SessionPool(size=2, session_factory=lambda: session))
+
+        threads, _ = run_in_threads([
+            lambda: scraper.scrape_patent(PATENT_NUMBER, crawl_full_drawings=True),
+            lambda: scraper.scrape_patent(PATENT_NUMBER, crawl_full_drawings=False),
+        ])
+        wait_until(lambda: session.calls == 2)
+        session.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert scraper.in_flight.stats()['executions'] == 2
+        scraper.close()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+附图标记OCR结果去重微基准
+
+对比逐一比较的原实现与网格分桶实现，在合成的密集附图标记布局上的耗时，并校验结果一致。
+布局模拟多次识别合并后的结果：每个标记在原位置附近被识别出多次，位置有抖动，置信度不同。
+
+用法:
+    python tools/benchmark_ocr_dedup.py [--markers 300 1000 3000] [--passes 3] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.ocr_utils import deduplicate_results  # noqa: E402
+
+
+def build_layout(rng: random.Random, markers: int, passes: int, width: int = 2500, height: int = 3500):
+    """生成密集布局：markers个标记，每个被识别passes次（位置抖动±20像素）"""
+    labels = [str(n) for n in range(1, 60)] + [f"{n}{c}" for n in range(1, 30) for c in 'ab']
+    anchors = [(rng.choice(labels), rng.randint(0, width), rng.randint(0, height)) for _ in range(markers)]
+    results = []
+    for _ in range(passes):
+        for number, x, y in anchors:
+            results.append({
+                'number': number,
+                'x': x + rng.randint(-20, 20),
+                'y': y + rng.randint(-20, 20),
+                'width': 24,
+                'height': 18,
+                'confidence': round(rng.uniform(50, 99), 2)
+            })
+    rng.shuffle(results)
+    return results
+
+
+def legacy_deduplicate(results, position_threshold: int = 20):
+    """原实现：与每个已保留结果逐一比较"""
+    deduplicated = []
+    for result in results:
+        is_duplicate = False
+        for existing in deduplicated:
+            if existing['number'] == result['number']:
+                distance = ((existing['x'] - result['x']) ** 2 +
+                            (existing['y'] - result['y']) ** 2) ** 0.5
+                if distance < position_threshold:
+                    if result['confidence'] > existing['confidence']:
+                        existing.update(result)
+                    is_duplicate = True
+                    break
+        if not is_duplicate:
+            deduplicated.append(result.copy())
+    return deduplicated
+
+
+def best_of(func, results, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(results, position_threshold=30)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--markers', type=int, nargs='+', default=[300, 1000, 3000], help='每张图的标记数量')
+    arg_parser.add_argument('--passes', type=int, default=3, help='每个标记被识别的次数')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='重复次数（取最快一次）')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(42)
+    for markers in args.markers:
+        results = build_layout(rng, markers, args.passes)
+        same = legacy_deduplicate(results, 30) == deduplicate_results(results, 30)
+        legacy = best_of(legacy_deduplicate, results, args.repeat)
+        grid = best_of(deduplicate_results, results, args.repeat)
+
+        print(f"标记数: {markers}, 识别结果数: {len(results)}")
+        print(f"  逐一比较: {legacy * 1000:.1f} ms")
+        print(f"  网格分桶: {grid * 1000:.1f} ms")
+        print(f"  加速比:   {legacy / grid:.2f}x")
+        print(f"  结果一致: {same}")
+
+
+if __name__ == '__main__':
+    main()